@@ -0,0 +1,123 @@
+# -*- coding: utf-8
+
+"""Benchmark of the automatic differentiation of component equations.
+
+Compare the number of fluid property calls and equation evaluations per
+iteration with numerical and with automatic partial derivatives for the
+equations opting in to the automatic differentiation: the zeta and the
+kA_group equations of a pipe and the zeta equation of a valve.
+
+Run with :code:`python benchmarks/autodiff.py`.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+benchmarks/autodiff.py
+
+SPDX-License-Identifier: MIT
+"""
+from collections import Counter
+from contextlib import contextmanager
+
+from tespy.components import Pipe
+from tespy.components import Sink
+from tespy.components import Source
+from tespy.components import Valve
+from tespy.connections import Connection
+from tespy.networks import Network
+
+EQUATIONS = {
+    Pipe: ["zeta_func", "kA_group_func"],
+    Valve: ["zeta_func"],
+}
+
+
+@contextmanager
+def count_evaluations(counter):
+    """Count the evaluations of the equations of :code:`EQUATIONS`."""
+    def counted(name, func):
+        # no functools.wraps: the automatic differentiation unwraps the
+        # equation and would bypass the counter
+        def wrapper(self, *args, **kwargs):
+            counter[name] += 1
+            return func(self, *args, **kwargs)
+        return wrapper
+
+    patched = []
+    for cls, names in EQUATIONS.items():
+        for name in names:
+            original = cls.__dict__.get(name)
+            setattr(cls, name, counted(name, getattr(cls, name)))
+            patched += [(cls, name, original)]
+    try:
+        yield
+    finally:
+        for cls, name, original in patched:
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+
+
+def create_network(instance):
+    """Create a network of a single component between source and sink."""
+    nw = Network(T_unit="C", p_unit="bar", iterinfo=False, profile=True)
+    so = Source("source")
+    si = Sink("sink")
+    c1 = Connection(so, "out1", instance, "in1", label="1")
+    c2 = Connection(instance, "out1", si, "in1", label="2")
+    nw.add_conns(c1, c2)
+    return nw, c1, c2
+
+
+def pipe_model():
+    """Pipe with zeta and kA_group equations."""
+    pipe = Pipe("pipe")
+    nw, c1, _ = create_network(pipe)
+    c1.set_attr(fluid={"water": 1}, m=10, T=90, p=10)
+    pipe.set_attr(zeta=1e6, kA=5e3, Tamb=10)
+    return nw, pipe, [pipe.zeta, pipe.kA_group]
+
+
+def valve_model():
+    """Valve with variable zeta value."""
+    valve = Valve("valve")
+    nw, c1, c2 = create_network(valve)
+    c1.set_attr(fluid={"CH4": 1}, m=10, p=10, T=120)
+    c2.set_attr(p=1)
+    valve.set_attr(zeta="var")
+    return nw, valve, [valve.zeta]
+
+
+def main():
+    results = {}
+    for model in [pipe_model, valve_model]:
+        for autodiff in [False, True]:
+            evaluations = Counter()
+            with count_evaluations(evaluations):
+                nw, component, parameters = model()
+                for data in parameters:
+                    data.autodiff = autodiff
+                nw.solve("design")
+            nw._convergence_check()
+
+            report = nw.profile_report()
+            report = report[
+                (report["object"] == component.label)
+                & (report["phase"].isin(["residual", "derivative"]))
+            ]
+            results[component.label, autodiff] = (
+                report["calls"].sum() / nw.iter,
+                sum(evaluations.values()) / nw.iter
+            )
+
+    print("Fluid property calls and equation evaluations per iteration:")
+    for (label, autodiff), (calls, evaluations) in results.items():
+        print(
+            f"- {label} (autodiff={autodiff}): {calls:.0f} property calls, "
+            f"{evaluations:.0f} equation evaluations"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8
+
+"""Benchmark of the IAPWS-IF97 implementation for water and steam.
+
+Compare the time per state of the native IF97 implementation for arrays and
+scalar states with the iapws library (if installed) and the IF97 back end of
+CoolProp for 2000 random states between 0.01 and 20 MPa and 300 and 900 K.
+
+Run with :code:`python benchmarks/if97.py`.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+benchmarks/if97.py
+
+SPDX-License-Identifier: MIT
+"""
+from time import perf_counter
+
+import CoolProp.CoolProp as CP
+import numpy as np
+
+from tespy.tools.fluid_properties import if97
+
+NUM_STATES = 2000
+
+
+def time_per_state(function, *args):
+    """Return the time per state of a function in microseconds."""
+    start = perf_counter()
+    function(*args)
+    return (perf_counter() - start) / NUM_STATES * 1e6
+
+
+def scalar(function):
+    """Evaluate a function state by state."""
+    def evaluate(x, y):
+        return [function(a, b) for a, b in zip(x, y)]
+    return evaluate
+
+
+def main():
+    rng = np.random.default_rng(42)
+    p = 1e4 + rng.random(NUM_STATES) * (20e6 - 1e4)
+    T = 300 + rng.random(NUM_STATES) * 600
+    h = if97.properties_pT(p, T)["h"]
+
+    timings = {
+        "h_pT": {
+            "array": time_per_state(if97.properties_pT, p, T),
+            "scalar": time_per_state(scalar(if97.properties_pT), p, T),
+            "CoolProp IF97": time_per_state(scalar(
+                lambda p, T: CP.PropsSI("H", "P", p, "T", T, "IF97::Water")
+            ), p, T),
+        },
+        "T_ph": {
+            "array": time_per_state(if97.properties_ph, p, h),
+            "scalar": time_per_state(scalar(if97.properties_ph), p, h),
+            "CoolProp IF97": time_per_state(scalar(
+                lambda p, h: CP.PropsSI("T", "P", p, "H", h, "IF97::Water")
+            ), p, h),
+        }
+    }
+
+    try:
+        from iapws import IAPWS97
+    except ImportError:
+        print("The iapws library is not installed and not benchmarked.")
+    else:
+        timings["h_pT"]["iapws"] = time_per_state(scalar(
+            lambda p, T: IAPWS97(P=p / 1e6, T=T).h
+        ), p, T)
+        timings["T_ph"]["iapws"] = time_per_state(scalar(
+            lambda p, h: IAPWS97(P=p / 1e6, h=h / 1e3).T
+        ), p, h)
+
+    print(f"Time per state for {NUM_STATES} random states:")
+    for function, results in timings.items():
+        print(f"- {function}: " + ", ".join(
+            f"{label} {value:.1f} us" for label, value in results.items()
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8
+
+"""Benchmark of the export and loading of networks.
+
+Compare the export and load times of a network of 500 parallel pipes for the
+export to a folder and to a single file.
+
+Run with :code:`python benchmarks/network_io.py`.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+benchmarks/network_io.py
+
+SPDX-License-Identifier: MIT
+"""
+import os
+import tempfile
+from time import perf_counter
+
+from tespy.components import Merge
+from tespy.components import Pipe
+from tespy.components import Sink
+from tespy.components import Source
+from tespy.components import Splitter
+from tespy.connections import Bus
+from tespy.connections import Connection
+from tespy.networks import Network
+from tespy.networks import load_network
+
+NUM_BRANCHES = 500
+
+
+def create_branched_network(num):
+    """Create a network of parallel pipes between a splitter and a merge."""
+    nw = Network(T_unit="C", p_unit="bar", iterinfo=False)
+    so, si = Source("source"), Sink("sink")
+    splitter = Splitter("splitter", num_out=num)
+    merge = Merge("merge", num_in=num)
+    c1 = Connection(so, "out1", splitter, "in1", label="inlet")
+    c2 = Connection(merge, "out1", si, "in1", label="outlet")
+    nw.add_conns(c1, c2)
+    heat = Bus("heat loss")
+    for i in range(num):
+        pipe = Pipe(f"pipe {i}", design=["zeta"], offdesign=["kA_char"])
+        c3 = Connection(splitter, f"out{i + 1}", pipe, "in1", label=f"{i} in")
+        c4 = Connection(
+            pipe, "out1", merge, f"in{i + 1}", label=f"{i} out", p0=5
+        )
+        nw.add_conns(c3, c4)
+        pipe.set_attr(zeta=1e6 * (1 + i / num), kA=5e3, Tamb=10)
+        heat.add_comps({"comp": pipe, "char": 0.9})
+    nw.add_busses(heat)
+    c1.set_attr(fluid={"water": 1}, m=10 * num, T=90, p=10)
+    return nw
+
+
+def main():
+    nw = create_branched_network(NUM_BRANCHES)
+    times = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for fn in ["network", "network.json"]:
+            path = os.path.join(tmp, fn)
+            start = perf_counter()
+            nw.export(path)
+            export = perf_counter() - start
+            start = perf_counter()
+            load_network(path)
+            times[fn] = export, perf_counter() - start
+
+    print(f"Export and load times of {len(nw.conns)} connections:")
+    for fn, (export, load) in times.items():
+        print(f"- {fn}: export {export:.2f} s, load {load:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
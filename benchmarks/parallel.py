@@ -0,0 +1,78 @@
+# -*- coding: utf-8
+
+"""Benchmark of the parallel evaluation of the equations.
+
+Compare the solve time of a network of 20 parallel pipes for different
+numbers of worker processes. The first solve includes the start of the
+worker processes, which persist for the following solves. The speedup depends
+on the number of cores of the machine.
+
+Run with :code:`python benchmarks/parallel.py`.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+benchmarks/parallel.py
+
+SPDX-License-Identifier: MIT
+"""
+from time import perf_counter
+
+from tespy.components import Merge
+from tespy.components import Pipe
+from tespy.components import Sink
+from tespy.components import Source
+from tespy.components import Splitter
+from tespy.connections import Connection
+from tespy.networks import Network
+
+NUM_BRANCHES = 20
+NUM_SOLVES = 3
+
+
+def create_pipe_network(num_branches, workers=1):
+    """Create a network of parallel pipes with different friction."""
+    nw = Network(T_unit="C", p_unit="bar", iterinfo=False, workers=workers)
+    so = Source("source")
+    si = Sink("sink")
+    splitter = Splitter("splitter", num_out=num_branches)
+    merge = Merge("merge", num_in=num_branches)
+    inlet = Connection(so, "out1", splitter, "in1", label="inlet")
+    outlet = Connection(merge, "out1", si, "in1", label="outlet")
+    nw.add_conns(inlet, outlet)
+
+    for i in range(num_branches):
+        pipe = Pipe(f"pipe {i}")
+        c1 = Connection(splitter, f"out{i + 1}", pipe, "in1", label=f"{i} in")
+        c2 = Connection(pipe, "out1", merge, f"in{i + 1}", label=f"{i} out")
+        nw.add_conns(c1, c2)
+        pipe.set_attr(zeta=1e6 * (1 + i / num_branches), kA=5e3, Tamb=10)
+        c1.set_attr(m0=10)
+        c2.set_attr(p0=10)
+
+    inlet.set_attr(fluid={"water": 1}, m=10 * num_branches, T=90, p=20)
+    return nw
+
+
+def main():
+    times = {}
+    for workers in [1, 2, 4]:
+        nw = create_pipe_network(NUM_BRANCHES, workers)
+        times[workers] = []
+        for _ in range(NUM_SOLVES):
+            start = perf_counter()
+            nw.solve("design")
+            times[workers] += [perf_counter() - start]
+            nw._convergence_check()
+
+    print(f"Solve time of {NUM_BRANCHES} parallel pipes:")
+    for workers, results in times.items():
+        speedup = times[1][-1] / results[-1]
+        print(
+            f"- {workers} workers: first solve {results[0]:.2f} s, "
+            f"following solves {results[-1]:.2f} s, speedup {speedup:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
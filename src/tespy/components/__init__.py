@@ -11,6 +11,7 @@ from .heat_exchangers.base import HeatExchanger  # noqa: F401
 from .heat_exchangers.condenser import Condenser  # noqa: F401
 from .heat_exchangers.desuperheater import Desuperheater  # noqa: F401
 from .heat_exchangers.parabolic_trough import ParabolicTrough  # noqa: F401
+from .heat_exchangers.segmented import SegmentedHeatExchanger  # noqa: F401
 from .heat_exchangers.simple import HeatExchangerSimple  # noqa: F401
 from .heat_exchangers.simple import SimpleHeatExchanger  # noqa: F401
 from .heat_exchangers.solar_collector import SolarCollector  # noqa: F401
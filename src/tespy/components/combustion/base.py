@@ -10,8 +10,6 @@ tespy/components/combustion/base.py
 
 SPDX-License-Identifier: MIT
 """
-import itertools
-
 import CoolProp.CoolProp as CP
 import numpy as np
 
@@ -300,6 +298,76 @@ class CombustionChamber(Component):
                     self.fuels[f][el] = 0
             self.fuels[f]['LHV'] = self.calc_lhv(f)
 
+        self.setup_reaction_matrices()
+
+    def setup_reaction_matrices(self):
+        r"""
+        Setup the matrices of the reaction balance.
+
+        The mass flows of the species produced or consumed by the reaction are
+        linear in the mass flows of the species entering the component, only
+        the fuel balance in case of excess fuel is nonlinear. The vectors and
+        matrices are ordered like the stoichiometry equations.
+
+        - :code:`carbon`, :code:`hydrogen`: moles of carbon and hydrogen atoms
+          per mass of the species
+        - :code:`oxygen`: moles of oxygen per mass of the species
+        - :code:`stoich`: moles of oxygen required for stoichiometric
+          combustion per mass of the species
+        - :code:`fuel`: indicator of the fuels
+        - :code:`lean`: reaction matrix for :math:`\lambda \geq 1` without
+          the oxygen balance
+        - :code:`lean_stoich`: oxygen consumption for stoichiometric
+          combustion of the fuels
+        - :code:`lean_oxygen`: oxygen consumption for a given combustion air
+          ratio (divided by :math:`\lambda`)
+        - :code:`rich`: linear part of the reaction matrix for
+          :math:`\lambda < 1`
+        """
+        inl, _ = self._get_combustion_connections()
+        index = {f: i for i, f in enumerate(self.fluid_eqs_list)}
+        num_fl = len(index)
+
+        def molar_mass(fluid):
+            return inl[0].fluid.wrapper[fluid]._molar_mass
+
+        def unit_vector(fluid):
+            vector = np.zeros(num_fl)
+            vector[index[fluid]] = 1
+            return vector
+
+        carbon = np.zeros(num_fl)
+        hydrogen = np.zeros(num_fl)
+        fuel = np.zeros(num_fl)
+        for f in self.fuel_list:
+            carbon[index[f]] = self.fuels[f]['C'] / molar_mass(f)
+            hydrogen[index[f]] = self.fuels[f]['H'] / molar_mass(f)
+            fuel[index[f]] = 1
+
+        oxygen = unit_vector(self.o2) / molar_mass(self.o2)
+        stoich = carbon + hydrogen / 4
+
+        co2 = unit_vector(self.co2) * molar_mass(self.co2)
+        h2o = unit_vector(self.h2o) * molar_mass(self.h2o) / 2
+        o2 = unit_vector(self.o2) * molar_mass(self.o2)
+
+        lean = np.outer(co2, carbon) + np.outer(h2o, hydrogen) - np.diag(fuel)
+        self.reaction = {
+            'carbon': carbon,
+            'hydrogen': hydrogen,
+            'oxygen': oxygen,
+            'stoich': stoich,
+            'fuel': fuel,
+            'lean': lean,
+            'lean_stoich': lean - np.outer(o2, stoich),
+            'lean_oxygen': np.outer(o2, oxygen),
+            'rich': (
+                np.outer(co2, carbon - stoich + oxygen)
+                + np.outer(h2o, hydrogen - 4 * (stoich - oxygen))
+                - np.outer(o2, oxygen)
+            )
+        }
+
     def calc_lhv(self, f):
         r"""
         Calculate the lower heating value of the combustion chamber's fuel.
@@ -483,15 +551,83 @@ class CombustionChamber(Component):
 
         Returns
         -------
-        residual : list
+        residual : ndarray
             Vector with residual values of equations.
+
+            .. math::
+
+                0 = \dot{\vec{m}}_\mathrm{in} + R \cdot
+                \dot{\vec{m}}_\mathrm{in} - \vec{x}_\mathrm{out} \cdot
+                \dot{m}_\mathrm{out}\\
+                \dot{\vec{m}}_\mathrm{in} = \sum_i \vec{x}_i \cdot
+                \dot{m}_i\;\forall i \in \text{combustion inlets}
+
+        Note
+        ----
+        The reaction matrix :math:`R` holds the mass flows of the species
+        produced (positive) and consumed (negative) by the reaction per mass
+        flow of the species entering the component. For the individual
+        equations see
+        :py:meth:`tespy.components.combustion.base.CombustionChamber.stoichiometry`
+        and for the setup of the matrices
+        :py:meth:`tespy.components.combustion.base.CombustionChamber.setup_reaction_matrices`.
         """
-        # calculate equations
-        residual = []
-        for fluid in self.fluid_eqs_list:
-            residual += [self.stoichiometry(fluid)]
+        inl, outl = self._get_combustion_connections()
+        m_in = self._species_mass_flow(inl)
+        R, _ = self._reaction_matrix(m_in)
+        return (
+            m_in + R @ m_in
+            - self._fluid_vector(outl[0]) * outl[0].m.val_SI
+        )
+
+    def _fluid_vector(self, c):
+        return np.array([c.fluid.val[f] for f in self.fluid_eqs_list])
 
-        return residual
+    def _species_mass_flow(self, conns):
+        return sum(c.m.val_SI * self._fluid_vector(c) for c in conns)
+
+    def _reaction_matrix(self, m_in):
+        r"""
+        Get the reaction matrix and its Jacobian for the inlet species flows.
+
+        Parameters
+        ----------
+        m_in : ndarray
+            Mass flows of the species entering the component.
+
+        Returns
+        -------
+        R : ndarray
+            Reaction matrix, the mass flows of the species produced and
+            consumed by the reaction are :math:`R \cdot \dot{\vec{m}}_{in}`.
+
+        J : ndarray
+            Partial derivatives of the reaction mass flows to the inlet
+            species flows.
+        """
+        reaction = self.reaction
+        n_oxygen = reaction['oxygen'] @ m_in
+        n_oxygen_stoich = reaction['stoich'] @ m_in
+
+        if not self.lamb.is_set:
+            self.lamb.val = n_oxygen / n_oxygen_stoich
+
+        if self.lamb.val >= 1:
+            if self.lamb.is_set:
+                R = reaction['lean'] - reaction['lean_oxygen'] / self.lamb.val
+            else:
+                R = reaction['lean_stoich']
+            return R, R
+
+        # excess fuel: the burnt share of the fuels is the ratio of available
+        # to stoichiometric oxygen
+        ratio = n_oxygen / n_oxygen_stoich
+        fuel = reaction['fuel']
+        R = reaction['rich'] - np.diag(fuel * ratio)
+        d_ratio = (
+            reaction['oxygen'] - ratio * reaction['stoich']
+        ) / n_oxygen_stoich
+        return R, R - np.outer(fuel * m_in, d_ratio)
 
     def stoichiometry(self, fluid):
         r"""
@@ -592,92 +728,7 @@ class CombustionChamber(Component):
         residual : float
             Residual value for corresponding fluid.
         """
-        # required to work with combustion chamber and engine
-        inl, outl = self._get_combustion_connections()
-
-        ###################################################################
-        # molar mass flow for fuel and oxygen
-        n_fuel = {}
-        n_oxy_stoich = {}
-        n_h = 0
-        n_c = 0
-        for f in self.fuel_list:
-            n_fuel[f] = 0
-            for i in inl:
-                n = i.m.val_SI * i.fluid.val[f] / inl[0].fluid.wrapper[f]._molar_mass
-                n_fuel[f] += n
-                n_h += n * self.fuels[f]['H']
-                n_c += n * self.fuels[f]['C']
-
-            # stoichiometric oxygen requirement for each fuel
-            n_oxy_stoich[f] = n_fuel[f] * (
-                self.fuels[f]['H'] / 4 + self.fuels[f]['C']
-            )
-
-        n_oxygen = 0
-        for i in inl:
-            n_oxygen += (
-                i.m.val_SI * i.fluid.val[self.o2] / inl[0].fluid.wrapper[self.o2]._molar_mass
-            )
-
-        ###################################################################
-        # calculate stoichiometric oxygen
-        n_oxygen_stoich = n_h / 4 + n_c
-
-        ###################################################################
-        # calculate lambda if not set
-        if not self.lamb.is_set:
-            self.lamb.val = n_oxygen / n_oxygen_stoich
-
-        ###################################################################
-        # calculate excess fuel if lambda is lower than 1
-        if self.lamb.val < 1:
-            n_h_exc = (n_oxygen_stoich - n_oxygen) * 4
-            n_c_exc = (n_oxygen_stoich - n_oxygen)
-        else:
-            n_h_exc = 0
-            n_c_exc = 0
-
-        ###################################################################
-        # equation for carbondioxide
-        if fluid == self.co2:
-            dm = (n_c - n_c_exc) * inl[0].fluid.wrapper[self.co2]._molar_mass
-
-        ###################################################################
-        # equation for water
-        elif fluid == self.h2o:
-            dm = (n_h - n_h_exc) / 2 * inl[0].fluid.wrapper[self.h2o]._molar_mass
-
-        ###################################################################
-        # equation for oxygen
-        elif fluid == self.o2:
-            if self.lamb.val < 1:
-                dm = -n_oxygen * inl[0].fluid.wrapper[self.o2]._molar_mass
-            else:
-                dm = -n_oxygen / self.lamb.val * inl[0].fluid.wrapper[self.o2]._molar_mass
-
-        ###################################################################
-        # equation for fuel
-        elif fluid in self.fuel_list:
-            if self.lamb.val < 1:
-                n_fuel_exc = (
-                    -(n_oxygen / n_oxygen_stoich - 1) * n_oxy_stoich[fluid]
-                    / (self.fuels[fluid]['H'] / 4 + self.fuels[fluid]['C'])
-                )
-            else:
-                n_fuel_exc = 0
-            dm = -(n_fuel[fluid] - n_fuel_exc) * inl[0].fluid.wrapper[fluid]._molar_mass
-
-        ###################################################################
-        # equation for other fluids
-        else:
-            dm = 0
-
-        res = dm
-        for i in inl:
-            res += i.fluid.val[fluid] * i.m.val_SI
-        res -= outl[0].fluid.val[fluid] * outl[0].m.val_SI
-        return res
+        return self.stoichiometry_func()[self.fluid_eqs_list.index(fluid)]
 
     def stoichiometry_func_doc(self, label):
         r"""
@@ -790,19 +841,33 @@ class CombustionChamber(Component):
         """
         # required to work with combustion chamber and engine
         inl, outl = self._get_combustion_connections()
-        f = self.stoichiometry
-        conns = inl + outl
-        for fluid, conn in itertools.product(self.fluid_eqs_list, conns):
-            eq_num = self.fluid_eqs_list.index(fluid)
-            if self.is_variable(conn.m, increment_filter):
-                self.jacobian[k + eq_num, conn.m.J_col] = self.numeric_deriv(
-                    f, 'm', conn, fluid=fluid
+        m_in = self._species_mass_flow(inl)
+        _, J = self._reaction_matrix(m_in)
+        J = J + np.eye(len(m_in))
+
+        for c in inl:
+            if self.is_variable(c.m, increment_filter):
+                self._set_stoichiometry_deriv(
+                    k, c.m.J_col, J @ self._fluid_vector(c)
                 )
-            for fluid_name in conn.fluid.is_var:
-                self.jacobian[k + eq_num, conn.fluid.J_col[fluid_name]] = self.numeric_deriv(
-                    f, fluid_name, conn, fluid=fluid
+            for fluid in c.fluid.is_var:
+                eq_num = self.fluid_eqs_list.index(fluid)
+                self._set_stoichiometry_deriv(
+                    k, c.fluid.J_col[fluid], J[:, eq_num] * c.m.val_SI
                 )
 
+        o = outl[0]
+        if self.is_variable(o.m, increment_filter):
+            self._set_stoichiometry_deriv(k, o.m.J_col, -self._fluid_vector(o))
+        for fluid in o.fluid.is_var:
+            deriv = np.zeros(len(m_in))
+            deriv[self.fluid_eqs_list.index(fluid)] = -o.m.val_SI
+            self._set_stoichiometry_deriv(k, o.fluid.J_col[fluid], deriv)
+
+    def _set_stoichiometry_deriv(self, k, col, deriv):
+        for eq_num, value in enumerate(deriv):
+            self.jacobian[k + eq_num, col] = value
+
     def energy_balance_func(self):
         r"""
         Calculate the energy balance of the adiabatic combustion chamber.
@@ -1067,24 +1132,8 @@ class CombustionChamber(Component):
         k : int
             Position of equation in Jacobian matrix.
         """
-        inl, outl = self._get_combustion_connections()
-        for i in inl:
-            if i.m.is_var:
-                deriv = 0
-                for f in self.fuel_list:
-                    deriv -= i.fluid.val[f] * self.fuels[f]['LHV']
-                self.jacobian[k, i.m.J_col] = deriv
-            for f in (self.fuel_list & i.fluid.is_var):
-                self.jacobian[k, i.fluid.J_col[f]] = -i.m.val_SI * self.fuels[f]['LHV']
-
-        o = outl[0]
-        if o.m.is_var:
-            deriv = 0
-            for f in self.fuel_list:
-                deriv += o.fluid.val[f] * self.fuels[f]['LHV']
-            self.jacobian[k, o.m.J_col] = deriv
-        for f in (self.fuel_list & o.fluid.is_var):
-            self.jacobian[k, o.fluid.J_col[f]] = o.m.val_SI * self.fuels[f]['LHV']
+        for col, deriv in self.calc_ti_deriv().items():
+            self.jacobian[k, col] = -deriv
 
     def calc_ti(self):
         r"""
@@ -1116,6 +1165,45 @@ class CombustionChamber(Component):
 
         return ti
 
+    def calc_ti_deriv(self, increment_filter=None):
+        r"""
+        Calculate the partial derivatives of the thermal input.
+
+        Parameters
+        ----------
+        increment_filter : ndarray
+            Matrix for filtering non-changing variables.
+
+        Returns
+        -------
+        deriv : dict
+            Partial derivatives of the thermal input to the variable mass
+            flows and fuel mass fractions of the combustion connections with
+            their column in the Jacobian matrix as key.
+
+            .. math::
+
+                \frac{\partial ti}{\partial \dot{m}_{in,i}} =
+                \sum_{fuel} LHV_{fuel} \cdot x_{fuel,in,i}\\
+                \frac{\partial ti}{\partial x_{fuel,in,i}} =
+                LHV_{fuel} \cdot \dot{m}_{in,i}
+        """
+        inl, outl = self._get_combustion_connections()
+        deriv = {}
+        for sign, conns in [(1, inl), (-1, outl)]:
+            for c in conns:
+                if self.is_variable(c.m, increment_filter):
+                    deriv[c.m.J_col] = sign * sum(
+                        c.fluid.val[f] * self.fuels[f]['LHV']
+                        for f in self.fuel_list
+                    )
+                for f in (self.fuel_list & c.fluid.is_var):
+                    deriv[c.fluid.J_col[f]] = (
+                        sign * c.m.val_SI * self.fuels[f]['LHV']
+                    )
+
+        return deriv
+
     def bus_func(self, bus):
         r"""
         Calculate the value of the bus function.
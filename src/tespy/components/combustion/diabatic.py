@@ -205,7 +205,7 @@ class DiabaticCombustionChamber(CombustionChamber):
                 min_val=0, deriv=self.ti_deriv, func=self.ti_func,
                 latex=self.ti_func_doc, num_eq=1),
             'pr': dc_cp(
-                min_val=0, deriv=self.pr_deriv,
+                min_val=0, deriv=self.pr_deriv, constant_deriv=True,
                 func=self.pr_func,
                 latex=self.pr_func_doc, num_eq=1),
             'eta': dc_cp(
@@ -20,6 +20,7 @@ from tespy.tools.data_containers import ComponentCharacteristics as dc_cc
 from tespy.tools.data_containers import ComponentProperties as dc_cp
 from tespy.tools.data_containers import SimpleDataContainer as dc_simple
 from tespy.tools.document_models import generate_latex_eq
+from tespy.tools.fluid_properties import h_mix_pT
 from tespy.tools.fluid_properties import s_mix_ph
 from tespy.tools.fluid_properties import s_mix_pT
 
@@ -266,11 +267,11 @@ class CombustionEngine(CombustionChamber):
             'Qloss': dc_cp(val=-1e5, d=1, max_val=-1),
             'pr1': dc_cp(
                 min_val=1e-4, max_val=1, num_eq=1, deriv=self.pr_deriv,
-                latex=self.pr_func_doc,
+                constant_deriv=True, latex=self.pr_func_doc,
                 func=self.pr_func, func_params={'pr': 'pr1'}),
             'pr2': dc_cp(
                 min_val=1e-4, max_val=1, num_eq=1, latex=self.pr_func_doc,
-                deriv=self.pr_deriv, func=self.pr_func,
+                deriv=self.pr_deriv, constant_deriv=True, func=self.pr_func,
                 func_params={'pr': 'pr2', 'inconn': 1, 'outconn': 1}),
             'zeta1': dc_cp(
                 min_val=0, max_val=1e15, num_eq=1, latex=self.zeta_func_doc,
@@ -460,19 +461,24 @@ class CombustionEngine(CombustionChamber):
         k : int
             Position of equation in Jacobian matrix.
         """
-        f = self.energy_balance_func
         # mass flow cooling water
         for i, o in zip(self.inl[:2], self.outl[:2]):
             if i.m.is_var:
                 self.jacobian[k, i.m.J_col] = -(o.h.val_SI - i.h.val_SI)
 
-        # mass flow and pressure for combustion reaction
+        # mass flow and fuel mass fractions for combustion reaction, the
+        # reference state does not depend on the pressure
+        for col, deriv in self.calc_ti_deriv(increment_filter).items():
+            self.jacobian[k, col] = deriv
+
         inl, outl = self._get_combustion_connections()
-        for c in inl + outl:
-            if self.is_variable(c.m, increment_filter):
-                self.jacobian[k, c.m.J_col] = self.numeric_deriv(f, 'm', c)
-            if self.is_variable(c.p, increment_filter):
-                self.jacobian[k, c.p.J_col] = self.numeric_deriv(f, 'p', c)
+        for sign, conns in [(1, inl), (-1, outl)]:
+            for c in conns:
+                if self.is_variable(c.m, increment_filter):
+                    h_ref = h_mix_pT(
+                        1e5, 298.15, c.fluid_data, mixing_rule="forced-gas"
+                    )
+                    self.jacobian[k, c.m.J_col] += sign * (c.h.val_SI - h_ref)
 
         # enthalpy all connections
         for i in self.inl:
@@ -483,16 +489,6 @@ class CombustionEngine(CombustionChamber):
             if o.h.is_var:
                 self.jacobian[k, o.h.J_col] = -o.m.val_SI
 
-        # fluid composition
-        for c in inl:
-            for fl in (self.fuel_list & c.fluid.is_var):
-                self.jacobian[k, c.fluid.J_col[fl]] = c.m.val_SI * self.fuels[fl]['LHV']
-
-        c = outl[0]
-        for fl in (self.fuel_list & c.fluid.is_var):
-            self.jacobian[k, c.fluid.J_col[fl]] = -c.m.val_SI * self.fuels[fl]['LHV']
-
-
         # power and heat loss
         if self.P.is_var:
             self.jacobian[k, self.P.J_col] = 1
@@ -680,16 +676,16 @@ class CombustionEngine(CombustionChamber):
         k : int
             Position of equation in Jacobian matrix.
         """
-        inl, outl = self._get_combustion_connections()
-        f = self.tiP_char_func
-        for c in inl + outl:
-            if self.is_variable(c.m, increment_filter):
-                self.jacobian[k, c.m.J_col] = self.numeric_deriv(f, 'm', c)
-            for fl in (self.fuel_list & c.fluid.is_var):
-                self.jacobian[k, c.fluid.J_col[fl]] = self.numeric_deriv(f, fl, c)
+        for col, deriv in self.calc_ti_deriv(increment_filter).items():
+            self.jacobian[k, col] = deriv
 
         if self.P.is_var:
-            self.jacobian[k, self.P.J_col] = self.numeric_deriv(f, 'P', None)
+            expr, dexpr = self.calc_P_expr()
+            char = self.tiP_char.char_func
+            self.jacobian[k, self.P.J_col] = (
+                char.evaluate(expr)
+                + self.P.val * char.evaluate_deriv(expr) * dexpr
+            )
 
     def Q1_char_func(self):
         r"""
@@ -766,25 +762,7 @@ class CombustionEngine(CombustionChamber):
         k : int
             Position of equation in Jacobian matrix.
         """
-        f = self.Q1_char_func
-        i = self.inl[0]
-        if self.is_variable(i.m, increment_filter):
-            self.jacobian[k, i.m.J_col] = self.numeric_deriv(f, 'm', i)
-        if self.is_variable(i.h, increment_filter):
-            self.jacobian[k, i.h.J_col] = self.numeric_deriv(f, 'h', i)
-        o = self.outl[0]
-        if self.is_variable(o.h, increment_filter):
-            self.jacobian[k, o.h.J_col] = self.numeric_deriv(f, 'h', o)
-
-        inl, outl = self._get_combustion_connections()
-        for c in inl + outl:
-            if self.is_variable(c.m, increment_filter):
-                self.jacobian[k, c.m.J_col] = self.numeric_deriv(f, 'm', c)
-            for fl in (self.fuel_list & c.fluid.is_var):
-                self.jacobian[k, c.fluid.J_col[fl]] = self.numeric_deriv(f, fl, c)
-
-        if self.P.is_var:
-            self.jacobian[k, self.P.J_col] = self.numeric_deriv(f, 'P', None)
+        self.heat_char_deriv(increment_filter, k, self.Q1_char, 0)
 
     def Q2_char_func(self):
         r"""
@@ -863,25 +841,7 @@ class CombustionEngine(CombustionChamber):
         k : int
             Position of equation in Jacobian matrix.
         """
-        f = self.Q2_char_func
-        i = self.inl[1]
-        if self.is_variable(i.m, increment_filter):
-            self.jacobian[k, i.m.J_col] = self.numeric_deriv(f, 'm', i)
-        if self.is_variable(i.h, increment_filter):
-            self.jacobian[k, i.h.J_col] = self.numeric_deriv(f, 'h', i)
-        o = self.outl[1]
-        if self.is_variable(o.h, increment_filter):
-            self.jacobian[k, o.h.J_col] = self.numeric_deriv(f, 'h', o)
-
-        inl, outl = self._get_combustion_connections()
-        for c in inl + outl:
-            if self.is_variable(c.m, increment_filter):
-                self.jacobian[k, c.m.J_col] = self.numeric_deriv(f, 'm', c)
-            for fl in (self.fuel_list & c.fluid.is_var):
-                self.jacobian[k, c.fluid.J_col[fl]] = self.numeric_deriv(f, fl, c)
-
-        if self.P.is_var:
-            self.jacobian[k, self.P.J_col] = self.numeric_deriv(f, 'P', None)
+        self.heat_char_deriv(increment_filter, k, self.Q2_char, 1)
 
     def Qloss_char_func(self):
         r"""
@@ -948,18 +908,81 @@ class CombustionEngine(CombustionChamber):
         k : int
             Position of equation in Jacobian matrix.
         """
-        f = self.Qloss_char_func
-        inl, outl = self._get_combustion_connections()
-        for c in inl + outl:
-            if self.is_variable(c.m, increment_filter):
-                self.jacobian[k, c.m.J_col] = self.numeric_deriv(f, 'm', c)
-            for fl in (self.fuel_list & c.fluid.is_var):
-                self.jacobian[k, c.fluid.J_col[fl]] = self.numeric_deriv(f, fl, c)
+        expr, dexpr = self.calc_P_expr()
+        f_ti = self.tiP_char.char_func
+        f_Qloss = self.Qloss_char.char_func
+        factor = f_Qloss.evaluate(expr)
+        for col, deriv in self.calc_ti_deriv(increment_filter).items():
+            self.jacobian[k, col] = factor * deriv
 
         if self.P.is_var:
-            self.jacobian[k, self.P.J_col] = self.numeric_deriv(f, 'P', None)
+            self.jacobian[k, self.P.J_col] = dexpr * (
+                self.calc_ti() * f_Qloss.evaluate_deriv(expr)
+                + f_ti.evaluate_deriv(expr) * self.Qloss.val
+            )
         if self.Qloss.is_var:
-            self.jacobian[k, self.Qloss.J_col] = self.numeric_deriv(f, 'Qloss', None)
+            self.jacobian[k, self.Qloss.J_col] = f_ti.evaluate(expr)
+
+    def heat_char_deriv(self, increment_filter, k, char, idx):
+        r"""
+        Calculate partial derivatives of a heat output to thermal input char.
+
+        Parameters
+        ----------
+        increment_filter : ndarray
+            Matrix for filtering non-changing variables.
+
+        k : int
+            Position of equation in Jacobian matrix.
+
+        char : tespy.tools.data_containers.ComponentCharacteristics
+            Characteristic of the heat output, i.e. :code:`Q1_char` or
+            :code:`Q2_char`.
+
+        idx : int
+            Index of the cooling loop.
+        """
+        i = self.inl[idx]
+        o = self.outl[idx]
+        expr, dexpr = self.calc_P_expr()
+        f_ti = self.tiP_char.char_func
+        factor = char.char_func.evaluate(expr)
+        for col, deriv in self.calc_ti_deriv(increment_filter).items():
+            self.jacobian[k, col] = factor * deriv
+
+        factor = f_ti.evaluate(expr)
+        if self.is_variable(i.m, increment_filter):
+            self.jacobian[k, i.m.J_col] = -factor * (o.h.val_SI - i.h.val_SI)
+        if self.is_variable(i.h, increment_filter):
+            self.jacobian[k, i.h.J_col] = factor * i.m.val_SI
+        if self.is_variable(o.h, increment_filter):
+            self.jacobian[k, o.h.J_col] = -factor * i.m.val_SI
+
+        if self.P.is_var:
+            self.jacobian[k, self.P.J_col] = dexpr * (
+                self.calc_ti() * char.char_func.evaluate_deriv(expr)
+                - f_ti.evaluate_deriv(expr) * i.m.val_SI
+                * (o.h.val_SI - i.h.val_SI)
+            )
+
+    def calc_P_expr(self):
+        r"""
+        Calculate the input of the characteristic lines.
+
+        Returns
+        -------
+        expr : tuple
+            Ratio of power output to power output in design case and its
+            derivative to the power output.
+
+            .. math::
+
+                expr = \frac{P}{P_{design}}
+        """
+        if np.isnan(self.P.design):
+            return 1, 0
+        else:
+            return self.P.val / self.P.design, 1 / self.P.design
 
     def calc_P(self):
         r"""
@@ -1151,82 +1174,58 @@ class CombustionEngine(CombustionChamber):
         deriv : ndarray
             Matrix of partial derivatives.
         """
-        inl, outl = self._get_combustion_connections()
-        f = self.calc_bus_value
-        b = bus.comps.loc[self]
+        b = bus.members[self]
 
         ######################################################################
         # derivatives for bus parameter of thermal input (TI)
         if b['param'] == 'TI':
-            for c in inl + outl:
-                if c.m.is_var:
-                    if c.m.J_col not in bus.jacobian:
-                        bus.jacobian[c.m.J_col] = 0
-                    bus.jacobian[c.m.J_col] -= self.numeric_deriv(f, 'm', c, bus=bus)
-
-                for fluid in c.fluid.is_var:
-                    if c.fluid.J_col[fluid] not in bus.jacobian:
-                        bus.jacobian[c.fluid.J_col[fluid]] = 0
-                    bus.jacobian[c.fluid.J_col[fluid]] -= self.numeric_deriv(f, fluid, c, bus=bus)
+            deriv = self.calc_ti_deriv()
 
         ######################################################################
         # derivatives for bus parameter of power production (P) or
         # heat loss (Qloss)
         elif b['param'] == 'P' or b['param'] == 'Qloss':
-            for c in inl + outl:
-                if c.m.is_var:
-                    if c.m.J_col not in bus.jacobian:
-                        bus.jacobian[c.m.J_col] = 0
-                    bus.jacobian[c.m.J_col] -= self.numeric_deriv(f, 'm', c, bus=bus)
-
-                for fluid in c.fluid.is_var:
-                    if c.fluid.J_col[fluid] not in bus.jacobian:
-                        bus.jacobian[c.fluid.J_col[fluid]] = 0
-                    bus.jacobian[c.fluid.J_col[fluid]] -= self.numeric_deriv(f, fluid, c, bus=bus)
-
+            expr, dexpr = self.calc_P_expr()
+            ti = self.calc_ti()
+            f_ti = self.tiP_char.char_func.evaluate(expr)
+            df_ti = self.tiP_char.char_func.evaluate_deriv(expr) * dexpr
+            if b['param'] == 'P':
+                factor = -1 / f_ti
+                dP = ti * df_ti / f_ti ** 2
+            else:
+                f_Qloss = self.Qloss_char.char_func.evaluate(expr)
+                df_Qloss = (
+                    self.Qloss_char.char_func.evaluate_deriv(expr) * dexpr
+                )
+                factor = -f_Qloss / f_ti
+                dP = -ti * (df_Qloss * f_ti - f_Qloss * df_ti) / f_ti ** 2
+
+            deriv = {
+                col: factor * d for col, d in self.calc_ti_deriv().items()
+            }
             # variable power
             if self.P.is_var:
-                if self.P.J_col not in bus.jacobian:
-                    bus.jacobian[self.P.J_col] = 0
-                bus.jacobian[self.P.J_col] -= self.numeric_deriv(f, 'P', None, bus=bus)
+                deriv[self.P.J_col] = dP
 
         ######################################################################
-        # derivatives for bus parameter of total heat production (Q)
-        elif b['param'] == 'Q':
-            for i, o in zip(self.inl[:2], self.outl[:2]):
+        # derivatives for bus parameter of total heat production (Q) or heat
+        # production 1 and 2 (Q1, Q2)
+        elif b['param'] in ['Q', 'Q1', 'Q2']:
+            if b['param'] == 'Q':
+                loops = [0, 1]
+            else:
+                loops = [int(b['param'][-1]) - 1]
+
+            deriv = {}
+            for j in loops:
+                i = self.inl[j]
+                o = self.outl[j]
                 if i.m.is_var:
-                    if i.m.J_col not in bus.jacobian:
-                        bus.jacobian[i.m.J_col] = 0
-                    bus.jacobian[i.m.J_col] -= self.numeric_deriv(f, 'm', i, bus=bus)
+                    deriv[i.m.J_col] = -(o.h.val_SI - i.h.val_SI)
                 if i.h.is_var:
-                    if i.h.J_col not in bus.jacobian:
-                        bus.jacobian[i.h.J_col] = 0
-                    bus.jacobian[i.h.J_col] -= self.numeric_deriv(f, 'h', i, bus=bus)
-
+                    deriv[i.h.J_col] = i.m.val_SI
                 if o.h.is_var:
-                    if o.h.J_col not in bus.jacobian:
-                        bus.jacobian[o.h.J_col] = 0
-                    bus.jacobian[o.h.J_col] -= self.numeric_deriv(f, 'h', o, bus=bus)
-
-        ######################################################################
-        # derivatives for bus parameter of heat production 1 and 2 (Q1, Q2)
-        elif b['param'] in ['Q1', 'Q2']:
-            i = self.inl[int(b["param"][-1]) - 1]
-            o = self.outl[int(b["param"][-1]) - 1]
-
-            if i.m.is_var:
-                if i.m.J_col not in bus.jacobian:
-                    bus.jacobian[i.m.J_col] = 0
-                bus.jacobian[i.m.J_col] -= self.numeric_deriv(f, 'm', i, bus=bus)
-            if i.h.is_var:
-                if i.h.J_col not in bus.jacobian:
-                    bus.jacobian[i.h.J_col] = 0
-                bus.jacobian[i.h.J_col] -= self.numeric_deriv(f, 'h', i, bus=bus)
-
-            if o.h.is_var:
-                if o.h.J_col not in bus.jacobian:
-                    bus.jacobian[o.h.J_col] = 0
-                bus.jacobian[o.h.J_col] -= self.numeric_deriv(f, 'h', o, bus=bus)
+                    deriv[o.h.J_col] = -i.m.val_SI
 
         ######################################################################
         # missing/invalid bus parameter
@@ -1236,6 +1235,12 @@ class CombustionEngine(CombustionChamber):
             logger.error(msg)
             raise ValueError(msg)
 
+        bus_value_deriv = self.calc_bus_value_deriv(bus)
+        for col, d in deriv.items():
+            if col not in bus.jacobian:
+                bus.jacobian[col] = 0
+            bus.jacobian[col] -= bus_value_deriv * d
+
     @staticmethod
     def initialise_source(c, key):
         r"""
@@ -12,9 +12,15 @@ available from its original location tespy/components/components.py
 SPDX-License-Identifier: MIT
 """
 
+import copy
+import inspect
+import logging
+import types
+
 import numpy as np
 
 from tespy.tools import logger
+from tespy.tools.autodiff import evaluate as autodiff_evaluate
 from tespy.tools.characteristics import CharLine
 from tespy.tools.characteristics import CharMap
 from tespy.tools.characteristics import load_default_char as ldc
@@ -432,9 +438,27 @@ class Component:
                 constraint["deriv"](sum_eq)
             sum_eq += num_eq
 
+        self.constant_deriv_parameters = []
+        for key, data in self.parameters.items():
+            if data.is_set and data.func is not None:
+                # the value of a variable parameter enters its derivatives
+                if (
+                        data.constant_deriv and not data.is_var
+                        and not data.autodiff
+                    ):
+                    data.deriv(None, sum_eq, **data.func_params)
+                    self.constant_deriv_parameters += [key]
+                sum_eq += data.num_eq
+
+        # the partial derivatives of linear equations are not recalculated
+        self.constant_jacobian = self.jacobian
+        self.jacobian = {}
+
         # done
-        msg = f"The component {self.label} has {self.num_vars} variables."
-        logger.debug(msg)
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "The component %s has %s variables.", self.label, self.num_vars
+            )
 
     def get_parameters(self):
         return {}
@@ -584,6 +608,23 @@ class Component:
                     r'\frac{p_\mathrm{out,' + str(outconn + 1) +
                     r'}}{p_\mathrm{in,' + str(inconn + 1) + r'}}')
 
+    def get_variable_columns(self):
+        r"""
+        Return the columns of all variables the component equations depend on.
+
+        Returns
+        -------
+        columns : list
+            Positions of the component variables and of the mass flow,
+            pressure, enthalpy and fluid composition variables of the inlets
+            and outlets in the Jacobian matrix.
+        """
+        columns = [data.J_col for data in self.vars]
+        for c in self.inl + self.outl:
+            columns += [var.J_col for var in [c.m, c.p, c.h] if var.is_var]
+            columns += [c.fluid.J_col[fluid] for fluid in c.fluid.is_var]
+        return columns
+
     def solve(self, increment_filter):
         """
         Solve equations and calculate partial derivatives of a component.
@@ -596,21 +637,104 @@ class Component:
         sum_eq = 0
         for constraint in self.constraints.values():
             num_eq = constraint['num_eq']
-            if num_eq > 0:
-                self.residual[sum_eq:sum_eq + num_eq] = constraint['func']()
-            if not constraint['constant_deriv']:
-                constraint['deriv'](increment_filter, sum_eq)
+            if constraint.get('autodiff', False):
+                self.residual[sum_eq:sum_eq + num_eq] = self.autodiff(
+                    constraint['func'], increment_filter, sum_eq
+                )
+            else:
+                if num_eq > 0:
+                    self.residual[sum_eq:sum_eq + num_eq] = (
+                        constraint['func']()
+                    )
+                if not constraint['constant_deriv']:
+                    constraint['deriv'](increment_filter, sum_eq)
             sum_eq += num_eq
 
-        for data in self.parameters.values():
+        for key, data in self.parameters.items():
             if data.is_set and data.func is not None:
-                self.residual[sum_eq:sum_eq + data.num_eq] = data.func(
-                    **data.func_params
-                )
-                data.deriv(increment_filter, sum_eq, **data.func_params)
+                if data.autodiff:
+                    self.residual[sum_eq:sum_eq + data.num_eq] = (
+                        self.autodiff(
+                            data.func, increment_filter, sum_eq,
+                            **data.func_params
+                        )
+                    )
+                else:
+                    self.residual[sum_eq:sum_eq + data.num_eq] = data.func(
+                        **data.func_params
+                    )
+                    if key not in self.constant_deriv_parameters:
+                        data.deriv(
+                            increment_filter, sum_eq, **data.func_params
+                        )
 
                 sum_eq += data.num_eq
 
+    def autodiff(self, func, increment_filter, k, **kwargs):
+        r"""
+        Calculate residual values and partial derivatives of an equation.
+
+        The equation is evaluated once on a copy of the component and its
+        connections holding :py:class:`tespy.tools.autodiff.Dual` numbers for
+        the mass flow, pressure and enthalpy of the connections and the
+        component variables, i.e. the state of the component and its
+        connections is not changed. The partial derivatives to the fluid
+        composition are calculated numerically.
+
+        Parameters
+        ----------
+        func : function
+            Equation to evaluate.
+
+        increment_filter : ndarray
+            Matrix for filtering non-changing variables.
+
+        k : int
+            Position of the (first) equation in the Jacobian matrix.
+
+        Returns
+        -------
+        residual : ndarray
+            Residual values of the equations.
+        """
+        local = copy.copy(self)
+        local.inl = [c._local_copy() for c in self.inl]
+        local.outl = [c._local_copy() for c in self.outl]
+        conns = list(zip(self.inl + self.outl, local.inl + local.outl))
+
+        variables = []
+        columns = []
+        for c, local_c in conns:
+            for var in ['m', 'p', 'h']:
+                if self.is_variable(c.get_attr(var), increment_filter):
+                    variables += [(local_c.get_attr(var), 'val_SI')]
+                    columns += [c.get_attr(var).J_col]
+
+        for data, key in self.vars.items():
+            local_data = copy.copy(data)
+            local.__dict__[key] = local_data
+            variables += [(local_data, 'val')]
+            columns += [data.J_col]
+
+        # bind the equation to the copy, e.g. without profiling wrappers
+        func = types.MethodType(inspect.unwrap(func).__func__, local)
+        residual, deriv = autodiff_evaluate(func, variables, **kwargs)
+        for i, row in enumerate(deriv):
+            for col, value in zip(columns, row):
+                self.jacobian[k + i, col] = value
+
+        for c, local_c in conns:
+            for fluid in c.fluid.is_var:
+                col = c.fluid.J_col[fluid]
+                if not increment_filter[col]:
+                    deriv = np.atleast_1d(
+                        local.numeric_deriv(func, fluid, local_c, **kwargs)
+                    )
+                    for i, value in enumerate(deriv):
+                        self.jacobian[k + i, col] = value
+
+        return residual
+
     def bus_func(self, bus):
         r"""
         Base method for calculation of the value of the bus function.
@@ -642,13 +766,15 @@ class Component:
             Ratio of power to power design depending on the bus base
             specification.
         """
-        b = bus.comps.loc[self]
+        b = bus.members[self]
         if np.isnan(b['P_ref']) or b['P_ref'] == 0:
             return 1
         else:
             comp_val = self.bus_func(b)
             if b['base'] == 'component':
                 return abs(comp_val / b['P_ref'])
+            elif b['inverse'].invertible:
+                return b['inverse'].evaluate(comp_val / b['P_ref'])
             else:
                 kwargs = {
                     "function": bus_char_evaluation,
@@ -695,11 +821,13 @@ class Component:
 
         Note
         ----
-        If the base value of the bus is the bus value itself, a newton
-        iteration is used to find the bus value satisfying the corresponding
-        equation (case 1).
+        If the base value of the bus is the bus value itself, the bus value
+        satisfying the corresponding equation (case 1) is calculated from the
+        inverse of the characteristic line, see
+        :py:class:`tespy.connections.bus.InverseBusChar`. In case the inverse
+        is not available, a newton iteration is used.
         """
-        return bus.comps.loc[self, 'char'].evaluate(self.calc_bus_expr(bus))
+        return bus.members[self]['char'].evaluate(self.calc_bus_expr(bus))
 
     def calc_bus_value(self, bus):
         r"""
@@ -729,11 +857,13 @@ class Component:
 
         Note
         ----
-        If the base value of the bus is the bus value itself, a newton
-        iteration is used to find the bus value satisfying the corresponding
-        equation (case 1).
+        If the base value of the bus is the bus value itself, the bus value
+        satisfying the corresponding equation (case 1) is calculated from the
+        inverse of the characteristic line, see
+        :py:class:`tespy.connections.bus.InverseBusChar`. In case the inverse
+        is not available, a newton iteration is used.
         """
-        b = bus.comps.loc[self]
+        b = bus.members[self]
         comp_val = self.bus_func(b)
         expr = self.calc_bus_expr(bus)
         if b['base'] == 'component':
@@ -741,6 +871,53 @@ class Component:
         else:
             return comp_val / b['char'].evaluate(expr)
 
+    def calc_bus_value_deriv(self, bus):
+        r"""
+        Return the derivative of the bus value to the component's value.
+
+        Parameters
+        ----------
+        bus : tespy.connections.bus.Bus
+            Bus to calculate the derivative on.
+
+        Returns
+        -------
+        deriv : float
+            Derivative of the bus value to the value of the energy transfer
+            at the component.
+
+            .. math::
+
+                \frac{\partial \dot{E}_\mathrm{bus}}
+                {\partial \dot{E}_\mathrm{component}} = \begin{cases}
+                \frac{1}{f + \frac{\dot{E}_\mathrm{bus}}
+                {\dot{E}_\mathrm{bus,ref}} \cdot f'} &
+                \text{bus base = 'bus'}\\
+                f + \left|\frac{\dot{E}_\mathrm{component}}
+                {\dot{E}_\mathrm{component,ref}}\right| \cdot f' &
+                \text{bus base = 'component'}
+                \end{cases}
+
+        Note
+        ----
+        The partial derivatives of the bus equation are the product of this
+        value and the partial derivatives of the component's value, see
+        :py:meth:`tespy.components.combustion.engine.CombustionEngine.bus_deriv`
+        for an example.
+        """
+        b = bus.members[self]
+        expr = self.calc_bus_expr(bus)
+        eta = b['char'].evaluate(expr)
+        if np.isnan(b['P_ref']) or b['P_ref'] == 0:
+            deta = 0
+        else:
+            deta = b['char'].evaluate_deriv(expr)
+
+        if b['base'] == 'component':
+            return eta + expr * deta
+        else:
+            return 1 / (eta + expr * deta)
+
     def initialise_source(self, c, key):
         r"""
         Return a starting value for pressure and enthalpy at outlet.
@@ -1091,13 +1268,13 @@ class Component:
         """
         pr = self.get_attr(pr)
         i = self.inl[inconn]
-        o = self.outl[inconn]
+        o = self.outl[outconn]
         if i.p.is_var:
             self.jacobian[k, i.p.J_col] = pr.val
         if o.p.is_var:
             self.jacobian[k, o.p.J_col] = -1
         if pr.is_var:
-            self.jacobian[k, self.pr.J_col] = i.p.val_SI
+            self.jacobian[k, pr.J_col] = i.p.val_SI
 
     def calc_zeta(self, i, o):
         if abs(i.m.val_SI) <= 1e-4:
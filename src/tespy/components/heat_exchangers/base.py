@@ -18,6 +18,8 @@ from tespy.tools.data_containers import ComponentCharacteristics as dc_cc
 from tespy.tools.data_containers import ComponentProperties as dc_cp
 from tespy.tools.data_containers import GroupedComponentCharacteristics as dc_gcc
 from tespy.tools.document_models import generate_latex_eq
+from tespy.tools.fluid_properties import dT_mix_dph
+from tespy.tools.fluid_properties import dT_mix_pdh
 from tespy.tools.fluid_properties import h_mix_pT
 from tespy.tools.fluid_properties import s_mix_ph
 
@@ -216,11 +218,11 @@ class HeatExchanger(Component):
                 deriv=self.ttd_l_deriv, latex=self.ttd_l_func_doc),
             'pr1': dc_cp(
                 min_val=1e-4, max_val=1, num_eq=1, deriv=self.pr_deriv,
-                latex=self.pr_func_doc,
+                constant_deriv=True, latex=self.pr_func_doc,
                 func=self.pr_func, func_params={'pr': 'pr1'}),
             'pr2': dc_cp(
                 min_val=1e-4, max_val=1, num_eq=1, latex=self.pr_func_doc,
-                deriv=self.pr_deriv, func=self.pr_func,
+                deriv=self.pr_deriv, constant_deriv=True, func=self.pr_func,
                 func_params={'pr': 'pr2', 'inconn': 1, 'outconn': 1}),
             'zeta1': dc_cp(
                 min_val=0, max_val=1e15, num_eq=1, latex=self.zeta_func_doc,
@@ -376,18 +378,34 @@ class HeatExchanger(Component):
         if self.is_variable(o.h):
             self.jacobian[k, o.h.J_col] = i.m.val_SI
 
-    def calculate_td_log(self):
-        i1 = self.inl[0]
-        i2 = self.inl[1]
-        o1 = self.outl[0]
-        o2 = self.outl[1]
+    def calculate_terminal_temperatures(self):
+        r"""
+        Calculate the temperatures at the terminals of the heat exchanger.
 
-        # temperature value manipulation for convergence stability
-        T_i1 = i1.calc_T()
-        T_i2 = i2.calc_T()
-        T_o1 = o1.calc_T()
-        T_o2 = o2.calc_T()
+        Returns
+        -------
+        T : list
+            Temperature at hot side inlet, cold side inlet, hot side outlet
+            and cold side outlet.
+        """
+        return [c.calc_T() for c in self.inl + self.outl]
 
+    def calculate_terminal_temperature_differences(self, T_i1, T_i2, T_o1, T_o2):
+        r"""
+        Calculate the upper and lower terminal temperature difference.
+
+        Parameters
+        ----------
+        T_i1, T_i2, T_o1, T_o2 : float
+            Terminal temperatures, see
+            :py:meth:`calculate_terminal_temperatures`.
+
+        Returns
+        -------
+        ttd : tuple
+            Upper and lower terminal temperature difference.
+        """
+        # temperature value manipulation for convergence stability
         if T_i1 <= T_o2:
             T_i1 = T_o2 + 0.01
         if T_i1 <= T_o2:
@@ -397,8 +415,11 @@ class HeatExchanger(Component):
         if T_o1 <= T_i2:
             T_i2 = T_o1 - 0.02
 
-        ttd_u = T_i1 - T_o2
-        ttd_l = T_o1 - T_i2
+        return T_i1 - T_o2, T_o1 - T_i2
+
+    def calculate_td_log(self):
+        T = self.calculate_terminal_temperatures()
+        ttd_u, ttd_l = self.calculate_terminal_temperature_differences(*T)
 
         if ttd_u == ttd_l:
             td_log = ttd_l
@@ -407,6 +428,97 @@ class HeatExchanger(Component):
 
         return td_log
 
+    def calculate_T_deriv(self, c, increment_filter=None):
+        r"""
+        Calculate the partial derivatives of a terminal temperature.
+
+        Parameters
+        ----------
+        c : tespy.connections.connection.Connection
+            Connection of the terminal.
+
+        increment_filter : ndarray
+            Matrix for filtering non-changing variables.
+
+        Returns
+        -------
+        deriv : tuple
+            Partial derivatives to pressure and enthalpy of the connection,
+            zero in case the respective variable is not a system variable.
+        """
+        args = (
+            c.p.val_SI, c.h.val_SI, c.fluid_data, c.mixing_rule,
+            c._get_T_guess()
+        )
+        dT_dp = 0
+        dT_dh = 0
+        if self.is_variable(c.p, increment_filter):
+            dT_dp = dT_mix_dph(*args)
+        if self.is_variable(c.h, increment_filter):
+            dT_dh = dT_mix_pdh(*args)
+        return dT_dp, dT_dh
+
+    def calculate_td_log_deriv(self, increment_filter=None):
+        r"""
+        Calculate the logarithmic temperature difference and its derivatives.
+
+        Parameters
+        ----------
+        increment_filter : ndarray
+            Matrix for filtering non-changing variables.
+
+        Returns
+        -------
+        td_log : float
+            Logarithmic temperature difference.
+
+        deriv : list
+            Partial derivatives of the logarithmic temperature difference to
+            pressure and enthalpy for all connections as tuples
+            :code:`(connection, d_dp, d_dh)`.
+
+            .. math::
+
+                \frac{\partial \Delta T_{log}}{\partial ttd_{l}} =
+                \frac{1}{\ln{\frac{ttd_{l}}{ttd_{u}}}} -
+                \frac{ttd_{l} - ttd_{u}}
+                {ttd_{l} \cdot \ln^2{\frac{ttd_{l}}{ttd_{u}}}}
+
+                \frac{\partial \Delta T_{log}}{\partial ttd_{u}} =
+                -\frac{1}{\ln{\frac{ttd_{l}}{ttd_{u}}}} +
+                \frac{ttd_{l} - ttd_{u}}
+                {ttd_{u} \cdot \ln^2{\frac{ttd_{l}}{ttd_{u}}}}
+        """
+        T = self.calculate_terminal_temperatures()
+        ttd_u, ttd_l = self.calculate_terminal_temperature_differences(*T)
+
+        if ttd_u == ttd_l:
+            td_log = ttd_l
+            d_ttd_u = 0.5
+            d_ttd_l = 0.5
+        else:
+            log = np.log((ttd_l) / (ttd_u))
+            td_log = (ttd_l - ttd_u) / log
+            d_ttd_u = -1 / log + td_log / (ttd_u * log)
+            d_ttd_l = 1 / log - td_log / (ttd_l * log)
+
+        # manipulated temperature differences do not change with the
+        # temperatures at the terminals
+        if ttd_u != T[0] - T[3]:
+            d_ttd_u = 0
+        if ttd_l != T[2] - T[1]:
+            d_ttd_l = 0
+
+        deriv = []
+        factors = [d_ttd_u, -d_ttd_l, d_ttd_l, -d_ttd_u]
+        for c, factor in zip(self.inl + self.outl, factors):
+            if factor == 0:
+                continue
+            dT_dp, dT_dh = self.calculate_T_deriv(c, increment_filter)
+            deriv += [(c, factor * dT_dp, factor * dT_dh)]
+
+        return td_log, deriv
+
     def kA_func(self):
         r"""
         Calculate heat transfer from heat transfer coefficient.
@@ -465,16 +577,44 @@ class HeatExchanger(Component):
         k : int
             Position of derivatives in Jacobian matrix (k-th equation).
         """
-        f = self.kA_func
         i = self.inl[0]
         o = self.outl[0]
         if self.is_variable(i.m):
             self.jacobian[k, i.m.J_col] = o.h.val_SI - i.h.val_SI
+        self._set_heat_transfer_deriv(k, self.kA.val)
+
+    def _set_heat_transfer_deriv(self, k, kA):
+        r"""
+        Set the pressure and enthalpy derivatives of the heat transfer.
+
+        Parameters
+        ----------
+        k : int
+            Position of derivatives in Jacobian matrix (k-th equation).
+
+        kA : float
+            Heat transfer coefficient.
+        """
+        i = self.inl[0]
+        o = self.outl[0]
         for c in self.inl + self.outl:
             if self.is_variable(c.p):
-                self.jacobian[k, c.p.J_col] = self.numeric_deriv(f, 'p', c)
+                self.jacobian[k, c.p.J_col] = 0
             if self.is_variable(c.h):
-                self.jacobian[k, c.h.J_col] = self.numeric_deriv(f, 'h', c)
+                self.jacobian[k, c.h.J_col] = 0
+        if self.is_variable(i.h):
+            self.jacobian[k, i.h.J_col] = -i.m.val_SI
+        if self.is_variable(o.h):
+            self.jacobian[k, o.h.J_col] = i.m.val_SI
+
+        td_log, deriv = self.calculate_td_log_deriv()
+        for c, d_dp, d_dh in deriv:
+            if self.is_variable(c.p):
+                self.jacobian[k, c.p.J_col] += kA * d_dp
+            if self.is_variable(c.h):
+                self.jacobian[k, c.h.J_col] += kA * d_dh
+
+        return td_log
 
     def kA_char_func(self):
         r"""
@@ -500,6 +640,26 @@ class HeatExchanger(Component):
         For standard functions f\ :subscript:`1` \ and f\ :subscript:`2` \ see
         module :py:mod:`tespy.data`.
         """
+        return (
+            self.inl[0].m.val_SI * (
+                self.outl[0].h.val_SI - self.inl[0].h.val_SI
+            ) + self.kA.design * self.calculate_fkA() * self.calculate_td_log()
+        )
+
+    def calculate_fkA(self):
+        r"""
+        Calculate the heat transfer coefficient correction factor.
+
+        Returns
+        -------
+        fkA : float
+            Correction factor of the heat transfer coefficient.
+
+            .. math::
+
+                f_{kA} = \frac{2}{\frac{1}{f_1\left( expr_1\right)} +
+                \frac{1}{f_2\left( expr_2\right)}}
+        """
         p1 = self.kA_char1.param
         p2 = self.kA_char2.param
         f1 = self.get_char_expr(p1, **self.kA_char1.char_params)
@@ -507,15 +667,7 @@ class HeatExchanger(Component):
 
         fkA1 = self.kA_char1.char_func.evaluate(f1)
         fkA2 = self.kA_char2.char_func.evaluate(f2)
-        fkA = 2 / (1 / fkA1 + 1 / fkA2)
-
-        td_log = self.calculate_td_log()
-
-        return (
-            self.inl[0].m.val_SI * (
-                self.outl[0].h.val_SI - self.inl[0].h.val_SI
-            ) + self.kA.design * fkA * td_log
-        )
+        return 2 / (1 / fkA1 + 1 / fkA2)
 
     def kA_char_func_doc(self, label):
         r"""
@@ -558,15 +710,30 @@ class HeatExchanger(Component):
         k : int
             Position of derivatives in Jacobian matrix (k-th equation).
         """
-        f = self.kA_char_func
-        for i in self.inl:
-            if self.is_variable(i.m):
-                self.jacobian[k, i.m.J_col] = self.numeric_deriv(f, 'm', i)
-        for c in self.inl + self.outl:
-            if self.is_variable(c.p):
-                self.jacobian[k, c.p.J_col] = self.numeric_deriv(f, 'p', c)
-            if self.is_variable(c.h):
-                self.jacobian[k, c.h.J_col] = self.numeric_deriv(f, 'h', c)
+        f = self.calculate_fkA
+        fkA = f()
+        td_log = self._set_heat_transfer_deriv(k, self.kA.design * fkA)
+
+        i = self.inl[0]
+        o = self.outl[0]
+        for c in self.inl:
+            if self.is_variable(c.m):
+                deriv = self.kA.design * td_log * self.numeric_deriv(f, 'm', c)
+                if c is i:
+                    deriv += o.h.val_SI - i.h.val_SI
+                self.jacobian[k, c.m.J_col] = deriv
+
+        # the volumetric flow and the pressure ratio depend on the pressure
+        # and the enthalpy, the mass flow does not
+        params = [self.kA_char1.param, self.kA_char2.param]
+        if not set(params).issubset({'m', 'm_out'}):
+            for c in self.inl + self.outl:
+                for var in ['p', 'h']:
+                    if self.is_variable(c.get_attr(var)):
+                        self.jacobian[k, c.get_attr(var).J_col] += (
+                            self.kA.design * td_log
+                            * self.numeric_deriv(f, var, c)
+                        )
 
     def ttd_u_func(self):
         r"""
@@ -616,12 +783,10 @@ class HeatExchanger(Component):
         k : int
             Position of derivatives in Jacobian matrix (k-th equation).
         """
-        f = self.ttd_u_func
-        for c in [self.inl[0], self.outl[1]]:
-            if self.is_variable(c.p, increment_filter):
-                self.jacobian[k, c.p.J_col] = self.numeric_deriv(f, 'p', c)
-            if self.is_variable(c.h, increment_filter):
-                self.jacobian[k, c.h.J_col] = self.numeric_deriv(f, 'h', c)
+        dT_dp, dT_dh = self.calculate_T_deriv(self.inl[0], increment_filter)
+        self._set_ttd_deriv(k, self.inl[0], -dT_dp, -dT_dh, increment_filter)
+        dT_dp, dT_dh = self.calculate_T_deriv(self.outl[1], increment_filter)
+        self._set_ttd_deriv(k, self.outl[1], dT_dp, dT_dh, increment_filter)
 
     def ttd_l_func(self):
         r"""
@@ -671,12 +836,16 @@ class HeatExchanger(Component):
         k : int
             Position of derivatives in Jacobian matrix (k-th equation).
         """
-        f = self.ttd_l_func
-        for c in [self.inl[1], self.outl[0]]:
-            if self.is_variable(c.p, increment_filter):
-                self.jacobian[k, c.p.J_col] = self.numeric_deriv(f, 'p', c)
-            if self.is_variable(c.h, increment_filter):
-                self.jacobian[k, c.h.J_col] = self.numeric_deriv(f, 'h', c)
+        dT_dp, dT_dh = self.calculate_T_deriv(self.inl[1], increment_filter)
+        self._set_ttd_deriv(k, self.inl[1], dT_dp, dT_dh, increment_filter)
+        dT_dp, dT_dh = self.calculate_T_deriv(self.outl[0], increment_filter)
+        self._set_ttd_deriv(k, self.outl[0], -dT_dp, -dT_dh, increment_filter)
+
+    def _set_ttd_deriv(self, k, c, d_dp, d_dh, increment_filter):
+        if self.is_variable(c.p, increment_filter):
+            self.jacobian[k, c.p.J_col] = d_dp
+        if self.is_variable(c.h, increment_filter):
+            self.jacobian[k, c.h.J_col] = d_dh
 
     def bus_func(self, bus):
         r"""
@@ -20,6 +20,7 @@ from tespy.tools.data_containers import ComponentProperties as dc_cp
 from tespy.tools.data_containers import GroupedComponentCharacteristics as dc_gcc
 from tespy.tools.data_containers import SimpleDataContainer as dc_simple
 from tespy.tools.document_models import generate_latex_eq
+from tespy.tools.fluid_properties import dT_sat_dp
 from tespy.tools.fluid_properties import dh_mix_dpQ
 from tespy.tools.fluid_properties import h_mix_pQ
 
@@ -233,11 +234,11 @@ class Condenser(HeatExchanger):
                 deriv=self.ttd_l_deriv, latex=self.ttd_l_func_doc),
             'pr1': dc_cp(
                 min_val=1e-4, max_val=1, num_eq=1, deriv=self.pr_deriv,
-                latex=self.pr_func_doc,
+                constant_deriv=True, latex=self.pr_func_doc,
                 func=self.pr_func, func_params={'pr': 'pr1'}),
             'pr2': dc_cp(
                 min_val=1e-4, max_val=1, num_eq=1, latex=self.pr_func_doc,
-                deriv=self.pr_deriv, func=self.pr_func,
+                deriv=self.pr_deriv, constant_deriv=True, func=self.pr_func,
                 func_params={'pr': 'pr2', 'inconn': 1, 'outconn': 1}),
             'zeta1': dc_cp(
                 min_val=0, max_val=1e15, num_eq=1, latex=self.zeta_func_doc,
@@ -321,18 +322,41 @@ class Condenser(HeatExchanger):
         if self.is_variable(o.h):
             self.jacobian[k, o.h.J_col] = 1
 
-    def calculate_td_log(self):
+    def calculate_terminal_temperatures(self):
+        r"""
+        Calculate the temperatures at the terminals of the condenser.
+
+        Returns
+        -------
+        T : list
+            Saturation temperature at hot side inlet and temperature at cold
+            side inlet, hot side outlet and cold side outlet.
+        """
+        return [
+            self.inl[0].calc_T_sat(), self.inl[1].calc_T(),
+            self.outl[0].calc_T(), self.outl[1].calc_T()
+        ]
+
+    def calculate_terminal_temperature_differences(self, T_i1, T_i2, T_o1, T_o2):
+        r"""
+        Calculate the upper and lower terminal temperature difference.
 
+        Parameters
+        ----------
+        T_i1, T_i2, T_o1, T_o2 : float
+            Terminal temperatures, see
+            :py:meth:`calculate_terminal_temperatures`.
+
+        Returns
+        -------
+        ttd : tuple
+            Upper and lower terminal temperature difference.
+        """
         i1 = self.inl[0]
         i2 = self.inl[1]
         o1 = self.outl[0]
         o2 = self.outl[1]
 
-        T_i1 = i1.calc_T_sat()
-        T_i2 = i2.calc_T()
-        T_o1 = o1.calc_T()
-        T_o2 = o2.calc_T()
-
         if T_i1 <= T_o2 and not i1.T.is_set:
             T_i1 = T_o2 + 0.5
         if T_i1 <= T_o2 and not o2.T.is_set:
@@ -342,14 +366,36 @@ class Condenser(HeatExchanger):
         if T_o1 <= T_i2 and not i2.T.is_set:
             T_i2 = T_o1 - 1
 
-        ttd_u = T_i1 - T_o2
-        ttd_l = T_o1 - T_i2
-        if ttd_u == ttd_l:
-            td_log = ttd_l
-        else:
-            td_log = (ttd_l - ttd_u) / np.log((ttd_l) / (ttd_u))
+        return T_i1 - T_o2, T_o1 - T_i2
+
+    def calculate_T_deriv(self, c, increment_filter=None):
+        r"""
+        Calculate the partial derivatives of a terminal temperature.
+
+        The temperature at the hot side inlet is the saturation temperature,
+        which only depends on the pressure.
+
+        Parameters
+        ----------
+        c : tespy.connections.connection.Connection
+            Connection of the terminal.
+
+        increment_filter : ndarray
+            Matrix for filtering non-changing variables.
+
+        Returns
+        -------
+        deriv : tuple
+            Partial derivatives to pressure and enthalpy of the connection,
+            zero in case the respective variable is not a system variable.
+        """
+        if c is not self.inl[0]:
+            return super().calculate_T_deriv(c, increment_filter)
 
-        return td_log
+        dT_dp = 0
+        if self.is_variable(c.p, increment_filter):
+            dT_dp = dT_sat_dp(c.p.val_SI, c.fluid_data)
+        return dT_dp, 0
 
     def kA_func_doc(self, label):
         r"""
@@ -0,0 +1,562 @@
+# -*- coding: utf-8
+
+"""Module of class SegmentedHeatExchanger.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+tespy/components/heat_exchangers/segmented.py
+
+SPDX-License-Identifier: MIT
+"""
+
+import numpy as np
+
+from tespy.components.component import component_registry
+from tespy.components.heat_exchangers.base import HeatExchanger
+from tespy.tools import logger
+from tespy.tools.data_containers import ComponentProperties as dc_cp
+from tespy.tools.data_containers import SimpleDataContainer as dc_simple
+from tespy.tools.document_models import generate_latex_eq
+from tespy.tools.fluid_properties import T_mix_ph_array
+from tespy.tools.fluid_properties import h_mix_pQ
+from tespy.tools.fluid_properties.helpers import get_number_of_fluids
+
+
+@component_registry
+class SegmentedHeatExchanger(HeatExchanger):
+    r"""
+    Class for counter current heat exchanger discretized in segments.
+
+    Both streams are divided into segments of identical heat transfer. The
+    temperature profiles are evaluated with one fluid property call per side
+    and applied to the heat transfer equations instead of the terminal
+    temperatures only. With this, the pinch point and the heat transfer
+    coefficient of heat exchangers with phase change (e.g. condensers or
+    evaporators) are calculated accurately, while the component only adds
+    equations on the states of its four connections to the network.
+
+    **Mandatory Equations**
+
+    - :py:meth:`tespy.components.heat_exchangers.base.HeatExchanger.energy_balance_func`
+
+    **Optional Equations**
+
+    - :py:meth:`tespy.components.heat_exchangers.base.HeatExchanger.energy_balance_hot_func`
+    - :py:meth:`tespy.components.heat_exchangers.base.HeatExchanger.kA_func`
+    - :py:meth:`tespy.components.heat_exchangers.base.HeatExchanger.kA_char_func`
+    - :py:meth:`tespy.components.heat_exchangers.base.HeatExchanger.ttd_u_func`
+    - :py:meth:`tespy.components.heat_exchangers.base.HeatExchanger.ttd_l_func`
+    - :py:meth:`tespy.components.heat_exchangers.segmented.SegmentedHeatExchanger.td_pinch_func`
+    - hot side :py:meth:`tespy.components.component.Component.pr_func`
+    - cold side :py:meth:`tespy.components.component.Component.pr_func`
+    - hot side :py:meth:`tespy.components.component.Component.zeta_func`
+    - cold side :py:meth:`tespy.components.component.Component.zeta_func`
+
+    Inlets/Outlets
+
+    - in1, in2 (index 1: hot side, index 2: cold side)
+    - out1, out2 (index 1: hot side, index 2: cold side)
+
+    Image
+
+    .. image:: /api/_images/HeatExchanger.svg
+       :alt: flowsheet of the segmented heat exchanger
+       :align: center
+       :class: only-light
+
+    .. image:: /api/_images/HeatExchanger_darkmode.svg
+       :alt: flowsheet of the segmented heat exchanger
+       :align: center
+       :class: only-dark
+
+    Parameters
+    ----------
+    label : str
+        The label of the component.
+
+    design : list
+        List containing design parameters (stated as String).
+
+    offdesign : list
+        List containing offdesign parameters (stated as String).
+
+    design_path : str
+        Path to the components design case.
+
+    local_offdesign : boolean
+        Treat this component in offdesign mode in a design calculation.
+
+    local_design : boolean
+        Treat this component in design mode in an offdesign calculation.
+
+    char_warnings : boolean
+        Ignore warnings on default characteristics usage for this component.
+
+    printout : boolean
+        Include this component in the network's results printout.
+
+    Q : float, dict
+        Heat transfer, :math:`Q/\text{W}`.
+
+    pr1 : float, dict, :code:`"var"`
+        Outlet to inlet pressure ratio at hot side, :math:`pr/1`.
+
+    pr2 : float, dict, :code:`"var"`
+        Outlet to inlet pressure ratio at cold side, :math:`pr/1`.
+
+    zeta1 : float, dict, :code:`"var"`
+        Geometry independent friction coefficient at hot side,
+        :math:`\frac{\zeta}{D^4}/\frac{1}{\text{m}^4}`.
+
+    zeta2 : float, dict, :code:`"var"`
+        Geometry independent friction coefficient at cold side,
+        :math:`\frac{\zeta}{D^4}/\frac{1}{\text{m}^4}`.
+
+    ttd_l : float, dict
+        Lower terminal temperature difference :math:`ttd_\mathrm{l}/\text{K}`.
+
+    ttd_u : float, dict
+        Upper terminal temperature difference :math:`ttd_\mathrm{u}/\text{K}`.
+
+    td_pinch : float, dict
+        Minimum temperature difference of all segments
+        :math:`\Delta T_\mathrm{pinch}/\text{K}`.
+
+    kA : float, dict
+        Area independent heat transfer coefficient, sum of the heat transfer
+        coefficients of all segments, :math:`kA/\frac{\text{W}}{\text{K}}`.
+
+    kA_char1 : tespy.tools.characteristics.CharLine, dict
+        Characteristic line for hot side heat transfer coefficient.
+
+    kA_char2 : tespy.tools.characteristics.CharLine, dict
+        Characteristic line for cold side heat transfer coefficient.
+
+    num_segments : int
+        Number of segments, default value: 20.
+
+    Note
+    ----
+    The pressure changes linearly with the enthalpy on both sides. For pure
+    fluids, the saturated liquid and saturated gas states are added to the
+    segment boundaries, i.e. the actual number of segments may be larger than
+    the specified number. The
+    logarithmic temperature difference :code:`td_log` is the mean temperature
+    difference of all segments weighted with their heat transfer coefficient.
+
+    Example
+    -------
+    Steam is condensed and subcooled with cooling water. With the lumped
+    logarithmic temperature difference of the terminal temperatures, the
+    temperature difference inside of the condenser is overestimated.
+
+    >>> from tespy.components import Sink, Source, SegmentedHeatExchanger
+    >>> from tespy.connections import Connection
+    >>> from tespy.networks import Network
+    >>> nw = Network(T_unit='C', p_unit='bar', iterinfo=False)
+    >>> st_in = Source('steam inlet')
+    >>> st_out = Sink('condensate outlet')
+    >>> cw_in = Source('cooling water inlet')
+    >>> cw_out = Sink('cooling water outlet')
+    >>> he = SegmentedHeatExchanger('condenser')
+    >>> he.component()
+    'segmented heat exchanger'
+    >>> st_he = Connection(st_in, 'out1', he, 'in1')
+    >>> he_st = Connection(he, 'out1', st_out, 'in1')
+    >>> cw_he = Connection(cw_in, 'out1', he, 'in2')
+    >>> he_cw = Connection(he, 'out2', cw_out, 'in1')
+    >>> nw.add_conns(st_he, he_st, cw_he, he_cw)
+
+    Superheated steam at 1 bar and 150 °C is cooled to 50 °C with cooling
+    water entering the component at 20 °C. The cooling water mass flow is
+    determined by the minimum temperature difference of 5 K, which is located
+    at the beginning of the condensation and not at one of the terminals.
+
+    >>> he.set_attr(pr1=1, pr2=1, td_pinch=5, num_segments=40)
+    >>> st_he.set_attr(fluid={'water': 1}, m=1, p=1, T=150)
+    >>> he_st.set_attr(T=50)
+    >>> cw_he.set_attr(fluid={'water': 1}, p=3, T=20)
+    >>> nw.solve('design')
+    >>> round(cw_he.m.val, 2)
+    7.89
+    >>> round(he_cw.T.val, 1)
+    97.7
+    >>> round(he.ttd_u.val, 1), round(he.ttd_l.val, 1)
+    (52.3, 30.0)
+
+    The mean temperature difference of the segments is considerably lower
+    than the logarithmic temperature difference of the terminal temperatures,
+    which is at 40.1 K.
+
+    >>> round(he.td_log.val, 1)
+    26.1
+    """
+
+    @staticmethod
+    def component():
+        return 'segmented heat exchanger'
+
+    def get_parameters(self):
+        data = super().get_parameters()
+        data.update({
+            'td_pinch': dc_cp(
+                min_val=0, num_eq=1, func=self.td_pinch_func,
+                deriv=self.td_pinch_deriv, latex=self.td_pinch_func_doc),
+            'num_segments': dc_simple(val=20)
+        })
+        return data
+
+    def preprocess(self, num_nw_vars):
+        super().preprocess(num_nw_vars)
+
+        num = self.num_segments.val
+        if not isinstance(num, (int, np.integer)) or num < 1:
+            msg = (
+                f"The number of segments of component {self.label} must be a "
+                f"positive integer, {num} was specified."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+
+    def _sides(self):
+        # start and end of both sides, starting at the hot side inlet
+        return [
+            (self.inl[0], self.outl[0]), (self.outl[1], self.inl[1])
+        ]
+
+    def calculate_segment_fractions(self):
+        r"""
+        Calculate the fractions of heat transfer at the segment boundaries.
+
+        The heat transfer is divided into segments of identical size. For pure
+        fluids, the saturated liquid and saturated gas states within the
+        enthalpy range of a side are added as segment boundaries, as the slope
+        of the temperature profile changes at these points.
+
+        Returns
+        -------
+        x : ndarray
+            Fractions of heat transfer from the hot side inlet.
+        """
+        x = [np.linspace(0, 1, self.num_segments.val + 1)]
+        for start, end in self._sides():
+            dh = end.h.val_SI - start.h.val_SI
+            dp = end.p.val_SI - start.p.val_SI
+            if dh == 0 or get_number_of_fluids(start.fluid_data) > 1:
+                continue
+
+            for Q in [0, 1]:
+                x_sat = 0
+                # correction of the pressure at the saturation state
+                for _ in range(2):
+                    try:
+                        h_sat = h_mix_pQ(
+                            start.p.val_SI + x_sat * dp, Q, start.fluid_data
+                        )
+                    except ValueError:
+                        # supercritical pressure
+                        break
+                    x_sat = (h_sat - start.h.val_SI) / dh
+                    if not 0 < x_sat < 1:
+                        break
+                else:
+                    x += [[x_sat]]
+
+        return np.unique(np.concatenate(x))
+
+    def _side_states(self, start, end, x):
+        # the pressure changes linearly with the enthalpy
+        p = start.p.val_SI + x * (end.p.val_SI - start.p.val_SI)
+        h = start.h.val_SI + x * (end.h.val_SI - start.h.val_SI)
+        return p, h
+
+    def calculate_segment_temperatures(self, x=None):
+        r"""
+        Calculate the temperatures at the boundaries of all segments.
+
+        Parameters
+        ----------
+        x : ndarray
+            Fractions of heat transfer at the segment boundaries, see
+            :py:meth:`calculate_segment_fractions`.
+
+        Returns
+        -------
+        T : tuple
+            Temperatures of the hot side and the cold side, starting at the hot
+            side inlet (cold side outlet).
+        """
+        if x is None:
+            x = self.calculate_segment_fractions()
+
+        T = []
+        for start, end in self._sides():
+            T += [T_mix_ph_array(
+                *self._side_states(start, end, x),
+                start.fluid_data, start.mixing_rule, T0=start._get_T_guess()
+            )]
+        return tuple(T)
+
+    def calculate_segment_temperatures_deriv(self, x, increment_filter=None):
+        r"""
+        Calculate the segment temperatures and their partial derivatives.
+
+        The states of a side and the states shifted in pressure and enthalpy
+        for the central differences are evaluated in a single call. The
+        fractions of heat transfer at the segment boundaries are kept
+        constant.
+
+        Parameters
+        ----------
+        x : ndarray
+            Fractions of heat transfer at the segment boundaries, see
+            :py:meth:`calculate_segment_fractions`.
+
+        increment_filter : ndarray
+            Matrix for filtering non-changing variables.
+
+        Returns
+        -------
+        T : tuple
+            Temperatures of the hot side and the cold side, starting at the hot
+            side inlet (cold side outlet).
+
+        deriv : list
+            Partial derivatives of the temperatures of both sides to pressure
+            and enthalpy of the respective state as tuples
+            :code:`(dT_dp, dT_dh)`, zero in case the pressure or enthalpy at
+            both ends of the side are not system variables.
+        """
+        d = 1e-1
+        T = []
+        deriv = []
+        for start, end in self._sides():
+            p, h = self._side_states(start, end, x)
+            states = [(p, h)]
+            shifts = []
+            for var, shift in [("p", (d, 0)), ("h", (0, d))]:
+                if any(
+                    self.is_variable(c.get_attr(var), increment_filter)
+                    for c in [start, end]
+                ):
+                    states += [
+                        (p + shift[0], h + shift[1]),
+                        (p - shift[0], h - shift[1])
+                    ]
+                    shifts += [var]
+
+            p_all, h_all = (np.concatenate(values) for values in zip(*states))
+            T_all = T_mix_ph_array(
+                p_all, h_all, start.fluid_data, start.mixing_rule,
+                T0=start._get_T_guess()
+            ).reshape(len(states), len(x))
+
+            dT = {"p": np.zeros(len(x)), "h": np.zeros(len(x))}
+            for i, var in enumerate(shifts):
+                dT[var] = (T_all[2 * i + 1] - T_all[2 * i + 2]) / (2 * d)
+
+            T += [T_all[0]]
+            deriv += [(dT["p"], dT["h"])]
+
+        return tuple(T), deriv
+
+    def _connection_deriv(self, x, deriv, dT_hot, dT_cold):
+        r"""
+        Apply the chain rule from the segment temperatures to the connections.
+
+        Parameters
+        ----------
+        x : ndarray
+            Fractions of heat transfer at the segment boundaries.
+
+        deriv : list
+            Partial derivatives of the segment temperatures, see
+            :py:meth:`calculate_segment_temperatures_deriv`.
+
+        dT_hot : ndarray
+            Partial derivatives of the function to the hot side temperatures.
+
+        dT_cold : ndarray
+            Partial derivatives of the function to the cold side temperatures.
+
+        Returns
+        -------
+        deriv : list
+            Partial derivatives of the function to pressure and enthalpy for
+            all connections as tuples :code:`(connection, d_dp, d_dh)`.
+        """
+        result = []
+        sides = zip(self._sides(), [dT_hot, dT_cold], deriv)
+        for (start, end), dT, (dT_dp, dT_dh) in sides:
+            for c, weight in [(start, 1 - x), (end, x)]:
+                result += [(
+                    c,
+                    np.sum(dT * weight * dT_dp),
+                    np.sum(dT * weight * dT_dh)
+                )]
+        return result
+
+    @staticmethod
+    def _segment_td_log(td):
+        # logarithmic temperature difference of every segment and the
+        # segments with different temperature differences at both ends
+        td_u = td[:-1]
+        td_l = td[1:]
+
+        td_log = (td_u + td_l) / 2
+        log = np.abs(td_l - td_u) > 1e-9 * td_u
+        td_log[log] = (
+            (td_l[log] - td_u[log]) / np.log(td_l[log] / td_u[log])
+        )
+        return td_log, log
+
+    def calculate_td_log(self):
+        r"""
+        Calculate the mean temperature difference of all segments.
+
+        Returns
+        -------
+        td_log : float
+            Mean logarithmic temperature difference.
+
+            .. math::
+
+                \Delta T_\mathrm{log} = \frac{1}
+                {\sum_{i=1}^N \frac{\Delta x_i}{\Delta T_{\mathrm{log},i}}}
+
+                \Delta x_i = \frac{\dot{Q}_i}{\dot{Q}}
+        """
+        x = self.calculate_segment_fractions()
+        T_hot, T_cold = self.calculate_segment_temperatures(x)
+        # temperature value manipulation for convergence stability
+        td = np.maximum(T_hot - T_cold, 0.01)
+        td_log, _ = self._segment_td_log(td)
+        return 1 / np.sum(np.diff(x) / td_log)
+
+    def calculate_td_log_deriv(self, increment_filter=None):
+        r"""
+        Calculate the mean temperature difference and its derivatives.
+
+        Parameters
+        ----------
+        increment_filter : ndarray
+            Matrix for filtering non-changing variables.
+
+        Returns
+        -------
+        td_log : float
+            Mean logarithmic temperature difference.
+
+        deriv : list
+            Partial derivatives of the mean logarithmic temperature
+            difference to pressure and enthalpy for all connections as tuples
+            :code:`(connection, d_dp, d_dh)`.
+
+            .. math::
+
+                \frac{\partial \Delta T_\mathrm{log}}
+                {\partial \Delta T_{\mathrm{log},i}} =
+                \frac{\Delta T_\mathrm{log}^2 \cdot \Delta x_i}
+                {\Delta T_{\mathrm{log},i}^2}
+        """
+        x = self.calculate_segment_fractions()
+        (T_hot, T_cold), deriv = self.calculate_segment_temperatures_deriv(
+            x, increment_filter
+        )
+        td = np.maximum(T_hot - T_cold, 0.01)
+        td_log_i, log = self._segment_td_log(td)
+        td_log = 1 / np.sum(np.diff(x) / td_log_i)
+
+        td_u = td[:-1][log]
+        td_l = td[1:][log]
+        ln = np.log(td_l / td_u)
+        d_td_u = np.full(len(td_log_i), 0.5)
+        d_td_l = np.full(len(td_log_i), 0.5)
+        d_td_u[log] = (td_log_i[log] / td_u - 1) / ln
+        d_td_l[log] = (1 - td_log_i[log] / td_l) / ln
+
+        weight = td_log ** 2 * np.diff(x) / td_log_i ** 2
+        d_td = np.zeros(len(x))
+        d_td[:-1] += weight * d_td_u
+        d_td[1:] += weight * d_td_l
+        # manipulated temperature differences do not change with the
+        # temperatures of the segments
+        d_td[T_hot - T_cold <= 0.01] = 0
+
+        return td_log, self._connection_deriv(x, deriv, d_td, -d_td)
+
+    def td_pinch_func(self):
+        r"""
+        Equation for minimum temperature difference of all segments.
+
+        Returns
+        -------
+        residual : float
+            Residual value of equation.
+
+            .. math::
+
+                0 = \Delta T_\mathrm{pinch} - \min\left(T_{hot,i} -
+                T_{cold,i}\right) \; \forall i \in \left[0, N\right]
+        """
+        T_hot, T_cold = self.calculate_segment_temperatures()
+        return self.td_pinch.val - np.min(T_hot - T_cold)
+
+    def td_pinch_func_doc(self, label):
+        r"""
+        Equation for minimum temperature difference of all segments.
+
+        Parameters
+        ----------
+        label : str
+            Label for equation.
+
+        Returns
+        -------
+        latex : str
+            LaTeX code of equations applied.
+        """
+        latex = (
+            r'0 = \Delta T_\mathrm{pinch} - \min\left(T_{\mathrm{hot},i} - '
+            r'T_{\mathrm{cold},i}\right) \; \forall i \in \left[0, N\right]'
+        )
+        return generate_latex_eq(self, latex, label)
+
+    def td_pinch_deriv(self, increment_filter, k):
+        r"""
+        Partial derivatives of minimum temperature difference function.
+
+        Parameters
+        ----------
+        increment_filter : ndarray
+            Matrix for filtering non-changing variables.
+
+        k : int
+            Position of derivatives in Jacobian matrix (k-th equation).
+        """
+        x = self.calculate_segment_fractions()
+        T_hot, T_cold = self.calculate_segment_temperatures(x)
+        # derivatives of the temperature difference at the pinch point only
+        x = x[[np.argmin(T_hot - T_cold)]]
+        _, deriv = self.calculate_segment_temperatures_deriv(
+            x, increment_filter
+        )
+        deriv = self._connection_deriv(x, deriv, -np.ones(1), np.ones(1))
+        for c, d_dp, d_dh in deriv:
+            if self.is_variable(c.p, increment_filter):
+                self.jacobian[k, c.p.J_col] = d_dp
+            if self.is_variable(c.h, increment_filter):
+                self.jacobian[k, c.h.J_col] = d_dh
+
+    def calc_parameters(self):
+        r"""Postprocessing parameter calculation."""
+        super().calc_parameters()
+
+        T_hot, T_cold = self.calculate_segment_temperatures()
+        self.td_pinch.val = np.min(T_hot - T_cold)
+        if self.td_pinch.val <= 0:
+            self.td_log.val = np.nan
+        else:
+            self.td_log.val = self.calculate_td_log()
+        self.kA.val = -self.Q.val / self.td_log.val
@@ -23,8 +23,15 @@ from tespy.tools.data_containers import ComponentProperties as dc_cp
 from tespy.tools.data_containers import GroupedComponentProperties as dc_gcp
 from tespy.tools.data_containers import SimpleDataContainer as dc_simple
 from tespy.tools.document_models import generate_latex_eq
+from tespy.tools.fluid_properties import dv_mix_dph
+from tespy.tools.fluid_properties import dv_mix_pdh
+from tespy.tools.fluid_properties import dviscosity_mix_dph
+from tespy.tools.fluid_properties import dviscosity_mix_pdh
 from tespy.tools.fluid_properties import s_mix_ph
+from tespy.tools.fluid_properties.helpers import _check_friction_model
 from tespy.tools.fluid_properties.helpers import darcy_friction_factor as dff
+from tespy.tools.fluid_properties.helpers import \
+    darcy_friction_factor_derivative as dff_deriv
 from tespy.tools.helpers import convert_to_SI
 
 
@@ -120,6 +127,13 @@ class SimpleHeatExchanger(Component):
         Parametergroup for pressure drop calculation based on pipes dimensions
         using darcy weissbach equation.
 
+    friction_model : str
+        Model for the darcy friction factor in turbulent flow:
+        :code:`"colebrook"` (implicit Colebrook-White equation),
+        :code:`"swamee-jain"`, :code:`"haaland"` or :code:`"serghides"`
+        (explicit approximations), default value: :code:`"colebrook"`. If not
+        specified, the friction model of the network is applied.
+
     ks_HW : float, dict, :code:`"var"`
         Pipe's roughness, :math:`ks/\text{1}`.
 
@@ -209,7 +223,8 @@ class SimpleHeatExchanger(Component):
                 func=self.energy_balance_func),
             'pr': dc_cp(
                 min_val=1e-4, max_val=1, num_eq=1,
-                deriv=self.pr_deriv, latex=self.pr_func_doc,
+                deriv=self.pr_deriv, constant_deriv=True,
+                latex=self.pr_func_doc,
                 func=self.pr_func, func_params={'pr': 'pr'}),
             'zeta': dc_cp(
                 min_val=0, max_val=1e15, num_eq=1,
@@ -223,6 +238,7 @@ class SimpleHeatExchanger(Component):
             'kA': dc_cp(min_val=0, d=1),
             'kA_char': dc_cc(param='m'), 'Tamb': dc_cp(),
             'dissipative': dc_simple(val=True),
+            'friction_model': dc_simple(val="colebrook"),
             'darcy_group': dc_gcp(
                 elements=['L', 'ks', 'D'], num_eq=1,
                 latex=self.darcy_func_doc,
@@ -253,6 +269,7 @@ class SimpleHeatExchanger(Component):
         super().preprocess(num_nw_vars)
 
         self.Tamb.val_SI = convert_to_SI('T', self.Tamb.val, self.inl[0].T.unit)
+        _check_friction_model(self.friction_model.val)
 
     def energy_balance_func(self):
         r"""
@@ -342,20 +359,31 @@ class SimpleHeatExchanger(Component):
         if abs(i.m.val_SI) < 1e-4:
             return i.p.val_SI - o.p.val_SI
 
-        visc_i = i.calc_viscosity(T0=i.T.val_SI)
-        visc_o = o.calc_viscosity(T0=o.T.val_SI)
-        v_i = i.calc_vol(T0=i.T.val_SI)
-        v_o = o.calc_vol(T0=o.T.val_SI)
-
-        Re = 4 * abs(i.m.val_SI) / (np.pi * self.D.val * (visc_i + visc_o) / 2)
+        Re, K, _, _ = self._darcy_parameters()
 
         return (
             (i.p.val_SI - o.p.val_SI)
-            - 8 * abs(i.m.val_SI) * i.m.val_SI * (v_i + v_o)
-            / 2 * self.L.val * dff(Re, self.ks.val, self.D.val)
-            / (np.pi ** 2 * self.D.val ** 5)
+            - K * abs(i.m.val_SI) * i.m.val_SI
+            * dff(Re, self.ks.val, self.D.val, self.friction_model.val)
+        )
+
+    def _darcy_parameters(self):
+        # Reynolds number, factor of the darcy friction factor in the pressure
+        # drop equation and sums of specific volume and viscosity
+        i = self.inl[0]
+        o = self.outl[0]
+        visc_sum = (
+            i.calc_viscosity(T0=i._get_T_guess())
+            + o.calc_viscosity(T0=o._get_T_guess())
+        )
+        v_sum = (
+            i.calc_vol(T0=i._get_T_guess()) + o.calc_vol(T0=o._get_T_guess())
         )
 
+        Re = 4 * abs(i.m.val_SI) / (np.pi * self.D.val * visc_sum / 2)
+        K = 8 * v_sum / 2 * self.L.val / (np.pi ** 2 * self.D.val ** 5)
+        return Re, K, v_sum, visc_sum
+
     def darcy_func_doc(self, label):
         r"""
         Equation for pressure drop calculation from darcy friction factor.
@@ -393,26 +421,76 @@ class SimpleHeatExchanger(Component):
 
         k : int
             Position of derivatives in Jacobian matrix (k-th equation).
+
+        Note
+        ----
+        The partial derivatives to mass flow, pressure and enthalpy apply the
+        chain rule to the derivative of the darcy friction factor to the
+        Reynolds number and the derivatives of specific volume :math:`v` and
+        dynamic viscosity :math:`\eta`, :math:`x` denotes pressure or
+        enthalpy at inlet or outlet.
+
+        .. math::
+
+            \frac{\partial f}{\partial \dot{m}_{in}} = -\frac{8 \cdot
+            |\dot{m}_{in}| \cdot \frac{v_{in}+v_{out}}{2} \cdot L}
+            {\pi^2 \cdot D^5} \cdot \left(2 \cdot \lambda + Re \cdot
+            \frac{\partial \lambda}{\partial Re}\right)\\
+            \frac{\partial f}{\partial x} = \frac{\partial \left(p_{in} -
+            p_{out}\right)}{\partial x} - \frac{8 \cdot |\dot{m}_{in}| \cdot
+            \dot{m}_{in} \cdot L}{\pi^2 \cdot D^5} \cdot
+            \left(\frac{\lambda}{2} \cdot \frac{\partial v}{\partial x} -
+            \frac{v_{in}+v_{out}}{2} \cdot
+            \frac{\partial \lambda}{\partial Re} \cdot
+            \frac{Re}{\eta_{in}+\eta_{out}} \cdot
+            \frac{\partial \eta}{\partial x}\right)
         """
-        func = self.darcy_func
         i = self.inl[0]
         o = self.outl[0]
-        if self.is_variable(i.m, increment_filter):
-            self.jacobian[k, i.m.J_col] = self.numeric_deriv(func, 'm', i)
-        if self.is_variable(i.p, increment_filter):
-            self.jacobian[k, i.p.J_col] = self.numeric_deriv(func, 'p', i)
-        if self.is_variable(i.h, increment_filter):
-            self.jacobian[k, i.h.J_col] = self.numeric_deriv(func, 'h', i)
-        if self.is_variable(o.p, increment_filter):
-            self.jacobian[k, o.p.J_col] = self.numeric_deriv(func, 'p', o)
-        if self.is_variable(o.h, increment_filter):
-            self.jacobian[k, o.h.J_col] = self.numeric_deriv(func, 'h', o)
+        if abs(i.m.val_SI) < 1e-4:
+            # the residual is the pressure difference
+            if self.is_variable(i.m, increment_filter):
+                self.jacobian[k, i.m.J_col] = 0
+            for c, sign in [(i, 1), (o, -1)]:
+                if self.is_variable(c.p, increment_filter):
+                    self.jacobian[k, c.p.J_col] = sign
+                if self.is_variable(c.h, increment_filter):
+                    self.jacobian[k, c.h.J_col] = 0
+        else:
+            Re, K, v_sum, visc_sum = self._darcy_parameters()
+            model = self.friction_model.val
+            darcy = dff(Re, self.ks.val, self.D.val, model)
+            darcy_deriv = dff_deriv(Re, self.ks.val, self.D.val, model)
+            if self.is_variable(i.m, increment_filter):
+                self.jacobian[k, i.m.J_col] = -K * abs(i.m.val_SI) * (
+                    2 * darcy + Re * darcy_deriv
+                )
+
+            factor = -K * abs(i.m.val_SI) * i.m.val_SI
+            for c, sign in [(i, 1), (o, -1)]:
+                args = (
+                    c.p.val_SI, c.h.val_SI, c.fluid_data, c.mixing_rule,
+                    c._get_T_guess()
+                )
+                if self.is_variable(c.p, increment_filter):
+                    self.jacobian[k, c.p.J_col] = sign + factor * (
+                        darcy * dv_mix_dph(*args) / v_sum
+                        - darcy_deriv * Re / visc_sum
+                        * dviscosity_mix_dph(*args)
+                    )
+                if self.is_variable(c.h, increment_filter):
+                    self.jacobian[k, c.h.J_col] = factor * (
+                        darcy * dv_mix_pdh(*args) / v_sum
+                        - darcy_deriv * Re / visc_sum
+                        * dviscosity_mix_pdh(*args)
+                    )
+
         # custom variables of hydro group
         for variable_name in self.darcy_group.elements:
             parameter = self.get_attr(variable_name)
             if parameter.is_var:
                 self.jacobian[k, parameter.J_col] = (
-                    self.numeric_deriv(func, variable_name, None)
+                    self.numeric_deriv(self.darcy_func, variable_name, None)
                 )
 
     def hazen_williams_func(self):
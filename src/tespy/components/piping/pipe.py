@@ -100,6 +100,10 @@ class Pipe(SimpleHeatExchanger):
         Parametergroup for pressure drop calculation based on pipes dimensions
         using darcy weissbach equation.
 
+    friction_model : str
+        Model for the darcy friction factor in turbulent flow, see
+        :py:class:`tespy.components.heat_exchangers.simple.SimpleHeatExchanger`.
+
     ks_HW : float, dict, :code:`"var"`
         Pipe's roughness, :math:`ks/\text{1}`.
 
@@ -140,7 +140,7 @@ class Valve(Component):
         return {
             'pr': dc_cp(
                 min_val=1e-4, max_val=1, num_eq=1,
-                deriv=self.pr_deriv, func=self.pr_func,
+                deriv=self.pr_deriv, constant_deriv=True, func=self.pr_func,
                 func_params={'pr': 'pr'}, latex=self.pr_func_doc),
             'zeta': dc_cp(
                 min_val=0, max_val=1e15, num_eq=1,
@@ -196,7 +196,7 @@ class WaterElectrolyzer(Component):
                 latex=self.heat_func_doc),
             'pr': dc_cp(
                 max_val=1, num_eq=1,
-                deriv=self.pr_deriv, func=self.pr_func,
+                deriv=self.pr_deriv, constant_deriv=True, func=self.pr_func,
                 func_params={'pr': 'pr'}, latex=self.pr_func_doc),
             'zeta': dc_cp(
                 min_val=0, num_eq=1,
@@ -979,7 +979,7 @@ class WaterElectrolyzer(Component):
             Matrix of partial derivatives.
         """
         f = self.calc_bus_value
-        b = bus.comps.loc[self]
+        b = bus.members[self]
 
         ######################################################################
         # derivatives for power on bus
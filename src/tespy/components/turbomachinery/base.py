@@ -15,6 +15,7 @@ from tespy.components.component import Component
 from tespy.components.component import component_registry
 from tespy.tools.data_containers import ComponentProperties as dc_cp
 from tespy.tools.document_models import generate_latex_eq
+from tespy.tools.fluid_properties import isentropic_deriv
 
 
 @component_registry
@@ -89,7 +90,7 @@ class Turbomachine(Component):
                 func=self.energy_balance_func,
                 latex=self.energy_balance_func_doc),
             'pr': dc_cp(
-                deriv=self.pr_deriv, num_eq=1,
+                deriv=self.pr_deriv, constant_deriv=True, num_eq=1,
                 func=self.pr_func, func_params={'pr': 'pr'},
                 latex=self.pr_func_doc)
         }
@@ -161,6 +162,24 @@ class Turbomachine(Component):
         if self.P.is_var:
             self.jacobian[k, self.P.J_col] = -1
 
+    def calc_isentropic_deriv(self):
+        r"""
+        Calculate the isentropic outlet enthalpy and its partial derivatives.
+
+        Returns
+        -------
+        deriv : tuple
+            Isentropic outlet enthalpy and its partial derivatives to inlet
+            pressure, inlet enthalpy and outlet pressure, see
+            :py:func:`tespy.tools.fluid_properties.functions.isentropic_deriv`.
+        """
+        i = self.inl[0]
+        o = self.outl[0]
+        return isentropic_deriv(
+            i.p.val_SI, i.h.val_SI, o.p.val_SI, i.fluid_data, i.mixing_rule,
+            T0=i._get_T_guess()
+        )
+
     def bus_func(self, bus):
         r"""
         Calculate the value of the bus function.
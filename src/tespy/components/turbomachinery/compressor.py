@@ -172,7 +172,7 @@ class Compressor(Turbomachine):
                 func=self.eta_s_char_func, latex=self.eta_s_char_func_doc),
             'pr': dc_cp(
                 min_val=1, num_eq=1,
-                deriv=self.pr_deriv,
+                deriv=self.pr_deriv, constant_deriv=True,
                 func=self.pr_func, func_params={'pr': 'pr'},
                 latex=self.pr_func_doc),
             'igva': dc_cp(min_val=-90, max_val=90, d=1e-3, val=0),
@@ -251,13 +251,13 @@ class Compressor(Turbomachine):
         """
         i = self.inl[0]
         o = self.outl[0]
-        f = self.eta_s_func
+        _, dp_in, dh_in, dp_out = self.calc_isentropic_deriv()
         if self.is_variable(i.p, increment_filter):
-            self.jacobian[k, i.p.J_col] = self.numeric_deriv(f, 'p', i)
+            self.jacobian[k, i.p.J_col] = -dp_in
         if self.is_variable(o.p, increment_filter):
-            self.jacobian[k, o.p.J_col] = self.numeric_deriv(f, 'p', o)
+            self.jacobian[k, o.p.J_col] = -dp_out
         if self.is_variable(i.h, increment_filter):
-            self.jacobian[k, i.h.J_col] = self.numeric_deriv(f, 'h', i)
+            self.jacobian[k, i.h.J_col] = 1 - self.eta_s.val - dh_in
         if self.is_variable(o.h, increment_filter):
             self.jacobian[k, o.h.J_col] = self.eta_s.val
 
@@ -275,19 +275,11 @@ class Compressor(Turbomachine):
                 0 = \left(h_{out}-h_{in}\right) \cdot \eta_{s,design}
                 \cdot f\left( expr \right) -\left( h_{out,s} - h_{in} \right)
         """
-        p = self.eta_s_char.param
-        expr = self.get_char_expr(p, **self.eta_s_char.char_params)
-        if not expr:
-            msg = ('Please choose a valid parameter, you want to link the '
-                   'isentropic efficiency to at component ' + self.label + '.')
-            logger.error(msg)
-            raise ValueError(msg)
-
         i = self.inl[0]
         o = self.outl[0]
         return (
             (o.h.val_SI - i.h.val_SI)
-            * self.eta_s.design * self.eta_s_char.char_func.evaluate(expr)
+            * self.eta_s.design * self.calc_eta_s_char()
             - (
                 isentropic(
                     i.p.val_SI,
@@ -300,6 +292,24 @@ class Compressor(Turbomachine):
             )
         )
 
+    def calc_eta_s_char(self):
+        r"""
+        Calculate the isentropic efficiency characteristic.
+
+        Returns
+        -------
+        f : float
+            Value of the characteristic :math:`f\left( expr \right)`.
+        """
+        p = self.eta_s_char.param
+        expr = self.get_char_expr(p, **self.eta_s_char.char_params)
+        if not expr:
+            msg = ('Please choose a valid parameter, you want to link the '
+                   'isentropic efficiency to at component ' + self.label + '.')
+            logger.error(msg)
+            raise ValueError(msg)
+        return self.eta_s_char.char_func.evaluate(expr)
+
     def eta_s_char_func_doc(self, label):
         r"""
         Equation for given isentropic efficiency characteristic.
@@ -332,19 +342,29 @@ class Compressor(Turbomachine):
         k : int
             Position of derivatives in Jacobian matrix (k-th equation).
         """
-        f = self.eta_s_char_func
+        f = self.calc_eta_s_char
         i = self.inl[0]
         o = self.outl[0]
+        _, dp_in, dh_in, dp_out = self.calc_isentropic_deriv()
+        eta = self.eta_s.design * f()
+        dh = (o.h.val_SI - i.h.val_SI) * self.eta_s.design
+        # the characteristic does not depend on the outlet enthalpy
         if self.is_variable(i.m, increment_filter):
-            self.jacobian[k, i.m.J_col] = self.numeric_deriv(f, 'm', i)
+            self.jacobian[k, i.m.J_col] = dh * self.numeric_deriv(f, 'm', i)
         if self.is_variable(i.p, increment_filter):
-            self.jacobian[k, i.p.J_col] = self.numeric_deriv(f, 'p', i)
+            self.jacobian[k, i.p.J_col] = (
+                dh * self.numeric_deriv(f, 'p', i) - dp_in
+            )
         if self.is_variable(i.h, increment_filter):
-            self.jacobian[k, i.h.J_col] = self.numeric_deriv(f, 'h', i)
+            self.jacobian[k, i.h.J_col] = (
+                1 - eta - dh_in + dh * self.numeric_deriv(f, 'h', i)
+            )
         if self.is_variable(o.p, increment_filter):
-            self.jacobian[k, o.p.J_col] = self.numeric_deriv(f, 'p', o)
+            self.jacobian[k, o.p.J_col] = (
+                dh * self.numeric_deriv(f, 'p', o) - dp_out
+            )
         if self.is_variable(o.h, increment_filter):
-            self.jacobian[k, o.h.J_col] = self.numeric_deriv(f, 'h', o)
+            self.jacobian[k, o.h.J_col] = eta
 
     def char_map_pr_func(self):
         r"""
@@ -375,7 +395,19 @@ class Compressor(Turbomachine):
         """
         i = self.inl[0]
         o = self.outl[0]
+        pr = self.calc_char_map_pr()
+        return (o.p.val_SI / i.p.val_SI) - pr * self.pr.design
+
+    def calc_char_map_pr(self):
+        r"""
+        Calculate the relative pressure ratio from the characteristic map.
 
+        Returns
+        -------
+        pr : float
+            Pressure ratio relative to its design value.
+        """
+        i = self.inl[0]
         x = np.sqrt(i.T.design / i.calc_T())
         y = (i.m.val_SI * i.p.design) / (i.m.design * i.p.val_SI * x)
 
@@ -383,9 +415,7 @@ class Compressor(Turbomachine):
         # value manipulation with igva
         yarr *= (1 - self.igva.val / 100)
         zarr *= (1 - self.igva.val / 100)
-        pr = self.char_map_pr.char_func.evaluate_y(y, yarr, zarr)
-
-        return (o.p.val_SI / i.p.val_SI) - pr * self.pr.design
+        return self.char_map_pr.char_func.evaluate_y(y, yarr, zarr)
 
     def char_map_pr_func_doc(self, label):
         r"""
@@ -431,22 +461,24 @@ class Compressor(Turbomachine):
         k : int
             Position of derivatives in Jacobian matrix (k-th equation).
         """
-        f = self.char_map_pr_func
+        f = self.calc_char_map_pr
         i = self.inl[0]
         o = self.outl[0]
+        pr_d = self.pr.design
         if self.is_variable(i.m, increment_filter):
-            self.jacobian[k, i.m.J_col] = self.numeric_deriv(f, 'm', i)
+            self.jacobian[k, i.m.J_col] = -pr_d * self.numeric_deriv(f, 'm', i)
         if self.is_variable(i.p, increment_filter):
-            self.jacobian[k, i.p.J_col] = self.numeric_deriv(f, 'p', i)
+            self.jacobian[k, i.p.J_col] = (
+                -o.p.val_SI / i.p.val_SI ** 2
+                - pr_d * self.numeric_deriv(f, 'p', i)
+            )
         if self.is_variable(i.h, increment_filter):
-            self.jacobian[k, i.h.J_col] = self.numeric_deriv(f, 'h', i)
+            self.jacobian[k, i.h.J_col] = -pr_d * self.numeric_deriv(f, 'h', i)
         if self.is_variable(o.p, increment_filter):
             self.jacobian[k, o.p.J_col] = 1 / i.p.val_SI
-        if self.is_variable(o.h, increment_filter):
-            self.jacobian[k, o.h.J_col] = self.numeric_deriv(f, 'h', o)
 
         if self.igva.is_var:
-            self.jacobian[k, self.igva.J_col] = self.numeric_deriv(
+            self.jacobian[k, self.igva.J_col] = -pr_d * self.numeric_deriv(
                 f, 'igva', None
             )
 
@@ -478,16 +510,7 @@ class Compressor(Turbomachine):
         """
         i = self.inl[0]
         o = self.outl[0]
-
-        x = np.sqrt(i.T.design / i.calc_T())
-        y = (i.m.val_SI * i.p.design) / (i.m.design * i.p.val_SI * x)
-
-        yarr, zarr = self.char_map_eta_s.char_func.evaluate_x(x)
-        # value manipulation with igva
-        yarr *= (1 - self.igva.val / 100)
-        zarr *= (1 - self.igva.val ** 2 / 10000)
-        eta = self.char_map_eta_s.char_func.evaluate_y(y, yarr, zarr)
-
+        eta = self.calc_char_map_eta_s()
         return (
             (
             isentropic(
@@ -501,6 +524,25 @@ class Compressor(Turbomachine):
             / (o.h.val_SI - i.h.val_SI) - eta * self.eta_s.design
         )
 
+    def calc_char_map_eta_s(self):
+        r"""
+        Calculate the relative isentropic efficiency from the map.
+
+        Returns
+        -------
+        eta : float
+            Isentropic efficiency relative to its design value.
+        """
+        i = self.inl[0]
+        x = np.sqrt(i.T.design / i.calc_T())
+        y = (i.m.val_SI * i.p.design) / (i.m.design * i.p.val_SI * x)
+
+        yarr, zarr = self.char_map_eta_s.char_func.evaluate_x(x)
+        # value manipulation with igva
+        yarr *= (1 - self.igva.val / 100)
+        zarr *= (1 - self.igva.val ** 2 / 10000)
+        return self.char_map_eta_s.char_func.evaluate_y(y, yarr, zarr)
+
     def char_map_eta_s_func_doc(self, label):
         r"""
         Get LaTeX equation for isentropic efficiency from characteristic map.
@@ -545,22 +587,33 @@ class Compressor(Turbomachine):
         k : int
             Position of derivatives in Jacobian matrix (k-th equation).
         """
-        f = self.char_map_eta_s_func
+        f = self.calc_char_map_eta_s
         i = self.inl[0]
         o = self.outl[0]
+        h_s, dp_in, dh_in, dp_out = self.calc_isentropic_deriv()
+        dh = o.h.val_SI - i.h.val_SI
+        ratio = (h_s - i.h.val_SI) / dh
+        eta_d = self.eta_s.design
         if self.is_variable(i.m, increment_filter):
-            self.jacobian[k, i.m.J_col] = self.numeric_deriv(f, 'm', i)
+            self.jacobian[k, i.m.J_col] = (
+                -eta_d * self.numeric_deriv(f, 'm', i)
+            )
         if self.is_variable(i.p, increment_filter):
-            self.jacobian[k, i.p.J_col] = self.numeric_deriv(f, 'p', i)
+            self.jacobian[k, i.p.J_col] = (
+                dp_in / dh - eta_d * self.numeric_deriv(f, 'p', i)
+            )
         if self.is_variable(i.h, increment_filter):
-            self.jacobian[k, i.h.J_col] = self.numeric_deriv(f, 'h', i)
+            self.jacobian[k, i.h.J_col] = (
+                (dh_in - 1 + ratio) / dh
+                - eta_d * self.numeric_deriv(f, 'h', i)
+            )
         if self.is_variable(o.p, increment_filter):
-            self.jacobian[k, o.p.J_col] = self.numeric_deriv(f, 'p', o)
+            self.jacobian[k, o.p.J_col] = dp_out / dh
         if self.is_variable(o.h, increment_filter):
-            self.jacobian[k, o.h.J_col] = self.numeric_deriv(f, 'h', o)
+            self.jacobian[k, o.h.J_col] = -ratio / dh
 
         if self.igva.is_var:
-            self.jacobian[k, self.igva.J_col] = self.numeric_deriv(
+            self.jacobian[k, self.igva.J_col] = -eta_d * self.numeric_deriv(
                 f, 'igva', None
             )
 
@@ -173,7 +173,7 @@ class Pump(Turbomachine):
                 latex=self.eta_s_func_doc),
             'pr': dc_cp(
                 min_val=1, num_eq=1,
-                deriv=self.pr_deriv,
+                deriv=self.pr_deriv, constant_deriv=True,
                 func=self.pr_func, func_params={'pr': 'pr'},
                 latex=self.pr_func_doc),
             'eta_s_char': dc_cc(
@@ -251,13 +251,13 @@ class Pump(Turbomachine):
         """
         i = self.inl[0]
         o = self.outl[0]
-        f = self.eta_s_func
+        _, dp_in, dh_in, dp_out = self.calc_isentropic_deriv()
         if self.is_variable(i.p, increment_filter):
-            self.jacobian[k, i.p.J_col] = self.numeric_deriv(f, 'p', i)
+            self.jacobian[k, i.p.J_col] = -dp_in
         if self.is_variable(o.p, increment_filter):
-            self.jacobian[k, o.p.J_col] = self.numeric_deriv(f, 'p', o)
+            self.jacobian[k, o.p.J_col] = -dp_out
         if self.is_variable(i.h, increment_filter):
-            self.jacobian[k, i.h.J_col] = self.numeric_deriv(f, 'h', i)
+            self.jacobian[k, i.h.J_col] = 1 - self.eta_s.val - dh_in
         if self.is_variable(o.h, increment_filter):
             self.jacobian[k, o.h.J_col] = self.eta_s.val
 
@@ -275,19 +275,11 @@ class Pump(Turbomachine):
                 0 = \left(h_{out}-h_{in}\right) \cdot \eta_{s,design}
                 \cdot f\left( expr \right) -\left( h_{out,s} - h_{in} \right)
         """
-        p = self.eta_s_char.param
-        expr = self.get_char_expr(p, **self.eta_s_char.char_params)
-        if not expr:
-            msg = ('Please choose a valid parameter, you want to link the '
-                   'isentropic efficiency to at component ' + self.label + '.')
-            logger.error(msg)
-            raise ValueError(msg)
-
         i = self.inl[0]
         o = self.outl[0]
         return (
             (o.h.val_SI - i.h.val_SI)
-            * self.eta_s.design * self.eta_s_char.char_func.evaluate(expr)
+            * self.eta_s.design * self.calc_eta_s_char()
             - (
                 isentropic(
                     i.p.val_SI,
@@ -300,6 +292,24 @@ class Pump(Turbomachine):
             )
         )
 
+    def calc_eta_s_char(self):
+        r"""
+        Calculate the isentropic efficiency characteristic.
+
+        Returns
+        -------
+        f : float
+            Value of the characteristic :math:`f\left( expr \right)`.
+        """
+        p = self.eta_s_char.param
+        expr = self.get_char_expr(p, **self.eta_s_char.char_params)
+        if not expr:
+            msg = ('Please choose a valid parameter, you want to link the '
+                   'isentropic efficiency to at component ' + self.label + '.')
+            logger.error(msg)
+            raise ValueError(msg)
+        return self.eta_s_char.char_func.evaluate(expr)
+
     def eta_s_char_func_doc(self, label):
         r"""
         Equation for given isentropic efficiency characteristic.
@@ -332,19 +342,29 @@ class Pump(Turbomachine):
         k : int
             Position of derivatives in Jacobian matrix (k-th equation).
         """
-        f = self.eta_s_char_func
+        f = self.calc_eta_s_char
         i = self.inl[0]
         o = self.outl[0]
+        _, dp_in, dh_in, dp_out = self.calc_isentropic_deriv()
+        eta = self.eta_s.design * f()
+        dh = (o.h.val_SI - i.h.val_SI) * self.eta_s.design
+        # the characteristic does not depend on the outlet enthalpy
         if self.is_variable(i.m, increment_filter):
-            self.jacobian[k, i.m.J_col] = self.numeric_deriv(f, 'm', i)
+            self.jacobian[k, i.m.J_col] = dh * self.numeric_deriv(f, 'm', i)
         if self.is_variable(i.p, increment_filter):
-            self.jacobian[k, i.p.J_col] = self.numeric_deriv(f, 'p', i)
+            self.jacobian[k, i.p.J_col] = (
+                dh * self.numeric_deriv(f, 'p', i) - dp_in
+            )
         if self.is_variable(i.h, increment_filter):
-            self.jacobian[k, i.h.J_col] = self.numeric_deriv(f, 'h', i)
+            self.jacobian[k, i.h.J_col] = (
+                1 - eta - dh_in + dh * self.numeric_deriv(f, 'h', i)
+            )
         if self.is_variable(o.p, increment_filter):
-            self.jacobian[k, o.p.J_col] = self.numeric_deriv(f, 'p', o)
+            self.jacobian[k, o.p.J_col] = (
+                dh * self.numeric_deriv(f, 'p', o) - dp_out
+            )
         if self.is_variable(o.h, increment_filter):
-            self.jacobian[k, o.h.J_col] = self.numeric_deriv(f, 'h', o)
+            self.jacobian[k, o.h.J_col] = eta
 
     def flow_char_func(self):
         r"""
@@ -359,11 +379,22 @@ class Pump(Turbomachine):
 
                 0 = p_{out} - p_{in} - f\left( expr \right)
         """
-        p = self.flow_char.param
-        expr = self.get_char_expr(p, **self.flow_char.char_params)
         return (
             self.outl[0].p.val_SI - self.inl[0].p.val_SI -
-            self.flow_char.char_func.evaluate(expr))
+            self.calc_flow_char())
+
+    def calc_flow_char(self):
+        r"""
+        Calculate the pressure rise from the flow characteristic.
+
+        Returns
+        -------
+        dp : float
+            Value of the characteristic :math:`f\left( expr \right)`.
+        """
+        p = self.flow_char.param
+        expr = self.get_char_expr(p, **self.flow_char.char_params)
+        return self.flow_char.char_func.evaluate(expr)
 
     def flow_char_func_doc(self, label):
         r"""
@@ -395,17 +426,17 @@ class Pump(Turbomachine):
         k : int
             Position of derivatives in Jacobian matrix (k-th equation).
         """
-        f = self.flow_char_func
+        f = self.calc_flow_char
         i = self.inl[0]
         o = self.outl[0]
         if self.is_variable(i.m, increment_filter):
-            self.jacobian[k, i.m.J_col] = self.numeric_deriv(f, 'm', i)
+            self.jacobian[k, i.m.J_col] = -self.numeric_deriv(f, 'm', i)
         if self.is_variable(i.p, increment_filter):
-            self.jacobian[k, i.p.J_col] = self.numeric_deriv(f, 'p', i)
+            self.jacobian[k, i.p.J_col] = -1 - self.numeric_deriv(f, 'p', i)
         if self.is_variable(i.h, increment_filter):
-            self.jacobian[k, i.h.J_col] = self.numeric_deriv(f, 'h', i)
+            self.jacobian[k, i.h.J_col] = -self.numeric_deriv(f, 'h', i)
         if self.is_variable(o.p, increment_filter):
-            self.jacobian[k, o.p.J_col] = self.numeric_deriv(f, 'p', o)
+            self.jacobian[k, o.p.J_col] = 1 - self.numeric_deriv(f, 'p', o)
 
     def convergence_check(self):
         r"""
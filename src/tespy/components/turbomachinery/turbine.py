@@ -19,6 +19,8 @@ from tespy.tools.data_containers import ComponentCharacteristics as dc_cc
 from tespy.tools.data_containers import ComponentProperties as dc_cp
 from tespy.tools.data_containers import SimpleDataContainer as dc_simple
 from tespy.tools.document_models import generate_latex_eq
+from tespy.tools.fluid_properties import dv_mix_dph
+from tespy.tools.fluid_properties import dv_mix_pdh
 from tespy.tools.fluid_properties import isentropic
 
 
@@ -164,7 +166,7 @@ class Turbine(Turbomachine):
                 func=self.eta_s_char_func, latex=self.eta_s_char_func_doc),
             'pr': dc_cp(
                 min_val=0, max_val=1, num_eq=1,
-                deriv=self.pr_deriv,
+                deriv=self.pr_deriv, constant_deriv=True,
                 func=self.pr_func, func_params={'pr': 'pr'},
                 latex=self.pr_func_doc),
             'cone': dc_simple(
@@ -234,15 +236,15 @@ class Turbine(Turbomachine):
         k : int
             Position of derivatives in Jacobian matrix (k-th equation).
         """
-        f = self.eta_s_func
         i = self.inl[0]
         o = self.outl[0]
+        _, dp_in, dh_in, dp_out = self.calc_isentropic_deriv()
         if self.is_variable(i.p, increment_filter):
-            self.jacobian[k, i.p.J_col] = self.numeric_deriv(f, "p", i)
+            self.jacobian[k, i.p.J_col] = self.eta_s.val * dp_in
         if self.is_variable(o.p, increment_filter):
-            self.jacobian[k, o.p.J_col] = self.numeric_deriv(f, "p", o)
+            self.jacobian[k, o.p.J_col] = self.eta_s.val * dp_out
         if self.is_variable(i.h, increment_filter):
-            self.jacobian[k, i.h.J_col] = self.numeric_deriv(f, "h", i)
+            self.jacobian[k, i.h.J_col] = 1 + self.eta_s.val * (dh_in - 1)
         if o.h.is_var and self.it == 0:
             self.jacobian[k, o.h.J_col] = -1
 
@@ -314,17 +316,50 @@ class Turbine(Turbomachine):
         k : int
             Position of derivatives in Jacobian matrix (k-th equation).
         """
-        f = self.cone_func
         i = self.inl[0]
         o = self.outl[0]
         if i.m.is_var:
             self.jacobian[k, i.m.J_col] = -1
+
+        n = 1
+        pr = o.p.val_SI / i.p.val_SI
+        pr_term = 1 - pr ** ((n + 1) / n)
+        if pr_term == 0:
+            # infinite slope of the square root
+            f = self.cone_func
+            if self.is_variable(i.p, increment_filter):
+                self.jacobian[k, i.p.J_col] = self.numeric_deriv(f, 'p', i)
+            if self.is_variable(i.h, increment_filter):
+                self.jacobian[k, i.h.J_col] = self.numeric_deriv(f, 'h', i)
+            if self.is_variable(o.p, increment_filter):
+                self.jacobian[k, o.p.J_col] = self.numeric_deriv(f, 'p', o)
+            return
+
+        # mass flow of the cone law and its logarithmic derivatives
+        vol = i.calc_vol(T0=i._get_T_guess())
+        m = (
+            i.m.design * i.p.val_SI / i.p.design
+            * np.sqrt(i.p.design * i.vol.design / (i.p.val_SI * vol))
+            * np.sqrt(abs(pr_term / (1 - (self.pr.design) ** ((n + 1) / n))))
+        )
+        dlog_dpr = -(n + 1) / n * pr ** (1 / n) / (2 * pr_term)
         if self.is_variable(i.p, increment_filter):
-            self.jacobian[k, i.p.J_col] = self.numeric_deriv(f, 'p', i)
+            dv_dp = dv_mix_dph(
+                i.p.val_SI, i.h.val_SI, i.fluid_data, i.mixing_rule,
+                T0=i._get_T_guess()
+            )
+            self.jacobian[k, i.p.J_col] = m * (
+                1 / (2 * i.p.val_SI) - dv_dp / (2 * vol)
+                - dlog_dpr * pr / i.p.val_SI
+            )
         if self.is_variable(i.h, increment_filter):
-            self.jacobian[k, i.h.J_col] = self.numeric_deriv(f, 'h', i)
+            dv_dh = dv_mix_pdh(
+                i.p.val_SI, i.h.val_SI, i.fluid_data, i.mixing_rule,
+                T0=i._get_T_guess()
+            )
+            self.jacobian[k, i.h.J_col] = -m * dv_dh / (2 * vol)
         if self.is_variable(o.p, increment_filter):
-            self.jacobian[k, o.p.J_col] = self.numeric_deriv(f, 'p', o)
+            self.jacobian[k, o.p.J_col] = m * dlog_dpr / i.p.val_SI
 
     def eta_s_char_func(self):
         r"""
@@ -341,21 +376,11 @@ class Turbine(Turbomachine):
                 \eta_\mathrm{s,design} \cdot f\left( expr \right) \cdot
                 \left(h_\mathrm{out,s}-h_\mathrm{in}\right)
         """
-        p = self.eta_s_char.param
-        expr = self.get_char_expr(p)
-        if not expr:
-            msg = (
-                "Please choose a valid parameter, you want to link the "
-                f"isentropic efficiency to at component {self.label}."
-            )
-            logger.error(msg)
-            raise ValueError(msg)
-
         inl = self.inl[0]
         outl = self.outl[0]
         return (
             -(outl.h.val_SI - inl.h.val_SI)
-            + self.eta_s.design * self.eta_s_char.char_func.evaluate(expr)
+            + self.eta_s.design * self.calc_eta_s_char()
             * (
                 isentropic(
                     inl.p.val_SI,
@@ -368,6 +393,26 @@ class Turbine(Turbomachine):
             )
         )
 
+    def calc_eta_s_char(self):
+        r"""
+        Calculate the isentropic efficiency characteristic.
+
+        Returns
+        -------
+        f : float
+            Value of the characteristic :math:`f\left( expr \right)`.
+        """
+        p = self.eta_s_char.param
+        expr = self.get_char_expr(p)
+        if not expr:
+            msg = (
+                "Please choose a valid parameter, you want to link the "
+                f"isentropic efficiency to at component {self.label}."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+        return self.eta_s_char.char_func.evaluate(expr)
+
     def eta_s_char_func_doc(self, label):
         r"""
         Equation for given isentropic efficiency characteristic.
@@ -400,19 +445,31 @@ class Turbine(Turbomachine):
         k : int
             Position of derivatives in Jacobian matrix (k-th equation).
         """
-        f = self.eta_s_char_func
+        f = self.calc_eta_s_char
         i = self.inl[0]
         o = self.outl[0]
+        h_s, dp_in, dh_in, dp_out = self.calc_isentropic_deriv()
+        eta = self.eta_s.design * f()
+        dh_s = h_s - i.h.val_SI
+        # the characteristic does not depend on the outlet enthalpy
         if self.is_variable(i.m, increment_filter):
-            self.jacobian[k, i.m.J_col] = self.numeric_deriv(f, 'm', i)
+            self.jacobian[k, i.m.J_col] = (
+                self.eta_s.design * dh_s * self.numeric_deriv(f, 'm', i)
+            )
         if self.is_variable(i.p, increment_filter):
-            self.jacobian[k, i.p.J_col] = self.numeric_deriv(f, "p", i)
+            self.jacobian[k, i.p.J_col] = eta * dp_in + (
+                self.eta_s.design * dh_s * self.numeric_deriv(f, 'p', i)
+            )
         if self.is_variable(i.h, increment_filter):
-            self.jacobian[k, i.h.J_col] = self.numeric_deriv(f, "h", i)
+            self.jacobian[k, i.h.J_col] = 1 + eta * (dh_in - 1) + (
+                self.eta_s.design * dh_s * self.numeric_deriv(f, 'h', i)
+            )
         if self.is_variable(o.p, increment_filter):
-            self.jacobian[k, o.p.J_col] = self.numeric_deriv(f, "p", o)
+            self.jacobian[k, o.p.J_col] = eta * dp_out + (
+                self.eta_s.design * dh_s * self.numeric_deriv(f, 'p', o)
+            )
         if self.is_variable(o.h, increment_filter):
-            self.jacobian[k, o.h.J_col] = self.numeric_deriv(f, "h", o)
+            self.jacobian[k, o.h.J_col] = -1
 
     def convergence_check(self):
         r"""
@@ -194,6 +194,7 @@ class Bus:
         self.char = CharLine(x=np.array([0, 3]), y=np.array([1, 1]))
         self.printout = True
         self.jacobian = {}
+        self.members = {}
 
         self.set_attr(**kwargs)
 
@@ -328,15 +329,17 @@ class Bus:
               efficiency definition is
               :math:`\eta=\frac{P_\mathrm{component}}{P_\mathrm{bus}}`.
         """
+        rows = {}
         for c in args:
             if isinstance(c, dict):
                 if 'comp' in c:
                     comp = c['comp']
                     # default values
                     if isinstance(comp, Component):
-                        self.comps.loc[comp] = [
-                            None, np.nan, self.char, np.nan, 'component'
-                        ]
+                        row = {
+                            "param": None, "P_ref": np.nan, "char": self.char,
+                            "efficiency": np.nan, "base": "component"
+                        }
                     else:
                         msg = 'Keyword "comp" must hold a TESPy component.'
                         logger.error(msg)
@@ -349,7 +352,7 @@ class Bus:
                 for k, v in c.items():
                     if k == 'param':
                         if isinstance(v, str) or v is None:
-                            self.comps.loc[comp, 'param'] = v
+                            row['param'] = v
                         else:
                             msg = (
                                 "The bus parameter selection must be a string "
@@ -364,12 +367,11 @@ class Bus:
                         except (TypeError, ValueError):
                             is_numeric = False
                         if isinstance(v, CharLine):
-                            self.comps.loc[comp, 'char'] = v
+                            row['char'] = v
                         elif is_numeric:
                             x = np.array([0, 3])
                             y = np.array([1, 1]) * v
-                            self.comps.loc[comp, 'char'] = (
-                                    CharLine(x=x, y=y))
+                            row['char'] = CharLine(x=x, y=y)
                         else:
                             msg = (
                                 'Char must be a number or a TESPy '
@@ -384,7 +386,7 @@ class Bus:
                         except (TypeError, ValueError):
                             is_numeric = False
                         if v is None or is_numeric:
-                            self.comps.loc[comp, 'P_ref'] = v
+                            row['P_ref'] = v
                         else:
                             msg = 'Reference value must be numeric.'
                             logger.error(msg)
@@ -392,7 +394,7 @@ class Bus:
 
                     elif k == 'base':
                         if v in ['bus', 'component']:
-                            self.comps.loc[comp, 'base'] = v
+                            row['base'] = v
                         else:
                             msg = (
                                 'The base value must be "bus" or "component".')
@@ -406,26 +408,144 @@ class Bus:
                 logger.error(msg)
                 raise TypeError(msg)
 
+            rows[comp] = row
             msg = f"Added component {comp.label} to bus {self.label}."
             logger.debug(msg)
 
+        if len(rows) == 0:
+            return
+
+        # update the DataFrame once for all components
+        rows = pd.DataFrame.from_dict(
+            rows, orient="index", columns=self.comps.columns
+        ).astype({"P_ref": float, "efficiency": float})
+        existing = rows.index.isin(self.comps.index)
+        if existing.any():
+            self.comps.loc[rows.index[existing]] = rows.loc[existing]
+        if len(self.comps) == 0:
+            self.comps = rows
+        elif not existing.all():
+            self.comps = pd.concat([self.comps, rows.loc[~existing]])
+
+        self.preprocess()
+
+    def preprocess(self):
+        r"""
+        Resolve the bus members for access by component in the simulation.
+
+        The specifications of every component (:code:`param`, :code:`P_ref`,
+        :code:`char` and :code:`base`) are stored in a dictionary per
+        component in the :code:`members` attribute. For the base
+        :code:`'bus'` the inverse of the characteristic line is calculated
+        once, see :py:class:`tespy.connections.bus.InverseBusChar`.
+        """
+        self.members = {}
+        for cp, data in zip(self.comps.index, self.comps.to_dict("records")):
+            if data["base"] == "bus":
+                data["inverse"] = InverseBusChar(data["char"])
+            else:
+                data["inverse"] = None
+            self.members[cp] = data
+
     def _serialize(self):
         export = {}
         export["P"] = self.P._serialize()
-        for cp in self.comps.index:
+        for cp, data in zip(self.comps.index, self.comps.to_dict("records")):
             export[cp.label] = {}
-            export[cp.label]["param"] = self.comps.loc[cp, "param"]
-            export[cp.label]["base"] = self.comps.loc[cp, "base"]
-            export[cp.label]["char"] = self.comps.loc[cp, "char"]._serialize()
+            export[cp.label]["param"] = data["param"]
+            export[cp.label]["base"] = data["base"]
+            export[cp.label]["char"] = data["char"]._serialize()
 
         return {self.label: export}
 
     def solve(self):
         self.residual = self.P.val
-        for cp in self.comps.index:
+        for cp in self.members:
             self.residual -= cp.calc_bus_value(self)
             cp.bus_deriv(self)
 
     def clear_jacobian(self):
         for k in self.jacobian:
             self.jacobian[k] = 0
+
+
+class InverseBusChar:
+    r"""
+    Inverse of the characteristic line of a bus with the base :code:`'bus'`.
+
+    For the base :code:`'bus'` the bus value :math:`\dot{E}_\mathrm{bus}` is
+    defined implicitly by the value of the component and the characteristic
+    line :math:`f`. With :math:`x` as the ratio of the bus value to its
+    reference value and :math:`y` as the ratio of the component value to the
+    bus reference value the equation reads
+
+    .. math::
+
+        y = x \cdot f\left(x\right)
+
+    On every segment of the characteristic line the right hand side is a
+    quadratic polynomial, which is inverted analytically. The inversion is
+    available, if the right hand side is strictly monotonic and the
+    characteristic line is not extrapolated. Otherwise the bus value is
+    calculated with a Newton iteration.
+
+    Parameters
+    ----------
+    char : tespy.tools.characteristics.CharLine
+        Characteristic line of the bus.
+
+    Example
+    -------
+    >>> from tespy.connections.bus import InverseBusChar
+    >>> from tespy.tools import CharLine
+    >>> char = CharLine(x=[0.5, 1, 1.5], y=[0.9, 0.95, 0.96])
+    >>> inverse = InverseBusChar(char)
+    >>> x = inverse.evaluate(0.8)
+    >>> round(x * char.evaluate(x), 8)
+    0.8
+    """
+
+    def __init__(self, char):
+        x = char.x
+        y = char.y
+        self.sign = 1 if y[0] > 0 else -1
+        y = y * self.sign
+
+        self.y_min = y[0]
+        self.y_max = y[-1]
+        self.slope = np.diff(y) / np.diff(x)
+        self.offset = y[:-1] - self.slope * x[:-1]
+        self.products = x * y
+
+        # derivative of x * f(x) on the segments, linear in x
+        lower = self.offset + 2 * self.slope * x[:-1]
+        upper = self.offset + 2 * self.slope * x[1:]
+        self.invertible = bool(
+            not char.extrapolate and (y > 0).all()
+            and (lower > 0).all() and (upper > 0).all()
+        )
+
+    def evaluate(self, y):
+        r"""
+        Return the ratio of the bus value to its reference value.
+
+        Parameters
+        ----------
+        y : float
+            Ratio of the component value to the bus reference value.
+
+        Returns
+        -------
+        x : float
+            Ratio of the bus value to the bus reference value.
+        """
+        y = y * self.sign
+        if y <= self.products[0]:
+            return y / self.y_min
+        elif y >= self.products[-1]:
+            return y / self.y_max
+
+        i = np.searchsorted(self.products, y, side="right") - 1
+        a = self.slope[i]
+        c = self.offset[i]
+        return 2 * y / (c + (c ** 2 + 4 * a * y) ** 0.5)
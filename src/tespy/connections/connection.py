@@ -9,11 +9,17 @@ available from its original location tespy/connections/connection.py
 SPDX-License-Identifier: MIT
 """
 
+import copy
+import inspect
+import logging
+import types
+
 import numpy as np
 
 from tespy.components.component import Component
 from tespy.tools import fluid_properties as fp
 from tespy.tools import logger
+from tespy.tools.autodiff import evaluate as autodiff_evaluate
 from tespy.tools.data_containers import DataContainer as dc
 from tespy.tools.data_containers import FluidComposition as dc_flu
 from tespy.tools.data_containers import FluidProperties as dc_prop
@@ -42,6 +48,7 @@ from tespy.tools.global_vars import ERR
 from tespy.tools.global_vars import fluid_property_data as fpd
 from tespy.tools.helpers import TESPyConnectionError
 from tespy.tools.helpers import TESPyNetworkError
+from tespy.tools.helpers import _numeric_deriv
 from tespy.tools.helpers import convert_from_SI
 
 
@@ -263,18 +270,21 @@ class Connection:
         # set default values for kwargs
         self.property_data = self.get_parameters()
         self.parameters = {
-            k: v for k, v in self.get_parameters().items()
+            k: v for k, v in self.property_data.items()
             if hasattr(v, "func") and v.func is not None
         }
         self.state = dc_simple()
         self.property_data0 = [x + '0' for x in self.property_data.keys()]
         self.__dict__.update(self.property_data)
         self.mixing_rule = None
-        msg = (
-            f"Created connection from {self.source.label} ({self.source_id}) "
-            f"to {self.target.label} ({self.target_id})."
-        )
-        logger.debug(msg)
+        # starting value for the inversion of the temperature
+        self._T_guess = np.nan
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "Created connection from %s (%s) to %s (%s).",
+                self.source.label, self.source_id, self.target.label,
+                self.target_id
+            )
 
         self.set_attr(**kwargs)
 
@@ -628,6 +638,14 @@ class Connection:
         self.residual = np.zeros(self.num_eq)
         self.jacobian = {}
 
+        # the partial derivatives of linear equations are not recalculated
+        for k, parameter in self.equations.items():
+            data = self.get_attr(parameter)
+            if data.constant_deriv and not data.autodiff:
+                data.deriv(k, **data.func_params)
+        self.constant_jacobian = self.jacobian
+        self.jacobian = {}
+
     def simplify_specifications(self):
         systemvar_specs = []
         nonsystemvar_specs = []
@@ -694,15 +712,15 @@ class Connection:
             ),
             "m_ref": dc_ref(
                 func=self.primary_ref_func, deriv=self.primary_ref_deriv,
-                num_eq=1, func_params={"variable": "m"}
+                constant_deriv=True, num_eq=1, func_params={"variable": "m"}
             ),
             "p_ref": dc_ref(
                 func=self.primary_ref_func, deriv=self.primary_ref_deriv,
-                num_eq=1, func_params={"variable": "p"}
+                constant_deriv=True, num_eq=1, func_params={"variable": "p"}
             ),
             "h_ref": dc_ref(
                 func=self.primary_ref_func, deriv=self.primary_ref_deriv,
-                num_eq=1, func_params={"variable": "h"}
+                constant_deriv=True, num_eq=1, func_params={"variable": "h"}
             ),
             "T_ref": dc_ref(
                 func=self.T_ref_func, deriv=self.T_ref_deriv, num_eq=1
@@ -740,8 +758,17 @@ class Connection:
 
     def calc_T(self, T0=None):
         if T0 is None:
-            T0 = self.T.val_SI
-        return T_mix_ph(self.p.val_SI, self.h.val_SI, self.fluid_data, self.mixing_rule, T0=T0)
+            T0 = self._get_T_guess()
+        T = T_mix_ph(self.p.val_SI, self.h.val_SI, self.fluid_data, self.mixing_rule, T0=T0)
+        # keep the temperature as starting value for the next inversion
+        self._T_guess = T
+        return T
+
+    def _get_T_guess(self):
+        r"""Return the starting value for the inversion of the temperature."""
+        if np.isnan(self._T_guess):
+            return self.T.val_SI
+        return self._T_guess
 
     def T_func(self, k, **kwargs):
         self.residual[k] = self.calc_T() - self.T.val_SI
@@ -749,15 +776,15 @@ class Connection:
     def T_deriv(self, k, **kwargs):
         if self.p.is_var:
             self.jacobian[k, self.p.J_col] = (
-                dT_mix_dph(self.p.val_SI, self.h.val_SI, self.fluid_data, self.mixing_rule, self.T.val_SI)
+                dT_mix_dph(self.p.val_SI, self.h.val_SI, self.fluid_data, self.mixing_rule, self._get_T_guess())
             )
         if self.h.is_var:
             self.jacobian[k, self.h.J_col] = (
-                dT_mix_pdh(self.p.val_SI, self.h.val_SI, self.fluid_data, self.mixing_rule, self.T.val_SI)
+                dT_mix_pdh(self.p.val_SI, self.h.val_SI, self.fluid_data, self.mixing_rule, self._get_T_guess())
             )
         for fluid in self.fluid.is_var:
             self.jacobian[k, self.fluid.J_col[fluid]] = dT_mix_ph_dfluid(
-                self.p.val_SI, self.h.val_SI, fluid, self.fluid_data, self.mixing_rule
+                self.p.val_SI, self.h.val_SI, fluid, self.fluid_data, self.mixing_rule, self._get_T_guess()
             )
 
     def T_ref_func(self, k, **kwargs):
@@ -772,16 +799,16 @@ class Connection:
         ref = self.T_ref.ref
         if ref.obj.p.is_var:
             self.jacobian[k, ref.obj.p.J_col] = -(
-                dT_mix_dph(ref.obj.p.val_SI, ref.obj.h.val_SI, ref.obj.fluid_data, ref.obj.mixing_rule)
+                dT_mix_dph(ref.obj.p.val_SI, ref.obj.h.val_SI, ref.obj.fluid_data, ref.obj.mixing_rule, ref.obj._get_T_guess())
             ) * ref.factor
         if ref.obj.h.is_var:
             self.jacobian[k, ref.obj.h.J_col] = -(
-                dT_mix_pdh(ref.obj.p.val_SI, ref.obj.h.val_SI, ref.obj.fluid_data, ref.obj.mixing_rule)
+                dT_mix_pdh(ref.obj.p.val_SI, ref.obj.h.val_SI, ref.obj.fluid_data, ref.obj.mixing_rule, ref.obj._get_T_guess())
             ) * ref.factor
         for fluid in ref.obj.fluid.is_var:
             if not self._increment_filter[ref.obj.fluid.J_col[fluid]]:
                 self.jacobian[k, ref.obj.fluid.J_col[fluid]] = -dT_mix_ph_dfluid(
-                    ref.obj.p.val_SI, ref.obj.h.val_SI, fluid, ref.obj.fluid_data, ref.obj.mixing_rule
+                    ref.obj.p.val_SI, ref.obj.h.val_SI, fluid, ref.obj.fluid_data, ref.obj.mixing_rule, ref.obj._get_T_guess()
                 )
 
     def calc_viscosity(self, T0=None):
@@ -798,21 +825,21 @@ class Connection:
             return np.nan
 
     def v_func(self, k, **kwargs):
-        self.residual[k] = self.calc_vol(T0=self.T.val_SI) * self.m.val_SI - self.v.val_SI
+        self.residual[k] = self.calc_vol(T0=self._get_T_guess()) * self.m.val_SI - self.v.val_SI
 
     def v_deriv(self, k, **kwargs):
         if self.m.is_var:
-            self.jacobian[k, self.m.J_col] = self.calc_vol(T0=self.T.val_SI)
+            self.jacobian[k, self.m.J_col] = self.calc_vol(T0=self._get_T_guess())
         if self.p.is_var:
-            self.jacobian[k, self.p.J_col] = dv_mix_dph(self.p.val_SI, self.h.val_SI, self.fluid_data) * self.m.val_SI
+            self.jacobian[k, self.p.J_col] = dv_mix_dph(self.p.val_SI, self.h.val_SI, self.fluid_data, self.mixing_rule, self._get_T_guess()) * self.m.val_SI
         if self.h.is_var:
-            self.jacobian[k, self.h.J_col] = dv_mix_pdh(self.p.val_SI, self.h.val_SI, self.fluid_data) * self.m.val_SI
+            self.jacobian[k, self.h.J_col] = dv_mix_pdh(self.p.val_SI, self.h.val_SI, self.fluid_data, self.mixing_rule, self._get_T_guess()) * self.m.val_SI
 
     def v_ref_func(self, k, **kwargs):
         ref = self.v_ref.ref
         self.residual[k] = (
-            self.calc_vol(T0=self.T.val_SI) * self.m.val_SI
-            - (ref.obj.calc_vol(T0=ref.obj.T.val_SI) * ref.obj.m.val_SI * ref.factor + ref.delta_SI)
+            self.calc_vol(T0=self._get_T_guess()) * self.m.val_SI
+            - (ref.obj.calc_vol(T0=ref.obj._get_T_guess()) * ref.obj.m.val_SI * ref.factor + ref.delta_SI)
         )
 
     def v_ref_deriv(self, k, **kwargs):
@@ -822,16 +849,16 @@ class Connection:
         ref = self.v_ref.ref
         if ref.obj.m.is_var:
             self.jacobian[k, ref.obj.m.J_col] = -(
-                ref.obj.calc_vol(T0=ref.obj.T.val_SI) * ref.factor
+                ref.obj.calc_vol(T0=ref.obj._get_T_guess()) * ref.factor
             )
         if ref.obj.p.is_var:
             self.jacobian[k, ref.obj.p.J_col] = -(
-                dv_mix_dph(ref.obj.p.val_SI, ref.obj.h.val_SI, ref.obj.fluid_data)
+                dv_mix_dph(ref.obj.p.val_SI, ref.obj.h.val_SI, ref.obj.fluid_data, ref.obj.mixing_rule, ref.obj._get_T_guess())
                 * ref.obj.m.val_SI * ref.factor
             )
         if ref.obj.h.is_var:
             self.jacobian[k, ref.obj.h.J_col] = -(
-                dv_mix_pdh(ref.obj.p.val_SI, ref.obj.h.val_SI, ref.obj.fluid_data)
+                dv_mix_pdh(ref.obj.p.val_SI, ref.obj.h.val_SI, ref.obj.fluid_data, ref.obj.mixing_rule, ref.obj._get_T_guess())
                 * ref.obj.m.val_SI * ref.factor
             )
 
@@ -889,19 +916,125 @@ class Connection:
 
     def calc_s(self):
         try:
-            return s_mix_ph(self.p.val_SI, self.h.val_SI, self.fluid_data, self.mixing_rule, T0=self.T.val_SI)
+            return s_mix_ph(self.p.val_SI, self.h.val_SI, self.fluid_data, self.mixing_rule, T0=self._get_T_guess())
         except NotImplementedError:
             return np.nan
 
     def calc_Q(self):
         return Q_mix_ph(self.p.val_SI, self.h.val_SI, self.fluid_data)
 
+    def get_variable_columns(self):
+        r"""
+        Return the columns of all variables the connection equations depend on.
+
+        Returns
+        -------
+        columns : list
+            Positions of the mass flow, pressure, enthalpy and fluid
+            composition variables of the connection and the connections
+            referenced in its equations in the Jacobian matrix.
+        """
+        conns = [self]
+        for parameter in self.equations.values():
+            ref = getattr(self.get_attr(parameter), "ref", None)
+            if ref is not None:
+                conns += [ref.obj]
+
+        columns = []
+        for c in conns:
+            columns += [var.J_col for var in [c.m, c.p, c.h] if var.is_var]
+            columns += [c.fluid.J_col[fluid] for fluid in c.fluid.is_var]
+        return columns
+
     def solve(self, increment_filter):
         self._increment_filter = increment_filter
         for k, parameter in self.equations.items():
             data = self.get_attr(parameter)
-            data.func(k, **data.func_params)
-            data.deriv(k, **data.func_params)
+            if data.autodiff:
+                self.autodiff(parameter, k)
+            else:
+                data.func(k, **data.func_params)
+                if not data.constant_deriv:
+                    data.deriv(k, **data.func_params)
+
+    def autodiff(self, parameter, k):
+        r"""
+        Calculate residual value and partial derivatives of an equation.
+
+        The equation is evaluated once on copies of the connection and the
+        referenced connection holding :py:class:`tespy.tools.autodiff.Dual`
+        numbers for the mass flow, pressure and enthalpy, i.e. the state of
+        the connections is not changed. The partial derivatives to the fluid
+        composition are calculated numerically.
+
+        Parameters
+        ----------
+        parameter : str
+            Parameter specifying the equation.
+
+        k : int
+            Position of the equation in the Jacobian matrix.
+        """
+        data = self.get_attr(parameter)
+        local = self._local_copy()
+        # the equations write their residual value to the residual of the copy
+        local.residual = {}
+        conns = [(self, local)]
+
+        ref = getattr(data, "ref", None)
+        if ref is not None:
+            local_ref = copy.copy(ref)
+            if ref.obj is self:
+                local_ref.obj = local
+            else:
+                local_ref.obj = ref.obj._local_copy()
+                conns += [(ref.obj, local_ref.obj)]
+            local_data = copy.copy(data)
+            local_data.ref = local_ref
+            local.__dict__[parameter] = local_data
+
+        variables = []
+        columns = []
+        for c, local_c in conns:
+            for var in ["m", "p", "h"]:
+                if c.get_attr(var).is_var:
+                    variables += [(local_c.get_attr(var), "val_SI")]
+                    columns += [c.get_attr(var).J_col]
+
+        # bind the equation to the copy, e.g. without profiling wrappers
+        equation = types.MethodType(inspect.unwrap(data.func).__func__, local)
+
+        def func():
+            equation(k, **data.func_params)
+            return local.residual[k]
+
+        value, deriv = autodiff_evaluate(func, variables)
+        self.residual[k] = value[0]
+        for col, d in zip(columns, deriv[0]):
+            self.jacobian[k, col] = d
+
+        for c, local_c in conns:
+            for fluid in c.fluid.is_var:
+                col = c.fluid.J_col[fluid]
+                if not self._increment_filter[col]:
+                    self.jacobian[k, col] = _numeric_deriv(
+                        local, func, fluid, local_c
+                    )
+
+    def _local_copy(self):
+        r"""
+        Return a copy of the connection for automatic differentiation.
+
+        The copy holds its own data containers of the mass flow, pressure,
+        enthalpy and fluid composition values. All other attributes are
+        shared with the connection.
+        """
+        local = copy.copy(self)
+        for var in ["m", "p", "h"]:
+            local.__dict__[var] = copy.copy(self.get_attr(var))
+        local.fluid = copy.copy(self.fluid)
+        local.fluid.val = self.fluid.val.copy()
+        return local
 
     def calc_results(self):
         self.T.val_SI = self.calc_T()
@@ -962,7 +1095,7 @@ class Connection:
     def check_pressure_bounds(self, fluid):
         if self.p.val_SI > self.fluid.wrapper[fluid]._p_max:
             self.p.val_SI = self.fluid.wrapper[fluid]._p_max
-            logger.debug(self._property_range_message('p'))
+            self._log_property_range('p')
 
         elif self.p.val_SI < self.fluid.wrapper[fluid]._p_min:
             try:
@@ -972,7 +1105,7 @@ class Connection:
                 self.fluid.wrapper[fluid].T_ph(self.p.val_SI, self.h.val_SI)
             except ValueError:
                 self.p.val_SI = self.fluid.wrapper[fluid]._p_min + 1e1
-                logger.debug(self._property_range_message('p'))
+                self._log_property_range('p')
 
     def check_enthalpy_bounds(self, fluid):
         # enthalpy
@@ -990,7 +1123,7 @@ class Connection:
                 self.h.val_SI = hmin * 0.9999
             else:
                 self.h.val_SI = hmin * 1.0001
-            logger.debug(self._property_range_message('h'))
+            self._log_property_range('h')
         else:
 
             T = self.fluid.wrapper[fluid]._T_max
@@ -1005,7 +1138,7 @@ class Connection:
 
             if self.h.val_SI > hmax:
                 self.h.val_SI = hmax * 0.9999
-                logger.debug(self._property_range_message('h'))
+                self._log_property_range('h')
 
     def check_two_phase_bounds(self, fluid):
 
@@ -1013,12 +1146,12 @@ class Connection:
             h = self.fluid.wrapper[fluid].h_pQ(self.p.val_SI, 1)
             if self.h.val_SI < h:
                 self.h.val_SI = h * 1.01
-                logger.debug(self._property_range_message('h'))
+                self._log_property_range('h')
         elif (self.Td_bp.val_SI < 0 or (self.state.val == 'l' and self.state.is_set)):
             h = self.fluid.wrapper[fluid].h_pQ(self.p.val_SI, 0)
             if self.h.val_SI > h:
                 self.h.val_SI = h * 0.99
-                logger.debug(self._property_range_message('h'))
+                self._log_property_range('h')
 
     def check_temperature_bounds(self):
         r"""
@@ -1040,11 +1173,11 @@ class Connection:
 
         if self.h.val_SI < hmin:
             self.h.val_SI = hmin
-            logger.debug(self._property_range_message('h'))
+            self._log_property_range('h')
 
         if self.h.val_SI > hmax:
             self.h.val_SI = hmax
-            logger.debug(self._property_range_message('h'))
+            self._log_property_range('h')
 
     def _property_range_message(self, prop):
         r"""
@@ -1070,7 +1203,19 @@ class Connection:
         )
         return msg
 
-    def get_physical_exergy(self, pamb, Tamb):
+    def _log_property_range(self, prop):
+        r"""
+        Log the adjustment of a fluid property to its value range.
+
+        Parameters
+        ----------
+        prop : str
+            Fluid property.
+        """
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(self._property_range_message(prop))
+
+    def get_physical_exergy(self, pamb, Tamb, dead_state=None):
         r"""
         Get the value of a connection's specific physical exergy.
 
@@ -1082,6 +1227,10 @@ class Connection:
         T0 : float
             Ambient temperature T0 / K.
 
+        dead_state : tuple
+            Specific enthalpy and entropy of the connection's fluid at the
+            dead state, calculated if not provided.
+
         Note
         ----
             .. math::
@@ -1093,7 +1242,7 @@ class Connection:
         """
         self.ex_therm, self.ex_mech = fp.functions.calc_physical_exergy(
             self.h.val_SI, self.s.val_SI, self.p.val_SI, pamb, Tamb,
-            self.fluid_data, self.mixing_rule, self.T.val_SI
+            self.fluid_data, self.mixing_rule, self.T.val_SI, dead_state
         )
         self.Ex_therm = self.ex_therm * self.m.val_SI
         self.Ex_mech = self.ex_mech * self.m.val_SI
@@ -1101,7 +1250,7 @@ class Connection:
         self.ex_physical = self.ex_therm + self.ex_mech
         self.Ex_physical = self.m.val_SI * self.ex_physical
 
-    def get_chemical_exergy(self, pamb, Tamb, Chem_Ex):
+    def get_chemical_exergy(self, pamb, Tamb, Chem_Ex, ex_chemical=None):
         r"""
         Get the value of a connection's specific chemical exergy.
 
@@ -1116,6 +1265,10 @@ class Connection:
         Chem_Ex : dict
             Lookup table for standard specific chemical exergy.
 
+        ex_chemical : float
+            Specific chemical exergy of the connection's fluid composition,
+            calculated if not provided.
+
         Note
         ----
             .. math::
@@ -1124,6 +1277,8 @@ class Connection:
         """
         if Chem_Ex is None:
             self.ex_chemical = 0
+        elif ex_chemical is not None:
+            self.ex_chemical = ex_chemical
         else:
             self.ex_chemical = fp.functions.calc_chemical_exergy(
                 pamb, Tamb, self.fluid_data, Chem_Ex, self.mixing_rule,
@@ -14,7 +14,9 @@ available from its original location tespy/networks/networks.py
 SPDX-License-Identifier: MIT
 """
 import json
+import logging
 import os
+from contextlib import nullcontext
 from time import time
 
 import numpy as np
@@ -32,8 +34,15 @@ from tespy.tools.data_containers import ComponentProperties as dc_cp
 from tespy.tools.data_containers import FluidComposition as dc_flu
 from tespy.tools.data_containers import GroupedComponentCharacteristics as dc_gcc
 from tespy.tools.data_containers import GroupedComponentProperties as dc_gcp
+from tespy.tools.fluid_properties.helpers import _check_friction_model
+from tespy.tools.fluid_properties.helpers import T_MIX_INVERSION_STATISTICS
+from tespy.tools.fluid_properties.saturation import get_saturation_cache
 from tespy.tools.global_vars import ERR
 from tespy.tools.global_vars import fluid_property_data as fpd
+from tespy.tools.parallel import ParallelEvaluator
+from tespy.tools.parallel import evaluate_equations
+from tespy.tools.profiling import FluidPropertyProfiler
+from tespy.tools.sensitivity import SensitivityAnalysis
 
 # Only require cupy if Cuda shall be used
 try:
@@ -48,6 +57,12 @@ class Network:
 
     Parameters
     ----------
+    friction_model : str
+        Model for the darcy friction factor of all components with a
+        :code:`friction_model` parameter that is not specified individually:
+        :code:`"colebrook"`, :code:`"swamee-jain"`, :code:`"haaland"` or
+        :code:`"serghides"`, default value: :code:`"colebrook"`.
+
     h_range : list
         List with minimum and maximum values for enthalpy value range.
 
@@ -69,6 +84,16 @@ class Network:
     p_unit : str
         Specify the unit for pressure: 'Pa', 'psi', 'bar', 'MPa'.
 
+    profile : boolean
+        Count and time the fluid property calls per object and solver phase,
+        see :py:meth:`tespy.networks.network.Network.profile_report`,
+        default value: False.
+
+    saturation_cache : boolean, list
+        Interpolate the saturation curves of the fluids with splines instead
+        of calling the fluid property back end. Pass a list of fluid names to
+        enable the cache for specific fluids only, default value: False.
+
     s_unit : str
         Specify the unit for specific entropy: 'J / kgK', 'kJ / kgK',
         'MJ / kgK'.
@@ -83,6 +108,13 @@ class Network:
     vol_unit : str
         Specify the unit for specific volume: 'm3 / kg', 'l / kg'.
 
+    workers : int
+        Number of worker processes evaluating the equations of the components
+        and connections in parallel, see
+        :py:class:`tespy.tools.parallel.ParallelEvaluator`. The profiling
+        only records the fluid property calls of the main process,
+        default value: 1.
+
     x_unit : str
         Specify the unit for steam mass fraction: '-', '%'.
 
@@ -160,6 +192,7 @@ class Network:
             "x_unit": self.x_unit,
             "v_unit": self.v_unit,
             "s_unit": self.s_unit,
+            "friction_model": self.friction_model,
         }
 
     def set_defaults(self):
@@ -206,6 +239,13 @@ class Network:
         self.checked = False
         self.design_path = None
         self.iterinfo = True
+        self.saturation_cache = False
+        self.friction_model = "colebrook"
+        self.profile = False
+        self.profiler = None
+        self.workers = 1
+        # evaluator with the worker processes for the parallel evaluation
+        self._parallel_pool = None
 
         msg = 'Default unit specifications:\n'
         for prop, data in fpd.items():
@@ -230,12 +270,23 @@ class Network:
                 'max: ' + str(limits[1]) + ' ' + self.get_attr(prop + '_unit'))
             logger.debug(msg)
 
+    def __getstate__(self):
+        # copies of the network start their own worker processes
+        state = self.__dict__.copy()
+        state["_parallel_pool"] = None
+        return state
+
     def set_attr(self, **kwargs):
         r"""
         Set, resets or unsets attributes of a network.
 
         Parameters
         ----------
+        friction_model : str
+            Model for the darcy friction factor of all components with a
+            :code:`friction_model` parameter that is not specified
+            individually.
+
         h_range : list
             List with minimum and maximum values for enthalpy value range.
 
@@ -257,6 +308,15 @@ class Network:
         p_unit : str
             Specify the unit for pressure: 'Pa', 'psi', 'bar', 'MPa'.
 
+        profile : boolean
+            Count and time the fluid property calls per object and solver
+            phase.
+
+        saturation_cache : boolean, list
+            Interpolate the saturation curves of the fluids with splines
+            instead of calling the fluid property back end. Pass a list of
+            fluid names to enable the cache for specific fluids only.
+
         s_unit : str
             Specify the unit for specific entropy: 'J / kgK', 'kJ / kgK',
             'MJ / kgK'.
@@ -270,6 +330,10 @@ class Network:
 
         vol_unit : str
             Specify the unit for specific volume: 'm3 / kg', 'l / kg'.
+
+        workers : int
+            Number of worker processes evaluating the equations of the
+            components and connections in parallel.
         """
         # unit sets
         for prop in fpd.keys():
@@ -323,6 +387,32 @@ class Network:
             logger.error(msg)
             raise TypeError(msg)
 
+        self.saturation_cache = kwargs.get(
+            'saturation_cache', self.saturation_cache
+        )
+
+        if not isinstance(self.saturation_cache, (bool, list)):
+            msg = (
+                'Network parameter saturation_cache must be True, False or a '
+                'list of fluid names!'
+            )
+            logger.error(msg)
+            raise TypeError(msg)
+
+        self.profile = kwargs.get('profile', self.profile)
+
+        if not isinstance(self.profile, bool):
+            msg = ('Network parameter profile must be True or False!')
+            logger.error(msg)
+            raise TypeError(msg)
+
+        if 'friction_model' in kwargs:
+            _check_friction_model(kwargs['friction_model'])
+            self.friction_model = kwargs['friction_model']
+
+        self.workers = kwargs.get('workers', self.workers)
+        hlp.check_workers(self.workers)
+
     def get_attr(self, key):
         r"""
         Get the value of a network attribute.
@@ -410,6 +500,7 @@ class Network:
             The connection to be added to the network, connections objects ci
             :code:`add_conns(c1, c2, c3, ...)`.
         """
+        labels = set()
         for c in args:
             if not isinstance(c, con.Connection):
                 msg = (
@@ -419,7 +510,7 @@ class Network:
                 logger.error(msg)
                 raise TypeError(msg)
 
-            elif c.label in self.conns.index:
+            elif c.label in self.conns.index or c.label in labels:
                 msg = (
                     'There is already a connection with the label '
                     f'{c.label}. The connection labels must be unique!'
@@ -427,18 +518,50 @@ class Network:
                 logger.error(msg)
                 raise ValueError(msg)
 
-            c.good_starting_values = False
+            labels.add(c.label)
 
-            self.conns.loc[c.label] = [
-                c, c.source, c.source_id, c.target, c.target_id
-            ]
+        if len(args) == 0:
+            return
+
+        # append all connections at once, adding single rows to the
+        # DataFrame scales with the number of connections already added
+        conns = pd.DataFrame(
+            [[c, c.source, c.source_id, c.target, c.target_id] for c in args],
+            index=[c.label for c in args], columns=self.conns.columns
+        )
+        self.conns = self._append_rows(self.conns, conns)
 
+        for c in args:
+            c.good_starting_values = False
             msg = f'Added connection {c.label} to network.'
             logger.debug(msg)
-            # set status "checked" to false, if connection is added to network.
-            self.checked = False
+
+        # set status "checked" to false, if connection is added to network.
+        self.checked = False
         self._add_comps(*args)
 
+    @staticmethod
+    def _append_rows(df, rows):
+        r"""
+        Append the rows of a DataFrame to another DataFrame.
+
+        Parameters
+        ----------
+        df : pandas.core.frame.DataFrame
+            DataFrame to append the rows to.
+
+        rows : pandas.core.frame.DataFrame
+            Rows to append with identical columns.
+
+        Returns
+        -------
+        pandas.core.frame.DataFrame
+            DataFrame containing the rows of both DataFrames.
+        """
+        if len(df) == 0:
+            return rows
+        return pd.concat([df, rows])
+
     def del_conns(self, *args):
         """
         Remove one or more connections from the network.
@@ -516,28 +639,39 @@ class Network:
             components are extracted from these information.
         """
         # get unique components in new connections
-        comps = list({cp for c in args for cp in [c.source, c.target]})
-        # add to the dataframe of components
-        for comp in comps:
-            if comp.label in self.comps.index:
-                if self.comps.loc[comp.label, 'object'] == comp:
-                    continue
-                else:
-                    comp_type = comp.__class__.__name__
+        comps = {}
+        for c in args:
+            for comp in [c.source, c.target]:
+                if comp.label in comps and comps[comp.label] != comp:
+                    other_obj = comps[comp.label]
+                elif comp.label in self.comps.index:
                     other_obj = self.comps.loc[comp.label, "object"]
-                    other_comp_type = other_obj.__class__.__name__
-                    msg = (
-                        f"The component with the label {comp.label} of type "
-                        f"{comp_type} cannot be added to the network as a "
-                        f"different component of type {other_comp_type} with "
-                        "the same label has already been added. All "
-                        "components must have unique values!"
-                    )
-                    raise hlp.TESPyNetworkError(msg)
+                    if other_obj == comp:
+                        continue
+                else:
+                    comps[comp.label] = comp
+                    continue
 
-            comp_type = comp.__class__.__name__
-            self.comps.loc[comp.label, 'comp_type'] = comp_type
-            self.comps.loc[comp.label, 'object'] = comp
+                comp_type = comp.__class__.__name__
+                other_comp_type = other_obj.__class__.__name__
+                msg = (
+                    f"The component with the label {comp.label} of type "
+                    f"{comp_type} cannot be added to the network as a "
+                    f"different component of type {other_comp_type} with "
+                    "the same label has already been added. All "
+                    "components must have unique values!"
+                )
+                raise hlp.TESPyNetworkError(msg)
+
+        if len(comps) == 0:
+            return
+
+        # add to the dataframe of components
+        comps = pd.DataFrame(
+            [[comp.__class__.__name__, comp] for comp in comps.values()],
+            index=list(comps.keys()), columns=self.comps.columns
+        )
+        self.comps = self._append_rows(self.comps, comps)
 
     def _del_comps(self, comps):
         r"""
@@ -765,16 +899,21 @@ class Network:
 
     def init_components(self):
         r"""Set up necessary component information."""
+        # collect incoming and outgoing connections of all components at
+        # once instead of filtering the connections for every component
+        inlets = {comp: [] for comp in self.comps["object"]}
+        outlets = {comp: [] for comp in self.comps["object"]}
+        for c, source, source_id, target, target_id in self.conns.values:
+            outlets[source] += [(source_id, c)]
+            inlets[target] += [(target_id, c)]
+
         for comp in self.comps["object"]:
-            # get incoming and outgoing connections of a component
-            sources = self.conns[self.conns['source'] == comp]
-            sources = sources['source_id'].sort_values().index.tolist()
-            targets = self.conns[self.conns['target'] == comp]
-            targets = targets['target_id'].sort_values().index.tolist()
             # save the incoming and outgoing as well as the number of
             # connections as component attribute
-            comp.inl = self.conns.loc[targets, 'object'].tolist()
-            comp.outl = self.conns.loc[sources, 'object'].tolist()
+            comp.inl = [c for _, c in sorted(inlets[comp], key=lambda x: x[0])]
+            comp.outl = [
+                c for _, c in sorted(outlets[comp], key=lambda x: x[0])
+            ]
             comp.num_i = len(comp.inlets())
             comp.num_o = len(comp.outlets())
 
@@ -807,8 +946,12 @@ class Network:
     def check_components(self):
         # count number of incoming and outgoing connections and compare to
         # expected values
+        num_o = self.conns["source"].value_counts()
+        num_i = self.conns["target"].value_counts()
         for comp in self.comps['object']:
-            counts = (self.conns[['source', 'target']] == comp).sum()
+            counts = {
+                "source": num_o.get(comp, 0), "target": num_i.get(comp, 0)
+            }
 
             if counts["source"] != comp.num_o:
                 msg = (
@@ -872,6 +1015,8 @@ class Network:
             self.create_massflow_and_fluid_branches()
             self.create_fluid_wrapper_branches()
         self.propagate_fluid_wrappers()
+        self.init_saturation_caches()
+        self.init_friction_models()
         self.presolve_massflow_topology()
         self.presolve_fluid_topology()
 
@@ -898,6 +1043,10 @@ class Network:
         # generic fluid property initialisation
         self.init_properties()
 
+        # resolve the bus members with the reference values of this run
+        for b in self.busses.values():
+            b.preprocess()
+
         msg = 'Network initialised.'
         logger.info(msg)
 
@@ -964,6 +1113,24 @@ class Network:
 
                 c._create_fluid_wrapper()
 
+    def init_saturation_caches(self):
+        r"""Enable or disable the saturation caches of the fluid wrappers."""
+        for c in self.conns["object"]:
+            for fluid, wrapper in c.fluid.wrapper.items():
+                if self.saturation_cache is True or (
+                        isinstance(self.saturation_cache, list)
+                        and fluid in self.saturation_cache):
+                    wrapper._saturation_cache = get_saturation_cache(wrapper)
+                else:
+                    wrapper._saturation_cache = None
+
+    def init_friction_models(self):
+        r"""Apply the network's friction model to the components."""
+        for cp in self.comps["object"]:
+            if "friction_model" in cp.parameters:
+                if not cp.friction_model.is_set:
+                    cp.friction_model.val = self.friction_model
+
     def presolve_massflow_topology(self):
 
         # mass flow is a single variable in each sub branch
@@ -997,12 +1164,12 @@ class Network:
                     c._m_tmp = c.m
                     c.m = main_conn.m
 
-                msg = (
-                    "Removing "
-                    f"{len(branch['connections']) - num_massflow_specs} "
-                    "mass flow variables from system variables."
-                )
-                logger.debug(msg)
+                if logger.is_enabled_for(logging.DEBUG):
+                    logger.debug(
+                        "Removing %s mass flow variables from system "
+                        "variables.",
+                        len(branch['connections']) - num_massflow_specs
+                    )
             elif num_massflow_specs > 1:
                 msg = (
                     "You cannot specify two or more values for mass flow in "
@@ -1119,7 +1286,15 @@ class Network:
                 self.num_conn_vars += 1
 
     def _reset_topology_reduction_specifications(self):
+        # keep the shared data containers for the sensitivity analysis
+        self._topology_reduction = []
         for c in self.conns["object"]:
+            if hasattr(c, "_m_tmp") or hasattr(c, "_fluid_tmp"):
+                self._topology_reduction += [(
+                    c,
+                    c.m if hasattr(c, "_m_tmp") else None,
+                    c.fluid if hasattr(c, "_fluid_tmp") else None
+                )]
             if hasattr(c, "_m_tmp"):
                 value = c.m.val_SI
                 unit = c.m.unit
@@ -1325,8 +1500,7 @@ class Network:
                     cp.get_attr(var).is_set = False
 
                 # set offdesign parameters
-                switched = False
-                msg = 'Set component attributes '
+                switched = []
 
                 for var in cp.offdesign:
                     # set variables provided in .offdesign attribute
@@ -1336,12 +1510,13 @@ class Network:
                     # take nominal values from design point
                     if isinstance(data, dc_cp):
                         cp.get_attr(var).val = cp.get_attr(var).design
-                        switched = True
-                        msg += var + ", "
+                        switched += [var]
 
-                if switched:
-                    msg = f"{msg[:-2]} to design value at component {cp.label}."
-                    logger.debug(msg)
+                if switched and logger.is_enabled_for(logging.DEBUG):
+                    logger.debug(
+                        "Set component attributes %s to design value at "
+                        "component %s.", ", ".join(switched), cp.label
+                    )
 
                 cp.new_design = False
 
@@ -1847,7 +2022,8 @@ class Network:
 
     def solve(self, mode, init_path=None, design_path=None,
               max_iter=50, min_iter=4, init_only=False, init_previous=True,
-              use_cuda=False, print_results=True, prepare_fast_lane=False):
+              use_cuda=False, print_results=True, prepare_fast_lane=False,
+              log_iterations=True, callbacks=None):
         r"""
         Solve the network.
 
@@ -1891,11 +2067,64 @@ class Network:
             Use cuda instead of numpy for matrix inversion, default:
             :code:`False`.
 
+        log_iterations : boolean
+            Log and print information during the iterations, default:
+            :code:`True`. If :code:`False`, the iteration information is not
+            printed regardless of the :code:`iterinfo` attribute and messages
+            below the warning level are ignored during the iterations.
+
+        callbacks : list
+            Functions called on events of the simulation with the name of the
+            event, the network and a dictionary of event data as arguments,
+            e.g. :code:`callback(event, nw, data)`, default: :code:`None`.
+            The simulation is stopped, if a function returns :code:`True` on
+            an :code:`"iteration"` event. See the note on the events below.
+
         Note
         ----
+        The following events are passed to the callbacks. All data contain
+        the time since the start of the simulation (:code:`"elapsed"`).
+
+        - :code:`"initialised"`: after the initialisation and the setup of
+          the system of equations with the number of variables
+          (:code:`"num_vars"`). Not passed, if :code:`init_only=True`.
+        - :code:`"iteration"`: after every iteration with the iteration
+          (:code:`"iteration"`), the norm of the residual values
+          (:code:`"residual"`) and of the increments of the variables
+          per class (:code:`"increment"`, dictionary with the keys
+          :code:`"massflow"`, :code:`"pressure"`, :code:`"enthalpy"`,
+          :code:`"fluid"` and :code:`"component"`).
+        - :code:`"converged"` or :code:`"failed"`: after the iterations with
+          the number of iterations (:code:`"iterations"`) and the norm of
+          the residual values (:code:`"residual"`). On failure, the reason is
+          provided (:code:`"reason"`: :code:`"linear dependency"`,
+          :code:`"no progress"`, :code:`"maximum iterations"` or
+          :code:`"callback"`).
+        - :code:`"postprocessed"`: after the postprocessing of the results
+          with the convergence state (:code:`"converged"`).
+
+        Without callbacks no event data are calculated.
+
         For more information on the solution process have a look at the online
         documentation at tespy.readthedocs.io in the section "TESPy modules".
         """
+        args = (
+            mode, init_path, design_path, max_iter, min_iter, init_only,
+            init_previous, use_cuda, print_results, prepare_fast_lane,
+            log_iterations, callbacks
+        )
+        if not self.profile:
+            self._solve(*args)
+            return
+
+        self.profiler = FluidPropertyProfiler()
+        with self.profiler.instrument(self):
+            self._solve(*args)
+
+    def _solve(self, mode, init_path, design_path, max_iter, min_iter,
+               init_only, init_previous, use_cuda, print_results,
+               prepare_fast_lane, log_iterations, callbacks):
+        self._solve_start_time = time()
         ## to own function
         self.new_design = False
         if self.design_path == design_path and design_path is not None:
@@ -1920,6 +2149,17 @@ class Network:
         self.init_previous = init_previous
         self.iter = 0
         self.use_cuda = use_cuda
+        self.log_iterations = log_iterations
+        self.aborted = False
+
+        if callbacks is None:
+            callbacks = []
+        if not isinstance(callbacks, list) or not all(
+                callable(callback) for callback in callbacks):
+            msg = 'The callbacks must be provided as list of functions.'
+            logger.error(msg)
+            raise TypeError(msg)
+        self.callbacks = callbacks
 
         if self.use_cuda and cu is None:
             msg = (
@@ -1939,24 +2179,18 @@ class Network:
         if not self.checked:
             self.check_network()
 
-        msg = (
-            "Solver properties:\n"
-            f" - mode: {self.mode}\n"
-            f" - init_path: {self.init_path}\n"
-            f" - design_path: {self.design_path}\n"
-            f" - min_iter: {self.min_iter}\n"
-            f" - max_iter: {self.max_iter}\n"
-            f" - init_path: {self.init_path}"
-        )
-        logger.debug(msg)
-
-        msg = (
-            "Network information:\n"
-            f" - Number of components: {len(self.comps)}\n"
-            f" - Number of connections: {len(self.conns)}\n"
-            f" - Number of busses: {len(self.busses)}"
-        )
-        logger.debug(msg)
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "Solver properties:\n - mode: %s\n - init_path: %s\n"
+                " - design_path: %s\n - min_iter: %s\n - max_iter: %s\n"
+                " - init_path: %s", self.mode, self.init_path,
+                self.design_path, self.min_iter, self.max_iter, self.init_path
+            )
+            logger.debug(
+                "Network information:\n - Number of components: %s\n"
+                " - Number of connections: %s\n - Number of busses: %s",
+                len(self.comps), len(self.conns), len(self.busses)
+            )
 
         self.initialise()
 
@@ -1969,11 +2203,24 @@ class Network:
 
         self.solve_determination()
 
+        if self.callbacks:
+            self._notify("initialised", num_vars=self.num_vars)
+
         self.solve_loop(print_results=print_results)
 
         if not prepare_fast_lane:
             self._reset_topology_reduction_specifications()
 
+        if self.callbacks:
+            self._notify_convergence()
+
+        if self.aborted:
+            msg = (
+                "The simulation was stopped by a callback after iteration "
+                f"{self.iter + 1}."
+            )
+            logger.info(msg)
+
         if self.lin_dep:
             msg = (
                 'Singularity in jacobian matrix, calculation aborted! Make '
@@ -1992,6 +2239,9 @@ class Network:
 
         self.postprocessing()
 
+        if self.callbacks:
+            self._notify("postprocessed", converged=self.converged)
+
         if not self.progress:
             msg = (
                 'The solver does not seem to make any progress, aborting '
@@ -2007,61 +2257,226 @@ class Network:
         logger.info(msg)
         return
 
+    def _notify(self, event, **data):
+        r"""
+        Pass an event of the simulation to the callbacks.
+
+        Parameters
+        ----------
+        event : str
+            Name of the event.
+
+        Returns
+        -------
+        abort : boolean
+            Flag, if any of the callbacks requested to stop the simulation.
+        """
+        data["elapsed"] = time() - self._solve_start_time
+        abort = False
+        for callback in self.callbacks:
+            if callback(event, self, data):
+                abort = True
+        return abort
+
+    def _notify_convergence(self):
+        r"""Pass the convergence state to the callbacks."""
+        data = {
+            "iterations": self.iter + 1, "residual": self.residual_history[-1]
+        }
+        if self.converged:
+            self._notify("converged", **data)
+            return
+
+        if self.lin_dep:
+            reason = "linear dependency"
+        elif self.aborted:
+            reason = "callback"
+        elif not self.progress:
+            reason = "no progress"
+        else:
+            reason = "maximum iterations"
+        self._notify("failed", reason=reason, **data)
+
     def solve_loop(self, print_results=True):
         r"""Loop of the newton algorithm."""
         # parameter definitions
         self.residual_history = np.array([])
-        self.residual = np.zeros([self.num_vars])
         self.increment = np.ones([self.num_vars])
-        self.jacobian = np.zeros((self.num_vars, self.num_vars))
+        self._variable_columns = {}
+        self._equation_offsets = []
+        self.num_reused_evaluations = 0
+        self.num_constant_jacobian_entries = 0
+
+        # the worker processes persist for simulations of the same topology
+        pool = self._parallel_pool
+        if pool is not None and not pool.matches(self, self.workers):
+            pool.close()
+            self._parallel_pool = None
+
+        if self.workers > 1:
+            if self._parallel_pool is None:
+                self._parallel_pool = ParallelEvaluator(self, self.workers)
+            self._parallel = self._parallel_pool
+            self.residual = self._parallel.residual
+            self.jacobian = self._parallel.jacobian
+            self.residual[:] = 0
+            self.jacobian[:] = 0
+        else:
+            self._parallel = None
+            self.residual = np.zeros([self.num_vars])
+            self.jacobian = np.zeros((self.num_vars, self.num_vars))
 
+        try:
+            self._solve_iterations(print_results)
+        finally:
+            if self._parallel is not None:
+                # keep the results apart from the shared memory blocks
+                self.residual = self.residual.copy()
+                self.jacobian = self.jacobian.copy()
+                self._parallel = None
+
+        if self.iterinfo and self.log_iterations:
+            self.iterinfo_tail(print_results)
+
+        if self.iter == self.max_iter - 1 and not self.aborted:
+            msg = (
+                f"Reached maximum iteration count ({self.max_iter})), "
+                "calculation stopped. Residual value is "
+                "{:.2e}".format(norm(self.residual))
+            )
+            logger.warning(msg)
+
+        return
+
+    def _solve_iterations(self, print_results):
+        r"""Iterate until convergence or the maximum number of iterations."""
         self.start_time = time()
         self.progress = True
+        T_mix_calls = T_MIX_INVERSION_STATISTICS["calls"]
+        T_mix_iterations = T_MIX_INVERSION_STATISTICS["iterations"]
+        self._set_variable_masks()
 
-        if self.iterinfo:
+        iterinfo = self.iterinfo and self.log_iterations
+        if iterinfo:
             self.iterinfo_head(print_results)
 
-        for self.iter in range(self.max_iter):
-            self.increment_filter = np.absolute(self.increment) < ERR ** 2
-            self.solve_control()
-            self.residual_history = np.append(
-                self.residual_history, norm(self.residual)
-            )
+        if self.log_iterations:
+            context = nullcontext()
+        else:
+            context = logger.minimum_level(logging.WARNING)
+
+        with context:
+            for self.iter in range(self.max_iter):
+                self.increment_filter = np.absolute(self.increment) < ERR ** 2
+                self.solve_control()
+                self.residual_history = np.append(
+                    self.residual_history, norm(self.residual)
+                )
 
-            if self.iterinfo:
-                self.iterinfo_body(print_results)
+                if iterinfo:
+                    self.iterinfo_body(print_results)
+
+                abort = self.callbacks and self._notify_iteration()
 
-            if (
-                    (self.iter >= self.min_iter - 1
-                     and (self.residual_history[-2:] < ERR ** 0.5).all())
-                    or self.lin_dep
-                ):
-                self.converged = not self.lin_dep
-                break
-
-            if self.iter > 40:
                 if (
-                    all(
-                        self.residual_history[(self.iter - 3):] >= self.residual_history[-3] * 0.95
-                    ) and self.residual_history[-1] >= self.residual_history[-2] * 0.95
-                ):
-                    self.progress = False
+                        (self.iter >= self.min_iter - 1
+                         and (self.residual_history[-2:] < ERR ** 0.5).all())
+                        or self.lin_dep
+                    ):
+                    self.converged = not self.lin_dep
                     break
 
-        self.end_time = time()
+                if abort:
+                    self.aborted = True
+                    break
 
-        if self.iterinfo:
-            self.iterinfo_tail(print_results)
+                if self.iter > 40:
+                    history = self.residual_history
+                    if (
+                        all(history[(self.iter - 3):] >= history[-3] * 0.95)
+                        and history[-1] >= history[-2] * 0.95
+                    ):
+                        self.progress = False
+                        break
 
-        if self.iter == self.max_iter - 1:
-            msg = (
-                f"Reached maximum iteration count ({self.max_iter})), "
-                "calculation stopped. Residual value is "
-                "{:.2e}".format(norm(self.residual))
+        self.end_time = time()
+        self.num_T_mix_calls = (
+            T_MIX_INVERSION_STATISTICS["calls"] - T_mix_calls
+        )
+        self.num_T_mix_iterations = (
+            T_MIX_INVERSION_STATISTICS["iterations"] - T_mix_iterations
+        )
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "Mixture temperature inversions: %s calls with %s inner "
+                "iterations.", self.num_T_mix_calls, self.num_T_mix_iterations
             )
-            logger.warning(msg)
+            logger.debug(
+                "Reused the residual values and partial derivatives of "
+                "components and connections with unchanged variables %s "
+                "times.", self.num_reused_evaluations
+            )
+            num_entries = np.count_nonzero(self.jacobian)
+            if num_entries > 0:
+                logger.debug(
+                    "%s of %s non-zero entries of the Jacobian matrix "
+                    "(%.1f%%) are constant and have been calculated once.",
+                    self.num_constant_jacobian_entries, num_entries,
+                    self.num_constant_jacobian_entries / num_entries * 100
+                )
 
-        return
+    def _notify_iteration(self):
+        r"""
+        Pass the progress of the iteration to the callbacks.
+
+        Returns
+        -------
+        abort : boolean
+            Flag, if any of the callbacks requested to stop the simulation.
+        """
+        if self.lin_dep:
+            increment = {key: np.nan for key in self._variable_masks}
+        else:
+            increment = self._increment_norms()
+        return self._notify(
+            "iteration", iteration=self.iter + 1,
+            residual=self.residual_history[-1], increment=increment
+        )
+
+    def _set_variable_masks(self):
+        r"""Collect the columns of the variables per variable class."""
+        columns = np.fromiter(
+            self.variables_dict.keys(), dtype=int,
+            count=len(self.variables_dict)
+        )
+        variables = np.array(
+            [data["variable"] for data in self.variables_dict.values()],
+            dtype=object
+        )
+        self._variable_masks = {
+            "massflow": columns[variables == "m"],
+            "pressure": columns[variables == "p"],
+            "enthalpy": columns[variables == "h"],
+            "fluid": columns[variables == "fluid"],
+            "component": columns[
+                ~np.isin(variables, ["m", "p", "h", "fluid"])
+            ]
+        }
+
+    def _increment_norms(self):
+        r"""
+        Calculate the norm of the increment per variable class.
+
+        Returns
+        -------
+        norms : dict
+            Norm of the increment of the mass flow, pressure, enthalpy, fluid
+            and component variables.
+        """
+        return {
+            key: norm(self.increment[columns])
+            for key, columns in self._variable_masks.items()
+        }
 
     def solve_determination(self):
         r"""Check, if the number of supplied parameters is sufficient."""
@@ -2081,21 +2496,25 @@ class Network:
             self.num_conn_vars + self.num_comp_vars
         )
 
-        msg = f'Number of connection equations: {self.num_conn_eq}.'
-        logger.debug(msg)
-        msg = f'Number of bus equations: {self.num_bus_eq}.'
-        logger.debug(msg)
-        msg = f'Number of component equations: {self.num_comp_eq}.'
-        logger.debug(msg)
-        msg = f'Number of user defined equations: {self.num_ude_eq}.'
-        logger.debug(msg)
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                'Number of connection equations: %s.', self.num_conn_eq
+            )
+            logger.debug('Number of bus equations: %s.', self.num_bus_eq)
+            logger.debug(
+                'Number of component equations: %s.', self.num_comp_eq
+            )
+            logger.debug(
+                'Number of user defined equations: %s.', self.num_ude_eq
+            )
 
-        msg = f'Total number of variables: {self.num_vars}.'
-        logger.debug(msg)
-        msg = f'Number of component variables: {self.num_comp_vars}.'
-        logger.debug(msg)
-        msg = f"Number of connection variables: {self.num_conn_vars}."
-        logger.debug(msg)
+            logger.debug('Total number of variables: %s.', self.num_vars)
+            logger.debug(
+                'Number of component variables: %s.', self.num_comp_vars
+            )
+            logger.debug(
+                'Number of connection variables: %s.', self.num_conn_vars
+            )
 
         n = (
             self.num_comp_eq + self.num_conn_eq +
@@ -2143,22 +2562,11 @@ class Network:
 
     def iterinfo_body(self, print_results=True):
         """Print convergence progress."""
-        m = [k for k, v in self.variables_dict.items() if v["variable"] == "m"]
-        p = [k for k, v in self.variables_dict.items() if v["variable"] == "h"]
-        p = [k for k, v in self.variables_dict.items() if v["variable"] == "p"]
-        h = [k for k, v in self.variables_dict.items() if v["variable"] == "h"]
-        fl = [k for k, v in self.variables_dict.items() if v["variable"] == "fluid"]
-        cp = [k for k in self.variables_dict if k not in m + p + h + fl]
-
         iter_str = str(self.iter + 1)
         residual_norm = norm(self.residual)
         residual = 'NaN'
         progress = 'NaN'
-        massflow = 'NaN'
-        pressure = 'NaN'
-        enthalpy = 'NaN'
-        fluid = 'NaN'
-        component = 'NaN'
+        increments = {key: 'NaN' for key in self._variable_masks}
 
         progress_val = -1
 
@@ -2166,11 +2574,10 @@ class Network:
             residual = '{:.2e}'.format(residual_norm)
 
             if not self.lin_dep:
-                massflow = '{:.2e}'.format(norm(self.increment[m]))
-                pressure = '{:.2e}'.format(norm(self.increment[p]))
-                enthalpy = '{:.2e}'.format(norm(self.increment[h]))
-                fluid = '{:.2e}'.format(norm(self.increment[fl]))
-                component  = '{:.2e}'.format(norm(self.increment[cp]))
+                increments = {
+                    key: '{:.2e}'.format(value)
+                    for key, value in self._increment_norms().items()
+                }
 
             # This should not be hardcoded here.
             if residual_norm > np.finfo(float).eps * 100:
@@ -2194,11 +2601,7 @@ class Network:
             iter=iter_str,
             residual=residual,
             progress=progress,
-            massflow=massflow,
-            pressure=pressure,
-            enthalpy=enthalpy,
-            fluid=fluid,
-            component=component
+            **increments
         )
         logger.progress(progress_val, msg)
         if print_results:
@@ -2299,9 +2702,23 @@ class Network:
         - Restrict fluid properties to value ranges
         - Check component parameters for consistency
         """
-        self.solve_components()
-        self.solve_busses()
-        self.solve_connections()
+        if self._parallel is not None and self.iter > 0:
+            if self.iter == 1:
+                # the workers receive the objects without instrumentation
+                if self.profile:
+                    context = self.profiler.suspended()
+                else:
+                    context = nullcontext()
+                with context:
+                    self._parallel.start(self._equation_offsets)
+            self.num_reused_evaluations += self._parallel.evaluate(
+                self.increment_filter, self._reuse_evaluations()
+            )
+            self.solve_busses()
+        else:
+            self.solve_components()
+            self.solve_busses()
+            self.solve_connections()
         self.solve_user_defined_eq()
         self.matrix_inversion()
 
@@ -2343,21 +2760,21 @@ class Network:
             if c.p.is_var:
                 if c.p.val_SI <= self.p_range_SI[0]:
                     c.p.val_SI = self.p_range_SI[0]
-                    logger.debug(c._property_range_message('p'))
+                    c._log_property_range('p')
 
                 elif c.p.val_SI >= self.p_range_SI[1]:
                     c.p.val_SI = self.p_range_SI[1]
-                    logger.debug(c._property_range_message('p'))
+                    c._log_property_range('p')
 
             # enthalpy
             if c.h.is_var:
                 if c.h.val_SI < self.h_range_SI[0]:
                     c.h.val_SI = self.h_range_SI[0]
-                    logger.debug(c._property_range_message('h'))
+                    c._log_property_range('h')
 
                 elif c.h.val_SI > self.h_range_SI[1]:
                     c.h.val_SI = self.h_range_SI[1]
-                    logger.debug(c._property_range_message('h'))
+                    c._log_property_range('h')
 
                 # temperature
                 if c.T.is_set:
@@ -2366,11 +2783,61 @@ class Network:
         # mass flow
         if c.m.val_SI <= self.m_range_SI[0] and c.m.is_var:
             c.m.val_SI = self.m_range_SI[0]
-            logger.debug(c._property_range_message('m'))
+            c._log_property_range('m')
 
         elif c.m.val_SI >= self.m_range_SI[1] and c.m.is_var:
             c.m.val_SI = self.m_range_SI[1]
-            logger.debug(c._property_range_message('m'))
+            c._log_property_range('m')
+
+    def _write_constant_jacobian(self, obj, sum_eq):
+        r"""
+        Write the constant partial derivatives of a component or connection.
+
+        Parameters
+        ----------
+        obj : object
+            Component or connection to write the partial derivatives of.
+
+        sum_eq : int
+            Position of the first equation of the object in the Jacobian.
+        """
+        if len(obj.constant_jacobian) > 0:
+            rows = [k[0] + sum_eq for k in obj.constant_jacobian]
+            columns = [k[1] for k in obj.constant_jacobian]
+            data = list(obj.constant_jacobian.values())
+            self.jacobian[rows, columns] = data
+            self.num_constant_jacobian_entries += len(data)
+
+    def _reuse_evaluations(self):
+        # the convergence checks of the first iterations change the values of
+        # the variables besides the increment and some partial derivatives
+        # depend on the iteration count of the object
+        return self.iter >= 3
+
+    def _get_variable_columns(self, obj):
+        r"""
+        Return the variable columns of an object for reusing its evaluation.
+
+        The residual values and partial derivatives of the last evaluation of
+        a component or connection are still in place, in case all increments
+        of its variables are filtered.
+
+        Parameters
+        ----------
+        obj : object
+            Component or connection.
+
+        Returns
+        -------
+        columns : list
+            Columns of the variables of the object, :code:`None` in case the
+            object must be evaluated.
+        """
+        if obj not in self._variable_columns:
+            self._variable_columns[obj] = obj.get_variable_columns()
+        if not self._reuse_evaluations():
+            return None
+        return self._variable_columns[obj]
 
     def solve_components(self):
         r"""
@@ -2378,15 +2845,17 @@ class Network:
         """
         # fetch component equation residuals and component partial derivatives
         sum_eq = 0
-        for cp in self.comps['object']:
-            cp.solve(self.increment_filter)
-            self.residual[sum_eq:sum_eq + cp.num_eq] = cp.residual
-
-            if len(cp.jacobian) > 0:
-                rows = [k[0] + sum_eq for k in cp.jacobian]
-                columns = [k[1] for k in cp.jacobian]
-                data = list(cp.jacobian.values())
-                self.jacobian[rows, columns] = data
+        for i, cp in enumerate(self.comps['object']):
+            if self.iter == 0:
+                self._write_constant_jacobian(cp, sum_eq)
+                self._equation_offsets += [("comp", i, sum_eq)]
+
+            if not evaluate_equations(
+                    cp, self.increment_filter, self.residual, self.jacobian,
+                    sum_eq, self._get_variable_columns(cp)):
+                self.num_reused_evaluations += 1
+
+            if len(cp.jacobian) > 0 or len(cp.constant_jacobian) > 0:
                 sum_eq += cp.num_eq
 
             cp.it += 1
@@ -2396,15 +2865,17 @@ class Network:
         Calculate the residual and derivatives of connection equations.
         """
         sum_eq = self.num_comp_eq
-        for c in self.conns['object']:
-            c.solve(self.increment_filter)
-            self.residual[sum_eq:sum_eq + c.num_eq] = c.residual
-
-            if len(c.jacobian) > 0:
-                rows = [k[0] + sum_eq for k in c.jacobian]
-                columns = [k[1] for k in c.jacobian]
-                data = list(c.jacobian.values())
-                self.jacobian[rows, columns] = data
+        for i, c in enumerate(self.conns['object']):
+            if self.iter == 0:
+                self._write_constant_jacobian(c, sum_eq)
+                self._equation_offsets += [("conn", i, sum_eq)]
+
+            if not evaluate_equations(
+                    c, self.increment_filter, self.residual, self.jacobian,
+                    sum_eq, self._get_variable_columns(c)):
+                self.num_reused_evaluations += 1
+
+            if len(c.jacobian) > 0 or len(c.constant_jacobian) > 0:
                 sum_eq += c.num_eq
 
             c.it += 1
@@ -2488,32 +2959,95 @@ class Network:
         """Process the bus results."""
         # busses
         for b in self.busses.values():
-            for cp in b.comps.index:
+            for cp, data in b.members.items():
                 # get components bus func value
                 bus_val = cp.calc_bus_value(b)
                 eff = cp.calc_bus_efficiency(b)
-                cmp_val = cp.bus_func(b.comps.loc[cp])
+                cmp_val = cp.bus_func(data)
 
-                b.comps.loc[cp, 'char'].get_domain_errors(
+                data['char'].get_domain_errors(
                     cp.calc_bus_expr(b), cp.label)
 
                 # save as reference value
                 if self.mode == 'design':
-                    if b.comps.loc[cp, 'base'] == 'component':
+                    if data['base'] == 'component':
                         design_value = cmp_val
                     else:
                         design_value = bus_val
 
                     b.comps.loc[cp, 'P_ref'] = design_value
+                    data['P_ref'] = design_value
 
                 else:
-                    design_value = b.comps.loc[cp, 'P_ref']
+                    design_value = data['P_ref']
 
                 result = [cmp_val, bus_val, eff, design_value]
                 self.results[b.label].loc[cp.label] = result
 
             b.P.val = self.results[b.label]['bus value'].sum()
 
+    def profile_report(self):
+        r"""
+        Return the fluid property calls of the last simulation.
+
+        The simulation must have been run with the network parameter
+        :code:`profile=True`.
+
+        Returns
+        -------
+        report : pandas.core.frame.DataFrame
+            Number of calls and accumulated time in seconds per object type,
+            object label, solver phase and fluid property function, sorted by
+            time. For more information see
+            :py:class:`tespy.tools.profiling.FluidPropertyProfiler`.
+        """
+        if self.profiler is None:
+            msg = (
+                "No profiling data available, set the network parameter "
+                "profile=True and run a simulation first."
+            )
+            logger.error(msg)
+            raise hlp.TESPyNetworkError(msg)
+
+        return self.profiler.report()
+
+    def sensitivities(self, outputs, parameters, method="auto"):
+        r"""
+        Calculate the sensitivities of results to parameters of the network.
+
+        The sensitivities are derived from the Jacobian matrix at the
+        converged state with the implicit function theorem and do not
+        require additional simulations.
+
+        Parameters
+        ----------
+        outputs : list
+            Tuples of a connection, component or bus and the name of the
+            result, e.g. :code:`(c1, "T")`, or functions without arguments.
+
+        parameters : list
+            Tuples of a connection, component, bus or user defined equation
+            and the name of a specified parameter, e.g.
+            :code:`(compressor, "eta_s")`.
+
+        method : str
+            Method for the linear system, :code:`"direct"`,
+            :code:`"adjoint"` or :code:`"auto"`, default value
+            :code:`"auto"`.
+
+        Returns
+        -------
+        sensitivities : pandas.core.frame.DataFrame
+            Sensitivities of the outputs (rows) to the parameters (columns)
+            in the units of the network.
+
+        Note
+        ----
+        For more information see
+        :py:class:`tespy.tools.sensitivity.SensitivityAnalysis`.
+        """
+        return SensitivityAnalysis(self).calculate(outputs, parameters, method)
+
     def print_results(self, colored=True, colors=None, print_results=True):
         r"""Print the calculations results to prompt."""
         # Define colors for highlighting values in result table
@@ -2650,13 +3184,57 @@ class Network:
             return np.nan
 
     def export(self, path):
-        """Export the network structure and parametrization."""
+        r"""
+        Export the network structure and parametrization.
+
+        Parameters
+        ----------
+        path : str
+            Path to export the network to. If the path ends with
+            :code:`.json`, all data are written to a single compact file,
+            otherwise to a folder with separate files for the network, the
+            connections, the busses and every component class.
+
+        Note
+        ----
+        Use :py:func:`tespy.networks.network_reader.load_network` to load an
+        exported network. Loading the single file is faster than reading
+        the separate files.
+        """
+        if path.endswith(".json"):
+            self.export_single_file(path)
+            return
+
         path, path_comps = self._modify_export_paths(path)
         self.export_network(path)
         self.export_connections(path)
         self.export_components(path_comps)
         self.export_busses(path)
 
+    def export_single_file(self, fn):
+        r"""
+        Export the network structure and parametrization to a single file.
+
+        Parameters
+        ----------
+        fn : str
+            Path/filename for the file.
+        """
+        path = os.path.dirname(fn)
+        if path != "" and not os.path.exists(path):
+            os.makedirs(path)
+
+        data = {
+            "Network": self._serialize(),
+            "Connection": self._serialize_connections(),
+            "Component": self._serialize_components(),
+            "Bus": self._serialize_busses()
+        }
+        with open(fn, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+        logger.debug('Network exported to %s.', fn)
+
     def save(self, path, **kwargs):
         r"""
         Save the results to results files.
@@ -2762,9 +3340,7 @@ class Network:
             logger.debug('Bus information saved to %s.', fn)
 
     def export_connections(self, fn):
-        connections = {}
-        for c in self.conns["object"]:
-            connections.update(c._serialize())
+        connections = self._serialize_connections()
 
         fn = fn + "connections.json"
         with open(fn, "w", encoding="utf-8") as f:
@@ -2772,11 +3348,7 @@ class Network:
         logger.debug('Connection information exported to %s.', fn)
 
     def export_components(self, fn):
-        for c in self.comps["comp_type"].unique():
-            components = {}
-            for cp in self.comps.loc[self.comps["comp_type"] == c, "object"]:
-                components.update(cp._serialize())
-
+        for c, components in self._serialize_components().items():
             fname = f"{fn}{c}.json"
             with open(fname, "w", encoding="utf-8") as f:
                 json.dump(components, f, indent=4)
@@ -2784,10 +3356,28 @@ class Network:
 
     def export_busses(self, fn):
         if len(self.busses) > 0:
-            busses = {}
-            for bus in self.busses.values():
-                busses.update(bus._serialize())
+            busses = self._serialize_busses()
             fn = fn + 'busses.json'
             with open(fn, "w", encoding="utf-8") as f:
                 json.dump(busses, f, indent=4)
             logger.debug('Bus information exported to %s.', fn)
+
+    def _serialize_connections(self):
+        connections = {}
+        for c in self.conns["object"]:
+            connections.update(c._serialize())
+        return connections
+
+    def _serialize_components(self):
+        components = {}
+        for comp_type, cp in self.comps[["comp_type", "object"]].values:
+            if comp_type not in components:
+                components[comp_type] = {}
+            components[comp_type].update(cp._serialize())
+        return components
+
+    def _serialize_busses(self):
+        busses = {}
+        for bus in self.busses.values():
+            busses.update(bus._serialize())
+        return busses
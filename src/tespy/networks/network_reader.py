@@ -3,7 +3,7 @@
 """Module for loading a tespy network from saved state.
 
 Use the method :func:`tespy.networks.network_reader.load_network` for importing
-a network from a saved state.
+a network from a saved state or a single exported file.
 
 
 This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
@@ -12,7 +12,6 @@ available from its original location tespy/networks/network_reader.py
 
 SPDX-License-Identifier: MIT
 """
-import importlib
 import json
 import os
 
@@ -34,12 +33,13 @@ from tespy.tools.helpers import modify_path_os
 
 def load_network(path):
     r"""
-    Load a network from a base path.
+    Load a network from a base path or a single file.
 
     Parameters
     ----------
     path : str
-        The path to the network data.
+        The path to the network data or the file, if the network has been
+        exported to a single file.
 
     Returns
     -------
@@ -63,6 +63,12 @@ def load_network(path):
     - busses.json
     - network.json
 
+    If the network has been exported to a path ending with :code:`.json`, a
+    single file contains the same information in the keys :code:`"Network"`,
+    :code:`"Connection"`, :code:`"Component"` (with one dictionary per
+    component class) and :code:`"Bus"`. Reading this file is faster than
+    reading the folder structure.
+
     Example
     -------
     Create a network and export it. This is followed by loading the network
@@ -172,75 +178,52 @@ def load_network(path):
     True
     >>> round(imported_nwk.get_comp('compressor').igva.val, 3) == igva
     True
+
+    Exporting the network to a single file and loading it yields the same
+    network.
+
+    >>> nw.export('exported_nwk/network.json')
+    >>> imported_nwk = load_network('exported_nwk/network.json')
+    >>> imported_nwk.set_attr(iterinfo=False)
+    >>> imported_nwk.solve('offdesign', design_path='design_state')
+    >>> round(imported_nwk.get_comp('turbine').eta_s.val, 3) == eta_s_t
+    True
     >>> shutil.rmtree('./exported_nwk', ignore_errors=True)
     >>> shutil.rmtree('./design_state', ignore_errors=True)
     """
-    if path[-1] != '/' and path[-1] != '\\':
-        path += '/'
-
-    path_comps = modify_path_os(path + 'components/')
-    path = modify_path_os(path)
+    if os.path.isfile(path):
+        msg = f"Reading network data from file {path}."
+        logger.info(msg)
 
-    msg = 'Reading network data from base path ' + path + '.'
-    logger.info(msg)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        data = _read_path(path)
 
     # load components
     comps = {}
-
-    module_name = "tespy.components"
-    module = importlib.import_module(module_name)
-
-    files = os.listdir(path_comps)
-    for f in files:
-        fn = path_comps + f
-        component = f.replace(".json", "")
-
-        msg = f"Reading component data ({component}) from {fn}."
-        logger.debug(msg)
-
-        with open(path_comps + f, "r", encoding="utf-8") as c:
-            data = json.load(c)
-
+    for component, comp_data in data["Component"].items():
         target_class = component_registry.items[component]
-        comps.update(_construct_components(target_class, data))
+        comps.update(_construct_components(target_class, comp_data))
 
     msg = 'Created network components.'
     logger.info(msg)
 
     # create network
-    nw = _construct_network(path)
-
-    # load connections
-    fn = path + 'connections.json'
-    msg = f"Reading connection data from {fn}."
-    logger.debug(msg)
+    nw = _construct_network(data["Network"])
 
-    with open(fn, "r", encoding="utf-8") as c:
-        data = json.load(c)
-
-    conns = _construct_connections(data, comps)
-
-    # add connections to network
-    for c in conns.values():
-        nw.add_conns(c)
+    # load connections and add them to network at once
+    conns = _construct_connections(data["Connection"], comps)
+    nw.add_conns(*conns.values())
 
     msg = 'Created connections.'
     logger.info(msg)
 
     # load busses
-    fn = path + 'busses.json'
-    if os.path.isfile(fn):
-
-        msg = f"Reading bus data from {fn}."
-        logger.debug(msg)
-
-        with open(fn, "r", encoding="utf-8") as c:
-            data = json.load(c)
-
-        busses = _construct_busses(data, comps)
+    if len(data["Bus"]) > 0:
+        busses = _construct_busses(data["Bus"], comps)
         # add busses to network
-        for b in busses.values():
-            nw.add_busses(b)
+        nw.add_busses(*busses.values())
 
         msg = 'Created busses.'
         logger.info(msg)
@@ -257,6 +240,63 @@ def load_network(path):
     return nw
 
 
+def _read_path(path):
+    r"""
+    Read the network data from a base path.
+
+    Parameters
+    ----------
+    path : str
+        Base-path to stored network data.
+
+    Returns
+    -------
+    data : dict
+        Network, connection, component and bus data.
+    """
+    if path[-1] != '/' and path[-1] != '\\':
+        path += '/'
+
+    path_comps = modify_path_os(path + 'components/')
+    path = modify_path_os(path)
+
+    msg = 'Reading network data from base path ' + path + '.'
+    logger.info(msg)
+
+    data = {"Component": {}, "Bus": {}}
+    for f in os.listdir(path_comps):
+        fn = path_comps + f
+        component = f.replace(".json", "")
+
+        msg = f"Reading component data ({component}) from {fn}."
+        logger.debug(msg)
+
+        with open(fn, "r", encoding="utf-8") as c:
+            data["Component"][component] = json.load(c)
+
+    # read network .json-file
+    with open(path + 'network.json', 'r') as f:
+        data["Network"] = json.load(f)
+
+    fn = path + 'connections.json'
+    msg = f"Reading connection data from {fn}."
+    logger.debug(msg)
+
+    with open(fn, "r", encoding="utf-8") as c:
+        data["Connection"] = json.load(c)
+
+    fn = path + 'busses.json'
+    if os.path.isfile(fn):
+
+        msg = f"Reading bus data from {fn}."
+        logger.debug(msg)
+
+        with open(fn, "r", encoding="utf-8") as c:
+            data["Bus"] = json.load(c)
+
+    return data
+
+
 def _construct_components(target_class, data):
     r"""
     Create TESPy component from class name and set parameters.
@@ -294,24 +334,20 @@ def _construct_components(target_class, data):
     return instances
 
 
-def _construct_network(path):
+def _construct_network(data):
     r"""
-    Create TESPy network from the path provided by the user.
+    Create TESPy network from the data provided by the user.
 
     Parameters
     ----------
-    path : str
-        Base-path to stored network data.
+    data : dict
+        Network information from .json file.
 
     Returns
     -------
     nw : tespy.networks.network.Network
         TESPy network object.
     """
-    # read network .json-file
-    with open(path + 'network.json', 'r') as f:
-        data = json.load(f)
-
     # create network object with its properties
     return Network(**data)
 
@@ -342,9 +378,6 @@ def _construct_connections(data, comps):
     ]
     arglist_ref = [_ for _ in data[list(data.keys())[0]] if "ref" in _]
 
-    module_name = "tespy.tools.fluid_properties.wrappers"
-    module = importlib.import_module(module_name)
-
     for label, conn in data.items():
         conns[label] = Connection(
             comps[conn["source"]], conn["source_id"],
@@ -360,6 +393,7 @@ def _construct_connections(data, comps):
 
         for f, engine in conn["fluid"]["engine"].items():
             conn["fluid"]["engine"][f] = wrapper_registry.items[engine]
+        conn["fluid"]["is_set"] = set(conn["fluid"]["is_set"])
 
         conns[label].fluid.set_attr(**conn["fluid"])
         conns[label]._create_fluid_wrapper()
@@ -402,12 +436,14 @@ def _construct_busses(data, comps):
         busses[label].P.set_attr(**bus_data["P"])
 
         components = [_ for _ in bus_data if _ != "P"]
+        component_data = []
         for cp in components:
             char = CharLine(**bus_data[cp]["char"])
-            component_data = {
+            component_data += [{
                 "comp": comps[cp], "param": bus_data[cp]["param"],
                 "base": bus_data[cp]["base"], "char": char
-            }
-            busses[label].add_comps(component_data)
+            }]
+        # add all components at once
+        busses[label].add_comps(*component_data)
 
     return busses
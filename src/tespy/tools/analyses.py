@@ -14,6 +14,9 @@ available from its original location tespy/tools/analyses.py
 
 SPDX-License-Identifier: MIT
 """
+from collections import OrderedDict
+from itertools import repeat
+
 import numpy as np
 import pandas as pd
 from tabulate import tabulate
@@ -21,11 +24,10 @@ from tabulate import tabulate
 from tespy.tools import helpers as hlp
 from tespy.tools import logger
 from tespy.tools.fluid_properties import single_fluid
+from tespy.tools.fluid_properties.functions import calc_dead_state
 from tespy.tools.global_vars import ERR
 from tespy.tools.global_vars import combustion_gases
 
-idx = pd.IndexSlice
-
 
 def categorize_fluids(conn):
     fluid = single_fluid(conn.fluid_data)
@@ -57,9 +59,52 @@ def categorize_fluids(conn):
     return cat
 
 
+def composition_key(conn):
+    """Return a hashable key of the fluid composition of a connection."""
+    return conn.mixing_rule, tuple(
+        (fluid, data["wrapper"].__class__, data["wrapper"].back_end,
+         data["mass_fraction"])
+        for fluid, data in conn.fluid_data.items()
+    )
+
+
+def long_format(values, points, labels, quantities, name):
+    """Create a long format table of the results of many operating points.
+
+    Parameters
+    ----------
+    values : ndarray
+        Values with the operating points in the first, the components in the
+        second and the quantities in the third dimension.
+
+    points : list
+        Labels of the operating points.
+
+    labels : list
+        Labels of the components.
+
+    quantities : list
+        Names of the quantities.
+
+    name : str
+        Name of the component index level.
+
+    Returns
+    -------
+    data : pandas.DataFrame
+        Table with the operating point, component and quantity as index.
+    """
+    index = pd.MultiIndex.from_product(
+        [points, labels, quantities], names=['point', name, 'quantity']
+    )
+    return pd.DataFrame({'value': values.reshape(-1)}, index=index)
+
+
 class ExergyAnalysis:
     r"""Class for exergy analysis of TESPy models."""
     exergy_cats = ["chemical", "physical", "massless"]
+    # maximum number of cached dead states
+    dead_state_cache_size = 256
 
     def __init__(self, network, E_F, E_P, E_L=[], internal_busses=[]):
         r"""
@@ -301,6 +346,26 @@ class ExergyAnalysis:
         as well as a list of the nodes.
 
         >>> links, nodes = ean.generate_plotly_sankey_input()
+
+        The analysis of many operating points, e.g. of a part load or time
+        series simulation, is available in batch mode. The labels of the
+        points are passed as iterable, which brings the network into the state
+        of the respective point before returning its label, e.g. a generator
+        function. The results are stored in long format tables, the sankey
+        data are only generated for the points passed in
+        :code:`sankey_points`.
+
+        >>> def operating_points():
+        ...     for m in [10, 9, 8]:
+        ...         fs_in.set_attr(m=m)
+        ...         nw.solve('design')
+        ...         yield m
+        >>> ean.analyse_many(operating_points(), pamb=pamb, Tamb=Tamb,
+        ... sankey_points=[8])
+        >>> ean.batch_network_data.shape
+        (3, 5)
+        >>> E_D = ean.batch_component_data.xs('E_D', level='quantity')
+        >>> links, nodes = ean.generate_plotly_sankey_input(point=8)
         """
         if len(E_F) == 0:
             msg = ('Missing fuel exergy E_F of network.')
@@ -317,6 +382,8 @@ class ExergyAnalysis:
         self.E_P = E_P
         self.E_L = E_L
         self.internal_busses = internal_busses
+        self.dead_states = OrderedDict()
+        self.reset_batch()
 
         bus_labels = [b.label for b in internal_busses + E_F + E_P + E_L]
         key_exergy_labels = ['E_P', 'E_F', 'E_D', 'E_L']
@@ -345,74 +412,194 @@ class ExergyAnalysis:
         pamb_SI = hlp.convert_to_SI('p', pamb, self.nw.p_unit)
         Tamb_SI = hlp.convert_to_SI('T', Tamb, self.nw.T_unit)
 
-        # reset data
-        dtypes = {
-            "E_F": float,
-            "E_P": float,
-            "E_D": float,
-            "epsilon": float,
-            "group": str
-        }
-        self.component_data = pd.DataFrame(
-            columns=list(dtypes.keys())
-        ).astype(dtypes)
+        self.create_layout()
+        self.evaluate(pamb_SI, Tamb_SI, Chem_Ex)
+        self.create_tables(Chem_Ex)
+        self.check_balance(self.network_data.values[:4])
 
-        self.bus_data = self.component_data.copy()
-        self.bus_data["base"] = np.nan
-        self.bus_data["base"] = self.bus_data["base"].astype(str)
-        conn_exergy_data_cols = ['e_PH', 'e_T', 'e_M', 'E_PH', 'E_T', 'E_M']
+    def analyse_many(
+            self, points, pamb, Tamb, Chem_Ex=None, sankey_points=[]):
+        """Run the exergy analysis for a series of operating points.
 
-        if Chem_Ex is not None:
-            conn_exergy_data_cols += ['e_CH', 'E_CH']
+        The network must be in the state of the respective operating point,
+        when the next label is taken from :code:`points`, e.g. by using a
+        generator function, which solves the network before yielding the
+        label of the point. The results are available in long format in the
+        :code:`batch_component_data`, :code:`batch_bus_data`,
+        :code:`batch_group_data` and :code:`batch_network_data` attributes.
 
-        self.connection_data = pd.DataFrame(
-            columns=conn_exergy_data_cols,
-            dtype='float64'
+        Parameters
+        ----------
+        points : iterable
+            Labels of the operating points.
+
+        pamb : float, iterable
+            Ambient pressure value for analysis, provide value in network's
+            pressure unit. Pass an iterable for one value per point.
+
+        Tamb : float, iterable
+            Ambient temperature value for analysis, provide value in network's
+            temperature unit. Pass an iterable for one value per point.
+
+        Chem_Ex : dict
+            Lookup table for standard specific chemical exergy.
+
+        sankey_points : list
+            Labels of the points to generate the sankey data for, see
+            :py:meth:`tespy.tools.analyses.ExergyAnalysis.generate_plotly_sankey_input`.
+        """
+        if np.ndim(pamb) == 0:
+            pamb = repeat(pamb)
+        if np.ndim(Tamb) == 0:
+            Tamb = repeat(Tamb)
+
+        self.reset_batch()
+        for point, p, T in zip(points, pamb, Tamb):
+            self.accumulate(p, T, Chem_Ex, point, point in sankey_points)
+
+        self.create_batch_data()
+
+    def reset_batch(self):
+        """Remove the results of all accumulated operating points."""
+        self.batch = None
+        self.batch_sankey_data = {}
+
+    def accumulate(self, pamb, Tamb, Chem_Ex=None, point=None, sankey=False):
+        """Add the exergy analysis of the current state to the batch results.
+
+        The structure of the network, i.e. the component groups, the bus
+        membership of the components and the fluid categories of the
+        connections, is collected on the first call and reused for all
+        subsequent points. Call
+        :py:meth:`tespy.tools.analyses.ExergyAnalysis.create_batch_data` to
+        create the result tables and
+        :py:meth:`tespy.tools.analyses.ExergyAnalysis.reset_batch` to start a
+        new series.
+
+        Parameters
+        ----------
+        pamb : float
+            Ambient pressure value for analysis, provide value in network's
+            pressure unit.
+
+        Tamb : float
+            Ambient temperature value for analysis, provide value in network's
+            temperature unit.
+
+        Chem_Ex : dict
+            Lookup table for standard specific chemical exergy.
+
+        point : object
+            Label of the operating point, defaults to the number of the point.
+
+        sankey : boolean
+            Generate the sankey data of this point, default value
+            :code:`False`.
+        """
+        pamb_SI = hlp.convert_to_SI('p', pamb, self.nw.p_unit)
+        Tamb_SI = hlp.convert_to_SI('T', Tamb, self.nw.T_unit)
+
+        if self.batch is None:
+            self.create_layout()
+            self.batch = {
+                'points': [], 'components': [], 'busses': [], 'groups': [],
+                'network': []
+            }
+
+        if point is None:
+            point = len(self.batch['points'])
+
+        self.evaluate(pamb_SI, Tamb_SI, Chem_Ex)
+        network = self.calculate_network_values()
+        aggregation = self.aggregate()
+        groups = np.bincount(
+            self.layout['group_index'],
+            weights=np.nan_to_num(aggregation[:, 2]),
+            minlength=len(self.layout['groups'])
         )
+        self.check_balance(network[:4])
+
+        self.batch['points'] += [point]
+        self.batch['components'] += [self.component_values]
+        self.batch['busses'] += [self.bus_values[:, :2]]
+        self.batch['groups'] += [groups]
+        self.batch['network'] += [network]
+
+        if sankey:
+            self.create_tables(Chem_Ex)
+            self.batch_sankey_data[point] = (
+                self.sankey_data, self.group_data.index.tolist()
+            )
 
-        self.network_data = pd.Series(
-            index=['E_F', 'E_P', 'E_D', 'E_L'], dtype='float64'
+    def create_batch_data(self):
+        """Create the long format tables of the accumulated operating points.
+
+        The component, bus and group tables are indexed by the operating
+        point, the label of the component (or group) and the quantity, the
+        network table by the operating point.
+        """
+        if self.batch is None or len(self.batch['points']) == 0:
+            msg = 'There are no operating points to create the tables for.'
+            logger.error(msg)
+            raise ValueError(msg)
+
+        points = self.batch['points']
+        network = np.array(self.batch['network'])
+        E_F = network[:, 0, None]
+        E_D = network[:, 2, None]
+
+        self.batch_network_data = pd.DataFrame(
+            network, columns=['E_F', 'E_P', 'E_D', 'E_L', 'epsilon'],
+            index=pd.Index(points, name='point')
         )
-        self.network_data[:] = 0
 
-        # physical exergy of connections
-        for conn in self.nw.conns['object']:
-            conn.get_physical_exergy(pamb_SI, Tamb_SI)
-            conn.get_chemical_exergy(pamb_SI, Tamb_SI, Chem_Ex)
-            conn_exergy_data = [
-                conn.ex_physical, conn.ex_therm, conn.ex_mech,
-                conn.Ex_physical, conn.Ex_therm, conn.Ex_mech
-            ]
-            if Chem_Ex is not None:
-                conn_exergy_data += [conn.ex_chemical, conn.Ex_chemical]
+        quantities = ['E_F', 'E_P', 'E_D', 'epsilon', 'y_Dk', 'y*_Dk']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.stack(self.batch['components'])
+            values = np.concatenate([
+                values, values[:, :, 1:2] / values[:, :, 0:1],
+                values[:, :, 2:3] / E_F[:, :, None],
+                values[:, :, 2:3] / E_D[:, :, None]
+            ], axis=2)
+            self.batch_component_data = long_format(
+                values, points, [cp.label for cp in self.layout['comps']],
+                quantities, 'component'
+            )
 
-            self.connection_data.loc[conn.label] = conn_exergy_data
+            values = np.stack(self.batch['busses']).reshape(
+                len(points), -1, 2
+            )
+            E_bus = values[:, :, 0:1] - values[:, :, 1:2]
+            values = np.concatenate([
+                values, E_bus, values[:, :, 1:2] / values[:, :, 0:1],
+                E_bus / E_F[:, :, None], E_bus / E_D[:, :, None]
+            ], axis=2)
+            self.batch_bus_data = long_format(
+                values, points, [b[1].label for b in self.layout['busses']],
+                quantities, 'bus'
+            )
 
-        # todo: überprüfen der sankey data + massless exergy
-        self.sankey_data = {}
-        sankey_columns_dtypes = {
-            'chemical': float,
-            'physical': float,
-            'massless': float
-        }
-        for label in self.reserved_fkt_groups:
-            self.sankey_data[label] = pd.DataFrame(
-                columns=sankey_columns_dtypes.keys(),
-                index=pd.MultiIndex(
-                    levels=[[], []],
-                    names=["target_group", "category"],
-                    codes=[[], []]
-                )
-            ).astype(sankey_columns_dtypes)
-
-        # exergy balance of components
-        for cp in self.nw.comps['object']:
-            # save component information
-            cp.exergy_balance(Tamb_SI)
-            self.component_data.loc[cp.label] = [
-                cp.E_F, cp.E_P, cp.E_D, cp.epsilon, cp.fkt_group
-            ]
+            values = np.stack(self.batch['groups'])
+            values = np.stack([values, values / E_F, values / E_D], axis=2)
+            self.batch_group_data = long_format(
+                values, points, self.layout['groups'],
+                ['E_D', 'y_Dk', 'y*_Dk'], 'group'
+            )
 
+    def create_layout(self):
+        """Collect the structure of the network for the analysis.
+
+        The component groups, the bus membership of the components, the
+        connections between the component groups and the fluid categories
+        are independent of the operating point.
+        """
+        comps = self.nw.comps['object'].tolist()
+        groups = {}
+        group_index = np.empty(len(comps), dtype=int)
+        busses = []
+        network_index = []
+        network_sign = []
+        for i, cp in enumerate(comps):
             if cp.fkt_group in self.reserved_fkt_groups:
                 msg = (
                     'The labels ' + ', '.join(self.reserved_fkt_groups) + ' '
@@ -421,63 +608,247 @@ class ExergyAnalysis:
                     'component/group with name ' + cp.fkt_group + '.'
                 )
                 raise ValueError(msg)
-            elif cp.fkt_group not in self.sankey_data:
-                self.sankey_data[cp.fkt_group] = pd.DataFrame(
-                    columns=sankey_columns_dtypes.keys(),
-                    index=pd.MultiIndex(
-                        levels=[[], []],
-                        names=["target_group", "category"],
-                        codes=[[], []]
-                    )
-                ).astype(sankey_columns_dtypes)
+            group_index[i] = groups.setdefault(cp.fkt_group, len(groups))
+
+            cp_on_num_busses = 0
+            for key, bus_list in [
+                    ('E_F', self.E_F), ('E_P', self.E_P),
+                    (None, self.internal_busses), ('E_L', self.E_L)]:
+                for b in bus_list:
+                    if cp not in b.members:
+                        continue
+
+                    if cp_on_num_busses > 0:
+                        msg = (
+                            'The component ' + cp.label + ' is on multiple '
+                            'busses in the exergy analysis. Make sure that no '
+                            'component is connected to more than one of the '
+                            'busses passed to the exergy_analysis method.')
+                        logger.error(msg)
+                        raise hlp.TESPyNetworkError(msg)
+
+                    base = b.members[cp]['base']
+                    busses += [(i, cp, b, base)]
+                    # fuel exergy of the bus for the base bus, product exergy
+                    # of the bus for the base component
+                    sign = 1 if (key == 'E_F') == (base == 'bus') else -1
+                    network_index += [['E_F', 'E_P', 'E_L', None].index(key)]
+                    network_sign += [0 if key is None else sign]
+                    cp_on_num_busses += 1
+
+        members = {}
+        for cp in comps:
+            members.setdefault(cp.fkt_group, []).append(cp)
+
+        # connections between the component groups
+        crossing = {}
+        for fkt_group, group_members in members.items():
+            crossing[fkt_group] = [
+                (conn.target.fkt_group, conn)
+                for cp in group_members for conn in cp.outl
+                if conn.target.fkt_group != fkt_group
+            ]
+
+        self.layout = {
+            'comps': comps,
+            'conns': self.nw.conns['object'].tolist(),
+            'groups': list(groups),
+            'group_index': group_index,
+            'busses': busses,
+            'bus_index': np.array([b[0] for b in busses], dtype=int),
+            'bus_based': np.array([b[3] == 'bus' for b in busses], dtype=bool),
+            'network_index': np.array(network_index, dtype=int),
+            'network_sign': np.array(network_sign, dtype=float),
+            'crossing': crossing,
+            'categories': {}
+        }
 
-            self.evaluate_busses(cp)
+    def categorize(self, conn):
+        """Return the fluid category of a connection from the layout."""
+        categories = self.layout['categories']
+        if conn not in categories:
+            categories[conn] = categorize_fluids(conn)
+        return categories[conn]
 
-        # create a table that includes exergy destruction attributed to the
-        # components
-        bus_based = self.bus_data[self.bus_data['base'] == 'bus'].index
-        component_based = self.bus_data[
-            self.bus_data['base'] == 'component'
-        ].index
+    def evaluate(self, pamb, Tamb, Chem_Ex=None):
+        """Calculate the exergy values of the current state of the network.
 
-        # add aggregated components with respective buses data
-        self.aggregation_data = self.component_data.copy()
-        # E_D is sum of both E_D
-        self.aggregation_data.loc[self.bus_data.index, 'E_D'] = (
-            self.component_data.loc[self.bus_data.index, 'E_D'] +
-            self.bus_data['E_D']
+        Parameters
+        ----------
+        pamb : float
+            Ambient pressure value in Pa.
+
+        Tamb : float
+            Ambient temperature value in K.
+
+        Chem_Ex : dict
+            Lookup table for standard specific chemical exergy.
+        """
+        self.evaluate_connections(pamb, Tamb, Chem_Ex)
+
+        comps = self.layout['comps']
+        self.component_values = np.empty((len(comps), 3))
+        for i, cp in enumerate(comps):
+            cp.exergy_balance(Tamb)
+            self.component_values[i] = [cp.E_F, cp.E_P, cp.E_D]
+
+        self.evaluate_busses()
+
+    def get_dead_state(self, conn, key, pamb, Tamb):
+        """Return the dead state values of a fluid composition.
+
+        The values of the most recently used compositions and ambient states
+        are kept in a cache of limited size
+        (:code:`ExergyAnalysis.dead_state_cache_size`).
+
+        Parameters
+        ----------
+        conn : tespy.connections.connection.Connection
+            Connection with the fluid composition.
+
+        key : tuple
+            Key of the fluid composition, see :py:func:`composition_key`.
+
+        pamb : float
+            Ambient pressure value in Pa.
+
+        Tamb : float
+            Ambient temperature value in K.
+
+        Returns
+        -------
+        dead_state : tuple
+            Specific enthalpy and entropy at the dead state.
+        """
+        cache_key = key, pamb, Tamb
+        dead_state = self.dead_states.get(cache_key)
+        if dead_state is None:
+            dead_state = calc_dead_state(
+                pamb, Tamb, conn.fluid_data, conn.mixing_rule
+            )
+            self.dead_states[cache_key] = dead_state
+            if len(self.dead_states) > self.dead_state_cache_size:
+                self.dead_states.popitem(last=False)
+        else:
+            self.dead_states.move_to_end(cache_key)
+        return dead_state
+
+    def evaluate_connections(self, pamb, Tamb, Chem_Ex=None):
+        """Calculate the exergy values of all connections.
+
+        The enthalpy and entropy at the dead state as well as the specific
+        chemical exergy only depend on the fluid composition. They are
+        calculated once per composition, the dead state values are reused in
+        subsequent analyses with identical ambient state.
+
+        Parameters
+        ----------
+        pamb : float
+            Ambient pressure value in Pa.
+
+        Tamb : float
+            Ambient temperature value in K.
+
+        Chem_Ex : dict
+            Lookup table for standard specific chemical exergy.
+        """
+        conns = self.layout['conns']
+        self.connection_values = np.empty(
+            (len(conns), 6 if Chem_Ex is None else 8)
         )
-        # E_F for bus based components is higher by E_D of bus
-        self.aggregation_data.loc[bus_based, 'E_F'] += (
-            self.bus_data.loc[bus_based, 'E_D']
+        ex_chemical = {}
+        for i, conn in enumerate(conns):
+            key = composition_key(conn)
+            dead_state = self.get_dead_state(conn, key, pamb, Tamb)
+            conn.get_physical_exergy(pamb, Tamb, dead_state)
+            conn.get_chemical_exergy(
+                pamb, Tamb, Chem_Ex, ex_chemical.get(key)
+            )
+            ex_chemical[key] = conn.ex_chemical
+
+            self.connection_values[i, :6] = [
+                conn.ex_physical, conn.ex_therm, conn.ex_mech,
+                conn.Ex_physical, conn.Ex_therm, conn.Ex_mech
+            ]
+            if Chem_Ex is not None:
+                self.connection_values[i, 6:] = [
+                    conn.ex_chemical, conn.Ex_chemical
+                ]
+
+    def evaluate_busses(self):
+        """Evaluate the exergy balances of the components on the busses."""
+        busses = self.layout['busses']
+        self.bus_values = np.empty((len(busses), 3))
+        for j, (_, cp, b, base) in enumerate(busses):
+            # todo: E_bus als dict mit den versch. werten
+            E_bus = sum(e for e in cp.E_bus.values() if e)
+            bus_efficiency = cp.calc_bus_efficiency(b)
+            if base == 'bus':
+                self.bus_values[j] = [
+                    E_bus / bus_efficiency, E_bus, bus_efficiency
+                ]
+            else:
+                self.bus_values[j] = [
+                    E_bus, E_bus * bus_efficiency, bus_efficiency
+                ]
+
+    def calculate_network_values(self):
+        """Calculate the fuel, product, destruction and loss of the network.
+
+        Returns
+        -------
+        network : ndarray
+            Fuel, product, destructed and lost exergy as well as the exergetic
+            efficiency of the network.
+        """
+        layout = self.layout
+        bus_based = layout['bus_based']
+        # fuel exergy of the bus for the base bus, product exergy otherwise
+        value = np.where(
+            bus_based, self.bus_values[:, 0], self.bus_values[:, 1]
+        ) * layout['network_sign']
+        E_F, E_P, E_L, _ = np.bincount(
+            layout['network_index'], weights=value, minlength=4
         )
-        # E_P of component based components is lower by E_D of bus
-        self.aggregation_data.loc[component_based, 'E_P'] -= (
-            self.bus_data.loc[component_based, 'E_D']
+        E_F = abs(E_F)
+        E_P = abs(E_P)
+        E_D = (
+            np.nansum(self.component_values[:, 2]) +
+            np.nansum(self.bus_values[:, 0] - self.bus_values[:, 1])
         )
+        return np.array([E_F, E_P, E_D, E_L, E_P / E_F])
 
-        # calculate network results
-        self.network_data.loc['E_D'] = (
-            self.component_data['E_D'].sum() + self.bus_data['E_D'].sum())
-        self.network_data.loc['E_F'] = abs(self.network_data.loc['E_F'])
-        self.network_data.loc['E_P'] = abs(self.network_data.loc['E_P'])
-        self.network_data.loc['epsilon'] = (
-            self.network_data.loc['E_P'] / self.network_data.loc['E_F']
-        )
+    def aggregate(self):
+        """Allocate the exergy destruction of the busses to the components.
 
-        # calculate exergy destruction ratios for components/busses
-        E_F = self.network_data.loc['E_F']
-        E_D = self.network_data.loc['E_D']
+        Returns
+        -------
+        aggregation : ndarray
+            Fuel, product and destructed exergy of the components including
+            their busses.
+        """
+        aggregation = self.component_values.copy()
+        index = self.layout['bus_index']
+        bus_based = self.layout['bus_based']
+        E_D = self.bus_values[:, 0] - self.bus_values[:, 1]
+        # E_D is sum of both E_D
+        aggregation[index, 2] += E_D
+        # E_F for bus based components is higher by E_D of bus
+        aggregation[index[bus_based], 0] += E_D[bus_based]
+        # E_P of component based components is lower by E_D of bus
+        aggregation[index[~bus_based], 1] -= E_D[~bus_based]
+        return aggregation
 
-        for d in [self.component_data, self.bus_data, self.aggregation_data]:
-            d['y_Dk'] = d['E_D'] / E_F
-            d['y*_Dk'] = d['E_D'] / E_D
-            d['epsilon'] = d['E_P'] / d['E_F']
+    def check_balance(self, network):
+        """Check the exergy balance of the network.
 
-        residual = abs(
-            self.network_data.loc['E_F'] - self.network_data.loc['E_P'] -
-            self.network_data.loc['E_D'] - self.network_data.loc['E_L']
-        )
+        Parameters
+        ----------
+        network : ndarray
+            Fuel, product, destructed and lost exergy of the network.
+        """
+        E_F, E_P, E_D, E_L = network
+        residual = abs(E_F - E_P - E_D - E_L)
 
         if residual >= ERR ** 0.5:
             msg = (
@@ -488,164 +859,162 @@ class ExergyAnalysis:
                 'properly setup for the exergy analysis.')
             logger.error(msg)
 
-        self.create_group_data()
-
-    def evaluate_busses(self, cp):
-        """Evaluate the exergy balances of busses.
+    def create_tables(self, Chem_Ex=None):
+        """Create the result tables of the current operating point.
 
         Parameters
         ----------
-        cp : tespy.components.component.Component
-            Component to analyse the bus exergy balance of.
+        Chem_Ex : dict
+            Lookup table for standard specific chemical exergy.
         """
-        cp_on_num_busses = 0
-        for b in self.E_F + self.E_P + self.internal_busses + self.E_L:
-            if cp in b.comps.index:
-                if cp_on_num_busses > 0:
-                    msg = (
-                        'The component ' + cp.label + ' is on multiple '
-                        'busses in the exergy analysis. Make sure that no '
-                        'component is connected to more than one of the '
-                        'busses passed to the exergy_analysis method.')
-                    logger.error(msg)
-                    raise hlp.TESPyNetworkError(msg)
-                # todo: E_bus als dict mit den versch. werten
-                if b.comps.loc[cp, 'base'] == 'bus':
-                    E_bus = sum(e for e in cp.E_bus.values() if e)
-                    self.bus_data.loc[cp.label, 'E_P'] = E_bus
-                    bus_efficiency = cp.calc_bus_efficiency(b)
-                    E_F = E_bus / bus_efficiency
-                    self.bus_data.loc[cp.label, 'E_F'] = E_F
-
-                    if b in self.E_F:
-                        self.network_data.loc['E_F'] += E_F
-                    elif b in self.E_P:
-                        self.network_data.loc['E_P'] -= E_F
-                    elif b in self.E_L:
-                        self.network_data.loc['E_L'] -= E_F
-
-                    for key, value in cp.E_bus.items():
-                        if value == 0:
-                            continue
-
-                        if key != "massless":
-                            # this should be a source
-                            category = categorize_fluids(cp.outl[0])
-                        else:
-                            category = "work"
-
-                        if (cp.fkt_group, category) not in self.sankey_data[b.label].index:
-                            self.sankey_data[b.label].loc[(cp.fkt_group, category), :] = 0
-
-                        self.sankey_data[b.label].loc[(cp.fkt_group, category), key] += value / bus_efficiency
-                else:
-                    E_bus = sum(e for e in cp.E_bus.values() if e)
-                    bus_efficiency = cp.calc_bus_efficiency(b)
-                    E_P = E_bus * bus_efficiency
-                    self.bus_data.loc[cp.label, 'E_P'] = E_P
-                    self.bus_data.loc[cp.label, 'E_F'] = E_bus
-
-                    if b in self.E_F:
-                        self.network_data.loc['E_F'] -= E_P
-                    elif b in self.E_P:
-                        self.network_data.loc['E_P'] += E_P
-                    elif b in self.E_L:
-                        self.network_data.loc['E_L'] += E_P
+        layout = self.layout
+        columns = ['e_PH', 'e_T', 'e_M', 'E_PH', 'E_T', 'E_M']
+        if Chem_Ex is not None:
+            columns += ['e_CH', 'E_CH']
 
-                    for key, value in cp.E_bus.items():
-                        if value == 0:
-                            continue
+        self.connection_data = pd.DataFrame(
+            self.connection_values, columns=columns,
+            index=[c.label for c in layout['conns']]
+        )
 
-                        if key != "massless":
-                            # this should be a sink
-                            category = categorize_fluids(cp.inl[0])
-                        else:
-                            category = "work"
+        labels = [cp.label for cp in layout['comps']]
+        groups = [cp.fkt_group for cp in layout['comps']]
+        busses = layout['busses']
+        E_F, E_P, E_D, E_L, epsilon = self.calculate_network_values()
 
-                        if (b.label, category) not in self.sankey_data[cp.fkt_group].index:
-                            self.sankey_data[cp.fkt_group].loc[(b.label, category), :] = 0
+        self.network_data = pd.Series({
+            'E_F': E_F, 'E_P': E_P, 'E_D': E_D, 'E_L': E_L,
+            'epsilon': epsilon
+        }, dtype='float64')
 
-                        self.sankey_data[cp.fkt_group].loc[(b.label, category), key] += value * bus_efficiency
+        self.component_data = pd.DataFrame(
+            self.component_values, columns=['E_F', 'E_P', 'E_D'],
+            index=labels
+        )
+        self.component_data['epsilon'] = np.nan
+        self.component_data['group'] = groups
+
+        self.bus_data = pd.DataFrame({
+            'E_F': self.bus_values[:, 0],
+            'E_P': self.bus_values[:, 1],
+            'E_D': self.bus_values[:, 0] - self.bus_values[:, 1],
+            'epsilon': np.nan,
+            'group': [b[1].fkt_group for b in busses],
+            'base': [b[3] for b in busses]
+        }, index=[b[1].label for b in busses])
 
-                self.bus_data.loc[cp.label, 'base'] = b.comps.loc[cp, 'base']
-                self.bus_data.loc[cp.label, 'group'] = cp.fkt_group
+        # create a table that includes exergy destruction attributed to the
+        # components
+        self.aggregation_data = pd.DataFrame(
+            self.aggregate(), columns=['E_F', 'E_P', 'E_D'], index=labels
+        )
+        self.aggregation_data['epsilon'] = np.nan
+        self.aggregation_data['group'] = groups
 
-                cp_on_num_busses += 1
+        # calculate exergy destruction ratios for components/busses
+        for d in [self.component_data, self.bus_data, self.aggregation_data]:
+            d['y_Dk'] = d['E_D'] / E_F
+            d['y*_Dk'] = d['E_D'] / E_D
+            d['epsilon'] = d['E_P'] / d['E_F']
 
-        self.bus_data['E_D'] = self.bus_data['E_F'] - self.bus_data['E_P']
+        self.create_group_data()
 
     def create_group_data(self):
         """Collect the component group exergy data."""
-        for group in self.sankey_data.keys():
-            E_D = self.aggregation_data[
-                self.aggregation_data['group'] == group
-            ]['E_D'].sum()
-            self.sankey_data[group].loc[('E_D', "E_D"), :] = [0., 0., E_D]
+        layout = self.layout
+        sankey = {label: {} for label in self.reserved_fkt_groups}
+        for group in layout['groups']:
+            sankey[group] = {}
+        self.sankey_values = sankey
+
+        # exergy transfer of the components on the busses
+        for j, (_, cp, b, base) in enumerate(layout['busses']):
+            bus_efficiency = self.bus_values[j, 2]
+            for key, value in cp.E_bus.items():
+                if value == 0:
+                    continue
+
+                if base == 'bus':
+                    # this should be a source
+                    if key != "massless":
+                        category = self.categorize(cp.outl[0])
+                    else:
+                        category = "work"
+                    row = sankey[b.label].setdefault(
+                        (cp.fkt_group, category), np.zeros(3)
+                    )
+                    row[self.exergy_cats.index(key)] += value / bus_efficiency
+                else:
+                    # this should be a sink
+                    if key != "massless":
+                        category = self.categorize(cp.inl[0])
+                    else:
+                        category = "work"
+                    row = sankey[cp.fkt_group].setdefault(
+                        (b.label, category), np.zeros(3)
+                    )
+                    row[self.exergy_cats.index(key)] += value * bus_efficiency
+
+        E_D = np.bincount(
+            layout['group_index'],
+            weights=np.nan_to_num(self.aggregation_data['E_D'].values),
+            minlength=len(layout['groups'])
+        )
+        E_D = dict(zip(layout['groups'], E_D))
+        for group, data in sankey.items():
+            data['E_D', 'E_D'] = np.array([0., 0., E_D.get(group, 0.)])
+
         # establish connections for fuel exergy via bus balance
         for b in self.E_F:
             input_value = self.calculate_group_input_value(b.label)
-            self.sankey_data['E_F'].loc[(b.label, "E_F"), self.exergy_cats] = (
-                self.sankey_data[b.label].loc[:, self.exergy_cats].sum()
-                - input_value.sum()
+            sankey['E_F'][b.label, 'E_F'] = (
+                sum(sankey[b.label].values()) - input_value
             )
 
         # establish connections for product exergy via bus balance
         for b in self.E_P:
             input_value = self.calculate_group_input_value(b.label)
-            self.sankey_data[b.label].loc[('E_P', "E_P"), self.exergy_cats] = (
-                input_value.sum()
-                - self.sankey_data[b.label].loc[:, self.exergy_cats].sum()
+            sankey[b.label]['E_P', 'E_P'] = (
+                input_value - sum(sankey[b.label].values())
             )
 
         # establish connections for exergy loss via bus balance
         for b in self.E_L:
             input_value = self.calculate_group_input_value(b.label)
-            self.sankey_data[b.label].loc[('E_L', 'E_L'), self.exergy_cats] = (
-                input_value.sum()
-                - self.sankey_data[b.label].loc[:, self.exergy_cats].sum()
+            sankey[b.label]['E_L', 'E_L'] = (
+                input_value - sum(sankey[b.label].values())
             )
 
-        for fkt_group, data in self.sankey_data.items():
-            mask = self.component_data['group'] == fkt_group
-            comps = self.component_data.loc[mask].index
-            for comp in comps:
-                comp_obj = self.nw.get_comp(comp)
-                sources = self.nw.conns[self.nw.conns['source'] == comp_obj]
-                for conn in sources['object']:
-                    if conn.target.label not in comps:
-                        target_group = self.component_data.loc[conn.target.label, 'group']
-                        target_value_chemical = (
-                            conn.Ex_chemical
-                            if hasattr(conn, "Ex_chemical") else 0.
-                        )
-                        target_value_physical = conn.Ex_physical
-                        cat = categorize_fluids(conn)
-                        if (target_group, cat) in data.index:
-                            self.sankey_data[fkt_group].loc[
-                                (target_group, cat), 'physical'] += target_value_physical
-                            self.sankey_data[fkt_group].loc[
-                                (target_group, cat), 'chemical'] += target_value_chemical
-                        else:
-                            self.sankey_data[fkt_group].loc[(target_group, cat), :] = [
-                                target_value_chemical, target_value_physical, 0
-                            ]
+        # exergy flows between the groups from the network topology
+        for fkt_group, crossing in layout['crossing'].items():
+            data = sankey[fkt_group]
+            for target_group, conn in crossing:
+                target_value_chemical = (
+                    conn.Ex_chemical
+                    if hasattr(conn, "Ex_chemical") else 0.
+                )
+                row = data.setdefault(
+                    (target_group, self.categorize(conn)), np.zeros(3)
+                )
+                row[:2] += [target_value_chemical, conn.Ex_physical]
+
+        self.sankey_data = {
+            group: self._sankey_frame(data) for group, data in sankey.items()
+        }
 
         # create overview of component groups
+        inputs = {}
+        for data in sankey.values():
+            for (target, _), value in data.items():
+                inputs[target] = inputs.get(target, 0.) + value
+
+        groups = layout['groups']
+        E_in = np.array([np.sum(inputs.get(group, 0.)) for group in groups])
+        E_D = np.array([sankey[group]['E_D', 'E_D'].sum() for group in groups])
         self.group_data = pd.DataFrame(
-            columns=['E_in', 'E_out', 'E_D'], dtype='float64'
+            {'E_in': E_in, 'E_out': E_in - E_D, 'E_D': E_D}, index=groups,
+            dtype='float64'
         )
-
-        for fkt_group in self.component_data['group'].unique():
-            self.group_data.loc[fkt_group, 'E_in'] = (
-                self.calculate_group_input_value(fkt_group).sum().sum()
-            )
-            self.group_data.loc[fkt_group, 'E_D'] = (
-                self.sankey_data[fkt_group].loc[idx['E_D', :], self.exergy_cats].sum().sum()
-            )
-
-        # calculate missing values
-        self.group_data['E_out'] = (
-            self.group_data['E_in'] - self.group_data['E_D'])
         self.group_data['y_Dk'] = (
             self.group_data['E_D'] / self.network_data.loc['E_F'])
         self.group_data['y*_Dk'] = (
@@ -656,14 +1025,27 @@ class ExergyAnalysis:
 
         return
 
+    def _sankey_frame(self, data):
+        """Create the sankey table of a component group."""
+        if len(data) > 0:
+            index = pd.MultiIndex.from_tuples(
+                list(data), names=["target_group", "category"]
+            )
+        else:
+            index = pd.MultiIndex(
+                levels=[[], []], names=["target_group", "category"],
+                codes=[[], []]
+            )
+        values = np.array(list(data.values()), dtype=float).reshape(-1, 3)
+        return pd.DataFrame(values, index=index, columns=self.exergy_cats)
+
     def calculate_group_input_value(self, group_label):
         """Calculate the total exergy input of a component group."""
-        value = pd.DataFrame(
-            columns=self.exergy_cats, index=[0], data=[[0., 0., 0.]]
-        )
-        for fkt_group, data in self.sankey_data.items():
-            if group_label in data.index:
-                value += data.loc[idx[group_label, :], self.exergy_cats].values
+        value = np.zeros(3)
+        for data in self.sankey_values.values():
+            for (target, _), row in data.items():
+                if target == group_label:
+                    value += row
         return value
 
     def single_group_input(self, group_label, group_data):
@@ -710,7 +1092,7 @@ class ExergyAnalysis:
 
     def generate_plotly_sankey_input(
             self, node_order=[], colors={}, display_thresold=1e-3,
-            disaggregate_flows=False):
+            disaggregate_flows=False, point=None):
         """Generate input data for sankey plots.
 
         Only exergy flow above the display threshold is included. All
@@ -741,15 +1123,34 @@ class ExergyAnalysis:
             Separate every flow by chemical, physical and massless exergy,
             defaults to False.
 
+        point : object
+            Label of an operating point of the batch analysis, see
+            :py:meth:`tespy.tools.analyses.ExergyAnalysis.analyse_many`. The
+            sankey data of the point must have been requested for the
+            analysis. Defaults to the last single point analysis.
+
         Returns
         -------
         tuple
             Tuple containing the links and node_order for the plotly sankey
             diagram.
         """
-        group_data = self.sankey_data.copy()
+        if point is None:
+            sankey_data = self.sankey_data
+            groups = self.group_data.index.tolist()
+        elif point in self.batch_sankey_data:
+            sankey_data, groups = self.batch_sankey_data[point]
+        else:
+            msg = (
+                'The sankey data of the operating point ' + str(point) + ' '
+                'are not available. Pass the point to the sankey_points of '
+                'the batch analysis.')
+            logger.error(msg)
+            raise KeyError(msg)
+
+        group_data = sankey_data.copy()
         cols = self.exergy_cats
-        for fkt_group, data in self.sankey_data.items():
+        for fkt_group, data in sankey_data.items():
             mask = data.loc[:, cols].abs().sum(axis=1) >= display_thresold
             group_data[fkt_group] = group_data[fkt_group].loc[mask]
 
@@ -758,7 +1159,7 @@ class ExergyAnalysis:
         if len(node_order) == 0:
             node_order = (
                 ['E_F'] + [b.label for b in self.E_F] +
-                [fkt_group for fkt_group in self.group_data.index] +
+                groups +
                 [b.label for b in self.internal_busses + self.E_P + self.E_L] +
                 ['E_P', 'E_L', 'E_D']
             )
@@ -0,0 +1,347 @@
+# -*- coding: utf-8
+
+"""Module for forward mode automatic differentiation.
+
+The :py:class:`Dual` number carries the value of an expression together with
+its gradient to a set of seeded variables. Equations evaluated with dual
+numbers in place of the variables' values therefore return their residual
+value and all partial derivatives from a single evaluation. The fluid property
+functions accept dual numbers through the :py:func:`differentiable` decorator,
+which applies the partial derivatives provided by the fluid property back end
+(or central differences, if not available) to the chain rule.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location tespy/tools/autodiff.py
+
+SPDX-License-Identifier: MIT
+"""
+
+from functools import wraps
+
+import numpy as np
+
+
+class Dual:
+    r"""
+    Dual number with the value and gradient of an expression.
+
+    Parameters
+    ----------
+    val : float
+        Value of the expression.
+
+    der : ndarray
+        Partial derivatives of the expression to the seeded variables.
+
+    Note
+    ----
+    Comparisons are evaluated on the value only. The NumPy functions
+    :code:`np.sqrt`, :code:`np.exp`, :code:`np.log`, :code:`np.abs` and the
+    arithmetic operators are supported, the functions of the :code:`math`
+    module convert the number to float and therefore drop the gradient.
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> from tespy.tools.autodiff import Dual
+    >>> x = Dual(2.0, np.array([1.0, 0.0]))
+    >>> y = Dual(3.0, np.array([0.0, 1.0]))
+    >>> z = x ** 2 * y + np.log(y)
+    >>> round(z.val, 4)
+    13.0986
+    >>> [round(d, 4) for d in z.der]
+    [12.0, 4.3333]
+    """
+
+    __slots__ = ("val", "der")
+
+    def __init__(self, val, der):
+        self.val = val
+        self.der = der
+
+    def __repr__(self):
+        return f"Dual({self.val}, {self.der})"
+
+    def __float__(self):
+        return float(self.val)
+
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.val + other.val, self.der + other.der)
+        return Dual(self.val + other, self.der)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.val - other.val, self.der - other.der)
+        return Dual(self.val - other, self.der)
+
+    def __rsub__(self, other):
+        return Dual(other - self.val, -self.der)
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            return Dual(
+                self.val * other.val,
+                self.der * other.val + other.der * self.val
+            )
+        return Dual(self.val * other, self.der * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            return Dual(
+                self.val / other.val,
+                (self.der * other.val - other.der * self.val) / other.val ** 2
+            )
+        return Dual(self.val / other, self.der / other)
+
+    def __rtruediv__(self, other):
+        return Dual(other / self.val, -self.der * other / self.val ** 2)
+
+    def __pow__(self, other):
+        if isinstance(other, Dual):
+            val = self.val ** other.val
+            return Dual(
+                val,
+                val * (
+                    other.der * np.log(self.val)
+                    + other.val * self.der / self.val
+                )
+            )
+        return Dual(
+            self.val ** other, other * self.val ** (other - 1) * self.der
+        )
+
+    def __rpow__(self, other):
+        val = other ** self.val
+        return Dual(val, val * np.log(other) * self.der)
+
+    def __neg__(self):
+        return Dual(-self.val, -self.der)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Dual(abs(self.val), np.sign(self.val) * self.der)
+
+    def __eq__(self, other):
+        return self.val == _value(other)
+
+    def __ne__(self, other):
+        return self.val != _value(other)
+
+    def __lt__(self, other):
+        return self.val < _value(other)
+
+    def __le__(self, other):
+        return self.val <= _value(other)
+
+    def __gt__(self, other):
+        return self.val > _value(other)
+
+    def __ge__(self, other):
+        return self.val >= _value(other)
+
+    __hash__ = None
+
+    def sqrt(self):
+        val = np.sqrt(self.val)
+        return Dual(val, self.der / (2 * val))
+
+    def exp(self):
+        val = np.exp(self.val)
+        return Dual(val, val * self.der)
+
+    def log(self):
+        return Dual(np.log(self.val), self.der / self.val)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs or ufunc not in _UFUNCS:
+            return NotImplemented
+        # numpy scalars would dispatch the operators back to the ufunc
+        inputs = [x if isinstance(x, Dual) else float(x) for x in inputs]
+        return _UFUNCS[ufunc](*inputs)
+
+
+_UFUNCS = {
+    np.add: lambda x, y: x + y,
+    np.subtract: lambda x, y: x - y,
+    np.multiply: lambda x, y: x * y,
+    np.true_divide: lambda x, y: x / y,
+    np.power: lambda x, y: x ** y,
+    np.negative: lambda x: -x,
+    np.absolute: abs,
+    np.sqrt: lambda x: x.sqrt(),
+    np.exp: lambda x: x.exp(),
+    np.log: lambda x: x.log(),
+    np.isnan: lambda x: np.isnan(_value(x)),
+    np.less: lambda x, y: x < y,
+    np.less_equal: lambda x, y: x <= y,
+    np.greater: lambda x, y: x > y,
+    np.greater_equal: lambda x, y: x >= y,
+}
+
+
+def _value(x):
+    if isinstance(x, Dual):
+        return x.val
+    return x
+
+
+def differentiable(*steps):
+    r"""
+    Make a fluid property function accept dual numbers.
+
+    Parameters
+    ----------
+    steps : float
+        Step width for the central difference of every leading positional
+        argument, which may be a dual number. The central differences are
+        applied in case no partial derivatives are registered for the
+        function.
+
+    Returns
+    -------
+    decorator : function
+        Decorator for the fluid property function.
+
+    Note
+    ----
+    The decorated function evaluates with floats in case one of its leading
+    arguments is a dual number and applies the chain rule to the partial
+    derivatives. The function calculating the partial derivatives to all
+    leading arguments is registered with the :code:`partials` decorator of
+    the decorated function. It takes the arguments of the function and
+    returns a tuple of partial derivatives, where :code:`None` entries are
+    replaced by central differences.
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> from tespy.tools.autodiff import Dual, differentiable
+    >>> @differentiable(1e-3, 1e-3)
+    ... def f(x, y, factor=1):
+    ...     return factor * x * y ** 2
+    >>> x = Dual(2.0, np.array([1.0]))
+    >>> round(f(x, 3.0, factor=2).der[0], 4)
+    18.0
+    >>> @f.partials
+    ... def f_partials(x, y, factor=1):
+    ...     return factor * y ** 2, None
+    >>> round(f(x, x).der[0], 4)
+    12.0
+    """
+    num_args = len(steps)
+
+    def decorator(function):
+        registry = {"partials": None}
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            for arg in args[:num_args]:
+                if isinstance(arg, Dual):
+                    return _evaluate(function, registry["partials"], steps,
+                                     args, kwargs)
+            return function(*args, **kwargs)
+
+        def partials(deriv):
+            registry["partials"] = deriv
+            return deriv
+
+        wrapper.partials = partials
+        return wrapper
+
+    return decorator
+
+
+def _evaluate(function, partials, steps, args, kwargs):
+    values = [_value(arg) for arg in args]
+    kwargs = {key: _value(value) for key, value in kwargs.items()}
+    val = function(*values, **kwargs)
+
+    if partials is None:
+        deriv = [None] * len(steps)
+    else:
+        deriv = list(partials(*values, **kwargs))
+
+    gradient = 0
+    for i, (arg, d) in enumerate(zip(args, steps)):
+        if not isinstance(arg, Dual):
+            continue
+        if deriv[i] is None:
+            upper = list(values)
+            lower = list(values)
+            upper[i] += d
+            lower[i] -= d
+            deriv[i] = (
+                function(*upper, **kwargs) - function(*lower, **kwargs)
+            ) / (2 * d)
+        gradient = gradient + deriv[i] * arg.der
+
+    return Dual(val, gradient)
+
+
+def evaluate(func, variables, **kwargs):
+    r"""
+    Evaluate a function and its partial derivatives to the variables.
+
+    Parameters
+    ----------
+    func : function
+        Function to evaluate, returning a single value or a list of values.
+
+    variables : list
+        List of tuples of an object and the name of the object's attribute
+        holding the variable's value, e.g. :code:`(c.p, "val_SI")`.
+
+    Returns
+    -------
+    result : tuple
+        Values of the function (ndarray of shape :code:`(num_eq,)`) and the
+        partial derivatives (ndarray of shape :code:`(num_eq, num_vars)`).
+
+    Example
+    -------
+    >>> from tespy.tools.autodiff import evaluate
+    >>> from tespy.tools.data_containers import FluidProperties as dc_prop
+    >>> m, h = dc_prop(val_SI=2.0), dc_prop(val_SI=5.0)
+    >>> val, deriv = evaluate(
+    ...     lambda: [m.val_SI * h.val_SI, h.val_SI - 3],
+    ...     [(m, "val_SI"), (h, "val_SI")]
+    ... )
+    >>> val.tolist(), deriv.tolist()
+    ([10.0, 2.0], [[5.0, 2.0], [0.0, 1.0]])
+    >>> m.val_SI
+    2.0
+    """
+    num_vars = len(variables)
+    values = [getattr(obj, attr) for obj, attr in variables]
+    try:
+        for i, ((obj, attr), val) in enumerate(zip(variables, values)):
+            der = np.zeros(num_vars)
+            der[i] = 1
+            setattr(obj, attr, Dual(val, der))
+        result = func(**kwargs)
+    finally:
+        for (obj, attr), val in zip(variables, values):
+            setattr(obj, attr, val)
+
+    if isinstance(result, (list, tuple, np.ndarray)):
+        result = list(result)
+    else:
+        result = [result]
+
+    val = np.empty(len(result))
+    deriv = np.zeros((len(result), num_vars))
+    for i, x in enumerate(result):
+        if isinstance(x, Dual):
+            val[i] = x.val
+            deriv[i] = x.der
+        else:
+            val[i] = x
+    return val, deriv
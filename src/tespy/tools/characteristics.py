@@ -123,6 +123,48 @@ class CharLine:
         yfrac = (x - self.x[xpos - 1]) / (self.x[xpos] - self.x[xpos - 1])
         return self.y[xpos - 1] + yfrac * (self.y[xpos] - self.y[xpos - 1])
 
+    def evaluate_deriv(self, x):
+        r"""
+        Return the derivative of the characteristic line at x.
+
+        Parameters
+        ----------
+        x : float
+            Input value for linear interpolation.
+
+        Returns
+        -------
+        dy : float
+            Slope of the characteristic line segment used for the evaluation
+            at x.
+
+        Note
+        ----
+        Outside of the specified range the slope is zero if :code:`extrapolate`
+        is :code:`False`. At the x-values of the lookup table the slope of the
+        lower adjacent segment is returned.
+
+        .. math::
+
+            \frac{dy}{dx} = \frac{y_1-y_0}{x_1-x_0}
+        """
+        xpos = np.searchsorted(self.x, x)
+        if xpos == len(self.x):
+            if self.extrapolate:
+                xpos = -1
+            else:
+                return 0
+        elif xpos == 0:
+            if self.extrapolate:
+                xpos = 1
+            else:
+                return 0
+
+        return (
+            (self.y[xpos] - self.y[xpos - 1])
+            / (self.x[xpos] - self.x[xpos - 1])
+        )
+
     def get_domain_errors(self, x, c):
         r"""
         Prompt error messages, if x value is out of bounds.
@@ -196,7 +196,8 @@ class ComponentCharacteristics(DataContainer):
             'char_func': None, 'is_set': False, 'param': None,
             'func_params': {}, 'func': None, 'deriv': None, 'latex': None,
             'char_params': {'type': 'rel', 'inconn': 0, 'outconn': 0},
-            'num_eq': 0
+            'num_eq': 0, 'autodiff': False,
+            'constant_deriv': False
         }
 
     def _serialize(self):
@@ -241,7 +242,8 @@ class ComponentCharacteristicMaps(DataContainer):
         return {
             'char_func': None, 'is_set': False, 'param': None, 'latex': None,
             'func_params': {}, 'func': None, 'deriv': None,
-            'num_eq': 0
+            'num_eq': 0, 'autodiff': False,
+            'constant_deriv': False
         }
 
     def _serialize(self):
@@ -284,6 +286,18 @@ class ComponentProperties(DataContainer):
     max_val : float
         Maximum value for this attribute, used if attribute is part of the
         system variables, default: max_val=1e12.
+
+    autodiff : boolean
+        Calculate the partial derivatives of the equation of this attribute
+        with automatic differentiation, see
+        :py:meth:`tespy.components.component.Component.autodiff`,
+        default: autodiff=False.
+
+    constant_deriv : boolean
+        Are the partial derivatives of the equation of this attribute
+        independent of the values of the variables? In this case they are
+        calculated only once per simulation, if the attribute itself is not a
+        variable, default: constant_deriv=False.
     """
 
     @staticmethod
@@ -302,7 +316,8 @@ class ComponentProperties(DataContainer):
             'min_val': -1e12, 'max_val': 1e12, 'is_var': False,
             'design': np.nan, 'is_result': False,
             'num_eq': 0, 'func_params': {}, 'func': None, 'deriv': None,
-            'latex': None
+            'latex': None, 'autodiff': False,
+            'constant_deriv': False
         }
 
     def _serialize(self):
@@ -405,7 +420,8 @@ class GroupedComponentProperties(DataContainer):
         return {
             'is_set': False, 'elements': [],
             'func': None, 'deriv': None, 'num_eq': 0, 'latex': None,
-            'func_params': {}
+            'func_params': {}, 'autodiff': False,
+            'constant_deriv': False
         }
 
 
@@ -438,7 +454,8 @@ class GroupedComponentCharacteristics(DataContainer):
         """
         return {
             'is_set': False, 'elements': [], 'func': None, 'deriv': None,
-            'num_eq': 0, 'latex': None, 'func_params': {}
+            'num_eq': 0, 'latex': None, 'func_params': {}, 'autodiff': False,
+            'constant_deriv': False
         }
 
 
@@ -496,6 +513,7 @@ class FluidProperties(DataContainer):
             "num_eq": 0,
             "J_col": None,
             "func_params": {},
+            "autodiff": False,
             "_solved": False
         }
 
@@ -525,6 +543,8 @@ class ReferencedFluidProperties(DataContainer):
             "deriv": None,
             "num_eq": 0,
             "func_params": {},
+            "autodiff": False,
+            "constant_deriv": False,
             "_solved": False
         }
 
@@ -572,6 +592,8 @@ class SimpleDataContainer(DataContainer):
             "deriv": None,
             "latex": None,
             "num_eq": 0,
+            "autodiff": False,
+            "constant_deriv": False,
             "_solved": False
         }
 
@@ -11,30 +11,132 @@ tespy/tools/fluid_properties/functions.py
 SPDX-License-Identifier: MIT
 """
 
+import numpy as np
+
+from tespy.tools.autodiff import differentiable
+
 from .helpers import _check_mixing_rule
 from .helpers import get_number_of_fluids
 from .helpers import get_pure_fluid
+from .helpers import get_saturation_engine
 from .helpers import inverse_temperature_mixture
 from .mixtures import EXERGY_CHEMICAL
 from .mixtures import H_MIX_PT_DIRECT
 from .mixtures import S_MIX_PT_DIRECT
 from .mixtures import T_MIX_PH_REVERSE
+from .mixtures import T_MIX_PH_REVERSE_DERIVATIVE
 from .mixtures import T_MIX_PS_REVERSE
+from .mixtures import T_MIX_PS_REVERSE_DERIVATIVE
 from .mixtures import V_MIX_PT_DIRECT
 from .mixtures import VISCOSITY_MIX_PT_DIRECT
 
 
+@differentiable(1e-1, 1e-1, 1e-1)
 def isentropic(p_1, h_1, p_2, fluid_data, mixing_rule=None, T0=None):
     if get_number_of_fluids(fluid_data) == 1:
         pure_fluid = get_pure_fluid(fluid_data)
         return pure_fluid["wrapper"].isentropic(p_1, h_1, p_2)
     else:
-        s_1 = s_mix_ph(p_1, h_1, fluid_data, mixing_rule)
-        T_2 = T_mix_ps(p_2, s_1, fluid_data, mixing_rule)
+        s_1 = s_mix_ph(p_1, h_1, fluid_data, mixing_rule, T0=T0)
+        T_2 = T_mix_ps(p_2, s_1, fluid_data, mixing_rule, T0=T0)
         return h_mix_pT(p_2, T_2, fluid_data, mixing_rule)
 
 
-def calc_physical_exergy(h, s, p, pamb, Tamb, fluid_data, mixing_rule=None, T0=None):
+def isentropic_deriv(p_1, h_1, p_2, fluid_data, mixing_rule=None, T0=None):
+    r"""
+    Calculate the isentropic outlet enthalpy and its partial derivatives.
+
+    Parameters
+    ----------
+    p_1 : float
+        Inlet pressure in Pa.
+
+    h_1 : float
+        Inlet enthalpy in J/kg.
+
+    p_2 : float
+        Outlet pressure in Pa.
+
+    fluid_data : dict
+        Fluid composition and wrappers.
+
+    mixing_rule : str
+        Mixing rule for the mixtures.
+
+    T0 : float
+        Starting value for temperature inversion of mixtures.
+
+    Returns
+    -------
+    deriv : tuple
+        Isentropic outlet enthalpy and its partial derivatives to inlet
+        pressure, inlet enthalpy and outlet pressure.
+
+        .. math::
+
+            \frac{\partial h_{2,s}}{\partial p_1} =
+            -\frac{T_{2,s} \cdot v_1}{T_1}\qquad
+            \frac{\partial h_{2,s}}{\partial h_1} = \frac{T_{2,s}}{T_1}\qquad
+            \frac{\partial h_{2,s}}{\partial p_2} = v_{2,s}
+
+    Note
+    ----
+    The partial derivatives of mixtures are calculated numerically.
+    """
+    if get_number_of_fluids(fluid_data) == 1:
+        pure_fluid = get_pure_fluid(fluid_data)
+        try:
+            return pure_fluid["wrapper"].isentropic_deriv(p_1, h_1, p_2)
+        except NotImplementedError:
+            pass
+
+    h_2 = isentropic(p_1, h_1, p_2, fluid_data, mixing_rule, T0)
+    d = 1e-1
+    deriv = [h_2]
+    for dx in [(d, 0, 0), (0, d, 0), (0, 0, d)]:
+        upper = isentropic(
+            p_1 + dx[0], h_1 + dx[1], p_2 + dx[2],
+            fluid_data, mixing_rule, T0
+        )
+        lower = isentropic(
+            p_1 - dx[0], h_1 - dx[1], p_2 - dx[2],
+            fluid_data, mixing_rule, T0
+        )
+        deriv += [(upper - lower) / (2 * d)]
+    return tuple(deriv)
+
+
+@isentropic.partials
+def _isentropic_partials(p_1, h_1, p_2, fluid_data, mixing_rule=None, T0=None):
+    return isentropic_deriv(p_1, h_1, p_2, fluid_data, mixing_rule, T0)[1:]
+
+
+def calc_dead_state(pamb, Tamb, fluid_data, mixing_rule=None):
+    r"""
+    Calculate specific enthalpy and entropy at the dead state.
+
+    Parameters
+    ----------
+    pamb : float
+        Ambient pressure p0 / Pa.
+
+    Tamb : float
+        Ambient temperature T0 / K.
+
+    Returns
+    -------
+    dead_state : tuple
+        Specific enthalpy and entropy
+        (:math:`h\left(p_0,T_0\right)`, :math:`s\left(p_0,T_0\right)`).
+    """
+    h0 = h_mix_pT(pamb, Tamb, fluid_data, mixing_rule)
+    s0 = s_mix_pT(pamb, Tamb, fluid_data, mixing_rule)
+    return h0, s0
+
+
+def calc_physical_exergy(
+        h, s, p, pamb, Tamb, fluid_data, mixing_rule=None, T0=None,
+        dead_state=None):
     r"""
     Calculate specific physical exergy.
 
@@ -49,6 +151,10 @@ def calc_physical_exergy(h, s, p, pamb, Tamb, fluid_data, mixing_rule=None, T0=N
     Tamb : float
         Ambient temperature T0 / K.
 
+    dead_state : tuple
+        Specific enthalpy and entropy at the dead state, see
+        :py:func:`calc_dead_state`. Calculated if not provided.
+
     Returns
     -------
     e_ph : tuple
@@ -68,8 +174,9 @@ def calc_physical_exergy(h, s, p, pamb, Tamb, fluid_data, mixing_rule=None, T0=N
     h_T0_p = h_mix_pT(p, Tamb, fluid_data, mixing_rule)
     s_T0_p = s_mix_pT(p, Tamb, fluid_data, mixing_rule)
     ex_therm = (h - h_T0_p) - Tamb * (s - s_T0_p)
-    h0 = h_mix_pT(pamb, Tamb, fluid_data, mixing_rule)
-    s0 = s_mix_pT(pamb, Tamb, fluid_data, mixing_rule)
+    if dead_state is None:
+        dead_state = calc_dead_state(pamb, Tamb, fluid_data, mixing_rule)
+    h0, s0 = dead_state
     ex_mech = (h_T0_p - h0) - Tamb * (s_T0_p - s0)
     return ex_therm, ex_mech
 
@@ -85,6 +192,7 @@ def calc_chemical_exergy(pamb, Tamb, fluid_data, Chem_Ex, mixing_rule=None, T0=N
         return EXERGY_CHEMICAL[mixing_rule](pamb, Tamb, fluid_data, Chem_Ex)
 
 
+@differentiable(1e-1, 1e-1)
 def T_mix_ph(p, h, fluid_data, mixing_rule=None, T0=None):
     if get_number_of_fluids(fluid_data) == 1:
         pure_fluid = get_pure_fluid(fluid_data)
@@ -93,11 +201,53 @@ def T_mix_ph(p, h, fluid_data, mixing_rule=None, T0=None):
         _check_mixing_rule(mixing_rule, T_MIX_PH_REVERSE, "temperature (from enthalpy)")
         kwargs = {
             "p": p, "target_value": h, "fluid_data": fluid_data, "T0": T0,
-            "f": T_MIX_PH_REVERSE[mixing_rule]
+            "f": T_MIX_PH_REVERSE[mixing_rule],
+            "df": T_MIX_PH_REVERSE_DERIVATIVE[mixing_rule]
         }
         return inverse_temperature_mixture(**kwargs)
 
 
+def T_mix_ph_array(p, h, fluid_data, mixing_rule=None, T0=None):
+    r"""
+    Calculate the temperatures of an array of states with one composition.
+
+    The wrapper of a pure fluid is called once for all states, for mixtures
+    the temperature of every state is the starting value for the next state.
+
+    Parameters
+    ----------
+    p : float, ndarray
+        Pressure values in Pa.
+
+    h : ndarray
+        Enthalpy values in J/kg.
+
+    fluid_data : dict
+        Fluid composition and wrappers.
+
+    mixing_rule : str
+        Mixing rule for the mixtures.
+
+    T0 : float
+        Starting value for the first state.
+
+    Returns
+    -------
+    T : ndarray
+        Temperature values in K.
+    """
+    p, h = np.broadcast_arrays(np.asarray(p, dtype=float), h)
+    if get_number_of_fluids(fluid_data) == 1:
+        pure_fluid = get_pure_fluid(fluid_data)
+        return np.asarray(pure_fluid["wrapper"].T_ph_array(p, h), dtype=float)
+
+    T = np.empty(h.shape)
+    for i, (p_i, h_i) in enumerate(zip(p, h)):
+        T[i] = T_mix_ph(p_i, h_i, fluid_data, mixing_rule, T0=T0)
+        T0 = T[i]
+    return T
+
+
 def dT_mix_pdh(p, h, fluid_data, mixing_rule=None, T0=None):
     d = 1e-1
     upper = T_mix_ph(p, h + d, fluid_data, mixing_rule=mixing_rule, T0=T0)
@@ -112,6 +262,21 @@ def dT_mix_dph(p, h, fluid_data, mixing_rule=None, T0=None):
     return (upper - lower) / (2 * d)
 
 
+@T_mix_ph.partials
+def _T_mix_ph_partials(p, h, fluid_data, mixing_rule=None, T0=None):
+    if get_number_of_fluids(fluid_data) == 1:
+        pure_fluid = get_pure_fluid(fluid_data)
+        try:
+            return pure_fluid["wrapper"].T_ph_deriv(p, h)
+        except NotImplementedError:
+            pass
+
+    return (
+        dT_mix_dph(p, h, fluid_data, mixing_rule, T0),
+        dT_mix_pdh(p, h, fluid_data, mixing_rule, T0)
+    )
+
+
 def dT_mix_ph_dfluid(p, h, fluid, fluid_data, mixing_rule=None, T0=None):
     d = 1e-5
     fluid_data[fluid]["mass_fraction"] += d
@@ -122,6 +287,7 @@ def dT_mix_ph_dfluid(p, h, fluid, fluid_data, mixing_rule=None, T0=None):
     return (upper - lower) / (2 * d)
 
 
+@differentiable(1e-1, 1e-3)
 def h_mix_pT(p, T, fluid_data, mixing_rule=None):
     if get_number_of_fluids(fluid_data) == 1:
         pure_fluid = get_pure_fluid(fluid_data)
@@ -131,22 +297,41 @@ def h_mix_pT(p, T, fluid_data, mixing_rule=None):
         return H_MIX_PT_DIRECT[mixing_rule](p, T, fluid_data)
 
 
+@differentiable(1e-1, 1e-4)
 def h_mix_pQ(p, Q, fluid_data, mixing_rule=None):
     if get_number_of_fluids(fluid_data) == 1:
         pure_fluid = get_pure_fluid(fluid_data)
-        return pure_fluid["wrapper"].h_pQ(p, Q)
+        return get_saturation_engine(pure_fluid["wrapper"]).h_pQ(p, Q)
     else:
         msg = "Saturation function cannot be called on mixtures."
         raise ValueError(msg)
 
 
 def dh_mix_dpQ(p, Q, fluid_data, mixing_rule=None):
+    if get_number_of_fluids(fluid_data) == 1:
+        pure_fluid = get_pure_fluid(fluid_data)
+        cache = pure_fluid["wrapper"]._saturation_cache
+        if cache is not None:
+            dh = cache.dh_pQ_dp(p, Q)
+            if dh is not None:
+                return dh
+
     d = 0.1
     upper = h_mix_pQ(p + d, Q, fluid_data)
     lower = h_mix_pQ(p - d, Q, fluid_data)
     return (upper - lower) / (2 * d)
 
 
+@h_mix_pQ.partials
+def _h_mix_pQ_partials(p, Q, fluid_data, mixing_rule=None):
+    # the enthalpy is linear in the vapor mass fraction
+    return (
+        dh_mix_dpQ(p, Q, fluid_data),
+        h_mix_pQ(p, 1, fluid_data) - h_mix_pQ(p, 0, fluid_data)
+    )
+
+
+@differentiable(1e-1, 1e-1)
 def Q_mix_ph(p, h, fluid_data, mixing_rule=None):
     if get_number_of_fluids(fluid_data) == 1:
         pure_fluid = get_pure_fluid(fluid_data)
@@ -156,31 +341,47 @@ def Q_mix_ph(p, h, fluid_data, mixing_rule=None):
         raise ValueError(msg)
 
 
+@differentiable(1e-3)
 def p_sat_T(T, fluid_data, mixing_rule=None):
     if get_number_of_fluids(fluid_data) == 1:
         pure_fluid = get_pure_fluid(fluid_data)
-        return pure_fluid["wrapper"].p_sat(T)
+        return get_saturation_engine(pure_fluid["wrapper"]).p_sat(T)
     else:
         msg = "Saturation function cannot be called on mixtures."
         raise ValueError(msg)
 
 
+@differentiable(1e-2)
 def T_sat_p(p, fluid_data, mixing_rule=None):
     if get_number_of_fluids(fluid_data) == 1:
         pure_fluid = get_pure_fluid(fluid_data)
-        return pure_fluid["wrapper"].T_sat(p)
+        return get_saturation_engine(pure_fluid["wrapper"]).T_sat(p)
     else:
         msg = "Saturation function cannot be called on mixtures."
         raise ValueError(msg)
 
 
 def dT_sat_dp(p, fluid_data, mixing_rule=None):
+    if get_number_of_fluids(fluid_data) == 1:
+        pure_fluid = get_pure_fluid(fluid_data)
+        cache = pure_fluid["wrapper"]._saturation_cache
+        if cache is not None:
+            dT = cache.dT_sat_dp(p)
+            if dT is not None:
+                return dT
+
     d = 0.01
     upper = T_sat_p(p + d, fluid_data)
     lower = T_sat_p(p - d, fluid_data)
     return (upper - lower) / (2 * d)
 
 
+@T_sat_p.partials
+def _T_sat_p_partials(p, fluid_data, mixing_rule=None):
+    return (dT_sat_dp(p, fluid_data),)
+
+
+@differentiable(1e-1, 1e-1)
 def s_mix_ph(p, h, fluid_data, mixing_rule=None, T0=None):
     if get_number_of_fluids(fluid_data) == 1:
         pure_fluid = get_pure_fluid(fluid_data)
@@ -191,6 +392,7 @@ def s_mix_ph(p, h, fluid_data, mixing_rule=None, T0=None):
 
 
 
+@differentiable(1e-1, 1e-3)
 def s_mix_pT(p, T, fluid_data, mixing_rule=None):
     if get_number_of_fluids(fluid_data) == 1:
         pure_fluid = get_pure_fluid(fluid_data)
@@ -200,6 +402,7 @@ def s_mix_pT(p, T, fluid_data, mixing_rule=None):
         return S_MIX_PT_DIRECT[mixing_rule](p, T, fluid_data)
 
 
+@differentiable(1e-1, 1e-3)
 def T_mix_ps(p, s, fluid_data, mixing_rule=None, T0=None):
     if get_number_of_fluids(fluid_data) == 1:
         pure_fluid = get_pure_fluid(fluid_data)
@@ -208,11 +411,13 @@ def T_mix_ps(p, s, fluid_data, mixing_rule=None, T0=None):
         _check_mixing_rule(mixing_rule, T_MIX_PS_REVERSE, "temperature (from entropy)")
         kwargs = {
             "p": p, "target_value": s, "fluid_data": fluid_data, "T0": T0,
-            "f": T_MIX_PS_REVERSE[mixing_rule]
+            "f": T_MIX_PS_REVERSE[mixing_rule],
+            "df": T_MIX_PS_REVERSE_DERIVATIVE[mixing_rule]
         }
         return inverse_temperature_mixture(**kwargs)
 
 
+@differentiable(1e-1, 1e-1)
 def v_mix_ph(p, h, fluid_data, mixing_rule=None, T0=None):
     if get_number_of_fluids(fluid_data) == 1:
         pure_fluid = get_pure_fluid(fluid_data)
@@ -225,17 +430,41 @@ def v_mix_ph(p, h, fluid_data, mixing_rule=None, T0=None):
 def dv_mix_dph(p, h, fluid_data, mixing_rule=None, T0=None):
     d = 1e-1
     upper = v_mix_ph(p + d, h, fluid_data, mixing_rule=mixing_rule, T0=T0)
-    lower = v_mix_ph(p - d, h, fluid_data, mixing_rule=mixing_rule, T0=upper)
+    lower = v_mix_ph(p - d, h, fluid_data, mixing_rule=mixing_rule, T0=T0)
     return (upper - lower) / (2 * d)
 
 
 def dv_mix_pdh(p, h, fluid_data, mixing_rule=None, T0=None):
     d = 1e-1
     upper = v_mix_ph(p, h + d, fluid_data, mixing_rule=mixing_rule, T0=T0)
-    lower = v_mix_ph(p, h - d, fluid_data, mixing_rule=mixing_rule, T0=upper)
+    lower = v_mix_ph(p, h - d, fluid_data, mixing_rule=mixing_rule, T0=T0)
     return (upper - lower) / (2 * d)
 
 
+@v_mix_ph.partials
+def _v_mix_ph_partials(p, h, fluid_data, mixing_rule=None, T0=None):
+    if get_number_of_fluids(fluid_data) == 1:
+        pure_fluid = get_pure_fluid(fluid_data)
+        try:
+            return pure_fluid["wrapper"].v_ph_deriv(p, h)
+        except NotImplementedError:
+            pass
+
+    return (
+        dv_mix_dph(p, h, fluid_data, mixing_rule, T0),
+        dv_mix_pdh(p, h, fluid_data, mixing_rule, T0)
+    )
+
+
+@s_mix_ph.partials
+def _s_mix_ph_partials(p, h, fluid_data, mixing_rule=None, T0=None):
+    # fundamental relation: T ds = dh - v dp
+    T = T_mix_ph(p, h, fluid_data, mixing_rule, T0)
+    v = v_mix_ph(p, h, fluid_data, mixing_rule, T)
+    return -v / T, 1 / T
+
+
+@differentiable(1e-1, 1e-3)
 def v_mix_pT(p, T, fluid_data, mixing_rule=None):
     if get_number_of_fluids(fluid_data) == 1:
         pure_fluid = get_pure_fluid(fluid_data)
@@ -245,6 +474,7 @@ def v_mix_pT(p, T, fluid_data, mixing_rule=None):
         return V_MIX_PT_DIRECT[mixing_rule](p, T, fluid_data)
 
 
+@differentiable(1e-1, 1e-1)
 def viscosity_mix_ph(p, h, fluid_data, mixing_rule=None, T0=None):
     if get_number_of_fluids(fluid_data) == 1:
         pure_fluid = get_pure_fluid(fluid_data)
@@ -254,6 +484,21 @@ def viscosity_mix_ph(p, h, fluid_data, mixing_rule=None, T0=None):
         return viscosity_mix_pT(p, T, fluid_data, mixing_rule)
 
 
+def dviscosity_mix_dph(p, h, fluid_data, mixing_rule=None, T0=None):
+    d = 1e-1
+    upper = viscosity_mix_ph(p + d, h, fluid_data, mixing_rule, T0)
+    lower = viscosity_mix_ph(p - d, h, fluid_data, mixing_rule, T0)
+    return (upper - lower) / (2 * d)
+
+
+def dviscosity_mix_pdh(p, h, fluid_data, mixing_rule=None, T0=None):
+    d = 1e-1
+    upper = viscosity_mix_ph(p, h + d, fluid_data, mixing_rule, T0)
+    lower = viscosity_mix_ph(p, h - d, fluid_data, mixing_rule, T0)
+    return (upper - lower) / (2 * d)
+
+
+@differentiable(1e-1, 1e-3)
 def viscosity_mix_pT(p, T, fluid_data, mixing_rule=None):
     if get_number_of_fluids(fluid_data) == 1:
         pure_fluid = get_pure_fluid(fluid_data)
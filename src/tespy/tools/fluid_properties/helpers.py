@@ -16,9 +16,13 @@ import numpy as np
 
 from tespy.tools.global_vars import ERR
 from tespy.tools.helpers import central_difference
+from tespy.tools.helpers import newton_brent
 from tespy.tools.helpers import newton_with_kwargs
 from tespy.tools.logger import logger
 
+# number of calls and inner iterations of the mixture temperature inversion
+T_MIX_INVERSION_STATISTICS = {"calls": 0, "iterations": 0}
+
 
 def _is_larger_than_precision(value):
     return value > ERR
@@ -35,6 +39,14 @@ def _check_mixing_rule(mixing_rule, mixing_functions, propertyfunction):
         raise KeyError(msg)
 
 
+def get_saturation_engine(wrapper):
+    """Return the saturation cache of a fluid if it is enabled."""
+    cache = wrapper._saturation_cache
+    if cache is None:
+        return wrapper
+    return cache
+
+
 def get_number_of_fluids(fluid_data):
     return sum([1 for f in fluid_data.values() if _is_larger_than_precision(f["mass_fraction"])])
 
@@ -64,8 +76,48 @@ def get_molar_fractions(fluid_data):
     return {key: value / molarflow_sum for key, value in molarflow.items()}
 
 
-def inverse_temperature_mixture(p=None, target_value=None, fluid_data=None, T0=None, f=None):
-    # calculate the fluid properties for fluid mixtures
+def inverse_temperature_mixture(p=None, target_value=None, fluid_data=None, T0=None, f=None, df=None):
+    r"""
+    Calculate the temperature of a mixture from a mixture property.
+
+    The temperature is found with a bracketed Newton method using the
+    analytical temperature derivative :code:`df` of the mixture property
+    function :code:`f`. Where the derivative is not available, e.g. for
+    condensing water in :code:`"ideal-cond"` mixtures, secant steps and
+    Brent's method are used instead.
+
+    Parameters
+    ----------
+    p : float
+        Pressure p / Pa.
+
+    target_value : float
+        Value of the mixture property, e.g. specific enthalpy h / (J/kg).
+
+    fluid_data : dict
+        Fluid data of the mixture.
+
+    T0 : float
+        Starting value for the temperature, e.g. the temperature of the last
+        calculation at the same connection.
+
+    f : function
+        Mixture property as function of pressure and temperature.
+
+    df : function
+        Derivative of the mixture property with respect to temperature.
+
+    Returns
+    -------
+    T : float
+        Temperature T / K.
+
+    Note
+    ----
+    The number of calls and the total number of property evaluations of the
+    inner iterations are counted in the keys :code:`"calls"` and
+    :code:`"iterations"` of :code:`T_MIX_INVERSION_STATISTICS`.
+    """
     valmin, valmax = get_mixture_temperature_range(fluid_data)
     if T0 is None or T0 == 0 or np.isnan(T0):
         T0 = (valmin + valmax) / 2.0
@@ -74,16 +126,34 @@ def inverse_temperature_mixture(p=None, target_value=None, fluid_data=None, T0=N
 
     function_kwargs = {
         "p": p, "fluid_data": fluid_data, "T": T0,
-        "function": f, "parameter": "T" , "delta": 0.01
+        "function": f, "parameter": "T"
     }
-    return newton_with_kwargs(
-        central_difference,
+    if df is not None:
+        df = _not_implemented_as_nan(df)
+
+    T, iterations = newton_brent(
+        df,
         target_value,
         val0=T0,
         valmin=valmin,
         valmax=valmax,
+        max_iter=20,
         **function_kwargs
     )
+    T_MIX_INVERSION_STATISTICS["calls"] += 1
+    T_MIX_INVERSION_STATISTICS["iterations"] += iterations
+    return T
+
+
+def _not_implemented_as_nan(function):
+
+    def wrapped(**kwargs):
+        try:
+            return function(**kwargs)
+        except NotImplementedError:
+            return np.nan
+
+    return wrapped
 
 
 def get_mixture_temperature_range(fluid_data):
@@ -134,7 +204,7 @@ def fluid_structure(fluid):
     return parts
 
 
-def darcy_friction_factor(re, ks, d):
+def darcy_friction_factor(re, ks, d, model="colebrook"):
     r"""
     Calculate the Darcy friction factor.
 
@@ -149,6 +219,11 @@ def darcy_friction_factor(re, ks, d):
     d : float
         Pipe diameter/characteristic lenght d / m.
 
+    model : str
+        Friction model for turbulent flow, available models are
+        :code:`"colebrook"` (default), :code:`"swamee-jain"`,
+        :code:`"haaland"` and :code:`"serghides"`.
+
     Returns
     -------
     darcy_friction_factor : float
@@ -186,6 +261,13 @@ def darcy_friction_factor(re, ks, d):
 
     Reference: :cite:`Nirschl2018`.
 
+    The explicit models approximate the Colebrook-White equation in the
+    transition zone and the hydraulically rough zone, see
+    :py:func:`swamee_jain`, :py:func:`haaland` and :py:func:`serghides`. They
+    are applied for all turbulent states and accept arrays of states. For an
+    array implementation of the default model see
+    :py:func:`darcy_friction_factor_array`.
+
     Example
     -------
     Calculate the Darcy friction factor at different hydraulic states.
@@ -214,7 +296,13 @@ def darcy_friction_factor(re, ks, d):
     0.012
     >>> round(darcy_friction_factor(re_very_high, ks_low, d_very_high), 3)
     0.009
+    >>> round(darcy_friction_factor(re_turb_trans, ks_rough, d, "haaland"), 3)
+    0.049
     """
+    if model != "colebrook":
+        _check_friction_model(model)
+        return _laminar_or(re, DARCY_FRICTION_MODELS[model](re, ks, d))
+
     if re <= 2320:
         return 64 / re
     else:
@@ -358,3 +446,367 @@ def colebrook(reynolds, ks, diameter, darcy_friction_factor, **kwargs):
             / (3.71 * diameter)
         ) + 1 / darcy_friction_factor ** 0.5
     )
+
+
+def swamee_jain(re, ks, d):
+    r"""
+    Calculate friction coefficient according to Swamee and Jain.
+
+    Explicit approximation of the Colebrook-White equation.
+
+    Parameters
+    ----------
+    re : float, ndarray
+        Reynolds number.
+
+    ks : float, ndarray
+        Equivalent sand roughness.
+
+    d : float, ndarray
+        Pipe's diameter.
+
+    Returns
+    -------
+    darcy_friction_factor : float, ndarray
+        Darcy friction factor.
+
+    Note
+    ----
+    .. math::
+
+        \lambda = \frac{0.25}{\log\left(\frac{k_s}{3.7 \cdot d} +
+        \frac{5.74}{re^{0.9}}\right)^2}
+    """
+    return 0.25 / np.log10(ks / (3.7 * d) + 5.74 * re ** -0.9) ** 2
+
+
+def swamee_jain_derivative(re, ks, d):
+    """Calculate derivative of Swamee and Jain equation to Reynolds number."""
+    B = ks / (3.7 * d) + 5.74 * re ** -0.9
+    return (
+        -0.5 * np.log10(B) ** -3 / (B * np.log(10))
+        * (-0.9 * 5.74 * re ** -1.9)
+    )
+
+
+def haaland(re, ks, d):
+    r"""
+    Calculate friction coefficient according to Haaland.
+
+    Explicit approximation of the Colebrook-White equation.
+
+    Parameters
+    ----------
+    re : float, ndarray
+        Reynolds number.
+
+    ks : float, ndarray
+        Equivalent sand roughness.
+
+    d : float, ndarray
+        Pipe's diameter.
+
+    Returns
+    -------
+    darcy_friction_factor : float, ndarray
+        Darcy friction factor.
+
+    Note
+    ----
+    .. math::
+
+        \frac{1}{\sqrt{\lambda}} = -1.8 \cdot \log\left[\left(
+        \frac{k_s}{3.7 \cdot d}\right)^{1.11} + \frac{6.9}{re}\right]
+    """
+    return 1 / (3.24 * np.log10((ks / (3.7 * d)) ** 1.11 + 6.9 / re) ** 2)
+
+
+def haaland_derivative(re, ks, d):
+    """Calculate derivative of Haaland equation to Reynolds number."""
+    C = (ks / (3.7 * d)) ** 1.11 + 6.9 / re
+    return (
+        -2 / (3.24 * np.log10(C) ** 3) / (C * np.log(10))
+        * (-6.9 / re ** 2)
+    )
+
+
+def _serghides_terms(re, ks, d):
+    # terms of the Serghides equation and their derivatives to re
+    e = ks / (3.7 * d)
+    ln10 = np.log(10)
+    u = e + 12 / re
+    A = -2 * np.log10(u)
+    dA = -2 / ln10 * (-12 / re ** 2) / u
+    u = e + 2.51 * A / re
+    B = -2 * np.log10(u)
+    dB = -2 / ln10 * (2.51 * dA / re - 2.51 * A / re ** 2) / u
+    u = e + 2.51 * B / re
+    C = -2 * np.log10(u)
+    dC = -2 / ln10 * (2.51 * dB / re - 2.51 * B / re ** 2) / u
+    N = (B - A) ** 2
+    D = C - 2 * B + A
+    X = A - N / D
+    dX = dA - (
+        2 * (B - A) * (dB - dA) * D - N * (dC - 2 * dB + dA)
+    ) / D ** 2
+    return X, dX
+
+
+def serghides(re, ks, d):
+    r"""
+    Calculate friction coefficient according to Serghides.
+
+    Explicit approximation of the Colebrook-White equation based on Steffensen
+    acceleration of its fixed point iteration.
+
+    Parameters
+    ----------
+    re : float, ndarray
+        Reynolds number.
+
+    ks : float, ndarray
+        Equivalent sand roughness.
+
+    d : float, ndarray
+        Pipe's diameter.
+
+    Returns
+    -------
+    darcy_friction_factor : float, ndarray
+        Darcy friction factor.
+
+    Note
+    ----
+    .. math::
+
+        A = -2 \cdot \log\left(\frac{k_s}{3.7 \cdot d} + \frac{12}{re}
+        \right)\\
+        B = -2 \cdot \log\left(\frac{k_s}{3.7 \cdot d} + \frac{2.51 \cdot
+        A}{re}\right)\\
+        C = -2 \cdot \log\left(\frac{k_s}{3.7 \cdot d} + \frac{2.51 \cdot
+        B}{re}\right)\\
+        \lambda = \left(A - \frac{\left(B - A\right)^2}{C - 2 \cdot B + A}
+        \right)^{-2}
+    """
+    return _serghides_terms(re, ks, d)[0] ** -2
+
+
+def serghides_derivative(re, ks, d):
+    """Calculate derivative of Serghides equation to Reynolds number."""
+    X, dX = _serghides_terms(re, ks, d)
+    return -2 * X ** -3 * dX
+
+
+def _colebrook_array(re, ks, d, x0):
+    # Newton iterations on x = 1 / sqrt(lambda) of the Colebrook-White
+    # equation: 0 = x + 2 * log(2.51 * x / re + ks / (3.71 * d))
+    x = x0
+    for _ in range(20):
+        u = 2.51 * x / re + ks / (3.71 * d)
+        dx = (x + 2 * np.log10(u)) / (1 + 2 / np.log(10) * 2.51 / re / u)
+        x = x - dx
+        if (np.abs(dx) <= ERR ** 2 * x).all():
+            break
+    return x ** -2
+
+
+def _prandtl_karman_array(re, x0):
+    # Newton iterations on x = 1 / sqrt(lambda) of the Prandtl-Kármán
+    # equation: 0 = x - 2 * log(re) + 2 * log(x) + 0.8
+    x = x0
+    for _ in range(20):
+        dx = (x - 2 * np.log10(re / x) + 0.8) / (1 + 2 / (x * np.log(10)))
+        x = x - dx
+        if (np.abs(dx) <= ERR ** 2 * x).all():
+            break
+    return x ** -2
+
+
+def darcy_friction_factor_array(re, ks, d, model="colebrook"):
+    r"""
+    Calculate the Darcy friction factor for arrays of states.
+
+    The flow regimes and equations are identical to
+    :py:func:`darcy_friction_factor`. The implicit equations of Colebrook-White
+    and Prandtl-Kármán are solved with vectorized Newton iterations starting
+    from the explicit approximation of Haaland.
+
+    Parameters
+    ----------
+    re : float, ndarray
+        Reynolds number re / 1.
+
+    ks : float, ndarray
+        Pipe roughness ks / m.
+
+    d : float, ndarray
+        Pipe diameter/characteristic lenght d / m.
+
+    model : str
+        Friction model for turbulent flow, default: :code:`"colebrook"`.
+
+    Returns
+    -------
+    darcy_friction_factor : ndarray
+        Darcy friction factor :math:`\lambda` / 1
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> from tespy.tools.fluid_properties.helpers import (
+    ...     darcy_friction_factor, darcy_friction_factor_array
+    ... )
+    >>> re = np.array([2000, 5000, 70000, 70000, 1e6])
+    >>> ks = np.array([5e-5, 5e-5, 5e-5, 1e-3, 5e-5])
+    >>> d = np.array([0.05, 0.05, 0.05, 0.05, 0.8])
+    >>> lamb = darcy_friction_factor_array(re, ks, d)
+    >>> [round(value, 3) for value in lamb]
+    [0.032, 0.038, 0.023, 0.049, 0.012]
+    >>> lamb_scalar = [darcy_friction_factor(*args) for args in zip(re, ks, d)]
+    >>> bool(np.allclose(lamb, lamb_scalar, rtol=1e-5))
+    True
+    """
+    re, ks, d = np.broadcast_arrays(
+        *[np.asarray(value, dtype=float) for value in [re, ks, d]]
+    )
+    if model != "colebrook":
+        _check_friction_model(model)
+        return _laminar_or(re, DARCY_FRICTION_MODELS[model](re, ks, d))
+
+    lamb = np.empty(re.shape)
+    laminar = re <= 2320
+    smooth = ~laminar & (re * ks / d < 65)
+    rough = ~laminar & ~smooth
+    lamb[laminar] = 64 / re[laminar]
+
+    mask = smooth & (re <= 1e4)
+    lamb[mask] = blasius(re[mask])
+    mask = smooth & (re > 1e4) & (re < 1e6)
+    lamb[mask] = hanakov(re[mask])
+    mask = smooth & (re >= 1e6)
+    if mask.any():
+        x0 = haaland(re[mask], 0, d[mask]) ** -0.5
+        lamb[mask] = _prandtl_karman_array(re[mask], x0)
+    if rough.any():
+        x0 = haaland(re[rough], ks[rough], d[rough]) ** -0.5
+        lamb[rough] = _colebrook_array(re[rough], ks[rough], d[rough], x0)
+
+    return lamb
+
+
+def darcy_friction_factor_derivative(re, ks, d, model="colebrook"):
+    r"""
+    Calculate the derivative of the Darcy friction factor to Reynolds number.
+
+    Parameters
+    ----------
+    re : float, ndarray
+        Reynolds number re / 1.
+
+    ks : float, ndarray
+        Pipe roughness ks / m.
+
+    d : float, ndarray
+        Pipe diameter/characteristic lenght d / m.
+
+    model : str
+        Friction model for turbulent flow, default: :code:`"colebrook"`.
+
+    Returns
+    -------
+    derivative : float, ndarray
+        Derivative of the Darcy friction factor
+        :math:`\frac{\partial \lambda}{\partial re}`.
+
+    Note
+    ----
+    The derivatives of the implicit equations of Prandtl-Kármán and
+    Colebrook-White are obtained from the implicit function theorem
+
+    .. math::
+
+        \frac{\partial \lambda}{\partial re} = -\frac{\partial F / \partial
+        re}{\partial F / \partial \lambda}
+
+    Example
+    -------
+    >>> from tespy.tools.fluid_properties.helpers import (
+    ...     darcy_friction_factor, darcy_friction_factor_derivative
+    ... )
+    >>> re, ks, d = 70000, 1e-3, 0.05
+    >>> dre = 1e-2
+    >>> numeric = (
+    ...     darcy_friction_factor(re + dre, ks, d, "serghides")
+    ...     - darcy_friction_factor(re - dre, ks, d, "serghides")
+    ... ) / (2 * dre)
+    >>> analytic = darcy_friction_factor_derivative(re, ks, d, "serghides")
+    >>> round(analytic / numeric, 6)
+    1.0
+    """
+    if model != "colebrook":
+        _check_friction_model(model)
+        turbulent = DARCY_FRICTION_MODEL_DERIVATIVES[model](re, ks, d)
+        return np.where(re <= 2320, -64 / re ** 2, turbulent)[()]
+
+    re, ks, d = np.broadcast_arrays(
+        *[np.asarray(value, dtype=float) for value in [re, ks, d]]
+    )
+    lamb = darcy_friction_factor_array(re, ks, d)
+    ln10 = np.log(10)
+    derivative = np.empty(re.shape)
+
+    laminar = re <= 2320
+    smooth = ~laminar & (re * ks / d < 65)
+    rough = ~laminar & ~smooth
+    derivative[laminar] = -64 / re[laminar] ** 2
+
+    mask = smooth & (re <= 1e4)
+    derivative[mask] = -0.25 * lamb[mask] / re[mask]
+    mask = smooth & (re > 1e4) & (re < 1e6)
+    derivative[mask] = (
+        -2 * (1.8 * np.log10(re[mask]) - 1.5) ** -3 * 1.8
+        / (re[mask] * ln10)
+    )
+    mask = smooth & (re >= 1e6)
+    derivative[mask] = -(2 / (re[mask] * ln10)) / prandtl_karman_derivative(
+        reynolds=re[mask], darcy_friction_factor=lamb[mask]
+    )
+
+    re, ks, d, lamb = re[rough], ks[rough], d[rough], lamb[rough]
+    A = 2.51 / (re * lamb ** 0.5) + ks / (3.71 * d)
+    dF_dre = 2 / (A * ln10) * (-2.51 / (re ** 2 * lamb ** 0.5))
+    dF_dlamb = (
+        2 / (A * ln10) * (-0.5 * 2.51 / (re * lamb ** 1.5))
+        - 0.5 * lamb ** -1.5
+    )
+    derivative[rough] = -dF_dre / dF_dlamb
+
+    return derivative[()]
+
+
+def _laminar_or(re, turbulent):
+    return np.where(re <= 2320, 64 / re, turbulent)[()]
+
+
+def _check_friction_model(model):
+    if model != "colebrook" and model not in DARCY_FRICTION_MODELS:
+        msg = (
+            f"The friction model '{model}' is not available. Available "
+            "models are 'colebrook', '"
+            + "', '".join(DARCY_FRICTION_MODELS.keys()) + "'."
+        )
+        logger.exception(msg)
+        raise KeyError(msg)
+
+
+DARCY_FRICTION_MODELS = {
+    "swamee-jain": swamee_jain,
+    "haaland": haaland,
+    "serghides": serghides,
+}
+
+DARCY_FRICTION_MODEL_DERIVATIVES = {
+    "swamee-jain": swamee_jain_derivative,
+    "haaland": haaland_derivative,
+    "serghides": serghides_derivative,
+}
@@ -0,0 +1,1486 @@
+# -*- coding: utf-8
+
+"""Module for the IAPWS-IF97 formulation of water and steam properties.
+
+The equations of the IAPWS Industrial Formulation 1997 (regions 1 to 5 and
+the backward equations for pressure-enthalpy and pressure-entropy inputs) are
+implemented with NumPy. All functions accept scalars as well as arrays of
+states and use SI units (Pa, K, J/kg, J/(kgK), kg/m3). Values outside of the
+range of validity are returned as nan.
+
+The backward equations provide the starting values for the temperature (and
+density in region 3), which are then refined with the basic equations, so the
+results are consistent with the forward calculation.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+tespy/tools/fluid_properties/if97.py
+
+SPDX-License-Identifier: MIT
+"""
+
+import functools
+
+import numpy as np
+
+R = 461.526
+T_CRIT = 647.096
+P_CRIT = 22.064e6
+RHO_CRIT = 322.0
+S_CRIT = 4412.02148223476
+T_TRIPLE = 273.16
+P_TRIPLE = 611.657
+T_MIN = 273.15
+T_MAX = 2273.15
+P_MAX = 100e6
+MOLAR_MASS = 0.018015268
+
+# boundaries between the regions
+_T_13 = 623.15
+_T_25 = 1073.15
+_P_MAX_5 = 50e6
+
+_REGION2_IDEAL = np.array([
+    [0, -9.6927686500217],
+    [1, 10.086655968018],
+    [-5, -0.005608791128302],
+    [-4, 0.071452738081455],
+    [-3, -0.40710498223928],
+    [-2, 1.4240819171444],
+    [-1, -4.383951131945],
+    [2, -0.28408632460772],
+    [3, 0.021268463753307],
+])
+
+_REGION5_IDEAL = np.array([
+    [0, -13.179983674201],
+    [1, 6.8540841634434],
+    [-3, -0.024805148933466],
+    [-2, 0.36901534980333],
+    [-1, -3.1161318213925],
+    [2, -0.32961626538917],
+])
+
+_REGION3_N1 = 1.0658070028513
+
+_REGION4 = np.array([
+    1167.0521452767, -724213.16703206, -17.073846940092, 12020.82470247,
+    -3232555.0322333, 14.91510861353, -4823.2657361591, 405113.40542057,
+    -0.23855557567849, 650.17534844798
+])
+
+_B23 = np.array([
+    348.05185628969, -1.1671859879975, 0.0010192970039326, 572.54459862746,
+    13.9188397787
+])
+
+_VISCOSITY_IDEAL = np.array([1.67752, 2.20462, 0.6366564, -0.241605])
+
+_VISCOSITY_RESIDUAL = np.array([
+    [0, 0, 0.520094],
+    [1, 0, 0.0850895],
+    [2, 0, -1.08374],
+    [3, 0, -0.289555],
+    [0, 1, 0.222531],
+    [1, 1, 0.999115],
+    [2, 1, 1.88797],
+    [3, 1, 1.26613],
+    [5, 1, 0.120573],
+    [0, 2, -0.281378],
+    [1, 2, -0.906851],
+    [2, 2, -0.772479],
+    [3, 2, -0.489837],
+    [4, 2, -0.25704],
+    [0, 3, 0.161913],
+    [1, 3, 0.257399],
+    [0, 4, -0.0325372],
+    [3, 4, 0.0698452],
+    [4, 5, 0.00872102],
+    [3, 6, -0.00435673],
+    [5, 6, -0.000593264],
+])
+
+_REGION1 = np.array([
+    [0, -2, 0.14632971213167],
+    [0, -1, -0.84548187169114],
+    [0, 0, -3.756360367204],
+    [0, 1, 3.3855169168385],
+    [0, 2, -0.95791963387872],
+    [0, 3, 0.15772038513228],
+    [0, 4, -0.016616417199501],
+    [0, 5, 0.00081214629983568],
+    [1, -9, 0.00028319080123804],
+    [1, -7, -0.00060706301565874],
+    [1, -1, -0.018990068218419],
+    [1, 0, -0.032529748770505],
+    [1, 1, -0.021841717175414],
+    [1, 3, -5.283835796993e-05],
+    [2, -3, -0.00047184321073267],
+    [2, 0, -0.00030001780793026],
+    [2, 1, 4.7661393906987e-05],
+    [2, 3, -4.4141845330846e-06],
+    [2, 17, -7.2694996297594e-16],
+    [3, -4, -3.1679644845054e-05],
+    [3, 0, -2.8270797985312e-06],
+    [3, 6, -8.5205128120103e-10],
+    [4, -5, -2.2425281908e-06],
+    [4, -2, -6.5171222895601e-07],
+    [4, 10, -1.4341729937924e-13],
+    [5, -8, -4.0516996860117e-07],
+    [8, -11, -1.2734301741641e-09],
+    [8, -6, -1.7424871230634e-10],
+    [21, -29, -6.8762131295531e-19],
+    [23, -31, 1.4478307828521e-20],
+    [29, -38, 2.6335781662795e-23],
+    [30, -39, -1.1947622640071e-23],
+    [31, -40, 1.8228094581404e-24],
+    [32, -41, -9.3537087292458e-26],
+])
+
+
+_REGION2_RESIDUAL = np.array([
+    [1, 0, -0.0017731742473213],
+    [1, 1, -0.017834862292358],
+    [1, 2, -0.045996013696365],
+    [1, 3, -0.057581259083432],
+    [1, 6, -0.05032527872793],
+    [2, 1, -3.3032641670203e-05],
+    [2, 2, -0.00018948987516315],
+    [2, 4, -0.0039392777243355],
+    [2, 7, -0.043797295650573],
+    [2, 36, -2.6674547914087e-05],
+    [3, 0, 2.0481737692309e-08],
+    [3, 1, 4.3870667284435e-07],
+    [3, 3, -3.227767723857e-05],
+    [3, 6, -0.0015033924542148],
+    [3, 35, -0.040668253562649],
+    [4, 1, -7.8847309559367e-10],
+    [4, 2, 1.2790717852285e-08],
+    [4, 3, 4.8225372718507e-07],
+    [5, 7, 2.2922076337661e-06],
+    [6, 3, -1.6714766451061e-11],
+    [6, 16, -0.0021171472321355],
+    [6, 35, -23.895741934104],
+    [7, 0, -5.905956432427e-18],
+    [7, 11, -1.2621808899101e-06],
+    [7, 25, -0.038946842435739],
+    [8, 8, 1.1256211360459e-11],
+    [8, 36, -8.2311340897998],
+    [9, 13, 1.9809712802088e-08],
+    [10, 4, 1.0406965210174e-19],
+    [10, 10, -1.0234747095929e-13],
+    [10, 14, -1.0018179379511e-09],
+    [16, 29, -8.0882908646985e-11],
+    [16, 50, 0.10693031879409],
+    [18, 57, -0.33662250574171],
+    [20, 20, 8.9185845355421e-25],
+    [20, 35, 3.0629316876232e-13],
+    [20, 48, -4.2002467698208e-06],
+    [21, 21, -5.9056029685639e-26],
+    [22, 53, 3.7826947613457e-06],
+    [23, 39, -1.2768608934681e-15],
+    [24, 26, 7.3087610595061e-29],
+    [24, 40, 5.5414715350778e-17],
+    [24, 58, -9.436970724121e-07],
+])
+
+
+_REGION3 = np.array([
+    [0, 0, -15.732845290239],
+    [0, 1, 20.944396974307],
+    [0, 2, -7.6867707878716],
+    [0, 7, 2.6185947787954],
+    [0, 10, -2.808078114862],
+    [0, 12, 1.2053369696517],
+    [0, 23, -0.0084566812812502],
+    [1, 2, -1.2654315477714],
+    [1, 6, -1.1524407806681],
+    [1, 15, 0.88521043984318],
+    [1, 17, -0.64207765181607],
+    [2, 0, 0.38493460186671],
+    [2, 2, -0.85214708824206],
+    [2, 6, 4.8972281541877],
+    [2, 7, -3.0502617256965],
+    [2, 22, 0.039420536879154],
+    [2, 26, 0.12558408424308],
+    [3, 0, -0.2799932969871],
+    [3, 2, 1.389979956946],
+    [3, 4, -2.018991502357],
+    [3, 16, -0.0082147637173963],
+    [3, 26, -0.47596035734923],
+    [4, 0, 0.0439840744735],
+    [4, 2, -0.44476435428739],
+    [4, 4, 0.90572070719733],
+    [4, 26, 0.70522450087967],
+    [5, 1, 0.10770512626332],
+    [5, 3, -0.32913623258954],
+    [5, 26, -0.50871062041158],
+    [6, 0, -0.022175400873096],
+    [6, 2, 0.094260751665092],
+    [6, 26, 0.16436278447961],
+    [7, 2, -0.013503372241348],
+    [8, 26, -0.014834345352472],
+    [9, 2, 0.00057922953628084],
+    [9, 26, 0.0032308904703711],
+    [10, 0, 8.0964802996215e-05],
+    [10, 1, -0.00016557679795037],
+    [11, 26, -4.4923899061815e-05],
+])
+
+
+_REGION5_RESIDUAL = np.array([
+    [1, 1, 0.0015736404855259],
+    [1, 2, 0.00090153761673944],
+    [1, 3, -0.0050270077677648],
+    [2, 3, 2.2440037409485e-06],
+    [2, 9, -4.1163275453471e-06],
+    [3, 7, 3.7919454822955e-08],
+])
+
+
+_BACKWARD1_T_PH = np.array([
+    [0, 0, -238.72489924521],
+    [0, 1, 404.21188637945],
+    [0, 2, 113.49746881718],
+    [0, 6, -5.8457616048039],
+    [0, 22, -0.0001528548241314],
+    [0, 32, -1.0866707695377e-06],
+    [1, 0, -13.391744872602],
+    [1, 1, 43.211039183559],
+    [1, 2, -54.010067170506],
+    [1, 3, 30.535892203916],
+    [1, 4, -6.5964749423638],
+    [1, 10, 0.0093965400878363],
+    [1, 32, 1.157364750534e-07],
+    [2, 10, -2.5858641282073e-05],
+    [2, 32, -4.0644363084799e-09],
+    [3, 10, 6.6456186191635e-08],
+    [3, 32, 8.0670734103027e-11],
+    [4, 32, -9.3477771213947e-13],
+    [5, 32, 5.8265442020601e-15],
+    [6, 32, -1.5020185953503e-17],
+])
+
+
+_BACKWARD1_T_PS = np.array([
+    [0, 0, 174.78268058307],
+    [0, 1, 34.806930892873],
+    [0, 2, 6.5292584978455],
+    [0, 3, 0.33039981775489],
+    [0, 11, -1.9281382923196e-07],
+    [0, 31, -2.4909197244573e-23],
+    [1, 0, -0.26107636489332],
+    [1, 1, 0.22592965981586],
+    [1, 2, -0.064256463395226],
+    [1, 3, 0.0078876289270526],
+    [1, 12, 3.5672110607366e-10],
+    [1, 31, 1.7332496994895e-24],
+    [2, 0, 0.00056608900654837],
+    [2, 1, -0.00032635483139717],
+    [2, 2, 4.4778286690632e-05],
+    [2, 9, -5.1322156908507e-10],
+    [2, 31, -4.2522657042207e-26],
+    [3, 10, 2.6400441360689e-13],
+    [3, 32, 7.8124600459723e-29],
+    [4, 32, -3.0732199903668e-31],
+])
+
+
+_BACKWARD2A_T_PH = np.array([
+    [0, 0, 1089.8952318288],
+    [0, 1, 849.51654495535],
+    [0, 2, -107.81748091826],
+    [0, 3, 33.153654801263],
+    [0, 7, -7.4232016790248],
+    [0, 20, 11.765048724356],
+    [1, 0, 1.844574935579],
+    [1, 1, -4.1792700549624],
+    [1, 2, 6.2478196935812],
+    [1, 3, -17.344563108114],
+    [1, 7, -200.58176862096],
+    [1, 9, 271.96065473796],
+    [1, 11, -455.11318285818],
+    [1, 18, 3091.9688604755],
+    [1, 44, 252266.40357872],
+    [2, 0, -0.0061707422868339],
+    [2, 2, -0.31078046629583],
+    [2, 7, 11.670873077107],
+    [2, 36, 128127984.04046],
+    [2, 38, -985549096.23276],
+    [2, 40, 2822454697.3002],
+    [2, 42, -3594897141.0703],
+    [2, 44, 1722734991.3197],
+    [3, 24, -13551.334240775],
+    [3, 44, 12848734.66465],
+    [4, 12, 1.3865724283226],
+    [4, 32, 235988.32556514],
+    [4, 44, -13105236.545054],
+    [5, 32, 7399.9835474766],
+    [5, 36, -551966.9703006],
+    [5, 42, 3715408.5996233],
+    [6, 34, 19127.72923966],
+    [6, 44, -415351.64835634],
+    [7, 28, -62.459855192507],
+])
+
+
+_BACKWARD2B_T_PH = np.array([
+    [0, 0, 1489.5041079516],
+    [0, 1, 743.07798314034],
+    [0, 2, -97.708318797837],
+    [0, 12, 2.4742464705674],
+    [0, 18, -0.63281320016026],
+    [0, 24, 1.1385952129658],
+    [0, 28, -0.47811863648625],
+    [0, 40, 0.0085208123431544],
+    [1, 0, 0.93747147377932],
+    [1, 2, 3.3593118604916],
+    [1, 6, 3.3809355601454],
+    [1, 12, 0.16844539671904],
+    [1, 18, 0.73875745236695],
+    [1, 24, -0.47128737436186],
+    [1, 28, 0.15020273139707],
+    [1, 40, -0.002176411421975],
+    [2, 2, -0.021810755324761],
+    [2, 8, -0.10829784403677],
+    [2, 18, -0.046333324635812],
+    [2, 40, 7.1280351959551e-05],
+    [3, 1, 0.00011032831789999],
+    [3, 2, 0.00018955248387902],
+    [3, 12, 0.0030891541160537],
+    [3, 24, 0.0013555504554949],
+    [4, 2, 2.8640237477456e-07],
+    [4, 12, -1.0779857357512e-05],
+    [4, 18, -7.6462712454814e-05],
+    [4, 24, 1.4052392818316e-05],
+    [4, 28, -3.1083814331434e-05],
+    [4, 40, -1.0302738212103e-06],
+    [5, 18, 2.821728163504e-07],
+    [5, 24, 1.2704902271945e-06],
+    [5, 40, 7.3803353468292e-08],
+    [6, 28, -1.1030139238909e-08],
+    [7, 2, -8.1456365207833e-14],
+    [7, 28, -2.5180545682962e-11],
+    [9, 1, -1.7565233969407e-18],
+    [9, 40, 8.6934156344163e-15],
+])
+
+
+_BACKWARD2C_T_PH = np.array([
+    [-7, 0, -3236839855524.2],
+    [-7, 4, 7326335090218.1],
+    [-6, 0, 358250899454.47],
+    [-6, 2, -583401318515.9],
+    [-5, 0, -10783068217.47],
+    [-5, 2, 20825544563.171],
+    [-2, 0, 610747.83564516],
+    [-2, 1, 859777.2253558],
+    [-1, 0, -25745.72360417],
+    [-1, 2, 31081.088422714],
+    [0, 0, 1208.2315865936],
+    [0, 1, 482.19755109255],
+    [1, 4, 3.7966001272486],
+    [1, 8, -10.842984880077],
+    [2, 4, -0.04536417267666],
+    [6, 0, 1.4559115658698e-13],
+    [6, 1, 1.126159740723e-12],
+    [6, 4, -1.7804982240686e-11],
+    [6, 10, 1.2324579690832e-07],
+    [6, 12, -1.1606921130984e-06],
+    [6, 16, 2.7846367088554e-05],
+    [6, 20, -0.00059270038474176],
+    [6, 22, 0.0012918582991878],
+])
+
+
+_BACKWARD2A_T_PS = np.array([
+    [-1.5, -24, -392359.83861984],
+    [-1.5, -23, 515265.7382727],
+    [-1.5, -19, 40482.443161048],
+    [-1.5, -13, -321.93790923902],
+    [-1.5, -11, 96.961424218694],
+    [-1.5, -10, -22.867846371773],
+    [-1.25, -19, -449429.14124357],
+    [-1.25, -15, -5011.8336020166],
+    [-1.25, -6, 0.35684463560015],
+    [-1.0, -26, 44235.33584819],
+    [-1.0, -21, -13673.388811708],
+    [-1.0, -17, 421632.60207864],
+    [-1.0, -16, 22516.925837475],
+    [-1.0, -9, 474.42144865646],
+    [-1.0, -8, -149.31130797647],
+    [-0.75, -15, -197811.26320452],
+    [-0.75, -14, -23554.39947076],
+    [-0.5, -26, -19070.616302076],
+    [-0.5, -13, 55375.669883164],
+    [-0.5, -9, 3829.3691437363],
+    [-0.5, -7, -603.91860580567],
+    [-0.25, -27, 1936.3102620331],
+    [-0.25, -25, 4266.064369861],
+    [-0.25, -11, -5978.0638872718],
+    [-0.25, -6, -704.01463926862],
+    [0.25, 1, 338.36784107553],
+    [0.25, 4, 20.862786635187],
+    [0.25, 8, 0.033834172656196],
+    [0.25, 11, -4.3124428414893e-05],
+    [0.5, 0, 166.53791356412],
+    [0.5, 1, -139.86292055898],
+    [0.5, 5, -0.78849547999872],
+    [0.5, 6, 0.072132411753872],
+    [0.5, 10, -0.0059754839398283],
+    [0.5, 14, -1.2141358953904e-05],
+    [0.5, 16, 2.3227096733871e-07],
+    [0.75, 0, -10.538463566194],
+    [0.75, 4, 2.0718925496502],
+    [0.75, 9, -0.072193155260427],
+    [0.75, 17, 2.074988708112e-07],
+    [1.0, 7, -0.018340657911379],
+    [1.0, 18, 2.9036272348696e-07],
+    [1.25, 3, 0.21037527893619],
+    [1.25, 15, 0.00025681239729999],
+    [1.5, 5, -0.012799002933781],
+    [1.5, 18, -8.2198102652018e-06],
+])
+
+
+_BACKWARD2B_T_PS = np.array([
+    [-6, 0, 316876.65083497],
+    [-6, 11, 20.864175881858],
+    [-5, 0, -398593.99803599],
+    [-5, 11, -21.816058518877],
+    [-4, 0, 223697.85194242],
+    [-4, 1, -2784.1703445817],
+    [-4, 11, 9.920743607148],
+    [-3, 0, -75197.512299157],
+    [-3, 1, 2970.8605951158],
+    [-3, 11, -3.4406878548526],
+    [-3, 12, 0.38815564249115],
+    [-2, 0, 17511.29508575],
+    [-2, 1, -1423.7112854449],
+    [-2, 6, 1.0943803364167],
+    [-2, 10, 0.89971619308495],
+    [-1, 0, -3375.9740098958],
+    [-1, 1, 471.62885818355],
+    [-1, 5, -1.9188241993679],
+    [-1, 8, 0.41078580492196],
+    [-1, 9, -0.33465378172097],
+    [0, 0, 1387.0034777505],
+    [0, 1, -406.63326195838],
+    [0, 2, 41.72734715961],
+    [0, 4, 2.1932549434532],
+    [0, 5, -1.0320050009077],
+    [0, 6, 0.35882943516703],
+    [0, 9, 0.0052511453726066],
+    [1, 0, 12.838916450705],
+    [1, 1, -2.8642437219381],
+    [1, 2, 0.56912683664855],
+    [1, 3, -0.099962954584931],
+    [1, 7, -0.0032632037778459],
+    [1, 8, 0.00023320922576723],
+    [2, 0, -0.1533480985745],
+    [2, 1, 0.029072288239902],
+    [2, 5, 0.00037534702741167],
+    [3, 0, 0.0017296691702411],
+    [3, 1, -0.00038556050844504],
+    [3, 3, -3.5017712292608e-05],
+    [4, 0, -1.4566393631492e-05],
+    [4, 1, 5.6420857267269e-06],
+    [5, 0, 4.1286150074605e-08],
+    [5, 1, -2.0684671118824e-08],
+    [5, 2, 1.6409393674725e-09],
+])
+
+
+_BACKWARD2C_T_PS = np.array([
+    [-2, 0, 909.68501005365],
+    [-2, 1, 2404.566708842],
+    [-1, 0, -591.6232638713],
+    [0, 0, 541.45404128074],
+    [0, 1, -270.98308411192],
+    [0, 2, 979.76525097926],
+    [0, 3, -469.66772959435],
+    [1, 0, 14.399274604723],
+    [1, 1, -19.104204230429],
+    [1, 3, 5.3299167111971],
+    [1, 4, -21.252975375934],
+    [2, 0, -0.3114733441376],
+    [2, 1, 0.60334840894623],
+    [2, 2, -0.042764839702509],
+    [3, 0, 0.0058185597255259],
+    [3, 1, -0.014597008284753],
+    [3, 5, 0.0056631175631027],
+    [4, 0, -7.6155864584577e-05],
+    [4, 1, 0.00022440342919332],
+    [4, 4, -1.2561095013413e-05],
+    [5, 0, 6.3323132660934e-07],
+    [5, 1, -2.0541989675375e-06],
+    [5, 2, 3.6405370390082e-08],
+    [6, 0, -2.9759897789215e-09],
+    [6, 1, 1.0136618529763e-08],
+    [7, 0, 5.9925719692351e-12],
+    [7, 1, -2.0677870105164e-11],
+    [7, 3, -2.0874278181886e-11],
+    [7, 4, 1.0162166825089e-10],
+    [7, 5, -1.6429828281347e-10],
+])
+
+
+_BACKWARD3A_T_PH = np.array([
+    [-12, 0, -1.33645667811215e-07],
+    [-12, 1, 4.55912656802978e-06],
+    [-12, 2, -1.46294640700979e-05],
+    [-12, 6, 0.0063934131297008],
+    [-12, 14, 372.783927268847],
+    [-12, 16, -7186.54377460447],
+    [-12, 20, 573494.7521034],
+    [-12, 22, -2675693.29111439],
+    [-10, 1, -3.34066283302614e-05],
+    [-10, 5, -0.0245479214069597],
+    [-10, 12, 47.8087847764996],
+    [-8, 0, 7.64664131818904e-06],
+    [-8, 2, 0.00128350627676972],
+    [-8, 4, 0.0171219081377331],
+    [-8, 10, -8.51007304583213],
+    [-5, 2, -0.0136513461629781],
+    [-3, 0, -3.84460997596657e-06],
+    [-2, 1, 0.00337423807911655],
+    [-2, 3, -0.551624873066791],
+    [-2, 4, 0.72920227710747],
+    [-1, 0, -0.00992522757376041],
+    [-1, 2, -0.119308831407288],
+    [0, 0, 0.793929190615421],
+    [0, 1, 0.454270731799386],
+    [1, 1, 0.20999859125991],
+    [3, 0, -0.00642109823904738],
+    [3, 1, -0.023515586860454],
+    [4, 0, 0.00252233108341612],
+    [4, 3, -0.00764885133368119],
+    [10, 4, 0.0136176427574291],
+    [12, 5, -0.0133027883575669],
+])
+
+
+_BACKWARD3B_T_PH = np.array([
+    [-12, 0, 3.2325457364492e-05],
+    [-12, 1, -0.000127575556587181],
+    [-10, 0, -0.000475851877356068],
+    [-10, 1, 0.00156183014181602],
+    [-10, 5, 0.105724860113781],
+    [-10, 10, -85.8514221132534],
+    [-10, 12, 724.140095480911],
+    [-8, 0, 0.00296475810273257],
+    [-8, 1, -0.00592721983365988],
+    [-8, 2, -0.0126305422818666],
+    [-8, 4, -0.115716196364853],
+    [-8, 10, 84.9000969739595],
+    [-6, 0, -0.0108602260086615],
+    [-6, 1, 0.0154304475328851],
+    [-6, 2, 0.0750455441524466],
+    [-4, 0, 0.0252520973612982],
+    [-4, 1, -0.0602507901232996],
+    [-3, 5, -3.07622221350501],
+    [-2, 0, -0.0574011959864879],
+    [-2, 4, 5.03471360939849],
+    [-1, 2, -0.925081888584834],
+    [-1, 4, 3.91733882917546],
+    [-1, 6, -77.314600713019],
+    [-1, 10, 9493.08762098587],
+    [-1, 14, -1410437.19679409],
+    [-1, 16, 8491662.30819026],
+    [0, 0, 0.861095729446704],
+    [0, 2, 0.32334644281172],
+    [1, 1, 0.873281936020439],
+    [3, 1, -0.436653048526683],
+    [5, 1, 0.286596714529479],
+    [6, 1, -0.131778331276228],
+    [8, 1, 0.00676682064330275],
+])
+
+
+_BACKWARD3A_V_PH = np.array([
+    [-12, 6, 0.00529944062966028],
+    [-12, 8, -0.170099690234461],
+    [-12, 12, 11.1323814312927],
+    [-12, 18, -2178.98123145125],
+    [-10, 4, -0.000506061827980875],
+    [-10, 7, 0.556495239685324],
+    [-10, 10, -9.43672726094016],
+    [-8, 5, -0.297856807561527],
+    [-8, 12, 93.9353943717186],
+    [-6, 3, 0.0192944939465981],
+    [-6, 4, 0.421740664704763],
+    [-6, 22, -3689141.2628233],
+    [-4, 2, -0.00737566847600639],
+    [-4, 3, -0.354753242424366],
+    [-3, 7, -1.99768169338727],
+    [-2, 3, 1.15456297059049],
+    [-2, 16, 5683.6687581596],
+    [-1, 0, 0.00808169540124668],
+    [-1, 1, 0.172416341519307],
+    [-1, 2, 1.04270175292927],
+    [-1, 3, -0.297691372792847],
+    [0, 0, 0.560394465163593],
+    [0, 1, 0.275234661176914],
+    [1, 0, -0.148347894866012],
+    [1, 1, -0.0651142513478515],
+    [1, 2, -2.92468715386302],
+    [2, 0, 0.0664876096952665],
+    [2, 2, 3.52335014263844],
+    [3, 0, -0.0146340792313332],
+    [4, 2, -2.24503486668184],
+    [5, 2, 1.10533464706142],
+    [8, 2, -0.0408757344495612],
+])
+
+
+_BACKWARD3B_V_PH = np.array([
+    [-12, 0, -2.25196934336318e-09],
+    [-12, 1, 1.40674363313486e-08],
+    [-8, 0, 2.3378408528056e-06],
+    [-8, 1, -3.31833715229001e-05],
+    [-8, 3, 0.00107956778514318],
+    [-8, 6, -0.271382067378863],
+    [-8, 7, 1.07202262490333],
+    [-8, 8, -0.853821329075382],
+    [-6, 0, -2.15214194340526e-05],
+    [-6, 1, 0.00076965608822273],
+    [-6, 2, -0.00431136580433864],
+    [-6, 5, 0.453342167309331],
+    [-6, 6, -0.507749535873652],
+    [-6, 10, -100.475154528389],
+    [-4, 3, -0.219201924648793],
+    [-4, 6, -3.21087965668917],
+    [-4, 10, 607.567815637771],
+    [-3, 0, 0.000557686450685932],
+    [-3, 2, 0.18749904002955],
+    [-2, 1, 0.00905368030448107],
+    [-2, 2, 0.285417173048685],
+    [-1, 0, 0.0329924030996098],
+    [-1, 1, 0.239897419685483],
+    [-1, 4, 4.82754995951394],
+    [-1, 5, -11.8035753702231],
+    [0, 0, 0.169490044091791],
+    [1, 0, -0.0179967222507787],
+    [1, 1, 0.0371810116332674],
+    [2, 2, -0.0536288335065096],
+    [2, 6, 1.6069710109252],
+])
+
+
+_BACKWARD3A_T_PS = np.array([
+    [-12, 28, 1500420082.63875],
+    [-12, 32, -159397258480.424],
+    [-10, 4, 0.000502181140217975],
+    [-10, 10, -67.2057767855466],
+    [-10, 12, 1450.58545404456],
+    [-10, 14, -8238.8953488889],
+    [-8, 5, -0.154852214233853],
+    [-8, 7, 11.2305046746695],
+    [-8, 8, -29.7000213482822],
+    [-8, 28, 43856513263.5495],
+    [-6, 2, 0.00137837838635464],
+    [-6, 6, -2.97478527157462],
+    [-6, 32, 9717779473494.13],
+    [-5, 0, -5.71527767052398e-05],
+    [-5, 14, 28830.794977842],
+    [-5, 32, -74442828926270.3],
+    [-4, 6, 12.8017324848921],
+    [-4, 10, -368.275545889071],
+    [-4, 36, 6647689047791770.0],
+    [-2, 1, 0.044935925195888],
+    [-2, 4, -4.22897836099655],
+    [-1, 1, -0.240614376434179],
+    [-1, 6, -4.74341365254924],
+    [0, 0, 0.72409399912611],
+    [0, 1, 0.923874349695897],
+    [0, 4, 3.99043655281015],
+    [1, 0, 0.0384066651868009],
+    [2, 0, -0.00359344365571848],
+    [2, 3, -0.735196448821653],
+    [3, 2, 0.188367048396131],
+    [8, 0, 0.000141064266818704],
+    [8, 1, -0.00257418501496337],
+    [10, 2, 0.00123220024851555],
+])
+
+
+_BACKWARD3B_T_PS = np.array([
+    [-12, 1, 0.52711170160166],
+    [-12, 3, -40.1317830052742],
+    [-12, 4, 153.020073134484],
+    [-12, 7, -2247.99398218827],
+    [-8, 0, -0.193993484669048],
+    [-8, 1, -1.40467557893768],
+    [-8, 3, 42.6799878114024],
+    [-6, 0, 0.752810643416743],
+    [-6, 2, 22.6657238616417],
+    [-6, 4, -622.873556909932],
+    [-5, 0, -0.660823667935396],
+    [-5, 1, 0.841267087271658],
+    [-5, 2, -25.3717501764397],
+    [-5, 4, 485.708963532948],
+    [-5, 6, 880.531517490555],
+    [-4, 12, 2650155.92794626],
+    [-3, 1, -0.359287150025783],
+    [-3, 6, -656.991567673753],
+    [-2, 2, 2.41768149185367],
+    [0, 0, 0.856873461222588],
+    [2, 1, 0.655143675313458],
+    [3, 1, -0.213535213206406],
+    [4, 0, 0.00562974957606348],
+    [5, 24, -316955725450471.0],
+    [6, 0, -0.000699997000152457],
+    [8, 3, 0.0119845803210767],
+    [12, 1, 1.93848122022095e-05],
+    [14, 2, -2.15095749182309e-05],
+])
+
+
+_BACKWARD3A_V_PS = np.array([
+    [-12, 10, 79.5544074093975],
+    [-12, 12, -2382.6124298459],
+    [-12, 14, 17681.3100617787],
+    [-10, 4, -0.00110524727080379],
+    [-10, 8, -15.3213833655326],
+    [-10, 10, 297.544599376982],
+    [-10, 20, -35031520.6871242],
+    [-8, 5, 0.277513761062119],
+    [-8, 6, -0.523964271036888],
+    [-8, 14, -148011.182995403],
+    [-8, 16, 1600148.99374266],
+    [-6, 28, 1708023226634.27],
+    [-5, 1, 0.000246866996006494],
+    [-4, 5, 1.6532608479798],
+    [-3, 2, -0.118008384666987],
+    [-3, 4, 2.537986423559],
+    [-2, 3, 0.965127704669424],
+    [-2, 8, -28.2172420532826],
+    [-1, 1, 0.203224612353823],
+    [-1, 2, 1.10648186063513],
+    [0, 0, 0.52612794845128],
+    [0, 1, 0.277000018736321],
+    [0, 3, 1.08153340501132],
+    [1, 0, -0.0744127885357893],
+    [2, 0, 0.0164094443541384],
+    [4, 2, -0.0680468275301065],
+    [5, 2, 0.025798857610164],
+    [6, 0, -0.000145749861944416],
+])
+
+
+_BACKWARD3B_V_PS = np.array([
+    [-12, 0, 5.91599780322238e-05],
+    [-12, 1, -0.00185465997137856],
+    [-12, 2, 0.0104190510480013],
+    [-12, 3, 0.0059864730203859],
+    [-12, 5, -0.771391189901699],
+    [-12, 6, 1.72549765557036],
+    [-10, 0, -0.000467076079846526],
+    [-10, 1, 0.0134533823384439],
+    [-10, 2, -0.0808094336805495],
+    [-10, 4, 0.508139374365767],
+    [-8, 0, 0.00128584643361683],
+    [-5, 1, -1.63899353915435],
+    [-5, 2, 5.86938199318063],
+    [-5, 3, -2.92466667918613],
+    [-4, 0, -0.00614076301499537],
+    [-4, 1, 5.76199014049172],
+    [-4, 2, -12.1613320606788],
+    [-4, 3, 1.67637540957944],
+    [-3, 1, -7.44135838773463],
+    [-2, 0, 0.0378168091437659],
+    [-2, 1, 4.01432203027688],
+    [-2, 2, 16.0279837479185],
+    [-2, 3, 3.17848779347728],
+    [-2, 4, -3.58362310304853],
+    [-2, 12, -1159952.60446827],
+    [0, 0, 0.199256573577909],
+    [0, 1, -0.122270624794624],
+    [0, 2, -19.1449143716586],
+    [1, 0, -0.0150448002905284],
+    [1, 2, 14.6407900162154],
+    [2, 2, -3.2747778718823],
+])
+
+
+
+def _vectorized(function):
+    """Broadcast the inputs to flat arrays and restore the shape of outputs."""
+
+    @functools.wraps(function)
+    def wrapper(*args):
+        arrays = np.broadcast_arrays(*[np.asarray(a, dtype=float) for a in args])
+        shape = arrays[0].shape
+        result = function(*[a.ravel() for a in arrays])
+        if isinstance(result, dict):
+            return {key: _reshape(value, shape) for key, value in result.items()}
+        return _reshape(result, shape)
+
+    return wrapper
+
+
+def _reshape(value, shape):
+    value = value.reshape(shape)
+    if shape == ():
+        return value.item()
+    return value
+
+
+def _series(table, x, y):
+    r"""Evaluate :math:`\sum n_i \cdot x^{I_i} \cdot y^{J_i}` per state."""
+    I, J, n = table.T
+    return (n * x[:, None] ** I * y[:, None] ** J).sum(axis=1)
+
+
+def _region1(p, T):
+    r"""
+    Calculate the properties of region 1 (Gibbs free energy).
+
+    Returns
+    -------
+    tuple
+        Specific volume, enthalpy, entropy and isobaric heat capacity.
+    """
+    pi = p / 16.53e6
+    tau = 1386 / T
+    I, J, n = _REGION1.T
+    a = (7.1 - pi)[:, None]
+    b = (tau - 1.222)[:, None]
+    aI = a ** I
+    bJ = b ** J
+    g = (n * aI * bJ).sum(axis=1)
+    g_pi = -(n * I * a ** (I - 1) * bJ).sum(axis=1)
+    g_tau = (n * J * aI * b ** (J - 1)).sum(axis=1)
+    g_tautau = (n * J * (J - 1) * aI * b ** (J - 2)).sum(axis=1)
+
+    v = pi * g_pi * R * T / p
+    h = tau * g_tau * R * T
+    s = R * (tau * g_tau - g)
+    cp = -R * tau ** 2 * g_tautau
+    return v, h, s, cp
+
+
+def _gas_region(p, T, T_star, tau_shift, ideal, residual):
+    r"""
+    Calculate the properties of regions 2 and 5 (Gibbs free energy).
+
+    Returns
+    -------
+    tuple
+        Specific volume, enthalpy, entropy and isobaric heat capacity.
+    """
+    pi = p / 1e6
+    tau = T_star / T
+    J0, n0 = ideal.T
+    t = tau[:, None]
+    g0 = np.log(pi) + (n0 * t ** J0).sum(axis=1)
+    g0_tau = (n0 * J0 * t ** (J0 - 1)).sum(axis=1)
+    g0_tautau = (n0 * J0 * (J0 - 1) * t ** (J0 - 2)).sum(axis=1)
+
+    I, J, n = residual.T
+    a = pi[:, None]
+    b = t - tau_shift
+    aI = a ** I
+    bJ = b ** J
+    gr = (n * aI * bJ).sum(axis=1)
+    gr_pi = (n * I * a ** (I - 1) * bJ).sum(axis=1)
+    gr_tau = (n * J * aI * b ** (J - 1)).sum(axis=1)
+    gr_tautau = (n * J * (J - 1) * aI * b ** (J - 2)).sum(axis=1)
+
+    v = R * T / p * (1 + pi * gr_pi)
+    h = R * T * tau * (g0_tau + gr_tau)
+    s = R * (tau * (g0_tau + gr_tau) - (g0 + gr))
+    cp = -R * tau ** 2 * (g0_tautau + gr_tautau)
+    return v, h, s, cp
+
+
+def _region2(p, T):
+    return _gas_region(p, T, 540, 0.5, _REGION2_IDEAL, _REGION2_RESIDUAL)
+
+
+def _region5(p, T):
+    return _gas_region(p, T, 1000, 0, _REGION5_IDEAL, _REGION5_RESIDUAL)
+
+
+def _region3(rho, T):
+    r"""
+    Calculate the properties of region 3 (Helmholtz free energy).
+
+    Returns
+    -------
+    dict
+        Pressure, enthalpy, entropy, isobaric heat capacity and the partial
+        derivatives of pressure, enthalpy and entropy with respect to density
+        and temperature.
+    """
+    delta = rho / RHO_CRIT
+    tau = T_CRIT / T
+    I, J, n = _REGION3.T
+    d = delta[:, None]
+    t = tau[:, None]
+    dI = d ** I
+    tJ = t ** J
+    dI_1 = d ** (I - 1)
+    tJ_1 = t ** (J - 1)
+    phi = _REGION3_N1 * np.log(delta) + (n * dI * tJ).sum(axis=1)
+    phi_d = _REGION3_N1 / delta + (n * I * dI_1 * tJ).sum(axis=1)
+    phi_dd = (
+        -_REGION3_N1 / delta ** 2
+        + (n * I * (I - 1) * d ** (I - 2) * tJ).sum(axis=1)
+    )
+    phi_t = (n * J * dI * tJ_1).sum(axis=1)
+    phi_tt = (n * J * (J - 1) * dI * t ** (J - 2)).sum(axis=1)
+    phi_dt = (n * I * J * dI_1 * tJ_1).sum(axis=1)
+
+    p = rho * R * T * delta * phi_d
+    h = R * T * (tau * phi_t + delta * phi_d)
+    s = R * (tau * phi_t - phi)
+    a = delta * phi_d - delta * tau * phi_dt
+    b = 2 * delta * phi_d + delta ** 2 * phi_dd
+    cp = R * (-tau ** 2 * phi_tt + a ** 2 / b)
+    return {
+        "p": p, "h": h, "s": s, "cp": cp,
+        "p_rho": R * T * b,
+        "p_T": rho * R * a,
+        "h_rho": R * T / RHO_CRIT * (tau * phi_dt + phi_d + delta * phi_dd),
+        "h_T": R * (-tau ** 2 * phi_tt + a),
+        "s_rho": R / RHO_CRIT * (tau * phi_dt - phi_d),
+        "s_T": -R * tau ** 2 * phi_tt / T,
+    }
+
+
+def _region3_p(rho, T):
+    r"""Calculate pressure and its derivative to density in region 3."""
+    delta = rho / RHO_CRIT
+    I, J, n = _REGION3.T
+    d = delta[:, None]
+    tJ = (T_CRIT / T)[:, None] ** J
+    phi_d = _REGION3_N1 / delta + (n * I * d ** (I - 1) * tJ).sum(axis=1)
+    phi_dd = (
+        -_REGION3_N1 / delta ** 2
+        + (n * I * (I - 1) * d ** (I - 2) * tJ).sum(axis=1)
+    )
+    p = rho * R * T * delta * phi_d
+    p_rho = R * T * (2 * delta * phi_d + delta ** 2 * phi_dd)
+    return p, p_rho
+
+
+def _p_sat(T):
+    n = _REGION4
+    theta = T + n[8] / (T - n[9])
+    A = theta ** 2 + n[0] * theta + n[1]
+    B = n[2] * theta ** 2 + n[3] * theta + n[4]
+    C = n[5] * theta ** 2 + n[6] * theta + n[7]
+    p = (2 * C / (-B + (B ** 2 - 4 * A * C) ** 0.5)) ** 4 * 1e6
+    return np.where((T >= T_MIN) & (T <= T_CRIT), p, np.nan)
+
+
+def _T_sat(p):
+    n = _REGION4
+    beta = (p / 1e6) ** 0.25
+    E = beta ** 2 + n[2] * beta + n[5]
+    F = n[0] * beta ** 2 + n[3] * beta + n[6]
+    G = n[1] * beta ** 2 + n[4] * beta + n[7]
+    D = 2 * G / (-F - (F ** 2 - 4 * E * G) ** 0.5)
+    T = (n[9] + D - ((n[9] + D) ** 2 - 4 * (n[8] + n[9] * D)) ** 0.5) / 2
+    return np.where((p >= _P_SAT_MIN) & (p <= P_CRIT), T, np.nan)
+
+
+def _p_b23(T):
+    return (_B23[0] + _B23[1] * T + _B23[2] * T ** 2) * 1e6
+
+
+def _T_b23(p):
+    return _B23[3] + ((p / 1e6 - _B23[4]) / _B23[2]) ** 0.5
+
+
+_P_SAT_MIN = 611.212677
+_P_SAT_13 = float(_p_sat(np.array([_T_13]))[0])
+
+
+def _rho_region3(p, T, liquid):
+    r"""
+    Calculate the density in region 3 from pressure and temperature.
+
+    The density is found with a bracketed Newton method. Liquid states start
+    at the high density end, vapor states at the low density end of the
+    bracket. Both branches converge monotonously to the outermost roots,
+    which are the liquid and the vapor density in the two-phase region.
+    """
+    p_13 = np.maximum(p, _P_SAT_13)
+    upper = 1.1 / _region1(p_13, np.full_like(p, _T_13))[0]
+    lower = 0.9 / _region2(p_13, _T_b23(p_13))[0]
+    rho = np.where(liquid, upper, lower)
+
+    active = np.arange(len(p))
+    for _ in range(100):
+        p_calc, p_rho = _region3_p(rho[active], T[active])
+        f = p_calc - p[active]
+        lower[active] = np.where(f < 0, rho[active], lower[active])
+        upper[active] = np.where(f > 0, rho[active], upper[active])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rho_new = rho[active] - f / p_rho
+        outside = (
+            ~np.isfinite(rho_new)
+            | (rho_new <= lower[active]) | (rho_new >= upper[active])
+        )
+        rho_new = np.where(
+            outside, (lower[active] + upper[active]) / 2, rho_new
+        )
+        converged = abs(rho_new - rho[active]) <= 1e-12 * rho_new
+        rho[active] = rho_new
+        active = active[~converged]
+        if len(active) == 0:
+            break
+
+    return rho
+
+
+def _saturation(p, T):
+    r"""
+    Calculate the properties of saturated liquid and saturated vapor.
+
+    Returns
+    -------
+    tuple
+        Arrays of specific volume, enthalpy and entropy of saturated liquid
+        and saturated vapor.
+    """
+    liquid = np.full((3, len(p)), np.nan)
+    vapor = np.full((3, len(p)), np.nan)
+
+    low = T <= _T_13
+    if low.any():
+        liquid[:, low] = _region1(p[low], T[low])[:3]
+        vapor[:, low] = _region2(p[low], T[low])[:3]
+
+    high = (T > _T_13) & (T <= T_CRIT)
+    if high.any():
+        p_high, T_high = p[high], T[high]
+        for phase, is_liquid in [(liquid, True), (vapor, False)]:
+            rho = _rho_region3(
+                p_high, T_high, np.full(len(p_high), is_liquid)
+            )
+            props = _region3(rho, T_high)
+            phase[:, high] = [1 / rho, props["h"], props["s"]]
+
+    return liquid, vapor
+
+
+def _region_pT(p, T):
+    r"""Return the region number of each state (0 outside of validity)."""
+    region = np.zeros(len(p), dtype=int)
+    valid = (T >= T_MIN) & (T <= T_MAX) & (p > 0) & (p <= P_MAX)
+
+    low = valid & (T <= _T_13)
+    p_sat = np.where(low, _p_sat(np.minimum(T, _T_13)), np.nan)
+    region[low & (p >= p_sat)] = 1
+    region[low & (p < p_sat)] = 2
+
+    medium = valid & (T > _T_13) & (T <= _T_25)
+    region3 = medium & (p > _p_b23(T))
+    region[region3] = 3
+    region[medium & ~region3] = 2
+
+    region[valid & (T > _T_25) & (p <= _P_MAX_5)] = 5
+    return region
+
+
+def _properties_pT(p, T):
+    region = _region_pT(p, T)
+    v, h, s, cp = np.full((4, len(p)), np.nan)
+
+    for number, function in [(1, _region1), (2, _region2), (5, _region5)]:
+        mask = region == number
+        if mask.any():
+            v[mask], h[mask], s[mask], cp[mask] = function(p[mask], T[mask])
+
+    mask = region == 3
+    if mask.any():
+        p_3, T_3 = p[mask], T[mask]
+        liquid = (T_3 < T_CRIT) & (p_3 > _p_sat(np.minimum(T_3, T_CRIT)))
+        rho = _rho_region3(p_3, T_3, liquid)
+        props = _region3(rho, T_3)
+        v[mask] = 1 / rho
+        h[mask], s[mask], cp[mask] = props["h"], props["s"], props["cp"]
+
+    return {"v": v, "h": h, "s": s, "cp": cp}
+
+
+def _backward1(p, y, prop):
+    pi = p / 1e6
+    if prop == "h":
+        return _series(_BACKWARD1_T_PH, pi, y / 2500e3 + 1)
+    return _series(_BACKWARD1_T_PS, pi, y / 1e3 + 2)
+
+
+def _backward2(p, y, prop):
+    pi = p / 1e6
+    T = np.empty(len(p))
+    if prop == "h":
+        eta = y / 2000e3
+        h_2bc = 2652.6571908428e3 + (
+            (np.maximum(pi, 6.546699678) - 4.5257578905948)
+            / 1.2809002730136e-4
+        ) ** 0.5 * 1e3
+        a = pi <= 4
+        c = (pi > 6.546699678) & (y < h_2bc)
+        b = ~a & ~c
+        T[a] = _series(_BACKWARD2A_T_PH, pi[a], eta[a] - 2.1)
+        T[b] = _series(_BACKWARD2B_T_PH, pi[b] - 2, eta[b] - 2.6)
+        T[c] = _series(_BACKWARD2C_T_PH, pi[c] + 25, eta[c] - 1.8)
+    else:
+        sigma = y / 1e3
+        a = pi <= 4
+        b = ~a & (sigma >= 5.85)
+        c = ~a & ~b
+        T[a] = _series(_BACKWARD2A_T_PS, pi[a], sigma[a] / 2 - 2)
+        T[b] = _series(_BACKWARD2B_T_PS, pi[b], 10 - sigma[b] / 0.7853)
+        T[c] = _series(_BACKWARD2C_T_PS, pi[c], 2 - sigma[c] / 2.9251)
+    return T
+
+
+def _backward3(p, y, prop):
+    pi = p / 100e6
+    T = np.empty(len(p))
+    v = np.empty(len(p))
+    if prop == "h":
+        P = p / 1e6
+        h_3ab = (
+            2014.64004206875 + 3.74696550136983 * P
+            - 0.0219921901054187 * P ** 2 + 8.7513168600995e-05 * P ** 3
+        ) * 1e3
+        a = y <= h_3ab
+        b = ~a
+        T[a] = 760 * _series(_BACKWARD3A_T_PH, pi[a] + 0.24, y[a] / 2300e3 - 0.615)
+        T[b] = 860 * _series(_BACKWARD3B_T_PH, pi[b] + 0.298, y[b] / 2800e3 - 0.72)
+        v[a] = 0.0028 * _series(_BACKWARD3A_V_PH, pi[a] + 0.128, y[a] / 2100e3 - 0.727)
+        v[b] = 0.0088 * _series(_BACKWARD3B_V_PH, pi[b] + 0.0661, y[b] / 2800e3 - 0.72)
+    else:
+        a = y <= S_CRIT
+        b = ~a
+        T[a] = 760 * _series(_BACKWARD3A_T_PS, pi[a] + 0.24, y[a] / 4.4e3 - 0.703)
+        T[b] = 860 * _series(_BACKWARD3B_T_PS, pi[b] + 0.76, y[b] / 5.3e3 - 0.818)
+        v[a] = 0.0028 * _series(_BACKWARD3A_V_PS, pi[a] + 0.187, y[a] / 4.4e3 - 0.755)
+        v[b] = 0.0088 * _series(_BACKWARD3B_V_PS, pi[b] + 0.298, y[b] / 5.3e3 - 0.816)
+    return T, v
+
+
+def _refine_T(p, y, T, prop, function, max_iter=10):
+    r"""Refine the temperature with the basic equation of a region."""
+    index = 1 if prop == "h" else 2
+    active = np.arange(len(p))
+    for _ in range(max_iter):
+        props = function(p[active], T[active])
+        derivative = props[3]
+        if prop == "s":
+            derivative = derivative / T[active]
+        dT = (props[index] - y[active]) / derivative
+        T[active] -= dT
+        active = active[~(abs(dT) <= 1e-10 * T[active])]
+        if len(active) == 0:
+            break
+    return T
+
+
+def _refine_region3(p, y, T, rho, prop, max_iter=20):
+    r"""Refine temperature and density with the basic equation."""
+    active = np.arange(len(p))
+    for _ in range(max_iter):
+        props = _region3(rho[active], T[active])
+        f1 = props["p"] - p[active]
+        f2 = props[prop] - y[active]
+        a, b = props["p_rho"], props["p_T"]
+        c, d = props[prop + "_rho"], props[prop + "_T"]
+        det = a * d - b * c
+        drho = (d * f1 - b * f2) / det
+        dT = (a * f2 - c * f1) / det
+        rho[active] -= drho
+        T[active] -= dT
+        converged = (
+            (abs(dT) <= 1e-10 * T[active])
+            & (abs(drho) <= 1e-10 * rho[active])
+        )
+        active = active[~converged]
+        if len(active) == 0:
+            break
+    return T, rho
+
+
+def _properties_py(p, y, prop):
+    r"""
+    Calculate the state from pressure and enthalpy or entropy.
+
+    Parameters
+    ----------
+    p : ndarray
+        Pressure.
+
+    y : ndarray
+        Specific enthalpy or specific entropy.
+
+    prop : str
+        :code:`"h"` for enthalpy and :code:`"s"` for entropy as second input.
+
+    Returns
+    -------
+    dict
+        Temperature, specific volume, the other caloric property and vapor
+        mass fraction (-1 for single phase states).
+    """
+    other = "s" if prop == "h" else "h"
+    index = 1 if prop == "h" else 2
+    num = len(p)
+    T, v, z = np.full((3, num), np.nan)
+    x = np.full(num, -1.0)
+    region = np.zeros(num, dtype=int)
+
+    valid = (p > 0) & (p <= P_MAX)
+    T_s = np.where(valid & (p <= P_CRIT), _T_sat(np.minimum(p, P_CRIT)), np.nan)
+
+    # low pressure: region 1, 2 (or 5) and two-phase from region 1 and 2
+    low = valid & (p <= _P_SAT_13)
+    below_triple = low & (p < _P_SAT_MIN)
+    region[below_triple] = 2
+    sat = low & ~below_triple
+    liquid = np.full((3, num), np.nan)
+    vapor = np.full((3, num), np.nan)
+    if sat.any():
+        liquid[:, sat] = _region1(p[sat], T_s[sat])[:3]
+        vapor[:, sat] = _region2(p[sat], T_s[sat])[:3]
+        y_l, y_v = liquid[index, sat], vapor[index, sat]
+        region[sat] = np.where(
+            y[sat] <= y_l, 1, np.where(y[sat] >= y_v, 2, 4)
+        )
+
+    # high pressure: region 1, 3, 2 (or 5) and two-phase from region 3
+    high = valid & (p > _P_SAT_13)
+    if high.any():
+        p_high, y_high = p[high], y[high]
+        y_13 = _region1(p_high, np.full(len(p_high), _T_13))[index]
+        y_23 = _region2(p_high, _T_b23(p_high))[index]
+        region[high] = np.where(
+            y_high <= y_13, 1, np.where(y_high >= y_23, 2, 3)
+        )
+        dome = high & (region == 3) & (p < P_CRIT)
+        if dome.any():
+            liquid[:, dome], vapor[:, dome] = _saturation(p[dome], T_s[dome])
+            y_l, y_v = liquid[index, dome], vapor[index, dome]
+            region[dome] = np.where((y[dome] > y_l) & (y[dome] < y_v), 4, 3)
+
+    # region 5 above the upper temperature limit of region 2
+    gas = region == 2
+    if gas.any():
+        y_25 = _region2(p[gas], np.full(gas.sum(), _T_25))[index]
+        region[gas] = np.where(
+            y[gas] > y_25, np.where(p[gas] <= _P_MAX_5, 5, 0), 2
+        )
+
+    mask = region == 1
+    if mask.any():
+        T[mask] = _refine_T(
+            p[mask], y[mask], _backward1(p[mask], y[mask], prop), prop,
+            _region1
+        )
+
+    mask = region == 2
+    if mask.any():
+        T_0 = _backward2(p[mask], y[mask], prop)
+        T_0 = np.where(np.isnan(T_s[mask]), T_0, np.maximum(T_0, T_s[mask]))
+        T[mask] = _refine_T(p[mask], y[mask], T_0, prop, _region2)
+
+    mask = region == 5
+    if mask.any():
+        T[mask] = _refine_T(
+            p[mask], y[mask], np.full(mask.sum(), 1500.0), prop, _region5,
+            max_iter=20
+        )
+
+    for number, function in [(1, _region1), (2, _region2), (5, _region5)]:
+        mask = (region == number) & (T <= T_MAX)
+        if mask.any():
+            props = function(p[mask], T[mask])
+            v[mask], z[mask] = props[0], props[3 - index]
+
+    mask = region == 3
+    if mask.any():
+        T_0, v_0 = _backward3(p[mask], y[mask], prop)
+        T[mask], rho = _refine_region3(p[mask], y[mask], T_0, 1 / v_0, prop)
+        v[mask] = 1 / rho
+        z[mask] = _region3(rho, T[mask])[other]
+
+    mask = region == 4
+    if mask.any():
+        y_l, y_v = liquid[index, mask], vapor[index, mask]
+        x[mask] = (y[mask] - y_l) / (y_v - y_l)
+        T[mask] = T_s[mask]
+        v[mask] = liquid[0, mask] + x[mask] * (vapor[0, mask] - liquid[0, mask])
+        z[mask] = (
+            liquid[3 - index, mask]
+            + x[mask] * (vapor[3 - index, mask] - liquid[3 - index, mask])
+        )
+
+    invalid = (region == 0) | ~(T <= T_MAX)
+    T[invalid], v[invalid], z[invalid] = np.nan, np.nan, np.nan
+    return {"T": T, "v": v, other: z, "x": x}
+
+
+@_vectorized
+def p_sat(T):
+    r"""Saturation pressure p / Pa from temperature T / K."""
+    return _p_sat(T)
+
+
+@_vectorized
+def T_sat(p):
+    r"""Saturation temperature T / K from pressure p / Pa."""
+    return _T_sat(p)
+
+
+@_vectorized
+def properties_pT(p, T):
+    r"""
+    Calculate the properties from pressure and temperature.
+
+    Parameters
+    ----------
+    p : float, ndarray
+        Pressure p / Pa.
+
+    T : float, ndarray
+        Temperature T / K.
+
+    Returns
+    -------
+    dict
+        Specific volume :code:`"v"` / (m3/kg), specific enthalpy :code:`"h"`
+        / (J/kg), specific entropy :code:`"s"` and specific isobaric heat
+        capacity :code:`"cp"` / (J/(kgK)).
+
+    Example
+    -------
+    Enthalpy of liquid water at 300 K and 3 MPa and of steam at 1500 K and
+    0.5 MPa (verification values of regions 1 and 5 of the IAPWS release).
+
+    >>> from tespy.tools.fluid_properties import if97
+    >>> props = if97.properties_pT([3e6, 0.5e6], [300, 1500])
+    >>> [round(h / 1e3, 5) for h in props["h"]]
+    [115.33127, 5219.76855]
+    """
+    return _properties_pT(p, T)
+
+
+@_vectorized
+def properties_ph(p, h):
+    r"""
+    Calculate the properties from pressure and specific enthalpy.
+
+    Parameters
+    ----------
+    p : float, ndarray
+        Pressure p / Pa.
+
+    h : float, ndarray
+        Specific enthalpy h / (J/kg).
+
+    Returns
+    -------
+    dict
+        Temperature :code:`"T"` / K, specific volume :code:`"v"` / (m3/kg),
+        specific entropy :code:`"s"` / (J/(kgK)) and vapor mass fraction
+        :code:`"x"` (-1 for single phase states).
+    """
+    return _properties_py(p, h, "h")
+
+
+@_vectorized
+def properties_ps(p, s):
+    r"""
+    Calculate the properties from pressure and specific entropy.
+
+    Parameters
+    ----------
+    p : float, ndarray
+        Pressure p / Pa.
+
+    s : float, ndarray
+        Specific entropy s / (J/(kgK)).
+
+    Returns
+    -------
+    dict
+        Temperature :code:`"T"` / K, specific volume :code:`"v"` / (m3/kg),
+        specific enthalpy :code:`"h"` / (J/kg) and vapor mass fraction
+        :code:`"x"` (-1 for single phase states).
+    """
+    return _properties_py(p, s, "s")
+
+
+@_vectorized
+def properties_QT(Q, T):
+    r"""
+    Calculate the properties of a saturated state from temperature.
+
+    Parameters
+    ----------
+    Q : float, ndarray
+        Vapor mass fraction.
+
+    T : float, ndarray
+        Saturation temperature T / K.
+
+    Returns
+    -------
+    dict
+        Pressure :code:`"p"` / Pa, specific volume :code:`"v"` / (m3/kg),
+        specific enthalpy :code:`"h"` / (J/kg) and specific entropy
+        :code:`"s"` / (J/(kgK)).
+    """
+    p = _p_sat(T)
+    liquid, vapor = _saturation(p, T)
+    v, h, s = liquid + Q * (vapor - liquid)
+    return {"p": p, "v": v, "h": h, "s": s}
+
+
+@_vectorized
+def properties_pQ(p, Q):
+    r"""
+    Calculate the properties of a saturated state from pressure.
+
+    Parameters
+    ----------
+    p : float, ndarray
+        Saturation pressure p / Pa.
+
+    Q : float, ndarray
+        Vapor mass fraction.
+
+    Returns
+    -------
+    dict
+        Temperature :code:`"T"` / K, specific volume :code:`"v"` / (m3/kg),
+        specific enthalpy :code:`"h"` / (J/kg) and specific entropy
+        :code:`"s"` / (J/(kgK)).
+    """
+    T = _T_sat(p)
+    liquid, vapor = _saturation(p, T)
+    v, h, s = liquid + Q * (vapor - liquid)
+    return {"T": T, "v": v, "h": h, "s": s}
+
+
+@_vectorized
+def viscosity(rho, T):
+    r"""
+    Dynamic viscosity / (Pa s) from density and temperature.
+
+    The viscosity is calculated according to the IAPWS 2008 release on the
+    viscosity of ordinary water substance for industrial use, i.e. without
+    the critical enhancement.
+    """
+    T_r = T / T_CRIT
+    rho_r = rho / RHO_CRIT
+    i = np.arange(len(_VISCOSITY_IDEAL))
+    mu_0 = 100 * T_r ** 0.5 / (_VISCOSITY_IDEAL / T_r[:, None] ** i).sum(axis=1)
+    mu_1 = np.exp(rho_r * _series(_VISCOSITY_RESIDUAL, 1 / T_r - 1, rho_r - 1))
+    return mu_0 * mu_1 * 1e-6
@@ -19,6 +19,7 @@ from tespy.tools.global_vars import gas_constants
 from .helpers import _is_larger_than_precision
 from .helpers import calc_molar_mass_mixture
 from .helpers import get_molar_fractions
+from .helpers import get_saturation_engine
 
 
 def h_mix_pT_ideal(p=None, T=None, fluid_data=None, **kwargs):
@@ -46,8 +47,9 @@ def h_mix_pT_ideal_cond(p=None, T=None, fluid_data=None, **kwargs):
         for fluid, data in fluid_data.items():
             if _is_larger_than_precision(data["mass_fraction"]):
                 if fluid == water_alias:
-                    h += fluid_data[water_alias]["wrapper"].h_QT(0, T) * mass_liquid
-                    h += fluid_data[water_alias]["wrapper"].h_QT(1, T) * mass_fractions_gas[fluid] * (1 - mass_liquid)
+                    water = get_saturation_engine(fluid_data[water_alias]["wrapper"])
+                    h += water.h_QT(0, T) * mass_liquid
+                    h += water.h_QT(1, T) * mass_fractions_gas[fluid] * (1 - mass_liquid)
                 else:
                     pp = p * molar_fraction_gas[fluid]
                     h += data["wrapper"].h_pT(pp, T) * mass_fractions_gas[fluid] * (1 - mass_liquid)
@@ -65,8 +67,9 @@ def h_mix_pT_forced_gas(p, T, fluid_data, **kwargs):
         if _is_larger_than_precision(data["mass_fraction"]):
             pp = p * molar_fractions[fluid]
             if fluid == "H2O" and pp >= data["wrapper"]._p_min:
-                if T <= data["wrapper"].T_sat(pp):
-                    h += data["wrapper"].h_QT(1, T) * data["mass_fraction"]
+                water = get_saturation_engine(data["wrapper"])
+                if T <= water.T_sat(pp):
+                    h += water.h_QT(1, T) * data["mass_fraction"]
                 else:
                     h += data["wrapper"].h_pT(pp, T) * data["mass_fraction"]
             else:
@@ -85,6 +88,55 @@ def h_mix_pT_incompressible(p, T, fluid_data, **kwargs):
     return h
 
 
+def cp_mix_pT_ideal(p=None, T=None, fluid_data=None, **kwargs):
+    molar_fractions = get_molar_fractions(fluid_data)
+
+    cp = 0
+    for fluid, data in fluid_data.items():
+
+        if _is_larger_than_precision(data["mass_fraction"]):
+            pp = p * molar_fractions[fluid]
+            cp += data["wrapper"].cp_pT(pp, T) * data["mass_fraction"]
+
+    return cp
+
+
+def cp_mix_pT_ideal_cond(p=None, T=None, fluid_data=None, **kwargs):
+
+    water_alias = _water_in_mixture(fluid_data)
+    if water_alias:
+        water_alias = next(iter(water_alias))
+        _, _, mass_liquid, _ = cond_check(p, T, fluid_data, water_alias)
+        if _is_larger_than_precision(mass_liquid):
+            # the amount of condensing water changes with temperature, no
+            # analytical derivative available
+            return np.nan
+
+    return cp_mix_pT_ideal(p, T, fluid_data, **kwargs)
+
+
+def cp_mix_pT_incompressible(p=None, T=None, fluid_data=None, **kwargs):
+
+    cp = 0
+    for data in fluid_data.values():
+        if _is_larger_than_precision(data["mass_fraction"]):
+            cp += data["wrapper"].cp_pT(p, T) * data["mass_fraction"]
+
+    return cp
+
+
+def ds_mix_dT_pT_ideal(p=None, T=None, fluid_data=None, **kwargs):
+    return cp_mix_pT_ideal(p, T, fluid_data, **kwargs) / T
+
+
+def ds_mix_dT_pT_ideal_cond(p=None, T=None, fluid_data=None, **kwargs):
+    return cp_mix_pT_ideal_cond(p, T, fluid_data, **kwargs) / T
+
+
+def ds_mix_dT_pT_incompressible(p=None, T=None, fluid_data=None, **kwargs):
+    return cp_mix_pT_incompressible(p, T, fluid_data, **kwargs) / T
+
+
 def s_mix_pT_ideal(p=None, T=None, fluid_data=None, **kwargs):
     molar_fractions = get_molar_fractions(fluid_data)
 
@@ -303,8 +355,9 @@ def cond_check(p, T, fluid_data, water_alias):
     water_mass_liquid = 0
     water_molar_liquid = 0
 
-    if fluid_data[water_alias]["wrapper"]._is_below_T_critical(T):
-        p_sat = fluid_data[water_alias]["wrapper"].p_sat(T)
+    wrapper = fluid_data[water_alias]["wrapper"]
+    if wrapper._is_below_T_critical(T):
+        p_sat = get_saturation_engine(wrapper).p_sat(T)
         pp_water = p * molar_fractions[water_alias]
 
         if p_sat < pp_water:
@@ -340,6 +393,13 @@ T_MIX_PH_REVERSE = {
 }
 
 
+T_MIX_PH_REVERSE_DERIVATIVE = {
+    "ideal": cp_mix_pT_ideal,
+    "ideal-cond": cp_mix_pT_ideal_cond,
+    "incompressible": cp_mix_pT_incompressible
+}
+
+
 T_MIX_PS_REVERSE = {
     "ideal": s_mix_pT_ideal,
     "ideal-cond": s_mix_pT_ideal_cond,
@@ -347,6 +407,13 @@ T_MIX_PS_REVERSE = {
 }
 
 
+T_MIX_PS_REVERSE_DERIVATIVE = {
+    "ideal": ds_mix_dT_pT_ideal,
+    "ideal-cond": ds_mix_dT_pT_ideal_cond,
+    "incompressible": ds_mix_dT_pT_incompressible
+}
+
+
 H_MIX_PT_DIRECT = {
     "ideal": h_mix_pT_ideal,
     "ideal-cond": h_mix_pT_ideal_cond,
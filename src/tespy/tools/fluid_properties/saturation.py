@@ -0,0 +1,387 @@
+# -*- coding: utf-8
+
+"""Module for the cached saturation curves of pure fluids.
+
+The saturation lookups (saturation temperature and pressure, enthalpy of
+saturated liquid and saturated vapor and their derivatives) are interpolated
+with piecewise cubic Hermite splines. The splines are built from the fluid
+property back end on first use of the cache of a fluid.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+tespy/tools/fluid_properties/saturation.py
+
+SPDX-License-Identifier: MIT
+"""
+
+import math
+from bisect import bisect_right
+
+import numpy as np
+
+from tespy.tools import logger
+
+# saturation caches per wrapper type, fluid and back end
+_SATURATION_CACHES = {}
+
+
+class HermiteSpline:
+    r"""
+    Piecewise cubic Hermite spline.
+
+    Parameters
+    ----------
+    x : ndarray
+        Strictly increasing nodes.
+
+    y : ndarray
+        Values at the nodes.
+
+    dy : ndarray
+        Derivatives at the nodes.
+
+    Note
+    ----
+    If the values at the nodes are monotonous, the derivatives are limited
+    according to Fritsch and Carlson, which guarantees a monotonous spline
+    :cite:`Fritsch1980`. Otherwise, the derivatives are used as passed.
+    """
+
+    def __init__(self, x, y, dy):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        dy = np.array(dy, dtype=float)
+        delta = np.diff(y) / np.diff(x)
+        if (delta > 0).all() or (delta < 0).all():
+            self._limit(dy, delta)
+
+        self.x = x.tolist()
+        self.y = y.tolist()
+        self.dy = dy.tolist()
+
+    @staticmethod
+    def _limit(dy, delta):
+        dy[np.sign(dy) != np.sign(np.r_[delta, delta[-1]])] = 0
+        dy[np.sign(dy) != np.sign(np.r_[delta[0], delta])] = 0
+        alpha = dy[:-1] / delta
+        beta = dy[1:] / delta
+        radius = alpha ** 2 + beta ** 2
+        for i in np.where(radius > 9)[0]:
+            tau = 3 / radius[i] ** 0.5
+            dy[i] = tau * alpha[i] * delta[i]
+            dy[i + 1] = tau * beta[i] * delta[i]
+
+    def _interval(self, x):
+        i = bisect_right(self.x, x) - 1
+        i = min(max(i, 0), len(self.x) - 2)
+        h = self.x[i + 1] - self.x[i]
+        return i, h, (x - self.x[i]) / h
+
+    def __call__(self, x):
+        i, h, t = self._interval(x)
+        t2 = t * t
+        t3 = t2 * t
+        return (
+            (2 * t3 - 3 * t2 + 1) * self.y[i]
+            + (t3 - 2 * t2 + t) * h * self.dy[i]
+            + (-2 * t3 + 3 * t2) * self.y[i + 1]
+            + (t3 - t2) * h * self.dy[i + 1]
+        )
+
+    def derivative(self, x):
+        i, h, t = self._interval(x)
+        t2 = t * t
+        return (
+            (6 * t2 - 6 * t) * (self.y[i] - self.y[i + 1]) / h
+            + (3 * t2 - 4 * t + 1) * self.dy[i]
+            + (3 * t2 - 2 * t) * self.dy[i + 1]
+        )
+
+
+class SaturationCache:
+    r"""
+    Cache of the saturation curve of a pure fluid.
+
+    The cache interpolates the saturation temperature :math:`T_\mathrm{sat}`,
+    the enthalpy of saturated liquid :math:`h'` and saturated vapor
+    :math:`h''` over the logarithm of pressure and the logarithm of the
+    saturation pressure over temperature. The splines cover the range from
+    the minimum pressure of the fluid to slightly below the critical point,
+    where the enthalpy curves become infinitely steep. Outside of that range
+    all calls are passed to the fluid property wrapper.
+
+    Parameters
+    ----------
+    wrapper : tespy.tools.fluid_properties.wrappers.FluidPropertyWrapper
+        Wrapper of the fluid.
+
+    tol : float
+        Relative tolerance of the splines, default value: 1e-9.
+
+    tol_p_sat : float
+        Relative tolerance of the saturation pressure, default value: 1e-7.
+        The tolerance is limited by the consistency of the saturation
+        pressure and temperature of the fluid property back end.
+
+    p_crit_margin : float
+        Relative distance of the upper end of the splines to the critical
+        pressure, default value: 1e-2.
+
+    Note
+    ----
+    The splines are built on first use. The derivatives at the nodes are
+    calculated with central finite differences of the wrapper calls and the
+    nodes are placed adaptively to meet the tolerance.
+
+    Example
+    -------
+    >>> from tespy.tools.fluid_properties.saturation import SaturationCache
+    >>> from tespy.tools.fluid_properties.wrappers import CoolPropWrapper
+    >>> water = CoolPropWrapper("water")
+    >>> cache = SaturationCache(water)
+    >>> round(cache.T_sat(1e5), 4) == round(water.T_sat(1e5), 4)
+    True
+    >>> round(cache.h_pQ(1e5, 0.5)) == round(water.h_pQ(1e5, 0.5))
+    True
+    """
+
+    def __init__(self, wrapper, tol=1e-9, tol_p_sat=1e-7, p_crit_margin=1e-2):
+        self.wrapper = wrapper
+        self.tol = tol
+        self.tol_p_sat = tol_p_sat
+        self.p_crit_margin = p_crit_margin
+        self.built = False
+        self.available = True
+
+    def build(self):
+        r"""Build the splines from the fluid property wrapper."""
+        self.built = True
+        wrapper = self.wrapper
+        try:
+            if wrapper._T_crit is None:
+                raise ValueError("The fluid has no saturation curve.")
+            T_min = max(wrapper._T_min, wrapper.T_sat(wrapper._p_min))
+            p_min = wrapper.p_sat(T_min) * (1 + 1e-4)
+            self._fit(p_min, self._find_p_max())
+
+        except (ValueError, NotImplementedError) as e:
+            self.available = False
+            msg = (
+                "Could not build the saturation cache for fluid "
+                f"{wrapper.fluid}, the fluid property back end is used "
+                f"instead: {e}"
+            )
+            logger.debug(msg)
+
+    def _find_p_max(self):
+        # some back ends fail to converge close to the critical point
+        margin = self.p_crit_margin
+        while margin < 0.1:
+            p_max = self.wrapper._p_crit * (1 - margin)
+            try:
+                self._derivatives(np.array([p_max]))
+                return p_max
+            except ValueError:
+                margin *= 2
+
+        msg = "The saturation curve cannot be evaluated near critical point."
+        raise ValueError(msg)
+
+    def _evaluate(self, p):
+        wrapper = self.wrapper
+        return np.array([
+            [wrapper.T_sat(value), wrapper.h_pQ(value, 0),
+             wrapper.h_pQ(value, 1)]
+            for value in p
+        ])
+
+    def _derivatives(self, p):
+        # central finite differences with respect to ln(p)
+        d = 1e-6
+        upper = self._evaluate(p * (1 + d))
+        lower = self._evaluate(p * (1 - d))
+        return (upper - lower) / (math.log(1 + d) - math.log(1 - d))
+
+    def _evaluate_p_sat(self, T):
+        return np.array([[math.log(self.wrapper.p_sat(value))] for value in T])
+
+    def _derivatives_p_sat(self, T):
+        # central finite differences with respect to T within the range of
+        # the splines, the step is larger than the noise of the saturation
+        # pressure of some back ends
+        d = 1e-4
+        T_upper = np.minimum(T * (1 + d), self.T_max)
+        T_lower = np.maximum(T * (1 - d), self.T_min)
+        upper = self._evaluate_p_sat(T_upper)
+        lower = self._evaluate_p_sat(T_lower)
+        return (upper - lower) / (T_upper - T_lower)[:, None]
+
+    def _refine(self, x, evaluate, derivatives, tol, scale=None):
+        r"""
+        Bisect the intervals of the nodes until the deviation of the splines
+        from the fluid property wrapper at the center of every interval is
+        below the tolerance.
+
+        Parameters
+        ----------
+        x : ndarray
+            Initial nodes.
+
+        evaluate : function
+            Values of the splines at the nodes.
+
+        derivatives : function
+            Derivatives of the splines at the nodes.
+
+        tol : float
+            Tolerance of the deviation.
+
+        scale : float
+            Scale of the deviation, by default the maximum absolute value of
+            every spline.
+
+        Returns
+        -------
+        tuple
+            Nodes, values and derivatives at the nodes.
+        """
+        y = evaluate(x)
+        dy = derivatives(x)
+
+        check = np.ones(len(x) - 1, dtype=bool)
+        for _ in range(30):
+            h = (x[1:] - x[:-1])[check]
+            x_center = (x[:-1] + x[1:])[check] / 2
+            # value of the Hermite splines at the center of the intervals
+            y_spline = (
+                (y[:-1] + y[1:])[check] / 2
+                + h[:, None] * (dy[:-1] - dy[1:])[check] / 8
+            )
+            y_center = evaluate(x_center)
+            if scale is None:
+                scale = np.abs(y).max(axis=0)
+            error = (np.abs(y_spline - y_center) / scale).max(axis=1)
+            refine = (error > tol) & (h > 1e-7)
+            if not refine.any():
+                break
+
+            x_new = x_center[refine]
+            refined = np.zeros(len(x) - 1, dtype=bool)
+            refined[np.where(check)[0][refine]] = True
+            order = np.argsort(np.r_[x, x_new], kind="stable")
+            x = np.r_[x, x_new][order]
+            y = np.r_[y, y_center[refine]][order]
+            dy = np.r_[dy, derivatives(x_new)][order]
+            # both halves of the refined intervals have to be checked
+            check = np.repeat(refined, np.where(refined, 2, 1))
+
+        return x, y, dy
+
+    def _fit(self, p_min, p_max):
+        r"""
+        Place the nodes adaptively and fit the splines.
+
+        The initial nodes are spaced evenly over :math:`\ln p` in the lower
+        half and over :math:`\ln (p_\mathrm{crit} - p)` in the upper half of
+        the pressure range. Intervals are bisected until the deviation of the
+        splines from the fluid property wrapper at the center of every
+        interval is below the tolerance, e.g. at discontinuities of the
+        derivatives between the regions of IAPWS-IF97. The saturation
+        pressure is fitted separately over the saturation temperature of the
+        nodes, as the saturation temperature and pressure of some back ends
+        are not exactly inverse to each other.
+        """
+        p_crit = self.wrapper._p_crit
+        p_mid = max(p_max / 2, p_min)
+        x = np.unique(np.log(np.r_[
+            np.geomspace(p_min, p_mid, 16),
+            p_crit - np.geomspace(p_crit - p_mid, p_crit - p_max, 16)
+        ]))
+        x, y, dy = self._refine(
+            x, lambda x: self._evaluate(np.exp(x)),
+            lambda x: self._derivatives(np.exp(x)), self.tol
+        )
+        self.p_min, self.p_max = math.exp(x[0]), math.exp(x[-1])
+        self._T_sat = HermiteSpline(x, y[:, 0], dy[:, 0])
+        self._h_l = HermiteSpline(x, y[:, 1], dy[:, 1])
+        self._h_v = HermiteSpline(x, y[:, 2], dy[:, 2])
+
+        T = np.unique(y[:, 0])
+        self.T_min, self.T_max = T[0], T[-1]
+        T, ln_p, dln_p = self._refine(
+            T, self._evaluate_p_sat, self._derivatives_p_sat, self.tol_p_sat,
+            scale=1
+        )
+        self._p_sat = HermiteSpline(T, ln_p[:, 0], dln_p[:, 0])
+
+    def _in_p_range(self, p):
+        if not self.built:
+            self.build()
+        return self.available and self.p_min <= p <= self.p_max
+
+    def _in_T_range(self, T):
+        if not self.built:
+            self.build()
+        return self.available and self.T_min <= T <= self.T_max
+
+    def T_sat(self, p):
+        if self._in_p_range(p):
+            return self._T_sat(math.log(p))
+        return self.wrapper.T_sat(p)
+
+    def p_sat(self, T):
+        if self._in_T_range(T):
+            return math.exp(self._p_sat(T))
+        return self.wrapper.p_sat(T)
+
+    def h_pQ(self, p, Q):
+        if self._in_p_range(p):
+            ln_p = math.log(p)
+            h_l = self._h_l(ln_p)
+            return h_l + Q * (self._h_v(ln_p) - h_l)
+        return self.wrapper.h_pQ(p, Q)
+
+    def h_QT(self, Q, T):
+        if self._in_T_range(T):
+            ln_p = self._p_sat(T)
+            h_l = self._h_l(ln_p)
+            return h_l + Q * (self._h_v(ln_p) - h_l)
+        return self.wrapper.h_QT(Q, T)
+
+    def dT_sat_dp(self, p):
+        r"""Return the derivative of saturation temperature to pressure."""
+        if self._in_p_range(p):
+            return self._T_sat.derivative(math.log(p)) / p
+        return None
+
+    def dh_pQ_dp(self, p, Q):
+        r"""Return the derivative of saturation enthalpy to pressure."""
+        if self._in_p_range(p):
+            ln_p = math.log(p)
+            dh_l = self._h_l.derivative(ln_p)
+            return (dh_l + Q * (self._h_v.derivative(ln_p) - dh_l)) / p
+        return None
+
+
+def get_saturation_cache(wrapper):
+    r"""
+    Get the saturation cache of the fluid of a wrapper.
+
+    The caches are shared by all wrappers of the same type, fluid and back
+    end.
+
+    Parameters
+    ----------
+    wrapper : tespy.tools.fluid_properties.wrappers.FluidPropertyWrapper
+        Wrapper of the fluid.
+
+    Returns
+    -------
+    cache : tespy.tools.fluid_properties.saturation.SaturationCache
+        Saturation cache of the fluid.
+    """
+    key = (wrapper.__class__.__name__, wrapper.fluid, wrapper.back_end)
+    if key not in _SATURATION_CACHES:
+        _SATURATION_CACHES[key] = SaturationCache(wrapper)
+    return _SATURATION_CACHES[key]
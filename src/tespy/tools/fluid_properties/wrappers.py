@@ -12,7 +12,9 @@ SPDX-License-Identifier: MIT
 """
 
 import CoolProp as CP
+import numpy as np
 
+from tespy.tools.fluid_properties import if97
 from tespy.tools.global_vars import ERR
 
 
@@ -37,6 +39,8 @@ class SerializableAbstractState(CP.AbstractState):
 @wrapper_registry
 class FluidPropertyWrapper:
 
+    _saturation_cache = None
+
     def __init__(self, fluid, back_end=None) -> None:
         """Base class for fluid property wrappers
 
@@ -63,6 +67,35 @@ class FluidPropertyWrapper:
     def isentropic(self, p_1, h_1, p_2):
         self._not_implemented()
 
+    def isentropic_deriv(self, p_1, h_1, p_2):
+        """Isentropic outlet enthalpy and its partial derivatives
+
+        The derivatives follow from :math:`dh = T ds + v dp` at the inlet and
+        the isentropic outlet state.
+
+        Parameters
+        ----------
+        p_1 : float
+            Inlet pressure
+        h_1 : float
+            Inlet enthalpy
+        p_2 : float
+            Outlet pressure
+
+        Returns
+        -------
+        tuple
+            Isentropic outlet enthalpy and its partial derivatives to inlet
+            pressure, inlet enthalpy and outlet pressure
+        """
+        s_1 = self.s_ph(p_1, h_1)
+        T_1 = self.T_ph(p_1, h_1)
+        v_1 = 1 / self.d_ph(p_1, h_1)
+        h_2 = self.h_ps(p_2, s_1)
+        T_2 = self.T_ph(p_2, h_2)
+        v_2 = 1 / self.d_ph(p_2, h_2)
+        return h_2, -T_2 * v_1 / T_1, T_2 / T_1, v_2
+
     def _is_below_T_critical(self, T):
         self._not_implemented()
 
@@ -72,12 +105,68 @@ class FluidPropertyWrapper:
     def T_ph(self, p, h):
         self._not_implemented()
 
+    def T_ph_array(self, p, h):
+        """Temperatures of an array of states
+
+        Parameters
+        ----------
+        p : ndarray
+            Pressure
+        h : ndarray
+            Enthalpy
+
+        Returns
+        -------
+        ndarray
+            Temperature
+        """
+        return np.array([self.T_ph(p_i, h_i) for p_i, h_i in zip(p, h)])
+
     def T_ps(self, p, s):
         self._not_implemented()
 
+    def T_ph_deriv(self, p, h):
+        """Partial derivatives of temperature to pressure and enthalpy
+
+        Parameters
+        ----------
+        p : float
+            Pressure
+        h : float
+            Enthalpy
+
+        Returns
+        -------
+        tuple
+            Partial derivatives of temperature to pressure at constant
+            enthalpy and to enthalpy at constant pressure
+        """
+        self._not_implemented()
+
+    def v_ph_deriv(self, p, h):
+        """Partial derivatives of specific volume to pressure and enthalpy
+
+        Parameters
+        ----------
+        p : float
+            Pressure
+        h : float
+            Enthalpy
+
+        Returns
+        -------
+        tuple
+            Partial derivatives of specific volume to pressure at constant
+            enthalpy and to enthalpy at constant pressure
+        """
+        self._not_implemented()
+
     def h_pT(self, p, T):
         self._not_implemented()
 
+    def cp_pT(self, p, T):
+        self._not_implemented()
+
     def h_QT(self, Q, T):
         self._not_implemented()
 
@@ -184,10 +273,39 @@ class CoolPropWrapper(FluidPropertyWrapper):
     def isentropic(self, p_1, h_1, p_2):
         return self.h_ps(p_2, self.s_ph(p_1, h_1))
 
+    def isentropic_deriv(self, p_1, h_1, p_2):
+        self.AS.update(CP.HmassP_INPUTS, h_1, p_1)
+        s_1 = self.AS.smass()
+        T_1 = self.AS.T()
+        v_1 = 1 / self.AS.rhomass()
+        self.AS.update(CP.PSmass_INPUTS, p_2, s_1)
+        T_2 = self.AS.T()
+        v_2 = 1 / self.AS.rhomass()
+        return self.AS.hmass(), -T_2 * v_1 / T_1, T_2 / T_1, v_2
+
     def T_ph(self, p, h):
         self.AS.update(CP.HmassP_INPUTS, h, p)
         return self.AS.T()
 
+    def T_ph_deriv(self, p, h):
+        if self.back_end == "INCOMP":
+            self._not_implemented()
+        self.AS.update(CP.HmassP_INPUTS, h, p)
+        return (
+            self.AS.first_partial_deriv(CP.iT, CP.iP, CP.iHmass),
+            self.AS.first_partial_deriv(CP.iT, CP.iHmass, CP.iP)
+        )
+
+    def v_ph_deriv(self, p, h):
+        if self.back_end == "INCOMP":
+            self._not_implemented()
+        self.AS.update(CP.HmassP_INPUTS, h, p)
+        v_2 = self.AS.rhomass() ** -2
+        return (
+            -v_2 * self.AS.first_partial_deriv(CP.iDmass, CP.iP, CP.iHmass),
+            -v_2 * self.AS.first_partial_deriv(CP.iDmass, CP.iHmass, CP.iP)
+        )
+
     def T_ps(self, p, s):
         self.AS.update(CP.PSmass_INPUTS, p, s)
         return self.AS.T()
@@ -204,6 +322,10 @@ class CoolPropWrapper(FluidPropertyWrapper):
         self.AS.update(CP.PT_INPUTS, p, T)
         return self.AS.hmass()
 
+    def cp_pT(self, p, T):
+        self.AS.update(CP.PT_INPUTS, p, T)
+        return self.AS.cpmass()
+
     def h_QT(self, Q, T):
         self.AS.update(CP.QT_INPUTS, Q, T)
         return self.AS.hmass()
@@ -335,6 +457,9 @@ class IAPWSWrapper(FluidPropertyWrapper):
     def h_pT(self, p, T):
         return self.AS(P=p / 1e6, T=T).h * 1e3
 
+    def cp_pT(self, p, T):
+        return self.AS(P=p / 1e6, T=T).cp * 1e3
+
     def h_QT(self, Q, T):
         return self.AS(T=T, x=Q).h * 1e3
 
@@ -377,6 +502,123 @@ class IAPWSWrapper(FluidPropertyWrapper):
         return self.AS(P=p / 1e6, T=T).s * 1e3
 
 
+@wrapper_registry
+class IF97Wrapper(FluidPropertyWrapper):
+
+    def __init__(self, fluid, back_end=None) -> None:
+        """Wrapper for the NumPy implementation of IAPWS-IF97
+
+        All methods accept scalars as well as arrays of states. Scalar states
+        outside of the range of validity raise a ValueError, array states
+        return nan at the respective positions.
+
+        Parameters
+        ----------
+        fluid : str
+            Name of the fluid
+        back_end : str, optional
+            Formulation of the water properties, by default "IF97"
+        """
+        if back_end is None:
+            back_end = "IF97"
+        super().__init__(fluid, back_end)
+        self._aliases = CP.CoolProp.get_aliases("H2O")
+
+        if self.fluid not in self._aliases:
+            msg = "The IF97 wrapper only supports water as fluid."
+            raise ValueError(msg)
+
+        if self.back_end != "IF97":
+            msg = f"The specified back_end {self.back_end} is not available."
+            raise NotImplementedError(msg)
+        self._set_constants()
+
+    def _set_constants(self):
+        self._T_min = if97.T_TRIPLE
+        self._T_max = if97.T_MAX
+        self._p_min = if97.P_TRIPLE
+        self._p_max = if97.P_MAX
+        self._p_crit = if97.P_CRIT
+        self._T_crit = if97.T_CRIT
+        self._molar_mass = if97.MOLAR_MASS
+
+    @staticmethod
+    def _check(value):
+        if np.ndim(value) == 0 and np.isnan(value):
+            msg = "The state is outside of the range of validity of IF97."
+            raise ValueError(msg)
+        return value
+
+    def _is_below_T_critical(self, T):
+        return T < self._T_crit
+
+    def _make_p_subcritical(self, p):
+        return np.where(p > self._p_crit, self._p_crit * 0.99, p)[()]
+
+    def isentropic(self, p_1, h_1, p_2):
+        return self.h_ps(p_2, self.s_ph(p_1, h_1))
+
+    def T_ph(self, p, h):
+        return self._check(if97.properties_ph(p, h)["T"])
+
+    def T_ph_array(self, p, h):
+        return self._check(if97.properties_ph(p, h)["T"])
+
+    def T_ps(self, p, s):
+        return self._check(if97.properties_ps(p, s)["T"])
+
+    def h_pQ(self, p, Q):
+        return self._check(if97.properties_pQ(p, Q)["h"])
+
+    def h_ps(self, p, s):
+        return self._check(if97.properties_ps(p, s)["h"])
+
+    def h_pT(self, p, T):
+        return self._check(if97.properties_pT(p, T)["h"])
+
+    def cp_pT(self, p, T):
+        return self._check(if97.properties_pT(p, T)["cp"])
+
+    def h_QT(self, Q, T):
+        return self._check(if97.properties_QT(Q, T)["h"])
+
+    def s_QT(self, Q, T):
+        return self._check(if97.properties_QT(Q, T)["s"])
+
+    def T_sat(self, p):
+        return self._check(if97.T_sat(self._make_p_subcritical(p)))
+
+    def p_sat(self, T):
+        T = np.where(T > self._T_crit, self._T_crit * 0.99, T)[()]
+        return self._check(if97.p_sat(T))
+
+    def Q_ph(self, p, h):
+        return self._check(if97.properties_ph(p, h)["x"])
+
+    def d_ph(self, p, h):
+        return self._check(1 / if97.properties_ph(p, h)["v"])
+
+    def d_pT(self, p, T):
+        return self._check(1 / if97.properties_pT(p, T)["v"])
+
+    def d_QT(self, Q, T):
+        return self._check(1 / if97.properties_QT(Q, T)["v"])
+
+    def viscosity_ph(self, p, h):
+        props = if97.properties_ph(p, h)
+        return self._check(if97.viscosity(1 / props["v"], props["T"]))
+
+    def viscosity_pT(self, p, T):
+        props = if97.properties_pT(p, T)
+        return self._check(if97.viscosity(1 / props["v"], T))
+
+    def s_ph(self, p, h):
+        return self._check(if97.properties_ph(p, h)["s"])
+
+    def s_pT(self, p, T):
+        return self._check(if97.properties_pT(p, T)["s"])
+
+
 @wrapper_registry
 class PyromatWrapper(FluidPropertyWrapper):
 
@@ -436,6 +678,9 @@ class PyromatWrapper(FluidPropertyWrapper):
     def h_pT(self, p, T):
         return self.AS.h(p=p, T=T)[0]
 
+    def cp_pT(self, p, T):
+        return self.AS.cp(p=p, T=T)[0]
+
     def h_ps(self, p, s):
         return self.AS.h(p=p, s=s)[0]
 
@@ -10,14 +10,19 @@ SPDX-License-Identifier: MIT
 """
 
 import json
+import math
+import numbers
 import os
+import sys
 from collections.abc import Mapping
+from copy import copy
 from copy import deepcopy
 
 import CoolProp.CoolProp as CP
 
 from tespy import __datapath__
 from tespy.tools import logger
+from tespy.tools.autodiff import evaluate as autodiff_evaluate
 from tespy.tools.global_vars import ERR
 from tespy.tools.global_vars import fluid_property_data
 
@@ -64,6 +69,76 @@ def merge_dicts(dict1, dict2):
     return result
 
 
+def check_workers(workers):
+    """Check the number of worker processes for parallel evaluations.
+
+    Parameters
+    ----------
+    workers : int
+        Number of worker processes.
+
+    Raises
+    ------
+    TypeError
+        If the number of workers is not an integer.
+
+    ValueError
+        If the number of workers is smaller than 1.
+    """
+    if not isinstance(workers, numbers.Integral) or isinstance(workers, bool):
+        msg = 'The number of workers must be an integer.'
+        logger.error(msg)
+        raise TypeError(msg)
+
+    if workers < 1:
+        msg = 'The number of workers must be at least 1.'
+        logger.error(msg)
+        raise ValueError(msg)
+
+
+def get_variable_value(data):
+    """Return the value of a variable of a network in SI units.
+
+    Parameters
+    ----------
+    data : dict
+        Entry of the :code:`variables_dict` of a network, holding the object
+        of the variable, the name of the variable and, for fluid variables,
+        the name of the fluid.
+
+    Returns
+    -------
+    value : float
+        Value of the variable.
+    """
+    if data["variable"] in ["m", "p", "h"]:
+        return data["obj"].get_attr(data["variable"]).val_SI
+    elif data["variable"] == "fluid":
+        return data["obj"].fluid.val[data["fluid"]]
+    else:
+        return data["obj"].val
+
+
+def set_variable_value(data, value):
+    """Set the value of a variable of a network in SI units.
+
+    Parameters
+    ----------
+    data : dict
+        Entry of the :code:`variables_dict` of a network, see
+        :py:func:`tespy.tools.helpers.get_variable_value`.
+
+    value : float
+        Value of the variable.
+    """
+    if data["variable"] in ["m", "p", "h"]:
+        data["obj"].get_attr(data["variable"]).val_SI = value
+    elif data["variable"] == "fluid":
+        data["obj"].fluid.val[data["fluid"]] = value
+    else:
+        data["obj"].val = value
+
+
 class TESPyNetworkError(Exception):
     """Custom message for network related errors."""
 
@@ -178,7 +253,9 @@ class UserDefinedEquation:
             Equation to evaluate.
 
         deriv : function
-            Partial derivatives of the equation.
+            Partial derivatives of the equation. If :code:`None`, the partial
+            derivatives are calculated by automatic differentiation, see
+            :py:meth:`tespy.tools.helpers.UserDefinedEquation.autodiff`.
 
         conns : list
             List of connections used by the function.
@@ -368,8 +445,54 @@ class UserDefinedEquation:
             raise TypeError(msg)
 
     def solve(self):
-        self.residual = self.func(self)
-        self.deriv(self)
+        if self.deriv is None:
+            self.residual = self.autodiff()
+        else:
+            self.residual = self.func(self)
+            self.deriv(self)
+
+    def autodiff(self):
+        r"""
+        Calculate residual value and partial derivatives of the equation.
+
+        The equation is evaluated once on copies of the connections holding
+        :py:class:`tespy.tools.autodiff.Dual` numbers for the mass flow,
+        pressure and enthalpy, i.e. the state of the connections is not
+        changed. The partial derivatives to the fluid composition are
+        calculated numerically. The function must use the fluid property
+        functions of :py:mod:`tespy.tools.fluid_properties` and the NumPy
+        functions in place of the :code:`math` module.
+
+        Returns
+        -------
+        residual : float
+            Residual value of the equation.
+        """
+        local = copy(self)
+        local_conns = {c: c._local_copy() for c in self.conns}
+        local.conns = [local_conns[c] for c in self.conns]
+
+        variables = {}
+        for c, local_c in local_conns.items():
+            for var in ['m', 'p', 'h']:
+                if c.get_attr(var).is_var:
+                    variables[c.get_attr(var).J_col] = (
+                        local_c.get_attr(var), 'val_SI'
+                    )
+
+        residual, deriv = autodiff_evaluate(
+            self.func, list(variables.values()), ude=local
+        )
+        for col, value in zip(variables, deriv[0]):
+            self.jacobian[col] = value
+
+        for c, local_c in local_conns.items():
+            for fluid in c.fluid.is_var:
+                self.jacobian[c.fluid.J_col[fluid]] = _numeric_deriv(
+                    local, self.func, fluid, local_c, ude=local
+                )
+
+        return residual[0]
 
     def numeric_deriv(self, dx, conn):
         r"""
@@ -566,6 +689,249 @@ def newton_with_kwargs(
     return x
 
 
+def newton_brent(
+        derivative, target_value, val0=300, valmin=70, valmax=3000,
+        max_iter=10, tol_rel=ERR, tol_abs=ERR ** 2, **function_kwargs
+    ):
+    r"""
+    Find the root of a function with a bracketed, safeguarded Newton method.
+
+    Every function evaluation narrows down a bracket around the root as soon
+    as a change of sign of the residual has been observed. Newton steps are
+    taken as long as the derivative is available and the step stays inside
+    the bracket. In case the derivative is not available (:code:`None` or not
+    finite), secant steps are taken instead. If the steps leave the bracket or
+    do not converge within :code:`max_iter` iterations, the root is found with
+    Brent's method.
+
+    Parameters
+    ----------
+    derivative : function
+        Derivative of the function with respect to the parameter. May be
+        :code:`None` to use secant steps only.
+
+    target_value : float
+        Target value of the function.
+
+    val0 : float
+        Starting value.
+
+    valmin : float
+        Lower bound of the parameter.
+
+    valmax : float
+        Upper bound of the parameter.
+
+    max_iter : int
+        Maximum number of Newton or secant iterations before switching to
+        Brent's method.
+
+    tol_rel : float
+        Relative tolerance of the residual in relation to the target value.
+
+    tol_abs : float
+        Absolute tolerance of the residual.
+
+    Returns
+    -------
+    tuple
+        Value of the parameter and the number of function evaluations.
+
+    Note
+    ----
+    Like in :py:meth:`newton_with_kwargs`, the :code:`function_kwargs` must
+    contain the function to evaluate (:code:`function`) and the name of the
+    parameter to solve for (:code:`parameter`).
+    """
+    parameter = function_kwargs["parameter"]
+    function = function_kwargs["function"]
+    tol = max(tol_abs, abs(target_value) * tol_rel)
+
+    def residual(x):
+        function_kwargs[parameter] = x
+        return function(**function_kwargs) - target_value
+
+    x = min(max(val0, valmin), valmax)
+    r = residual(x)
+    evaluations = 1
+    x_prev = r_prev = None
+    # points with negative and positive residual
+    negative = None
+    positive = None
+
+    while True:
+        if r < 0:
+            negative = (x, r)
+        elif r > 0:
+            positive = (x, r)
+        else:
+            return x, evaluations
+
+        if evaluations > max_iter:
+            break
+
+        d = math.nan
+        if derivative is not None:
+            function_kwargs[parameter] = x
+            d = derivative(**function_kwargs)
+
+        if d == 0 or not math.isfinite(d):
+            if x_prev is None:
+                # trial step to obtain a secant
+                step = 1e-2 * max(abs(x), 1)
+                if x + step > valmax:
+                    step = -step
+                x_new = x + step
+            elif x != x_prev:
+                d = (r - r_prev) / (x - x_prev)
+
+            if x_prev is not None and (d == 0 or not math.isfinite(d)):
+                break
+
+        if math.isfinite(d) and d != 0:
+            x_new = min(max(x - r / d, valmin), valmax)
+            if abs(r) <= tol:
+                return x_new, evaluations
+        elif abs(r) <= tol:
+            return x, evaluations
+
+        if negative is not None and positive is not None:
+            lower, upper = sorted([negative[0], positive[0]])
+            if not lower < x_new < upper:
+                break
+
+        elif x_new == x:
+            # the root is outside of the value range
+            return x, evaluations
+
+        x_prev, r_prev = x, r
+        x = x_new
+        r = residual(x)
+        evaluations += 1
+
+    if negative is None or positive is None:
+        for bound in [valmax, valmin]:
+            r_bound = residual(bound)
+            evaluations += 1
+            if r_bound == 0:
+                return bound, evaluations
+            elif (r_bound > 0) != (r > 0):
+                break
+        else:
+            msg = (
+                'The bracketed Newton algorithm was not able to find a '
+                f'feasible value for function {function}. The target value '
+                f'{target_value} is not within the range of the function '
+                f'for the values between {valmin} and {valmax}.'
+            )
+            logger.debug(msg)
+            if abs(r_bound) < abs(r):
+                return bound, evaluations
+            return x, evaluations
+
+        bracket = (x, r, bound, r_bound)
+    else:
+        bracket = negative + positive
+
+    x, brent_evaluations = _brent(residual, *bracket, tol=tol_abs)
+    return x, evaluations + brent_evaluations
+
+
+def _brent(residual, a, fa, b, fb, tol=ERR ** 2, tol_x=ERR ** 1.5, max_iter=100):
+    r"""
+    Find the root of a function within a bracket with Brent's method.
+
+    Parameters
+    ----------
+    residual : function
+        Function of a single parameter to find the root of.
+
+    a, b : float
+        Values enclosing the root.
+
+    fa, fb : float
+        Residual values at a and b (must be of opposite sign).
+
+    tol : float
+        Absolute tolerance of the residual.
+
+    tol_x : float
+        Absolute tolerance of the parameter.
+
+    Returns
+    -------
+    tuple
+        Value of the parameter and the number of function evaluations.
+
+    Note
+    ----
+    If the bracket collapses without the residual meeting the tolerance, e.g.
+    because the function jumps across the target value, the end of the
+    bracket with the negative residual is returned.
+    """
+    if abs(fa) < abs(fb):
+        a, b, fa, fb = b, a, fb, fa
+
+    c, fc = a, fa
+    d = e = b - a
+    evaluations = 0
+
+    while evaluations < max_iter:
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+
+        tol_b = 2 * sys.float_info.epsilon * abs(b) + 0.5 * tol_x
+        m = 0.5 * (c - b)
+        if abs(m) <= tol_b or abs(fb) <= tol:
+            break
+
+        if abs(e) >= tol_b and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                # secant step
+                p = 2 * m * s
+                q = 1 - s
+            else:
+                # inverse quadratic interpolation
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+
+            if p > 0:
+                q = -q
+            else:
+                p = -p
+
+            if 2 * p < min(3 * m * q - abs(tol_b * q), abs(e * q)):
+                e = d
+                d = p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+
+        a, fa = b, fb
+        if abs(d) > tol_b:
+            b += d
+        else:
+            b += math.copysign(tol_b, m)
+
+        fb = residual(b)
+        evaluations += 1
+
+    if abs(fb) > tol and fb > 0 and fc < 0:
+        # no root within tolerance, e.g. at a discontinuity of the function
+        return c, evaluations
+
+    return b, evaluations
+
+
 def central_difference(function=None, parameter=None, delta=None, **kwargs):
     upper = kwargs.copy()
     upper[parameter] += delta
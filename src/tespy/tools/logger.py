@@ -12,7 +12,9 @@ SPDX-License-Identifier: MIT
 import logging
 import os
 import sys
+import threading
 import warnings
+from contextlib import contextmanager
 from logging import handlers
 
 import tespy
@@ -159,6 +161,74 @@ def critical(msg, *args, **kwargs):
     return log(logging.CRITICAL, msg, *args, **kwargs)
 
 
+def is_enabled_for(level):
+    """
+    Check, if a message with severity 'level' would be handled.
+
+    Other than :code:`logging.Logger.isEnabledFor` this considers the levels
+    of the handlers the message is passed to, too. Use it to skip building
+    messages in frequently called functions, e.g.
+
+    if is_enabled_for(logging.DEBUG):
+        debug("Adjusted %s to %f.", "pressure", 1e5)
+    """
+    logger = get_logger()
+    if not logger.isEnabledFor(level):
+        return False
+
+    thread = threading.get_ident()
+    for log_filter in logger.filters:
+        if (
+                isinstance(log_filter, _MinimumLevelFilter)
+                and log_filter.thread == thread and level < log_filter.level):
+            return False
+
+    found = False
+    log = logger
+    while log is not None:
+        for handler in log.handlers:
+            found = True
+            if level >= handler.level:
+                return True
+        log = log.parent if log.propagate else None
+
+    # without any handler the message is passed to logging.lastResort
+    return not found and logging.lastResort is not None and (
+        level >= logging.lastResort.level
+    )
+
+
+class _MinimumLevelFilter(logging.Filter):
+    """Ignore messages of the current thread with a severity below 'level'."""
+
+    def __init__(self, level):
+        super().__init__()
+        self.level = level
+        self.thread = threading.get_ident()
+
+    def filter(self, record):
+        return record.thread != self.thread or record.levelno >= self.level
+
+
+@contextmanager
+def minimum_level(level):
+    """
+    Temporarily ignore messages of the current thread with a severity below
+    'level'. The level of the logger and the messages of other threads are
+    not affected.
+
+    with minimum_level(logging.WARNING):
+        debug("This message is ignored.")
+    """
+    logger = get_logger()
+    log_filter = _MinimumLevelFilter(level)
+    logger.addFilter(log_filter)
+    try:
+        yield
+    finally:
+        logger.removeFilter(log_filter)
+
+
 # Custom logging function that abuses log level TESPY_PROGRESS_LOG_LEVEL
 # to report progress information programmatically.
 def progress(value, msg, *args, **kwargs):
@@ -1,12 +1,94 @@
+import multiprocessing as mp
+import os
+import pickle
+import weakref
+from copy import deepcopy
+
 try:
     import pygmo as pg
 except ImportError:
     pg = None
 
+try:
+    from scipy import optimize
+except ImportError:
+    optimize = None
+
+import numpy as np
 import pandas as pd
 
+from tespy.tools import logger
+from tespy.tools.helpers import check_workers
 from tespy.tools.helpers import merge_dicts
 
+# worker process pools shared by all copies of an optimization problem, as
+# pygmo works on copies of the problem
+_pools = {}
+# finalizers stopping the pools, when the copy creating them is deleted
+_finalizers = {}
+# problem of the worker process, set by the pool initializer
+_worker_problem = None
+
+
+def _init_worker(problem):
+    global _worker_problem
+    _worker_problem = pickle.loads(problem)
+
+
+def _evaluate_in_worker(task):
+    return _worker_problem.evaluate(*task)
+
+
+def _close_pool(pool_id):
+    _finalizers.pop(pool_id, None)
+    pool = _pools.pop(pool_id, None)
+    if pool is not None:
+        pool.close()
+        pool.join()
+
+
+def get_starting_values(nw):
+    """Return the starting values of the connections after a simulation.
+
+    Parameters
+    ----------
+    nw : tespy.networks.network.Network
+        Network to get the starting values of.
+
+    Returns
+    -------
+    state : list
+        Mass flow, pressure, enthalpy and fluid composition starting values
+        of every connection in the network's units.
+    """
+    return [
+        (c.m.val0, c.p.val0, c.h.val0, c.fluid.val0.copy())
+        for c in nw.conns['object']
+    ]
+
+
+def set_starting_values(nw, state):
+    """Use starting values of a previous simulation for the next simulation.
+
+    Parameters
+    ----------
+    nw : tespy.networks.network.Network
+        Network to set the starting values of.
+
+    state : list
+        Starting values as returned by
+        :py:func:`tespy.tools.optimization.get_starting_values`.
+    """
+    for c, (m, p, h, fluid) in zip(nw.conns['object'], state):
+        c.m.val0 = m
+        c.p.val0 = p
+        c.h.val0 = h
+        c.fluid.val0 = fluid.copy()
+        for f in c.fluid.is_var:
+            if f in fluid:
+                c.fluid.val[f] = fluid[f]
+        c.good_starting_values = True
+
 
 class OptimizationProblem:
     r"""
@@ -38,11 +120,39 @@ class OptimizationProblem:
         Name of the objective. :code:`objective` is passed to the
         :code:`get_objective` method of your tespy model instance.
 
+    workers : int
+        Number of worker processes for the evaluation of a batch of
+        individuals, see
+        :py:meth:`tespy.tools.optimization.OptimizationProblem.batch_fitness`,
+        default value :code:`1`.
+
+    decimals : int
+        Number of decimals of the decision variables for the identification
+        of individuals, which have been evaluated before. Pass :code:`None`
+        to evaluate every individual, default value :code:`6`.
+
     Note
     ----
     For the required structure of the input dictionaries see the example in
     below.
 
+    The fitness of every individual is stored with the rounded values of the
+    decision variables. Individuals with identical rounded values are not
+    evaluated again. In case the model provides its network in the
+    :code:`nw` attribute, the simulation of an individual starts from the
+    results of the closest individual evaluated before (relative to the
+    bounds of the decision variables).
+
+    With more than one worker, every worker process holds its own copy of the
+    model. The model is copied to the workers on the first call of
+    :code:`batch_fitness`, it must therefore be picklable. To use the
+    batch evaluation pass a batch fitness evaluator to the population and to
+    algorithms supporting it, e.g.
+    :code:`pg.population(prob, size=num_ind, b=pg.bfe())`.
+    The worker processes are stopped at the end of the :code:`run` method, by
+    calling :code:`close` or when leaving a :code:`with` block of the problem.
+    Otherwise they are stopped, when the problem is garbage collected.
+
     Installation of pygmo via pip is not available for Windows and OSX users
     currently. Please use conda instead or refer to their
     `documentation <https://esa.github.io/pygmo2/>`_.
@@ -53,7 +163,8 @@ class OptimizationProblem:
     documentation.
     """
 
-    def __init__(self, model, variables={}, constraints={}, objective="objective"):
+    def __init__(self, model, variables={}, constraints={},
+                 objective="objective", workers=1, decimals=6):
         if pg is None:
             msg = (
                 "For this function of TESPy pygmo has to be installed. Either"
@@ -62,6 +173,13 @@ class OptimizationProblem:
             )
             raise ImportError(msg)
 
+        self._setup(
+            model, variables, constraints, objective, workers, decimals
+        )
+
+    def _setup(self, model, variables, constraints, objective, workers,
+               decimals):
+        """Set up the decision variables, constraints and objective."""
         self.model = model
         default_variables = {"Connections": {}, "Components": {}}
         default_constraints = {
@@ -95,12 +213,23 @@ class OptimizationProblem:
                     self.bounds[1] += [self.variables[obj][label]['max']]
                     self.variable_list += [obj + '-' + label]
 
-        self.input_dict = self.variables.copy()
+        self.input_dict = deepcopy(self.variables)
 
         self.nic = 0
         self.collect_constraints("upper", build=True)
         self.collect_constraints("lower", build=True)
 
+        check_workers(workers)
+
+        self.workers = workers
+        self.decimals = decimals
+        self.memo = {}
+        self.archive_x = []
+        self.archive_state = []
+        self.num_solves = 0
+        self.num_memo_hits = 0
+        self.pool_id = id(self)
+
     def collect_constraints(self, border, build=False):
         """Collect the constraints
 
@@ -157,19 +286,13 @@ class OptimizationProblem:
         else:
             return evaluation
 
-    def fitness(self, x):
-        """Evaluate the fitness function of an individual.
+    def set_decision_variables(self, x):
+        """Write the decision variables to the input dictionary of the model.
 
         Parameters
         ----------
         x : list
             List of the decision variables' values of the current individual.
-
-        Returns
-        -------
-        fitness : list
-            A list containing the fitness function evaluation as well as the
-            evaluation of the upper and lower constraints.
         """
         i = 0
         for obj, data in self.variables.items():
@@ -182,13 +305,158 @@ class OptimizationProblem:
                     self.input_dict[obj][label] = x[i]
                     i += 1
 
+    def evaluate(self, x, state=None):
+        """Solve the model for an individual.
+
+        Parameters
+        ----------
+        x : list
+            List of the decision variables' values of the current individual.
+
+        state : list
+            Starting values for the simulation, see
+            :py:func:`tespy.tools.optimization.get_starting_values`.
+
+        Returns
+        -------
+        result : tuple
+            Fitness of the individual and the starting values from its
+            results, :code:`None` if the objective could not be evaluated.
+        """
+        self.set_decision_variables(x)
+        nw = getattr(self.model, "nw", None)
+        if state is not None and nw is not None:
+            set_starting_values(nw, state)
+
         self.model.solve_model(**self.input_dict)
         f1 = [self.model.get_objective(self.objective)]
 
         cu = self.collect_constraints("upper")
         cl = self.collect_constraints("lower")
 
-        return f1 + cu + cl
+        state = None
+        if nw is not None and np.isfinite(f1).all():
+            state = get_starting_values(nw)
+
+        return f1 + cu + cl, state
+
+    def _memo_key(self, x):
+        if self.decimals is None:
+            return None
+        return tuple(np.round(np.asarray(x, dtype=float), self.decimals))
+
+    def _closest_state(self, x):
+        if len(self.archive_x) == 0:
+            return None
+        scale = np.asarray(self.bounds[1], dtype=float) - self.bounds[0]
+        scale[scale == 0] = 1
+        distance = np.linalg.norm(
+            (np.asarray(self.archive_x) - x) / scale, axis=1
+        )
+        return self.archive_state[int(np.argmin(distance))]
+
+    def _store(self, x, key, fitness, state):
+        if key is not None:
+            self.memo[key] = fitness
+        if state is not None:
+            self.archive_x += [np.asarray(x, dtype=float)]
+            self.archive_state += [state]
+
+    def fitness(self, x):
+        """Evaluate the fitness function of an individual.
+
+        Parameters
+        ----------
+        x : list
+            List of the decision variables' values of the current individual.
+
+        Returns
+        -------
+        fitness : list
+            A list containing the fitness function evaluation as well as the
+            evaluation of the upper and lower constraints.
+        """
+        key = self._memo_key(x)
+        if key in self.memo:
+            self.num_memo_hits += 1
+            return self.memo[key]
+
+        fitness, state = self.evaluate(x, self._closest_state(x))
+        self.num_solves += 1
+        self._store(x, key, fitness, state)
+        return fitness
+
+    def batch_fitness(self, dvs):
+        """Evaluate the fitness function of a batch of individuals.
+
+        Individuals, which have been evaluated before, and duplicates within
+        the batch are taken from the memo. The remaining individuals are
+        evaluated by the worker processes, each starting from the results of
+        the closest individual evaluated in previous batches.
+
+        Parameters
+        ----------
+        dvs : list
+            Concatenated decision variables' values of the individuals.
+
+        Returns
+        -------
+        fitness : numpy.ndarray
+            Concatenated fitness function evaluations of the individuals.
+        """
+        dvs = np.asarray(dvs, dtype=float).reshape(
+            -1, len(self.variable_list)
+        )
+        fitness = [None] * len(dvs)
+        pending = {}
+        for i, x in enumerate(dvs):
+            key = self._memo_key(x)
+            if key in self.memo:
+                self.num_memo_hits += 1
+                fitness[i] = self.memo[key]
+            elif key is not None and key in pending:
+                self.num_memo_hits += 1
+                pending[key] += [i]
+            else:
+                pending[i if key is None else key] = [i]
+
+        tasks = [
+            (dvs[idx[0]], self._closest_state(dvs[idx[0]]))
+            for idx in pending.values()
+        ]
+        if self.workers > 1 and len(tasks) > 1:
+            if self.pool_id not in _pools:
+                # the pool holds a pickled copy to not keep the problem alive
+                _pools[self.pool_id] = mp.Pool(
+                    self.workers, initializer=_init_worker,
+                    initargs=(pickle.dumps(self),)
+                )
+                _finalizers[self.pool_id] = weakref.finalize(
+                    self, _close_pool, self.pool_id
+                )
+            results = _pools[self.pool_id].map(_evaluate_in_worker, tasks)
+        else:
+            results = [self.evaluate(*task) for task in tasks]
+
+        self.num_solves += len(tasks)
+        for idx, (x, _), (f, state) in zip(pending.values(), tasks, results):
+            self._store(x, self._memo_key(x), f, state)
+            for i in idx:
+                fitness[i] = f
+
+        return np.concatenate(fitness)
+
+    def close(self):
+        """Stop the worker processes of the batch fitness evaluation."""
+        finalizer = _finalizers.get(self.pool_id)
+        if finalizer is not None:
+            finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
     def get_nobj(self):
         """Return number of objectives."""
@@ -214,24 +482,151 @@ class OptimizationProblem:
         pop : pygmo.population
             PyGMO population object.
         """
-        individual = 0
-        for x in pop.get_x():
-            self.individuals.loc[(gen, individual), self.variable_list] = x
-            individual += 1
-
-        individual = 0
-        for objective in pop.get_f():
-            self.individuals.loc[
-                (gen, individual),
-                self.objective_list + self.constraint_list
-            ] = objective
-            individual += 1
-
-        self.individuals['valid'] = (
-            self.individuals[self.constraint_list] < 0
-        ).all(axis='columns')
-
-    def run(self, algo, pop, num_ind, num_gen):
+        x = pop.get_x()
+        if len(x) != self._x.shape[1]:
+            msg = (
+                f"The population has {len(x)} individuals, the run has been "
+                f"set up for {self._x.shape[1]} individuals."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+
+        self._x[gen] = x
+        self._f[gen] = pop.get_f()
+        self._valid[gen] = (
+            self._f[gen, :, len(self.objective_list):] < 0
+        ).all(axis=1)
+        self._individuals = None
+
+    @property
+    def individuals(self):
+        """Return the data of all individuals of the last run.
+
+        Returns
+        -------
+        individuals : pandas.core.frame.DataFrame
+            Decision variables, objective and constraint values and validity
+            of the individuals indexed by generation and individual.
+        """
+        if self._individuals is None:
+            num_gen, num_ind = self._valid.shape
+            index = pd.MultiIndex.from_product(
+                [range(num_gen), range(num_ind)], names=["gen", "ind"]
+            )
+            self._individuals = pd.DataFrame(
+                np.concatenate([
+                    self._x.reshape(num_gen * num_ind, -1),
+                    self._f.reshape(num_gen * num_ind, -1)
+                ], axis=1),
+                index=index,
+                columns=(
+                    self.variable_list + self.objective_list
+                    + self.constraint_list
+                )
+            )
+            self._individuals["valid"] = self._valid.ravel()
+
+        return self._individuals
+
+    def _report(self, gen, pop, num_gen):
+        """Log the champion of a generation."""
+        champion = ", ".join(
+            [
+                f"{label}: {round(value, 4)}" for label, value in zip(
+                    self.objective_list + self.variable_list,
+                    list(pop.champion_f[:len(self.objective_list)])
+                    + list(pop.champion_x)
+                )
+            ]
+        )
+        msg = f"Generation {gen}, champion: {champion}."
+        logger.progress(
+            gen + 1, msg,
+            extra={"progress_min": 0, "progress_max": num_gen}
+        )
+
+    def _save_checkpoint(self, checkpoint, gen, pop):
+        """Write the population and the archive of the run to disk.
+
+        Parameters
+        ----------
+        checkpoint : str
+            Path to the checkpoint file.
+
+        gen : int
+            Number of the last generation processed.
+
+        pop : pygmo.core.population
+            PyGMO population of the last generation processed.
+        """
+        udp = pop.problem.extract(type(self))
+        data = {
+            "gen": gen,
+            "x": self._x[:gen + 1],
+            "f": self._f[:gen + 1],
+            "pop_x": pop.get_x(),
+            "pop_f": pop.get_f(),
+            "memo": udp.memo,
+            "archive_x": udp.archive_x,
+            "archive_state": udp.archive_state,
+        }
+        # write to a temporary file first to keep the last checkpoint intact
+        # in case the run is interrupted while writing
+        with open(checkpoint + ".tmp", "wb") as f:
+            pickle.dump(data, f)
+        os.replace(checkpoint + ".tmp", checkpoint)
+
+    def _load_checkpoint(self, checkpoint, pop):
+        """Restore the population and the archive of a run from disk.
+
+        Parameters
+        ----------
+        checkpoint : str
+            Path to the checkpoint file.
+
+        pop : pygmo.core.population
+            PyGMO population of the run, providing the problem.
+
+        Returns
+        -------
+        result : tuple
+            Number of the last generation processed and the population of
+            that generation.
+        """
+        with open(checkpoint, "rb") as f:
+            data = pickle.load(f)
+
+        gen = data["gen"]
+        if gen >= self._x.shape[0] or data["x"].shape[1:] != self._x.shape[1:]:
+            msg = (
+                f"The checkpoint {checkpoint} does not match the number of "
+                "generations, individuals or decision variables of the run."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+
+        self._x[:gen + 1] = data["x"]
+        self._f[:gen + 1] = data["f"]
+        self._valid[:gen + 1] = (
+            data["f"][:, :, len(self.objective_list):] < 0
+        ).all(axis=2)
+
+        restored = pg.population(pop.problem)
+        for x, f in zip(data["pop_x"], data["pop_f"]):
+            restored.push_back(x, f)
+        udp = restored.problem.extract(type(self))
+        udp.memo = data["memo"]
+        udp.archive_x = data["archive_x"]
+        udp.archive_state = data["archive_state"]
+
+        msg = (
+            f"Resuming the optimization after generation {gen} from the "
+            f"checkpoint {checkpoint}."
+        )
+        logger.info(msg)
+        return gen, restored
+
+    def run(self, algo, pop, num_ind, num_gen, callback=None, checkpoint=None):
         """Run the optimization algorithm.
 
         Parameters
@@ -247,58 +642,325 @@ class OptimizationProblem:
 
         num_gen : int
             Number of generations.
-        """
 
-        self.individuals = pd.DataFrame(
-            index=range(num_gen * num_ind)
-        )
+        callback : function
+            Function called after every generation with the generation
+            number, the population and the optimization problem as
+            arguments. The run is stopped, if the function returns
+            :code:`True`.
 
-        self.individuals["gen"] = [
-            gen for gen in range(num_gen) for ind in range(num_ind)
-        ]
-        self.individuals["ind"] = [
-            ind for gen in range(num_gen) for ind in range(num_ind)
-        ]
+        checkpoint : str
+            Path to a checkpoint file. The population and the archive of
+            evaluated individuals are written to the file after every
+            generation. If the file exists, the run is resumed from the
+            generation stored in the file.
 
-        self.individuals.set_index(["gen", "ind"], inplace=True)
+        Returns
+        -------
+        pop : pygmo.core.population
+            PyGMO population of the last generation.
+
+        Note
+        ----
+        The champion of every generation is reported with the logger's
+        progress level. The data of the individuals of all generations are
+        available in the :code:`individuals` attribute after the run.
+        """
+        num_vars = len(self.variable_list)
+        num_f = len(self.objective_list) + len(self.constraint_list)
+        self._x = np.full((num_gen, num_ind, num_vars), np.nan)
+        self._f = np.full((num_gen, num_ind, num_f), np.nan)
+        self._valid = np.zeros((num_gen, num_ind), dtype=bool)
+        self._individuals = None
+
+        first_gen = 0
+        if checkpoint is not None and os.path.isfile(checkpoint):
+            gen, pop = self._load_checkpoint(checkpoint, pop)
+            first_gen = gen + 1
+
+        for gen in range(first_gen, num_gen):
+            if gen > 0:
+                pop = algo.evolve(pop)
 
-        # replace prints with logging
-        gen = 0
-        for gen in range(num_gen - 1):
             self._process_generation_data(gen, pop)
+            self._report(gen, pop, num_gen)
+            if checkpoint is not None:
+                self._save_checkpoint(checkpoint, gen, pop)
+            if callback is not None and callback(gen, pop, self):
+                msg = f"The optimization was stopped in generation {gen}."
+                logger.info(msg)
+                break
+
+        # pygmo evaluates the fitness on its own copy of the problem
+        udp = pop.problem.extract(type(self))
+        if udp is not None:
+            msg = (
+                f"The model has been solved {udp.num_solves} times, the "
+                f"fitness of {udp.num_memo_hits} individuals has been taken "
+                "from the memo."
+            )
+            logger.debug(msg)
+        self.close()
 
-            print('Evolution: {}'.format(gen))
-            for i in range(len(self.objective_list)):
-                print(
-                    self.objective_list[i] + ': {}'.format(
-                        round(pop.champion_f[i], 4)
-                    )
-                )
-            for i in range(len(self.variable_list)):
-                print(
-                    self.variable_list[i] + ': {}'.format(
-                        round(pop.champion_x[i], 4)
-                    )
-                )
-            pop = algo.evolve(pop)
+        return pop
 
-        if num_gen > 1:
-            gen += 1
 
-        self._process_generation_data(gen, pop)
+class GradientOptimizationProblem(OptimizationProblem):
+    r"""
+    The GradientOptimizationProblem handles gradient based optimization.
 
-        print('Final evolution: {}'.format(gen))
-        for i in range(len(self.objective_list)):
-            print(
-                self.objective_list[i] + ': {}'.format(
-                    round(pop.champion_f[i], 4)
-                )
+    - Set up the optimization problem with the same input dictionaries as
+      the :py:class:`tespy.tools.optimization.OptimizationProblem`.
+    - Run a local optimization with :code:`scipy.optimize.minimize` starting
+      from a single point, see
+      :py:meth:`tespy.tools.optimization.GradientOptimizationProblem.run`.
+    - Provide the evaluated points in the :code:`.individuals` attribute.
+
+    Parameters
+    ----------
+    model : custom class
+        Object of some class, which provides all the methods required by the
+        optimization suite and the network in the :code:`nw` attribute.
+
+    variables : dict
+        Dictionary containing the decision variables and their respective
+        bounds.
+
+    constraints : dict
+        Dictionary containing the constraints for the model.
+
+    objective : str
+        Name of the objective. :code:`objective` is passed to the
+        :code:`get_objective` method of your tespy model instance.
+
+    method : str
+        Method of :code:`scipy.optimize.minimize` supporting bounds and
+        inequality constraints, e.g. :code:`"SLSQP"` or
+        :code:`"trust-constr"`, default value :code:`"SLSQP"`.
+
+    Note
+    ----
+    The gradients of the objective and the constraints are calculated from
+    the Jacobian matrix of the converged simulation, see
+    :py:class:`tespy.tools.sensitivity.SensitivityAnalysis`. For this, the
+    decision variables of the :code:`"Connections"` and :code:`"Components"`
+    must be specified parameters of the respective connection or component
+    in the network, and the :code:`get_objective` and :code:`get_param`
+    methods must read the values from the network's objects, not from its
+    :code:`results` DataFrames. The gradients to other decision variables
+    are calculated by forward differences with an additional simulation per
+    variable.
+
+    Every simulation starts from the results of the previous converged
+    simulation. The number of simulations and gradient evaluations are
+    available in the :code:`num_solves` and :code:`num_gradients`
+    attributes.
+
+    Example
+    -------
+    For an example please go to the tutorials section of TESPy's online
+    documentation.
+    """
+
+    def __init__(self, model, variables={}, constraints={},
+                 objective="objective", method="SLSQP"):
+        if optimize is None:
+            msg = (
+                "For this function of TESPy scipy has to be installed. Use "
+                "pip or conda to install the latest scipy version."
             )
-        for i in range(len(self.variable_list)):
-            print(
-                self.variable_list[i] + ': {}'.format(
-                    round(pop.champion_x[i], 4)
-                )
+            raise ImportError(msg)
+
+        if getattr(model, "nw", None) is None:
+            msg = (
+                "The model must provide its network in the nw attribute for "
+                "the gradient based optimization."
             )
+            logger.error(msg)
+            raise AttributeError(msg)
+
+        self._setup(model, variables, constraints, objective, 1, None)
+        self.method = method
+        self.num_gradients = 0
+        self.state = None
+        self._last = None
+        self._history = []
+
+    def _parameters(self):
+        """Return the network objects and parameters of the variables."""
+        nw = self.model.nw
+        parameters = []
+        for obj, data in self.variables.items():
+            for label, params in data.items():
+                if obj == "Connections":
+                    parameters += [(nw.get_conn(label), p) for p in params]
+                elif obj == "Components":
+                    parameters += [(nw.get_comp(label), p) for p in params]
+                else:
+                    parameters += [None]
+        return parameters
+
+    def _function(self, i):
+        """Return a function evaluating an objective or constraint value."""
+        def function():
+            values = (
+                [self.model.get_objective(self.objective)]
+                + self.collect_constraints("upper")
+                + self.collect_constraints("lower")
+            )
+            return values[i]
 
-        return pop
+        function.__name__ = (self.objective_list + self.constraint_list)[i]
+        return function
+
+    def _gradient(self, x, fitness):
+        """Calculate the gradients of the objective and the constraints."""
+        parameters = self._parameters()
+        gradient = np.zeros((len(fitness), len(x)))
+
+        columns = [i for i, p in enumerate(parameters) if p is not None]
+        if len(columns) > 0:
+            sensitivities = self.model.nw.sensitivities(
+                [self._function(i) for i in range(len(fitness))],
+                [parameters[i] for i in columns], method="direct"
+            )
+            gradient[:, columns] = sensitivities.values
+
+        state = self.state
+        for i, parameter in enumerate(parameters):
+            if parameter is not None:
+                continue
+            d = 1e-4 * max(abs(x[i]), 1)
+            if x[i] + d > self.bounds[1][i]:
+                d = -d
+            x_d = np.array(x, dtype=float)
+            x_d[i] += d
+            fitness_d, _ = self.evaluate(x_d, state)
+            self.num_solves += 1
+            gradient[:, i] = (np.asarray(fitness_d) - fitness) / d
+
+        self.num_gradients += 1
+        return gradient
+
+    def _evaluate(self, x):
+        """Return the fitness and its gradient, simulating new points only."""
+        key = tuple(np.asarray(x, dtype=float))
+        if self._last is not None and self._last[0] == key:
+            return self._last[1], self._last[2]
+
+        fitness, state = self.evaluate(x, self.state)
+        self.num_solves += 1
+        fitness = np.asarray(fitness, dtype=float)
+        converged = state is not None and self.model.nw.converged
+        self._history += [list(key) + list(fitness) + [converged]]
+
+        if converged:
+            self.state = state
+            gradient = self._gradient(x, fitness)
+        else:
+            msg = (
+                "The simulation of the decision variables "
+                f"{dict(zip(self.variable_list, key))} failed."
+            )
+            logger.warning(msg)
+            gradient = np.full((len(fitness), len(x)), np.nan)
+
+        self._last = (key, fitness, gradient)
+        return fitness, gradient
+
+    def _objective(self, x):
+        fitness, gradient = self._evaluate(x)
+        return fitness[0], gradient[0]
+
+    def _constraints(self, x):
+        # scipy expects inequality constraints as non-negative values
+        return -self._evaluate(x)[0][self.nobj:]
+
+    def _constraints_jacobian(self, x):
+        return -self._evaluate(x)[1][self.nobj:]
+
+    @property
+    def individuals(self):
+        """Return the data of all points evaluated in the last run.
+
+        Returns
+        -------
+        individuals : pandas.core.frame.DataFrame
+            Decision variables, objective and constraint values and validity
+            of the evaluated points in order of their evaluation. Points
+            simulated for the forward differences are not included.
+        """
+        columns = (
+            self.variable_list + self.objective_list + self.constraint_list
+        )
+        individuals = pd.DataFrame(
+            self._history, columns=columns + ["converged"]
+        )
+        individuals.index.name = "evaluation"
+        individuals["valid"] = individuals["converged"] & (
+            individuals[self.constraint_list] <= 0
+        ).all(axis=1)
+        return individuals.drop(columns="converged")
+
+    def run(self, x0=None, tol=None, options=None):
+        """Run the optimization algorithm.
+
+        Parameters
+        ----------
+        x0 : list
+            Starting values of the decision variables. By default, the
+            decision variables of the connections and components start from
+            the current values of the model, all other decision variables
+            from the center of their bounds.
+
+        tol : float
+            Tolerance for termination passed to
+            :code:`scipy.optimize.minimize`.
+
+        options : dict
+            Solver options passed to :code:`scipy.optimize.minimize`, e.g.
+            :code:`{"maxiter": 50}`.
+
+        Returns
+        -------
+        result : scipy.optimize.OptimizeResult
+            Result of the optimization.
+        """
+        if x0 is None:
+            # the center of the bounds for variables outside the network
+            x0 = (np.asarray(self.bounds[0], dtype=float) + self.bounds[1]) / 2
+            i = 0
+            for obj, data in self.variables.items():
+                for label, params in data.items():
+                    if obj in ["Connections", "Components"]:
+                        for param in params:
+                            x0[i] = self.model.get_param(obj, label, param)
+                            i += 1
+                    else:
+                        i += 1
+
+        self.num_solves = 0
+        self.num_gradients = 0
+        self._last = None
+        self._history = []
+
+        constraints = []
+        if self.nic > 0:
+            constraints = [{
+                "type": "ineq", "fun": self._constraints,
+                "jac": self._constraints_jacobian
+            }]
+
+        result = optimize.minimize(
+            self._objective, np.asarray(x0, dtype=float), jac=True,
+            method=self.method, bounds=list(zip(*self.bounds)),
+            constraints=constraints, tol=tol, options=options
+        )
+
+        msg = (
+            f"The optimization finished with the message: {result.message} "
+            f"The model has been solved {self.num_solves} times, the "
+            f"gradients have been evaluated {self.num_gradients} times."
+        )
+        logger.info(msg)
+        return result
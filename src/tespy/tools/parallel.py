@@ -0,0 +1,422 @@
+# -*- coding: utf-8
+
+"""Module for the parallel evaluation of component and connection equations.
+
+The equations of the components and connections of a network are independent
+of each other within a Newton iteration. The :py:class:`ParallelEvaluator`
+distributes them on a pool of worker processes, which persists for the
+duration of a simulation. The values of the variables, the increment filter,
+the residual vector and the Jacobian matrix are shared through
+:py:mod:`multiprocessing.shared_memory`, the processes synchronize once per
+iteration.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location tespy/tools/parallel.py
+
+SPDX-License-Identifier: MIT
+"""
+
+import multiprocessing as mp
+import os
+import pickle
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from tespy.tools import logger
+from tespy.tools.helpers import get_variable_value
+from tespy.tools.helpers import set_variable_value
+
+
+def evaluate_equations(obj, increment_filter, residual, jacobian, sum_eq,
+                       variable_columns=None):
+    r"""
+    Write residual values and partial derivatives of a component/connection.
+
+    Parameters
+    ----------
+    obj : object
+        Component or connection to evaluate.
+
+    increment_filter : ndarray
+        Matrix for filtering non-changing variables.
+
+    residual : ndarray
+        Residual vector of the network.
+
+    jacobian : ndarray
+        Jacobian matrix of the network.
+
+    sum_eq : int
+        Position of the first equation of the object in the Jacobian.
+
+    variable_columns : list
+        Columns of the variables of the object, see e.g.
+        :py:meth:`tespy.components.component.Component.get_variable_columns`.
+        The object is evaluated in any case, if not specified.
+
+    Returns
+    -------
+    evaluated : boolean
+        :code:`False` in case none of the variables changed in the last
+        iteration and the residual values and partial derivatives of the last
+        evaluation are still in place.
+    """
+    if (
+            variable_columns is not None
+            and increment_filter[variable_columns].all()):
+        return False
+
+    obj.solve(increment_filter)
+    residual[sum_eq:sum_eq + obj.num_eq] = obj.residual
+
+    if len(obj.jacobian) > 0:
+        rows = [k[0] + sum_eq for k in obj.jacobian]
+        columns = [k[1] for k in obj.jacobian]
+        data = list(obj.jacobian.values())
+        jacobian[rows, columns] = data
+    return True
+
+
+def _attach(name, shape, dtype):
+    buffer = shared_memory.SharedMemory(name=name)
+    return buffer, np.ndarray(shape, dtype=dtype, buffer=buffer.buf)
+
+
+def _load(payload, tasks):
+    comps, conns, variables_dict = pickle.loads(payload)
+    objects = {"comp": comps, "conn": conns}
+    tasks = [(objects[kind][i], sum_eq) for kind, i, sum_eq in tasks]
+    fluid_conns = [c for c in conns if len(c.fluid.is_var) > 0]
+    columns = {obj: obj.get_variable_columns() for obj, _ in tasks}
+    return tasks, variables_dict, fluid_conns, columns
+
+
+def _worker(pipe, buffers, num_vars):
+    r"""
+    Evaluate the equations of the assigned components and connections.
+
+    The worker receives the components and connections of a simulation with a
+    :code:`"load"` message and evaluates their equations for every
+    :code:`"evaluate"` message until it receives :code:`None`.
+
+    Parameters
+    ----------
+    pipe : multiprocessing.connection.Connection
+        Connection to the main process.
+
+    buffers : dict
+        Names of the shared memory blocks.
+
+    num_vars : int
+        Number of variables of the network.
+    """
+    shm = {}
+    shm["state"], state = _attach(buffers["state"], (num_vars,), float)
+    shm["filter"], increment_filter = _attach(
+        buffers["filter"], (num_vars,), bool
+    )
+    shm["residual"], residual = _attach(
+        buffers["residual"], (num_vars,), float
+    )
+    shm["jacobian"], jacobian = _attach(
+        buffers["jacobian"], (num_vars, num_vars), float
+    )
+
+    tasks = []
+    variables_dict = {}
+    fluid_conns = []
+    columns = {}
+    try:
+        while True:
+            message = pipe.recv()
+            if message is None:
+                break
+            try:
+                if message[0] == "load":
+                    tasks, variables_dict, fluid_conns, columns = _load(
+                        *message[1:]
+                    )
+                    pipe.send(True)
+                    continue
+
+                reuse = message[1]
+                for col, data in variables_dict.items():
+                    set_variable_value(data, state[col])
+                for c in fluid_conns:
+                    c.build_fluid_data()
+
+                num_reused = 0
+                for obj, sum_eq in tasks:
+                    if not evaluate_equations(
+                            obj, increment_filter, residual, jacobian, sum_eq,
+                            columns[obj] if reuse else None):
+                        num_reused += 1
+                    obj.it += 1
+
+                pipe.send(num_reused)
+            except Exception as e:
+                pipe.send(e)
+    finally:
+        # drop the views before closing the shared memory blocks
+        del state, increment_filter, residual, jacobian
+        for buffer in shm.values():
+            buffer.close()
+
+
+def _shutdown(pid, processes, pipes, buffers):
+    # forked processes inherit the evaluator but do not own the workers
+    if os.getpid() != pid:
+        return
+    for pipe in pipes:
+        try:
+            pipe.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+    for pipe in pipes:
+        pipe.close()
+    for buffer in buffers.values():
+        try:
+            buffer.close()
+        except BufferError:
+            # views on the block are still alive, released with them
+            pass
+        buffer.unlink()
+
+
+class ParallelEvaluator:
+    r"""
+    Evaluate the component and connection equations in worker processes.
+
+    Parameters
+    ----------
+    nw : tespy.networks.network.Network
+        Network to evaluate the equations of.
+
+    num_workers : int
+        Number of worker processes.
+
+    Note
+    ----
+    The evaluator provides the residual vector and Jacobian matrix of the
+    network in shared memory. The worker processes are started with the
+    first call of :py:meth:`ParallelEvaluator.start` and persist for all
+    simulations of the network with the same topology and number of
+    variables. At the start of every simulation, the state of the network
+    after the first iteration, which is evaluated in the main process, is
+    sent to the workers. The components and connections are distributed on
+    the workers by their number of equations. Busses and user defined
+    equations are evaluated in the main process. The workers are stopped
+    with :py:meth:`ParallelEvaluator.close` or when the evaluator is garbage
+    collected.
+
+    Example
+    -------
+    The evaluator is used by the network, in case the :code:`workers`
+    parameter is larger than one.
+
+    >>> from tespy.components import Sink, Source, Valve
+    >>> from tespy.connections import Connection
+    >>> from tespy.networks import Network
+    >>> nw = Network(p_unit="bar", T_unit="C", iterinfo=False, workers=2)
+    >>> so = Source("source")
+    >>> si = Sink("sink")
+    >>> v = Valve("valve", pr=0.5)
+    >>> c1 = Connection(so, "out1", v, "in1")
+    >>> c2 = Connection(v, "out1", si, "in1")
+    >>> nw.add_conns(c1, c2)
+    >>> c1.set_attr(fluid={"R134a": 1}, m=1, p=10, T=30)
+    >>> nw.solve("design")
+    >>> round(c2.T.val, 2)
+    15.73
+    """
+
+    def __init__(self, nw, num_workers):
+        self.nw = nw
+        self.num_workers = num_workers
+        self.num_vars = nw.num_vars
+        self.topology = self.get_topology(nw)
+        self.processes = []
+        self.pipes = []
+
+        self.buffers = {}
+        self.arrays = {}
+        for name, shape, dtype in [
+                ("state", (self.num_vars,), float),
+                ("filter", (self.num_vars,), bool),
+                ("residual", (self.num_vars,), float),
+                ("jacobian", (self.num_vars, self.num_vars), float)]:
+            size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+            buffer = shared_memory.SharedMemory(create=True, size=size)
+            self.buffers[name] = buffer
+            self.arrays[name] = np.ndarray(
+                shape, dtype=dtype, buffer=buffer.buf
+            )
+            self.arrays[name][:] = 0
+
+        # stop the workers and release the shared memory, if the evaluator
+        # is not closed explicitly
+        self._finalizer = weakref.finalize(
+            self, _shutdown, os.getpid(), self.processes, self.pipes,
+            self.buffers
+        )
+
+    @staticmethod
+    def get_topology(nw):
+        r"""
+        Return the topology of a network.
+
+        Parameters
+        ----------
+        nw : tespy.networks.network.Network
+            Network to get the topology of.
+
+        Returns
+        -------
+        topology : tuple
+            Labels of the components and connections of the network.
+        """
+        return tuple(nw.comps.index), tuple(nw.conns.index)
+
+    def matches(self, nw, num_workers):
+        r"""
+        Check, if the evaluator can be used for a simulation of a network.
+
+        Parameters
+        ----------
+        nw : tespy.networks.network.Network
+            Network to simulate.
+
+        num_workers : int
+            Number of worker processes.
+
+        Returns
+        -------
+        matches : boolean
+            The evaluator is open and the network has the same topology,
+            number of variables and workers.
+        """
+        return (
+            self._finalizer.alive
+            and self.nw is nw
+            and self.num_workers == num_workers
+            and self.num_vars == nw.num_vars
+            and self.topology == self.get_topology(nw)
+        )
+
+    @property
+    def residual(self):
+        return self.arrays["residual"]
+
+    @property
+    def jacobian(self):
+        return self.arrays["jacobian"]
+
+    def start(self, offsets):
+        r"""
+        Send the components and connections of a simulation to the workers.
+
+        The worker processes are started, if they are not running yet.
+
+        Parameters
+        ----------
+        offsets : list
+            Tuples of the object type (:code:`"comp"` or :code:`"conn"`), the
+            index of the object and the position of its first equation in
+            the Jacobian matrix.
+        """
+        comps = list(self.nw.comps["object"])
+        conns = list(self.nw.conns["object"])
+        objects = {"comp": comps, "conn": conns}
+
+        # longest processing time first: largest blocks to the least loaded
+        tasks = [[] for _ in range(self.num_workers)]
+        load = np.zeros(self.num_workers)
+        offsets = sorted(
+            [o for o in offsets if objects[o[0]][o[1]].num_eq > 0],
+            key=lambda o: objects[o[0]][o[1]].num_eq, reverse=True
+        )
+        for kind, i, sum_eq in offsets:
+            worker = int(np.argmin(load))
+            tasks[worker] += [(kind, i, sum_eq)]
+            load[worker] += objects[kind][i].num_eq
+
+        payload = pickle.dumps((comps, conns, self.nw.variables_dict))
+        names = {name: buffer.name for name, buffer in self.buffers.items()}
+        started = 0
+        for _ in range(len(self.processes), self.num_workers):
+            parent, child = mp.Pipe()
+            process = mp.Process(
+                target=_worker, args=(child, names, self.num_vars),
+                daemon=True
+            )
+            process.start()
+            self.processes += [process]
+            self.pipes += [parent]
+            started += 1
+
+        for pipe, worker_tasks in zip(self.pipes, tasks):
+            pipe.send(("load", payload, worker_tasks))
+        self._receive()
+
+        msg = (
+            f"Started {started} worker processes and distributed "
+            f"{len(offsets)} components and connections on "
+            f"{len(self.processes)} workers."
+        )
+        logger.debug(msg)
+
+    def evaluate(self, increment_filter, reuse=True):
+        r"""
+        Evaluate the equations of all components and connections.
+
+        Parameters
+        ----------
+        increment_filter : ndarray
+            Matrix for filtering non-changing variables.
+
+        reuse : boolean
+            Skip the evaluation of components and connections, whose
+            variables did not change in the last iteration.
+
+        Returns
+        -------
+        num_reused : int
+            Number of components and connections, which have not been
+            evaluated, as their variables did not change.
+        """
+        state = self.arrays["state"]
+        for col, data in self.nw.variables_dict.items():
+            state[col] = get_variable_value(data)
+        self.arrays["filter"][:] = increment_filter
+
+        for pipe in self.pipes:
+            pipe.send(("evaluate", reuse))
+
+        return sum(self._receive())
+
+    def _receive(self):
+        results = []
+        for pipe in self.pipes:
+            result = pipe.recv()
+            if isinstance(result, Exception):
+                msg = (
+                    "The evaluation of the equations failed in a worker "
+                    f"process: {result}"
+                )
+                logger.error(msg)
+                raise result
+            results += [result]
+        return results
+
+    def close(self):
+        r"""Stop the worker processes and release the shared memory."""
+        # drop the views before closing the shared memory blocks
+        self.arrays = {}
+        self._finalizer()
@@ -0,0 +1,300 @@
+# -*- coding: utf-8
+
+"""Module for the profiling of fluid property calls.
+
+The profiler replaces the methods of the fluid property wrappers and the
+mixture functions of :py:mod:`tespy.tools.fluid_properties.functions` with
+timed versions for the duration of a simulation only. The original functions
+are restored afterwards, i.e. there is no overhead in case the profiling is
+not enabled.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location tespy/tools/profiling.py
+
+SPDX-License-Identifier: MIT
+"""
+
+import inspect
+import sys
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+
+import pandas as pd
+
+from tespy.tools.fluid_properties import functions
+from tespy.tools.fluid_properties.wrappers import wrapper_registry
+
+
+class FluidPropertyProfiler:
+    r"""
+    Count and time the fluid property calls of a network simulation.
+
+    The calls are recorded per wrapper method or mixture function, per
+    calling object (component, connection, bus or user defined equation) and
+    per solver phase:
+
+    - :code:`"initialisation"`: network initialisation and presolving
+    - :code:`"residual"`: calculation of the residual values of the equations
+    - :code:`"derivative"`: calculation of the partial derivatives
+    - :code:`"bounds"`: checks of the variable values for feasible ranges
+    - :code:`"postprocessing"`: calculation of the results
+
+    Note
+    ----
+    The time recorded for a mixture function includes the time spent in the
+    calls to the wrapper methods from within that function. The equations of
+    the busses are evaluated together with their partial derivatives and
+    therefore recorded in the residual phase.
+
+    Example
+    -------
+    The profiler is enabled with the :code:`profile` parameter of the network.
+    The report is available after the simulation.
+
+    >>> from tespy.components import Sink, Source, SimpleHeatExchanger
+    >>> from tespy.connections import Connection
+    >>> from tespy.networks import Network
+    >>> nw = Network(T_unit="C", p_unit="bar", iterinfo=False, profile=True)
+    >>> so = Source("source")
+    >>> heater = SimpleHeatExchanger("heater")
+    >>> si = Sink("sink")
+    >>> c1 = Connection(so, "out1", heater, "in1", label="1")
+    >>> c2 = Connection(heater, "out1", si, "in1", label="2")
+    >>> nw.add_conns(c1, c2)
+    >>> heater.set_attr(pr=0.95)
+    >>> c1.set_attr(fluid={"air": 1}, m=1, p=10, T=20)
+    >>> c2.set_attr(T=120)
+    >>> nw.solve("design")
+    >>> report = nw.profile_report()
+    >>> list(report.columns)
+    ['type', 'object', 'phase', 'function', 'calls', 'time']
+    >>> calls = report[report["object"] == "2"].groupby("phase")["calls"].sum()
+    >>> list(calls.index)
+    ['bounds', 'derivative', 'postprocessing', 'residual']
+    >>> "CoolPropWrapper.T_ph" in report["function"].values
+    True
+    """
+
+    def __init__(self):
+        self.records = {}
+        self.context = ("Network", "network", "initialisation")
+        self._patches = []
+
+    def _record(self, name, function):
+        profiler = self
+
+        @wraps(function)
+        def recorded(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                key = profiler.context + (name,)
+                record = profiler.records.setdefault(key, [0, 0.0])
+                record[0] += 1
+                record[1] += perf_counter() - start
+
+        return recorded
+
+    @staticmethod
+    def _context(obj, phase):
+        return (obj.__class__.__name__, getattr(obj, "label", "network"), phase)
+
+    def _in_context(self, obj, phase, function):
+        profiler = self
+        context = self._context(obj, phase)
+
+        @wraps(function)
+        def in_context(*args, **kwargs):
+            previous = profiler.context
+            profiler.context = context
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.context = previous
+
+        return in_context
+
+    def _patch_attribute(self, target, name, value):
+        own = name in vars(target)
+        self._patches += [(target, name, getattr(target, name), own, value)]
+        setattr(target, name, value)
+
+    def _patch_item(self, target, key, value):
+        self._patches += [(target, key, target[key], None, value)]
+        target[key] = value
+
+    def _restore(self):
+        for target, name, original, own, _ in reversed(self._patches):
+            if own is None:
+                target[name] = original
+            elif own:
+                setattr(target, name, original)
+            else:
+                delattr(target, name)
+
+    def _reapply(self):
+        for target, name, _, own, value in self._patches:
+            if own is None:
+                target[name] = value
+            else:
+                setattr(target, name, value)
+
+    @contextmanager
+    def suspended(self):
+        r"""
+        Temporarily restore the original functions and methods.
+
+        The instrumented objects of a network cannot be pickled, e.g. to
+        send them to the worker processes of the parallel evaluation.
+        """
+        self._restore()
+        try:
+            yield self
+        finally:
+            self._reapply()
+
+    def _instrument_functions(self):
+        # wrapper methods are replaced on class level, methods inherited from
+        # a parent class are replaced on the parent class only
+        for wrapper in wrapper_registry.items.values():
+            for name, method in list(vars(wrapper).items()):
+                if inspect.isfunction(method) and not name.startswith("_"):
+                    self._patch_attribute(
+                        wrapper, name,
+                        self._record(f"{wrapper.__name__}.{name}", method)
+                    )
+
+        # the mixture functions are imported by name in many modules
+        originals = {
+            function: self._record(name, function)
+            for name, function in vars(functions).items()
+            if inspect.isfunction(function)
+            and function.__module__ == functions.__name__
+        }
+        for module_name, module in list(sys.modules.items()):
+            if module is None or not module_name.startswith("tespy"):
+                continue
+            for name, value in list(vars(module).items()):
+                if inspect.isfunction(value) and value in originals:
+                    self._patch_attribute(module, name, originals[value])
+
+    def _instrument_network(self, nw):
+        for name, phase in [
+                ("check_variable_bounds", "bounds"),
+                ("postprocessing", "postprocessing")]:
+            self._patch_attribute(
+                nw, name, self._in_context(nw, phase, getattr(nw, name))
+            )
+
+        # the objects' equations are available after initialisation only
+        initialise = self._in_context(nw, "initialisation", nw.initialise)
+
+        def initialise_and_instrument():
+            initialise()
+            self._instrument_objects(nw)
+
+        self._patch_attribute(nw, "initialise", initialise_and_instrument)
+
+        check_connection_properties = nw.check_connection_properties
+
+        def check_connection_properties_in_context(c):
+            previous = self.context
+            self.context = self._context(c, "bounds")
+            try:
+                check_connection_properties(c)
+            finally:
+                self.context = previous
+
+        self._patch_attribute(
+            nw, "check_connection_properties",
+            check_connection_properties_in_context
+        )
+
+    def _instrument_objects(self, nw):
+        for cp in nw.comps["object"]:
+            for constraint in cp.constraints.values():
+                for key, phase in [
+                        ("func", "residual"), ("deriv", "derivative")]:
+                    self._patch_item(
+                        constraint, key,
+                        self._in_context(cp, phase, constraint[key])
+                    )
+            for data in cp.parameters.values():
+                if getattr(data, "func", None) is not None:
+                    self._patch_containers(cp, data)
+            for name, phase in [
+                    ("autodiff", "residual"),
+                    ("convergence_check", "bounds"),
+                    ("calc_parameters", "postprocessing")]:
+                self._patch_attribute(
+                    cp, name, self._in_context(cp, phase, getattr(cp, name))
+                )
+
+        for c in nw.conns["object"]:
+            for parameter in c.equations.values():
+                self._patch_containers(c, c.get_attr(parameter))
+            for name, phase in [
+                    ("autodiff", "residual"),
+                    ("calc_results", "postprocessing")]:
+                self._patch_attribute(
+                    c, name, self._in_context(c, phase, getattr(c, name))
+                )
+
+        for bus in nw.busses.values():
+            self._patch_attribute(
+                bus, "solve", self._in_context(bus, "residual", bus.solve)
+            )
+
+        for ude in nw.user_defined_eq.values():
+            self._patch_containers(ude, ude)
+            self._patch_attribute(
+                ude, "autodiff",
+                self._in_context(ude, "residual", ude.autodiff)
+            )
+
+    def _patch_containers(self, obj, data):
+        for name, phase in [("func", "residual"), ("deriv", "derivative")]:
+            # user defined equations without derivative use autodiff
+            if getattr(data, name) is None:
+                continue
+            self._patch_attribute(
+                data, name, self._in_context(obj, phase, getattr(data, name))
+            )
+
+    @contextmanager
+    def instrument(self, nw):
+        r"""
+        Instrument the fluid property calls of a network simulation.
+
+        Parameters
+        ----------
+        nw : tespy.networks.network.Network
+            Network to profile.
+        """
+        self.records = {}
+        try:
+            self._instrument_functions()
+            self._instrument_network(nw)
+            yield self
+        finally:
+            self._restore()
+            self._patches = []
+
+    def report(self):
+        r"""
+        Return the recorded calls and time.
+
+        Returns
+        -------
+        report : pandas.core.frame.DataFrame
+            Number of calls and accumulated time in seconds per object type,
+            object label, solver phase and function, sorted by time.
+        """
+        report = pd.DataFrame(
+            [key + tuple(record) for key, record in self.records.items()],
+            columns=["type", "object", "phase", "function", "calls", "time"]
+        )
+        return report.sort_values("time", ascending=False, ignore_index=True)
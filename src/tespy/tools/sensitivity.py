@@ -0,0 +1,596 @@
+# -*- coding: utf-8
+
+r"""Module for the sensitivity analysis of a converged network.
+
+The sensitivities of results to specified parameters are calculated from the
+Jacobian matrix of the converged network with the implicit function theorem:
+With the residual equations :math:`R(x, \theta)=0` the change of the variables
+:math:`x` due to a change of the parameters :math:`\theta` is
+
+.. math::
+
+    \frac{dx}{d\theta} = -J^{-1} \cdot \frac{\partial R}{\partial \theta}
+
+and the sensitivity of an output :math:`y=g(x, \theta)` is
+
+.. math::
+
+    \frac{dy}{d\theta} = \frac{\partial g}{\partial x} \cdot
+    \frac{dx}{d\theta} + \frac{\partial g}{\partial \theta}
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location tespy/tools/sensitivity.py
+
+SPDX-License-Identifier: MIT
+"""
+
+import numpy as np
+import pandas as pd
+
+from tespy.tools import logger
+from tespy.tools.global_vars import fluid_property_data as fpd
+from tespy.tools.helpers import TESPyNetworkError
+from tespy.tools.helpers import convert_to_SI
+from tespy.tools.helpers import get_variable_value
+from tespy.tools.helpers import set_variable_value
+
+
+def _step(value):
+    return 1e-6 * max(abs(value), 1)
+
+
+class SensitivityAnalysis:
+    r"""
+    Calculate the sensitivities of results to parameters of a network.
+
+    Parameters
+    ----------
+    nw : tespy.networks.network.Network
+        Converged network to analyse.
+
+    Note
+    ----
+    The Jacobian matrix is evaluated at the converged state of the network
+    and factorized once. The partial derivatives of the residual values to
+    the parameters are calculated numerically by evaluating the equations of
+    the component, connection, bus or user defined equation the parameter
+    belongs to. Only for specified mass flow, pressure and enthalpy values
+    and for temperature, vapor quality or temperature difference to boiling
+    point, which have been presolved, all equations of the network are
+    evaluated. The partial derivatives of the outputs to the variables are
+    calculated numerically from the variables of the respective connection,
+    component or bus.
+
+    With the :code:`direct` method, the changes of the variables are
+    calculated for every parameter, with the :code:`adjoint` method a linear
+    system is solved for every output instead. Both methods yield identical
+    sensitivities, the adjoint method is preferable for many parameters and
+    few outputs.
+
+    Outputs can also be functions without arguments, e.g. the objective of an
+    optimization. These are differentiated along the changes of the variables
+    calculated with the direct method: The results of all connections,
+    components and busses are calculated for the changed variables and
+    parameters before the function is called. The function therefore must
+    read the values from the network's objects and not from the
+    :code:`results` DataFrames.
+
+    Example
+    -------
+    Calculate the sensitivity of the outlet temperature and the heat loss
+    of a pipe to the inlet temperature, the mass flow and the heat transfer
+    coefficient. The sensitivities refer to the units of the parameters and
+    outputs of the network.
+
+    >>> from tespy.components import Pipe, Sink, Source
+    >>> from tespy.connections import Connection
+    >>> from tespy.networks import Network
+    >>> nw = Network(T_unit="C", p_unit="bar", iterinfo=False)
+    >>> so = Source("source")
+    >>> si = Sink("sink")
+    >>> pipe = Pipe("pipe", pr=0.95, kA=5e3, Tamb=10)
+    >>> c1 = Connection(so, "out1", pipe, "in1", label="1")
+    >>> c2 = Connection(pipe, "out1", si, "in1", label="2")
+    >>> nw.add_conns(c1, c2)
+    >>> c1.set_attr(fluid={"water": 1}, m=10, T=90, p=10)
+    >>> nw.solve("design")
+    >>> sensitivities = nw.sensitivities(
+    ...     outputs=[(c2, "T"), (pipe, "Q")],
+    ...     parameters=[(c1, "T"), (c1, "m"), (pipe, "kA")]
+    ... )
+    >>> sensitivities.round(3)
+                   1              pipe
+                   T         m      kA
+    2    T     0.889     0.846  -0.002
+    pipe Q -4717.959 -2202.334 -71.021
+    """
+
+    def __init__(self, nw):
+        if not getattr(nw, "converged", False):
+            msg = (
+                "The sensitivity analysis requires a converged simulation of "
+                "the network."
+            )
+            logger.error(msg)
+            raise TESPyNetworkError(msg)
+
+        self.nw = nw
+        self.comps = list(nw.comps["object"])
+        self.conns = list(nw.conns["object"])
+        self.busses = list(nw.busses.values())
+        self.udes = list(nw.user_defined_eq.values())
+
+    def calculate(self, outputs, parameters, method="auto"):
+        r"""
+        Calculate the sensitivity matrix.
+
+        Parameters
+        ----------
+        outputs : list
+            Tuples of a connection, component or bus and the name of the
+            result, e.g. :code:`(c1, "T")`, :code:`(compressor, "P")` or
+            :code:`(bus, "P")`, or functions without arguments returning a
+            value calculated from the results of the network.
+
+        parameters : list
+            Tuples of a connection, component, bus or user defined equation
+            and the name of a specified parameter, e.g. :code:`(c1, "T")`,
+            :code:`(compressor, "eta_s")`, :code:`(bus, "P")` or
+            :code:`(ude, "dT")` for a parameter in the :code:`params` of a
+            user defined equation.
+
+        method : str
+            Method for the linear system, :code:`"direct"`,
+            :code:`"adjoint"` or :code:`"auto"` (adjoint for less outputs
+            than parameters and no functions as outputs), default value
+            :code:`"auto"`.
+
+        Returns
+        -------
+        sensitivities : pandas.core.frame.DataFrame
+            Sensitivities of the outputs (rows) to the parameters (columns)
+            in the units of the network. The rows of functions are labeled
+            with the name of the function.
+        """
+        if method not in ["auto", "direct", "adjoint"]:
+            msg = (
+                "The method of the sensitivity analysis must be 'auto', "
+                f"'direct' or 'adjoint', not '{method}'."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+
+        functions = [output for output in outputs if callable(output)]
+        if method == "auto":
+            if len(outputs) < len(parameters) and len(functions) == 0:
+                method = "adjoint"
+            else:
+                method = "direct"
+
+        # results of the connections, which are changed by the evaluation of
+        # the equations and outputs
+        snapshot = {
+            container: container.__dict__.copy() for c in self.conns
+            for container in [c.get_attr(prop) for prop in fpd] + [c.fluid]
+        }
+        self._apply_topology_reduction()
+        try:
+            parameters = [
+                self._parameter(obj, name) for obj, name in parameters
+            ]
+            outputs = [
+                self._function(output) if callable(output)
+                else self._output(*output) for output in outputs
+            ]
+
+            self.x0 = np.array([
+                get_variable_value(self.nw.variables_dict[col])
+                for col in range(self.nw.num_vars)
+            ])
+            self.blocks = self._blocks()
+            jacobian = self._jacobian()
+
+            residual_deriv = np.zeros((self.nw.num_vars, len(parameters)))
+            output_deriv = np.zeros((len(outputs), self.nw.num_vars))
+            direct_deriv = np.zeros((len(outputs), len(parameters)))
+            for j, parameter in enumerate(parameters):
+                residual_deriv[:, j] = self._residual_deriv(parameter)
+            for i, output in enumerate(outputs):
+                if output["kind"] == "function":
+                    continue
+                output_deriv[i] = self._output_deriv(output)
+                for j, parameter in enumerate(parameters):
+                    direct_deriv[i, j] = self._direct_deriv(output, parameter)
+
+            try:
+                if method == "direct" or len(functions) > 0:
+                    increment = np.linalg.solve(jacobian, -residual_deriv)
+                if method == "direct":
+                    sensitivities = output_deriv @ increment
+                else:
+                    adjoint = np.linalg.solve(jacobian.T, output_deriv.T)
+                    sensitivities = -adjoint.T @ residual_deriv
+            except np.linalg.LinAlgError:
+                msg = (
+                    "The Jacobian matrix of the network is singular, the "
+                    "sensitivities cannot be calculated."
+                )
+                logger.error(msg)
+                raise TESPyNetworkError(msg)
+
+            for i, output in enumerate(outputs):
+                if output["kind"] == "function":
+                    sensitivities[i] = self._function_deriv(
+                        output, parameters, increment
+                    )
+        finally:
+            self.nw._reset_topology_reduction_specifications()
+            for container, values in snapshot.items():
+                container.__dict__.update(values)
+            for c in self.conns:
+                c.build_fluid_data()
+
+        msg = (
+            f"Calculated the sensitivities of {len(outputs)} outputs to "
+            f"{len(parameters)} parameters with the {method} method."
+        )
+        logger.debug(msg)
+
+        return pd.DataFrame(
+            sensitivities + direct_deriv,
+            index=pd.MultiIndex.from_tuples(
+                [(o["label"], o["name"]) for o in outputs]
+            ),
+            columns=pd.MultiIndex.from_tuples(
+                [(p["obj"].label, p["name"]) for p in parameters]
+            )
+        )
+
+    def _apply_topology_reduction(self):
+        """Map the shared mass flow and fluid containers of the last solve."""
+        for c, m, fluid in self.nw._topology_reduction:
+            if m is not None:
+                c._m_tmp = c.m
+                c.m = m
+            if fluid is not None:
+                c._fluid_tmp = c.fluid
+                c.fluid = fluid
+
+    def _parameter(self, obj, name):
+        """Return the data of a parameter of the analysis."""
+        data = {"obj": obj, "name": name}
+        if obj in self.udes:
+            if name not in obj.params:
+                msg = (
+                    f"The user defined equation {obj.label} does not have "
+                    f"the parameter {name}."
+                )
+                logger.error(msg)
+                raise KeyError(msg)
+            data["kind"] = "ude"
+            data["blocks"] = [obj]
+            return data
+
+        container = obj.get_attr(name)
+        if not getattr(container, "is_set", False) or not hasattr(
+                container, "val") or getattr(container, "is_var", False):
+            msg = (
+                f"The parameter {name} of {obj.label} must be a specified "
+                "value for the sensitivity analysis."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+
+        data["container"] = container
+        if obj in self.comps:
+            data["kind"] = "comp"
+            data["blocks"] = [obj]
+        elif obj in self.busses:
+            data["kind"] = "bus"
+            data["blocks"] = [obj]
+        elif obj in self.conns:
+            if name not in fpd:
+                msg = (
+                    "The sensitivity analysis supports the mass flow, "
+                    "pressure, enthalpy, temperature, volumetric flow, vapor "
+                    "quality and temperature difference to boiling point "
+                    f"specifications of connections, not {name}."
+                )
+                logger.error(msg)
+                raise ValueError(msg)
+            data["kind"] = "conn"
+            if name in obj.equations.values():
+                data["blocks"] = [obj]
+            else:
+                # fixed variables affect all equations of the network
+                data["blocks"] = None
+        else:
+            msg = f"The object {obj.label} is not part of the network."
+            logger.error(msg)
+            raise ValueError(msg)
+
+        return data
+
+    def _function(self, func):
+        """Return the data of a function output of the analysis."""
+        name = getattr(func, "__name__", func.__class__.__name__)
+        return {
+            "kind": "function", "func": func, "label": name, "name": "",
+            "obj": None, "conns": [], "comps": []
+        }
+
+    def _output(self, obj, name):
+        """Return the data of an output of the analysis."""
+        data = {"obj": obj, "name": name, "label": obj.label}
+        if obj in self.conns:
+            data["kind"] = "conn"
+            conns = [obj]
+            comps = []
+        elif obj in self.comps:
+            data["kind"] = "comp"
+            conns = obj.inl + obj.outl
+            comps = [obj]
+        elif obj in self.busses and name == "P":
+            data["kind"] = "bus"
+            comps = list(obj.members)
+            conns = list({c for cp in comps for c in cp.inl + cp.outl})
+        else:
+            msg = (
+                f"The output {name} of {obj.label} is not available for the "
+                "sensitivity analysis."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+
+        data["conns"] = conns
+        data["comps"] = comps
+        columns = set()
+        for c in conns:
+            columns |= {
+                c.get_attr(var).J_col for var in ["m", "p", "h"]
+                if c.get_attr(var).is_var
+            }
+            columns |= {c.fluid.J_col[f] for f in c.fluid.is_var}
+        for cp in comps:
+            columns |= {container.J_col for container in cp.vars}
+        data["columns"] = sorted(columns)
+        return data
+
+    def _blocks(self):
+        """Return the equation blocks and their first row in the Jacobian."""
+        objects = {"comp": self.comps, "conn": self.conns}
+        blocks = [
+            (kind, objects[kind][i], sum_eq)
+            for kind, i, sum_eq in self.nw._equation_offsets
+            if objects[kind][i].num_eq > 0
+        ]
+        sum_eq = self.nw.num_comp_eq + self.nw.num_conn_eq
+        for bus in self.busses:
+            if bus.P.is_set:
+                blocks += [("bus", bus, sum_eq)]
+                sum_eq += 1
+        for ude in self.udes:
+            blocks += [("ude", ude, sum_eq)]
+            sum_eq += 1
+        return blocks
+
+    def _evaluate(self, kind, obj, increment_filter):
+        """Return residual values and partial derivatives of a block."""
+        residual, jacobian = obj.residual, obj.jacobian
+        obj.jacobian = {}
+        try:
+            if kind in ["comp", "conn"]:
+                # some constant partial derivatives are written in the first
+                # iteration only
+                it, obj.it = obj.it, 0
+                obj.residual = np.zeros(obj.num_eq)
+                try:
+                    obj.solve(increment_filter)
+                finally:
+                    obj.it = it
+                derivatives = {**obj.constant_jacobian, **obj.jacobian}
+            else:
+                obj.solve()
+                derivatives = {(0, k): v for k, v in obj.jacobian.items()}
+            return np.atleast_1d(obj.residual).copy(), derivatives
+        finally:
+            obj.residual, obj.jacobian = residual, jacobian
+
+    def _jacobian(self):
+        """Evaluate the Jacobian matrix at the converged state."""
+        jacobian = np.zeros((self.nw.num_vars, self.nw.num_vars))
+        increment_filter = np.zeros(self.nw.num_vars, dtype=bool)
+        for kind, obj, sum_eq in self.blocks:
+            _, derivatives = self._evaluate(kind, obj, increment_filter)
+            for (k, col), value in derivatives.items():
+                jacobian[sum_eq + k, col] = value
+        return jacobian
+
+    def _residual(self, objects):
+        """Evaluate the residual values of the blocks of some objects."""
+        residual = np.zeros(self.nw.num_vars)
+        increment_filter = np.ones(self.nw.num_vars, dtype=bool)
+        for kind, obj, sum_eq in self.blocks:
+            if objects is None or obj in objects:
+                values, _ = self._evaluate(kind, obj, increment_filter)
+                residual[sum_eq:sum_eq + len(values)] = values
+        return residual
+
+    def _set_parameter(self, parameter, value):
+        """Set the value of a parameter in the units of the network."""
+        obj = parameter["obj"]
+        name = parameter["name"]
+        if parameter["kind"] == "ude":
+            obj.params[name] = value
+            return
+
+        container = parameter["container"]
+        if parameter["kind"] == "conn":
+            container.val = value
+            container.val_SI = convert_to_SI(name, value, container.unit)
+            if parameter["blocks"] is None:
+                if len(obj.fluid.is_var) == 0:
+                    obj.simplify_specifications()
+                for var in ["p", "h", "T", "x", "Td_bp"]:
+                    obj.get_attr(var)._solved = False
+        else:
+            # temperatures (e.g. ambient temperature) are in val_SI
+            delta = value - container.val
+            container.val = value
+            if hasattr(container, "val_SI"):
+                container.val_SI += delta
+
+    def _get_parameter(self, parameter):
+        if parameter["kind"] == "ude":
+            return parameter["obj"].params[parameter["name"]]
+        return parameter["container"].val
+
+    def _snapshot(self, parameter):
+        """Store the values possibly changed by a parameter perturbation."""
+        if parameter["kind"] == "ude":
+            return parameter["obj"].params[parameter["name"]]
+        elif parameter["kind"] == "conn":
+            return {
+                container: container.__dict__.copy()
+                for container in [
+                    parameter["obj"].get_attr(prop) for prop in fpd
+                ]
+            }
+        container = parameter["container"]
+        return {container: container.__dict__.copy()}
+
+    def _restore(self, parameter, snapshot):
+        if parameter["kind"] == "ude":
+            parameter["obj"].params[parameter["name"]] = snapshot
+            return
+        for container, values in snapshot.items():
+            container.__dict__.update(values)
+
+    def _residual_deriv(self, parameter):
+        """Calculate the partial derivatives of the residuals to a parameter."""
+        value = self._get_parameter(parameter)
+        snapshot = self._snapshot(parameter)
+        d = _step(value)
+        try:
+            self._set_parameter(parameter, value + d)
+            upper = self._residual(parameter["blocks"])
+            self._set_parameter(parameter, value - d)
+            lower = self._residual(parameter["blocks"])
+        finally:
+            self._restore(parameter, snapshot)
+        return (upper - lower) / (2 * d)
+
+    def _evaluate_output(self, output):
+        """Evaluate an output at the current values of the variables."""
+        containers = [
+            c.get_attr(prop) for c in output["conns"] for prop in fpd
+        ] + [
+            cp.get_attr(key) for cp in output["comps"]
+            for key in cp.parameters
+        ]
+        snapshot = {
+            container: container.__dict__.copy() for container in containers
+        }
+        try:
+            for c in output["conns"]:
+                c.build_fluid_data()
+                c.calc_results()
+            if output["kind"] == "bus":
+                bus = output["obj"]
+                return sum(cp.calc_bus_value(bus) for cp in bus.members)
+            for cp in output["comps"]:
+                cp.calc_parameters()
+            return output["obj"].get_attr(output["name"]).val
+        finally:
+            for container, values in snapshot.items():
+                container.__dict__.update(values)
+
+    def _set_variable(self, col, value):
+        data = self.nw.variables_dict[col]
+        set_variable_value(data, value)
+        if data["variable"] == "fluid":
+            for c in self.conns:
+                if c.fluid is data["obj"].fluid:
+                    c.build_fluid_data()
+
+    def _output_deriv(self, output):
+        """Calculate the partial derivatives of an output to the variables."""
+        deriv = np.zeros(self.nw.num_vars)
+        for col in output["columns"]:
+            d = _step(self.x0[col])
+            try:
+                self._set_variable(col, self.x0[col] + d)
+                upper = self._evaluate_output(output)
+                self._set_variable(col, self.x0[col] - d)
+                lower = self._evaluate_output(output)
+            finally:
+                self._set_variable(col, self.x0[col])
+            deriv[col] = (upper - lower) / (2 * d)
+        return deriv
+
+    def _direct_deriv(self, output, parameter):
+        """Calculate the partial derivative of an output to a parameter."""
+        if parameter["kind"] == "ude" or (
+                parameter["blocks"] is not None
+                and parameter["obj"] not in output["conns"] + output["comps"]):
+            return 0
+
+        value = self._get_parameter(parameter)
+        snapshot = self._snapshot(parameter)
+        d = _step(value)
+        try:
+            self._set_parameter(parameter, value + d)
+            upper = self._evaluate_output(output)
+            self._set_parameter(parameter, value - d)
+            lower = self._evaluate_output(output)
+        finally:
+            self._restore(parameter, snapshot)
+        return (upper - lower) / (2 * d)
+
+    def _evaluate_function(self, func):
+        """Evaluate a function at the current values of the variables."""
+        containers = [
+            c.get_attr(prop) for c in self.conns for prop in fpd
+        ] + [
+            cp.get_attr(key) for cp in self.comps for key in cp.parameters
+        ] + [bus.P for bus in self.busses]
+        snapshot = {
+            container: container.__dict__.copy() for container in containers
+        }
+        try:
+            for c in self.conns:
+                c.build_fluid_data()
+                c.calc_results()
+            for cp in self.comps:
+                cp.calc_parameters()
+            for bus in self.busses:
+                bus.P.val = sum(cp.calc_bus_value(bus) for cp in bus.members)
+            return func()
+        finally:
+            for container, values in snapshot.items():
+                container.__dict__.update(values)
+
+    def _set_variables(self, x):
+        for col, data in self.nw.variables_dict.items():
+            set_variable_value(data, x[col])
+
+    def _function_deriv(self, output, parameters, increment):
+        """Calculate the derivatives of a function along the variables."""
+        deriv = np.zeros(len(parameters))
+        for j, parameter in enumerate(parameters):
+            value = self._get_parameter(parameter)
+            snapshot = self._snapshot(parameter)
+            d = _step(value)
+            try:
+                self._set_parameter(parameter, value + d)
+                self._set_variables(self.x0 + d * increment[:, j])
+                upper = self._evaluate_function(output["func"])
+                self._set_parameter(parameter, value - d)
+                self._set_variables(self.x0 - d * increment[:, j])
+                lower = self._evaluate_function(output["func"])
+            finally:
+                self._restore(parameter, snapshot)
+                self._set_variables(self.x0)
+            deriv[j] = (upper - lower) / (2 * d)
+        return deriv
@@ -0,0 +1,724 @@
+# -*- coding: utf-8
+
+r"""Module for surrogate models of networks.
+
+A surrogate model replaces the simulation of a network by a fast
+approximation of selected results as function of selected parameters. The
+:py:class:`SurrogateBuilder` samples the parameter space, solves the network
+at every sample and fits a :py:class:`Surrogate`, which is evaluated with
+NumPy only and can be saved to and loaded from disk.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location tespy/tools/surrogate.py
+
+SPDX-License-Identifier: MIT
+"""
+
+import itertools
+import json
+import multiprocessing as mp
+
+try:
+    from scipy.stats import qmc
+except ImportError:
+    qmc = None
+
+import numpy as np
+import pandas as pd
+
+from tespy.tools import logger
+from tespy.tools.helpers import TESPyNetworkError
+from tespy.tools.helpers import check_workers
+from tespy.tools.optimization import get_starting_values
+from tespy.tools.optimization import set_starting_values
+
+# builder of the worker process, set by the pool initializer
+_worker_builder = None
+
+
+def _init_worker(builder):
+    global _worker_builder
+    _worker_builder = builder
+
+
+def _solve_in_worker(X):
+    return _worker_builder._solve_points(X)
+
+
+def _thin_plate(r):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(r > 0, r ** 2 * np.log(r), 0)
+
+
+class Surrogate:
+    r"""
+    Fast approximation of results of a network.
+
+    Parameters
+    ----------
+    kind : str
+        Type of the surrogate, :code:`"grid"` (piecewise linear interpolation
+        on a regular grid), :code:`"rbf"` (thin plate spline radial basis
+        functions) or :code:`"polynomial"`.
+
+    parameters : list
+        Tuples of the label of the object and the name of the parameter.
+
+    outputs : list
+        Tuples of the label of the object and the name of the output.
+
+    lower : ndarray
+        Lower bounds of the parameters.
+
+    upper : ndarray
+        Upper bounds of the parameters.
+
+    data : dict
+        Arrays of the fitted surrogate.
+
+    Note
+    ----
+    The surrogates are created by the
+    :py:meth:`tespy.tools.surrogate.SurrogateBuilder.build` method or from a
+    file with :py:meth:`tespy.tools.surrogate.Surrogate.load`. The parameters
+    are scaled to their bounds, outside of the bounds the surrogates
+    extrapolate. Predictions of the grid surrogate in the cells of failed
+    simulations are :code:`nan`.
+    """
+
+    def __init__(self, kind, parameters, outputs, lower, upper, data):
+        if kind not in ["grid", "rbf", "polynomial"]:
+            msg = (
+                "The kind of the surrogate must be 'grid', 'rbf' or "
+                f"'polynomial', not '{kind}'."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+
+        self.kind = kind
+        self.parameters = [tuple(p) for p in parameters]
+        self.outputs = [tuple(o) for o in outputs]
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        self.data = data
+        self.validation = None
+
+    @classmethod
+    def fit(cls, kind, parameters, outputs, lower, upper, X, Y, **kwargs):
+        r"""
+        Fit a surrogate to the results of the simulations.
+
+        Parameters
+        ----------
+        kind : str
+            Type of the surrogate, see
+            :py:class:`tespy.tools.surrogate.Surrogate`.
+
+        parameters : list
+            Tuples of the label of the object and the name of the parameter.
+
+        outputs : list
+            Tuples of the label of the object and the name of the output.
+
+        lower : ndarray
+            Lower bounds of the parameters.
+
+        upper : ndarray
+            Upper bounds of the parameters.
+
+        X : ndarray
+            Values of the parameters of the simulations.
+
+        Y : ndarray
+            Values of the outputs of the simulations, :code:`nan` for failed
+            simulations.
+
+        degree : int
+            Degree of the polynomial surrogate, default value :code:`2`.
+
+        smoothing : float
+            Smoothing of the rbf surrogate, default value :code:`0` for
+            interpolation of the results.
+
+        Returns
+        -------
+        surrogate : tespy.tools.surrogate.Surrogate
+            Fitted surrogate.
+        """
+        surrogate = cls(kind, parameters, outputs, lower, upper, {})
+        X = np.asarray(X, dtype=float)
+        Y = np.asarray(Y, dtype=float)
+        valid = np.isfinite(Y).all(axis=1)
+        u = surrogate._scale(X)
+
+        if kind == "grid":
+            # remove the round-off of the scaling of the grid points
+            u = np.round(u, 12)
+            nodes = [np.unique(u[:, i]) for i in range(u.shape[1])]
+            shape = tuple(len(n) for n in nodes)
+            if np.prod(shape) != len(X):
+                msg = (
+                    "The grid surrogate requires the simulation results on a "
+                    "full factorial grid of the parameters."
+                )
+                logger.error(msg)
+                raise ValueError(msg)
+            index = tuple(
+                np.searchsorted(n, u[:, i]) for i, n in enumerate(nodes)
+            )
+            values = np.full(shape + (Y.shape[1],), np.nan)
+            values[index] = Y
+            surrogate.data["values"] = values
+            for i, n in enumerate(nodes):
+                surrogate.data[f"nodes_{i}"] = n
+
+        elif kind == "polynomial":
+            degree = kwargs.get("degree", 2)
+            exponents = np.array([
+                np.bincount(np.array(c, dtype=int), minlength=u.shape[1])
+                for k in range(degree + 1)
+                for c in itertools.combinations_with_replacement(
+                    range(u.shape[1]), k
+                )
+            ])
+            surrogate.data["exponents"] = exponents
+            matrix = surrogate._polynomial(u[valid])
+            surrogate.data["coefficients"] = np.linalg.lstsq(
+                matrix, Y[valid], rcond=None
+            )[0]
+
+        else:
+            u, Y = u[valid], Y[valid]
+            num, dim = u.shape
+            tail = np.hstack([np.ones((num, 1)), u])
+            system = np.zeros((num + dim + 1, num + dim + 1))
+            system[:num, :num] = _thin_plate(
+                np.linalg.norm(u[:, None] - u[None], axis=2)
+            ) + kwargs.get("smoothing", 0) * np.eye(num)
+            system[:num, num:] = tail
+            system[num:, :num] = tail.T
+            rhs = np.vstack([Y, np.zeros((dim + 1, Y.shape[1]))])
+            try:
+                weights = np.linalg.solve(system, rhs)
+            except np.linalg.LinAlgError:
+                msg = (
+                    "The rbf surrogate cannot be fitted, the samples must be "
+                    "distinct and not lie on a hyperplane."
+                )
+                logger.error(msg)
+                raise ValueError(msg)
+            surrogate.data["centers"] = u
+            surrogate.data["weights"] = weights
+
+        return surrogate
+
+    def _scale(self, X):
+        return (X - self.lower) / (self.upper - self.lower)
+
+    def _polynomial(self, u):
+        z = 2 * u - 1
+        return np.prod(
+            z[:, None, :] ** self.data["exponents"][None], axis=2
+        )
+
+    def _predict(self, u):
+        if self.kind == "polynomial":
+            return self._polynomial(u) @ self.data["coefficients"]
+
+        elif self.kind == "rbf":
+            centers = self.data["centers"]
+            weights = self.data["weights"]
+            phi = _thin_plate(
+                np.linalg.norm(u[:, None] - centers[None], axis=2)
+            )
+            tail = np.hstack([np.ones((len(u), 1)), u])
+            return (
+                phi @ weights[:len(centers)] + tail @ weights[len(centers):]
+            )
+
+        values = self.data["values"]
+        index = []
+        share = []
+        for i in range(u.shape[1]):
+            nodes = self.data[f"nodes_{i}"]
+            j = np.clip(np.searchsorted(nodes, u[:, i]) - 1, 0, len(nodes) - 2)
+            index += [j]
+            share += [(u[:, i] - nodes[j]) / (nodes[j + 1] - nodes[j])]
+
+        result = np.zeros((len(u), values.shape[-1]))
+        for corner in itertools.product([0, 1], repeat=u.shape[1]):
+            weight = np.ones(len(u))
+            for i, k in enumerate(corner):
+                weight *= share[i] if k else 1 - share[i]
+            result += weight[:, None] * values[
+                tuple(j + k for j, k in zip(index, corner))
+            ]
+        return result
+
+    def predict(self, X, chunk_size=10000):
+        r"""
+        Predict the outputs for values of the parameters.
+
+        Parameters
+        ----------
+        X : ndarray
+            Values of the parameters, one row per point or a single point.
+
+        chunk_size : int
+            Number of points evaluated at once, default value
+            :code:`10000`.
+
+        Returns
+        -------
+        Y : ndarray
+            Values of the outputs, one row per point.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        if X.shape[1] != len(self.parameters):
+            msg = (
+                f"The surrogate has {len(self.parameters)} parameters, the "
+                f"values passed have {X.shape[1]} columns."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+
+        u = self._scale(X)
+        Y = np.empty((len(u), len(self.outputs)))
+        for start in range(0, len(u), chunk_size):
+            Y[start:start + chunk_size] = self._predict(
+                u[start:start + chunk_size]
+            )
+        return Y
+
+    def save(self, path):
+        r"""
+        Save the surrogate to a file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file, the file ending :code:`.npz` is appended if not
+            present.
+        """
+        metadata = {
+            "kind": self.kind,
+            "parameters": self.parameters,
+            "outputs": self.outputs
+        }
+        arrays = {f"data_{key}": value for key, value in self.data.items()}
+        if self.validation is not None:
+            arrays["validation"] = self.validation.values
+            metadata["validation"] = list(self.validation.columns)
+
+        np.savez_compressed(
+            path, metadata=json.dumps(metadata), lower=self.lower,
+            upper=self.upper, **arrays
+        )
+        logger.debug(f"Saved the surrogate to {path}.")
+
+    @classmethod
+    def load(cls, path):
+        r"""
+        Load a surrogate from a file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file written by
+            :py:meth:`tespy.tools.surrogate.Surrogate.save`.
+
+        Returns
+        -------
+        surrogate : tespy.tools.surrogate.Surrogate
+            Surrogate read from the file.
+        """
+        with np.load(path, allow_pickle=False) as f:
+            metadata = json.loads(str(f["metadata"]))
+            data = {
+                key[len("data_"):]: f[key] for key in f.files
+                if key.startswith("data_")
+            }
+            surrogate = cls(
+                metadata["kind"], metadata["parameters"],
+                metadata["outputs"], f["lower"], f["upper"], data
+            )
+            if "validation" in metadata:
+                surrogate.validation = pd.DataFrame(
+                    f["validation"], columns=metadata["validation"],
+                    index=pd.MultiIndex.from_tuples(surrogate.outputs)
+                )
+        return surrogate
+
+
+class SurrogateBuilder:
+    r"""
+    Sample a network and fit surrogates of its results.
+
+    Parameters
+    ----------
+    nw : tespy.networks.network.Network
+        Network to sample.
+
+    parameters : dict
+        Lower and upper bounds of the parameters to sample with tuples of a
+        connection, component or bus and the name of a specified parameter
+        as keys, e.g. :code:`{(c1, "m"): [5, 20], (pipe, "kA"): [1e3, 1e4]}`.
+
+    outputs : list
+        Tuples of a connection, component or bus and the name of the result,
+        e.g. :code:`(c2, "T")` or :code:`(bus, "P")`.
+
+    workers : int
+        Number of worker processes for the simulations, default value
+        :code:`1`.
+
+    solve_kwargs : dict
+        Keyword arguments of :py:meth:`tespy.networks.network.Network.solve`,
+        default value :code:`{"mode": "design"}`.
+
+    Note
+    ----
+    The samples are ordered along a nearest neighbor path through the
+    parameter space and every simulation starts from the results of the
+    last converged simulation. With more than one worker, the path is split
+    into one section per worker process, each holding its own copy of the
+    network. The copies are created by :py:mod:`multiprocessing`, on
+    platforms using the :code:`spawn` start method the network is pickled.
+
+    The values of the parameters are given and the outputs are returned in
+    the units of the network. After the sampling the parameters of the
+    network are reset to their original values.
+
+    Example
+    -------
+    Create a surrogate of the outlet temperature and the heat loss of a pipe
+    as function of the inlet temperature and the mass flow.
+
+    >>> import numpy as np
+    >>> from tespy.components import Pipe, Sink, Source
+    >>> from tespy.connections import Connection
+    >>> from tespy.networks import Network
+    >>> from tespy.tools.surrogate import SurrogateBuilder
+    >>> nw = Network(T_unit="C", p_unit="bar", iterinfo=False)
+    >>> so = Source("source")
+    >>> si = Sink("sink")
+    >>> pipe = Pipe("pipe", pr=0.95, kA=5e3, Tamb=10)
+    >>> c1 = Connection(so, "out1", pipe, "in1", label="1")
+    >>> c2 = Connection(pipe, "out1", si, "in1", label="2")
+    >>> nw.add_conns(c1, c2)
+    >>> c1.set_attr(fluid={"water": 1}, m=10, T=90, p=10)
+    >>> nw.solve("design", print_results=False)
+    >>> builder = SurrogateBuilder(
+    ...     nw, parameters={(c1, "T"): [60, 120], (c1, "m"): [5, 20]},
+    ...     outputs=[(c2, "T"), (pipe, "Q")]
+    ... )
+    >>> surrogate = builder.build(40, method="lhs", kind="rbf", seed=42)
+    >>> bool((surrogate.validation["max relative"] < 1e-2).all())
+    True
+    >>> Y = surrogate.predict(np.array([[90, 10], [100, 15]]))
+    >>> Y.shape
+    (2, 2)
+    >>> round(Y[0, 0], 1)
+    81.0
+    """
+
+    def __init__(self, nw, parameters, outputs, workers=1,
+                 solve_kwargs=None):
+        for obj, name in parameters:
+            container = obj.get_attr(name)
+            if not getattr(container, "is_set", False) or getattr(
+                    container, "is_var", False):
+                msg = (
+                    f"The parameter {name} of {obj.label} must be a specified "
+                    "value of the network to be sampled."
+                )
+                logger.error(msg)
+                raise ValueError(msg)
+
+        check_workers(workers)
+
+        self.nw = nw
+        self.parameters = list(parameters)
+        self.lower = np.array([parameters[p][0] for p in self.parameters])
+        self.upper = np.array([parameters[p][1] for p in self.parameters])
+        self.outputs = list(outputs)
+        self.workers = workers
+        self.solve_kwargs = {"mode": "design", "print_results": False}
+        if solve_kwargs is not None:
+            self.solve_kwargs.update(solve_kwargs)
+
+        self.num_solves = 0
+        self.num_failed = 0
+        self.samples = None
+        self.validation_samples = None
+
+    @property
+    def parameter_labels(self):
+        return [(obj.label, name) for obj, name in self.parameters]
+
+    @property
+    def output_labels(self):
+        return [(obj.label, name) for obj, name in self.outputs]
+
+    def sample(self, num_points, method="lhs", seed=None):
+        r"""
+        Sample the parameter space.
+
+        Parameters
+        ----------
+        num_points : int
+            Number of samples, for the :code:`"grid"` method the number of
+            points per parameter.
+
+        method : str
+            Sampling method, :code:`"lhs"` (Latin hypercube),
+            :code:`"sobol"` (scrambled Sobol sequence, requires scipy),
+            :code:`"grid"` (full factorial grid) or :code:`"random"`,
+            default value :code:`"lhs"`.
+
+        seed : int
+            Seed of the random number generator.
+
+        Returns
+        -------
+        X : ndarray
+            Values of the parameters, one row per sample.
+        """
+        dim = len(self.parameters)
+        rng = np.random.default_rng(seed)
+        if method == "lhs":
+            u = (
+                np.argsort(rng.random((dim, num_points)), axis=1).T
+                + rng.random((num_points, dim))
+            ) / num_points
+        elif method == "sobol":
+            if qmc is None:
+                msg = (
+                    "For the Sobol sampling scipy has to be installed. Use "
+                    "pip or conda to install the latest scipy version."
+                )
+                raise ImportError(msg)
+            u = qmc.Sobol(dim, seed=rng).random(num_points)
+        elif method == "grid":
+            u = np.array(list(itertools.product(
+                *[np.linspace(0, 1, num_points)] * dim
+            )))
+        elif method == "random":
+            u = rng.random((num_points, dim))
+        else:
+            msg = (
+                "The sampling method must be 'lhs', 'sobol', 'grid' or "
+                f"'random', not '{method}'."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+
+        return self.lower + u * (self.upper - self.lower)
+
+    def _path(self, X):
+        """Order the samples along a nearest neighbor path."""
+        u = (X - self.lower) / (self.upper - self.lower)
+        remaining = np.ones(len(u), dtype=bool)
+        order = [0]
+        remaining[0] = False
+        for _ in range(len(u) - 1):
+            distance = np.linalg.norm(u - u[order[-1]], axis=1)
+            distance[~remaining] = np.inf
+            order += [int(np.argmin(distance))]
+            remaining[order[-1]] = False
+        return np.array(order, dtype=int)
+
+    def _specifications(self):
+        """Return the specified values of the components and connections."""
+        containers = [
+            c.get_attr(prop) for c in self.nw.conns["object"]
+            for prop in c.property_data if prop != "fluid"
+        ] + [
+            cp.get_attr(key) for cp in self.nw.comps["object"]
+            for key in cp.parameters
+        ]
+        return {
+            container: container.__dict__.copy() for container in containers
+            if getattr(container, "is_set", False)
+        }
+
+    def _solve_points(self, X):
+        """Solve the network for samples, starting from the last result."""
+        Y = np.full((len(X), len(self.outputs)), np.nan)
+        state = get_starting_values(self.nw)
+        # the results of failed simulations overwrite specified values
+        specifications = self._specifications()
+        for k, x in enumerate(X):
+            for (obj, name), value in zip(self.parameters, x):
+                obj.set_attr(**{name: value})
+
+            set_starting_values(self.nw, state)
+            try:
+                self.nw.solve(**self.solve_kwargs)
+                converged = self.nw.converged and not self.nw.lin_dep
+            except (ValueError, TESPyNetworkError) as e:
+                # the solver stopped without restoring the connections
+                self.nw._reset_topology_reduction_specifications()
+                logger.debug("The simulation of sample %s failed: %s", x, e)
+                converged = False
+
+            if converged:
+                Y[k] = [
+                    obj.get_attr(name).val for obj, name in self.outputs
+                ]
+                state = get_starting_values(self.nw)
+            else:
+                for container, values in specifications.items():
+                    container.__dict__.update(values)
+        return Y
+
+    def solve(self, X):
+        r"""
+        Solve the network for the samples.
+
+        Parameters
+        ----------
+        X : ndarray
+            Values of the parameters, one row per sample.
+
+        Returns
+        -------
+        samples : pandas.core.frame.DataFrame
+            Values of the parameters and the outputs and convergence of the
+            simulation per sample. The outputs of failed simulations are
+            :code:`nan`.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        order = self._path(X)
+        sections = np.array_split(order, min(self.workers, len(X)))
+
+        if self.workers > 1 and len(sections) > 1:
+            with mp.Pool(
+                    len(sections), initializer=_init_worker,
+                    initargs=(self,)) as pool:
+                results = pool.map(
+                    _solve_in_worker, [X[s] for s in sections]
+                )
+        else:
+            original = [
+                obj.get_attr(name).val for obj, name in self.parameters
+            ]
+            state = get_starting_values(self.nw)
+            try:
+                results = [self._solve_points(X[s]) for s in sections]
+            finally:
+                for (obj, name), value in zip(self.parameters, original):
+                    obj.set_attr(**{name: value})
+                set_starting_values(self.nw, state)
+
+        Y = np.empty((len(X), len(self.outputs)))
+        for section, result in zip(sections, results):
+            Y[section] = result
+
+        converged = np.isfinite(Y).all(axis=1)
+        self.num_solves += len(X)
+        self.num_failed += int((~converged).sum())
+        if not converged.all():
+            msg = (
+                f"The simulation of {int((~converged).sum())} of {len(X)} "
+                "samples failed."
+            )
+            logger.warning(msg)
+
+        samples = pd.DataFrame(
+            np.hstack([X, Y]),
+            columns=pd.MultiIndex.from_tuples(
+                self.parameter_labels + self.output_labels
+            )
+        )
+        samples["converged"] = converged
+        return samples
+
+    def build(self, num_points, method="lhs", kind="rbf", num_validation=None,
+              seed=None, **kwargs):
+        r"""
+        Sample the network and fit a surrogate.
+
+        Parameters
+        ----------
+        num_points : int
+            Number of samples, for the :code:`"grid"` method the number of
+            points per parameter.
+
+        method : str
+            Sampling method, see
+            :py:meth:`tespy.tools.surrogate.SurrogateBuilder.sample`.
+
+        kind : str
+            Type of the surrogate, :code:`"grid"` (requires the
+            :code:`"grid"` method), :code:`"rbf"` or :code:`"polynomial"`,
+            default value :code:`"rbf"`.
+
+        num_validation : int
+            Number of additional random samples held out for the validation
+            of the surrogate, by default a fifth of the samples.
+
+        seed : int
+            Seed of the random number generator.
+
+        kwargs
+            Options of the fit, see
+            :py:meth:`tespy.tools.surrogate.Surrogate.fit`.
+
+        Returns
+        -------
+        surrogate : tespy.tools.surrogate.Surrogate
+            Fitted surrogate with the errors on the validation samples in the
+            :code:`validation` attribute.
+        """
+        X = self.sample(num_points, method, seed)
+        self.samples = self.solve(X)
+
+        outputs = self.output_labels
+        surrogate = Surrogate.fit(
+            kind, self.parameter_labels, outputs, self.lower, self.upper,
+            X, self.samples[outputs].values, **kwargs
+        )
+
+        if num_validation is None:
+            num_validation = max(len(X) // 5, 1)
+        if num_validation > 0:
+            seed = None if seed is None else seed + 1
+            X = self.sample(num_validation, "random", seed)
+            self.validation_samples = self.solve(X)
+            valid = self.validation_samples["converged"].values
+            if valid.any():
+                expected = self.validation_samples[outputs].values[valid]
+                error = np.abs(surrogate.predict(X[valid]) - expected)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    relative = error / np.abs(expected)
+                validation = {
+                    "mean absolute": error.mean(axis=0),
+                    "root mean square": np.sqrt((error ** 2).mean(axis=0)),
+                    "max absolute": error.max(axis=0),
+                    "max relative": relative.max(axis=0)
+                }
+            else:
+                msg = (
+                    "None of the simulations of the validation samples "
+                    "converged, the errors of the surrogate are unknown."
+                )
+                logger.warning(msg)
+                validation = {
+                    key: np.nan for key in [
+                        "mean absolute", "root mean square", "max absolute",
+                        "max relative"
+                    ]
+                }
+            surrogate.validation = pd.DataFrame(
+                validation, index=pd.MultiIndex.from_tuples(outputs)
+            )
+
+        num_converged = int(self.samples["converged"].sum())
+        msg = (
+            f"Fitted a {kind} surrogate to {num_converged} of "
+            f"{len(self.samples)} samples."
+        )
+        logger.debug(msg)
+        return surrogate
@@ -10,6 +10,7 @@ tests/test_networks/test_exergy_and_entropy_analysis.py
 SPDX-License-Identifier: MIT
 """
 
+from pytest import approx
 from pytest import raises
 
 from tespy.components import Compressor
@@ -26,6 +27,7 @@ from tespy.connections import Bus
 from tespy.connections import Connection
 from tespy.networks import Network
 from tespy.tools import ExergyAnalysis
+from tespy.tools.fluid_properties.functions import calc_physical_exergy
 from tespy.tools.global_vars import ERR
 from tespy.tools.helpers import TESPyNetworkError
 
@@ -127,6 +129,90 @@ class TestClausiusRankine:
         delta = round(abs(ean.network_data.E_F - ean.network_data.E_P), 2)
         assert delta < 1e-2, msg
 
+    def test_exergy_analysis_dead_state(self):
+        """Test the reuse of the dead state values of the connections."""
+        ean = ExergyAnalysis(
+            self.nw, E_P=[self.power], E_F=[self.heat],
+            internal_busses=[self.fwp_power])
+        ean.analyse(pamb=self.pamb, Tamb=self.Tamb)
+        E_D = ean.network_data.E_D
+        ean.analyse(pamb=self.pamb, Tamb=self.Tamb)
+        msg = (
+            'The dead state must be calculated once for all connections with '
+            'identical fluid composition and ambient state.')
+        assert len(ean.dead_states) == 1, msg
+        assert ean.network_data.E_D == E_D
+
+        ean.analyse(pamb=self.pamb, Tamb=self.Tamb + 10)
+        assert len(ean.dead_states) == 2
+
+        c = self.nw.get_conn('fw')
+        e_T, e_M = calc_physical_exergy(
+            c.h.val_SI, c.s.val_SI, c.p.val_SI, 1e5, self.Tamb + 283.15,
+            c.fluid_data, c.mixing_rule
+        )
+        assert ean.connection_data.loc['fw', 'e_T'] == approx(e_T)
+        assert ean.connection_data.loc['fw', 'e_M'] == approx(e_M)
+
+        # the least recently used dead state is dropped from the cache
+        ean.dead_state_cache_size = 2
+        ean.analyse(pamb=self.pamb, Tamb=self.Tamb)
+        ean.analyse(pamb=self.pamb, Tamb=self.Tamb + 20)
+        assert len(ean.dead_states) == 2
+        assert [key[2] for key in ean.dead_states] == [
+            self.Tamb + 273.15, self.Tamb + 293.15
+        ]
+
+    def test_exergy_analysis_batch(self):
+        """Test the batch analysis against the single point analysis."""
+        ean = ExergyAnalysis(
+            self.nw, E_P=[self.power], E_F=[self.heat],
+            internal_busses=[self.fwp_power])
+        self.nw.get_comp('turbine').set_attr(eta_s=0.9)
+        fs = self.nw.get_conn('fs')
+        results = {}
+
+        def operating_points():
+            for m in [10, 8]:
+                fs.set_attr(m=m)
+                self.nw.solve('design')
+                ean.analyse(pamb=self.pamb, Tamb=self.Tamb)
+                results[m] = (
+                    ean.component_data.copy(), ean.bus_data.copy(),
+                    ean.group_data.copy(), ean.network_data.copy(),
+                    ean.generate_plotly_sankey_input()
+                )
+                yield m
+
+        ean.analyse_many(
+            operating_points(), pamb=self.pamb, Tamb=self.Tamb,
+            sankey_points=[8])
+
+        for m, (components, busses, groups, network, links) in (
+                results.items()):
+            for batch, data, level in [
+                    (ean.batch_component_data, components, 'component'),
+                    (ean.batch_bus_data, busses, 'bus'),
+                    (ean.batch_group_data, groups, 'group')]:
+                for quantity in ['E_D', 'y_Dk', 'y*_Dk']:
+                    values = batch.xs(
+                        (m, quantity), level=['point', 'quantity']
+                    )['value']
+                    assert values.loc[data.index].values == approx(
+                        data[quantity].values, abs=1e-6, nan_ok=True
+                    )
+
+            assert ean.batch_network_data.loc[m].values == approx(
+                network.values
+            )
+
+        links, nodes = ean.generate_plotly_sankey_input(point=8)
+        assert links['value'] == approx(results[8][4][0]['value'])
+        assert nodes == results[8][4][1]
+
+        with raises(KeyError):
+            ean.generate_plotly_sankey_input(point=10)
+
     def test_exergy_analysis_plotting_data(self):
         """Test exergy analysis plotting."""
         self.nw.get_comp('steam generator').set_attr(pr=0.9)
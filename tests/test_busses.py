@@ -20,8 +20,12 @@ from tespy.components import Source
 from tespy.components import Turbine
 from tespy.connections import Bus
 from tespy.connections import Connection
+from tespy.connections.bus import InverseBusChar
 from tespy.networks import Network
 from tespy.tools.characteristics import CharLine
+from tespy.tools.helpers import bus_char_derivative
+from tespy.tools.helpers import bus_char_evaluation
+from tespy.tools.helpers import newton_with_kwargs
 
 
 class TestBusses:
@@ -244,3 +248,46 @@ class TestBusses:
         assert P_cp_tpo == P_cp_cpi and P_cp_tpo == P_cp_cpibb, msg
 
         shutil.rmtree('tmp', ignore_errors=True)
+
+    def test_members(self):
+        """Test the resolution of the bus members per component."""
+        tpo = self.nw.busses['total power output']
+        cp = self.nw.get_comp('compressor')
+        gt = self.nw.get_comp('turbine')
+
+        assert list(tpo.members) == [cp, gt]
+        assert isinstance(tpo.members[cp]['inverse'], InverseBusChar)
+        assert tpo.members[gt]['inverse'] is None
+        assert tpo.members[cp]['P_ref'] == tpo.comps.loc[cp, 'P_ref']
+
+    def test_InverseBusChar(self):
+        """Test the analytical inversion of bus characteristic lines."""
+        for sign in [1, -1]:
+            char = CharLine(
+                x=self.generator.x, y=self.generator.y * sign,
+                extrapolate=False
+            )
+            inverse = InverseBusChar(char)
+            assert inverse.invertible
+
+            for y in np.linspace(0.05, 12, 40) * sign:
+                x = newton_with_kwargs(
+                    derivative=bus_char_derivative, target_value=0,
+                    val0=1, valmin=-1e15, valmax=1e15,
+                    function=bus_char_evaluation, parameter='bus_value',
+                    component_value=y, reference_value=1, char_func=char
+                )
+                msg = (
+                    'The inverse of the bus characteristic must be ' +
+                    str(round(x, 8)) + ' at the value ' + str(y) + ' but '
+                    'is ' + str(round(inverse.evaluate(y), 8)) + '.')
+                assert round(inverse.evaluate(y), 8) == round(x, 8), msg
+
+        char = CharLine(
+            x=self.generator.x, y=self.generator.y, extrapolate=True)
+        msg = 'Extrapolated characteristic lines must not be inverted.'
+        assert not InverseBusChar(char).invertible, msg
+
+        char = CharLine(x=[0, 1, 2], y=[1, 0.4, 0.1])
+        msg = 'Non-monotonic bus values must not be inverted.'
+        assert not InverseBusChar(char).invertible, msg
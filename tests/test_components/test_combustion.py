@@ -11,6 +11,7 @@ SPDX-License-Identifier: MIT
 """
 import shutil
 
+import numpy as np
 import pytest
 
 from tespy.components import CombustionChamber
@@ -21,6 +22,7 @@ from tespy.components import Source
 from tespy.connections import Bus
 from tespy.connections import Connection
 from tespy.networks import Network
+from tespy.tools.characteristics import CharLine
 
 
 class TestCombustion:
@@ -287,3 +289,145 @@ class TestCombustion:
                str(instance.Qloss.val) + '.')
         assert round(Qloss.P.val, 1) == round(instance.Qloss.val, 1), msg
         shutil.rmtree('./tmp', ignore_errors=True)
+
+    @pytest.mark.parametrize("fuel_factor", [1, 4])
+    def test_stoichiometry_deriv(self, fuel_factor):
+        """Test the analytical derivatives of the reaction balance."""
+        instance = CombustionChamber('combustion chamber')
+        self.setup_CombustionChamber_network(instance)
+
+        air = {'N2': 0.7556, 'O2': 0.2315, 'Ar': 0.0129}
+        fuel = {'CO2': 0.04, 'CH4': 0.9, 'H2': 0.06}
+        self.c1.set_attr(fluid=air, p=1, T=30, m=1)
+        self.c2.set_attr(fluid=fuel, T=30)
+        instance.set_attr(lamb=1.5)
+        self.nw.solve('design')
+        self.nw._convergence_check()
+
+        # lean (lambda > 1) and rich (lambda < 1) combustion
+        instance.set_attr(lamb=None)
+        self.c2.m.val_SI *= fuel_factor * 1.2
+        instance.stoichiometry_func()
+        assert (instance.lamb.val < 1) == (fuel_factor > 1)
+
+        # make all mass flows and mass fractions variables of the system
+        col = 0
+        for c in [self.c1, self.c2, self.c3]:
+            c.m.is_var = True
+            c.m.J_col = col
+            c.fluid.is_var = set(c.fluid.val)
+            c.fluid.J_col = {
+                fluid: col + 1 + i for i, fluid in enumerate(c.fluid.val)
+            }
+            col += 1 + len(c.fluid.val)
+
+        instance.jacobian = {}
+        instance.stoichiometry_deriv(None, 0)
+        for c in [self.c1, self.c2, self.c3]:
+            # the numerical derivative is one-sided at mass fractions of 0
+            variables = [('m', c.m.J_col)] + [
+                (fluid, col) for fluid, col in c.fluid.J_col.items()
+                if 1e-5 < c.fluid.val[fluid] < 1 - 1e-5
+            ]
+            for variable, col in variables:
+                for eq_num, fluid in enumerate(instance.fluid_eqs_list):
+                    numeric = instance.numeric_deriv(
+                        instance.stoichiometry, variable, c, fluid=fluid
+                    )
+                    assert instance.jacobian[eq_num, col] == pytest.approx(
+                        numeric, rel=1e-5, abs=1e-8
+                    )
+
+    @pytest.mark.parametrize("base", ["component", "bus"])
+    def test_CombustionEngine_deriv(self, base):
+        """Test the analytical derivatives of the combustion engine."""
+        instance = CombustionEngine('combustion engine')
+        self.setup_CombustionEngine_network(instance)
+
+        air = {'N2': 0.7556, 'O2': 0.2315, 'Ar': 0.0129, 'H2O': 0, 'CO2': 0,
+               'CH4': 0}
+        fuel = {'CO2': 0.04, 'CH4': 0.96}
+        instance.set_attr(pr1=0.99, pr2=0.99, lamb=1.2)
+        self.c1.set_attr(p=5, T=30, fluid=air)
+        self.c2.set_attr(T=30, fluid=fuel)
+        self.c4.set_attr(p=3, T=60, m=50, fluid={'H2O': 1})
+        self.c5.set_attr(p=3, T=80, m=50, fluid={'H2O': 1})
+        instance.set_attr(ti=1e6)
+        self.nw.solve('design')
+        self.nw._convergence_check()
+
+        # evaluate the characteristic lines between their supporting points
+        instance.P.design = instance.P.val * 1.13
+        char = CharLine(x=[0, 1, 2], y=[0.9, 1, 0.95])
+        busses = []
+        for param in ['TI', 'P', 'Qloss', 'Q', 'Q1', 'Q2']:
+            bus = Bus(param)
+            bus.add_comps({
+                'comp': instance, 'param': param, 'char': char, 'base': base
+            })
+            bus.comps.loc[instance, 'P_ref'] = (
+                instance.bus_func(bus.comps.loc[instance]) * 1.2
+            )
+            busses += [bus]
+
+        # make all variables of the engine variables of the system
+        conns = [
+            self.c1, self.c2, self.c3, self.c4, self.c5, self.c6, self.c7
+        ]
+        variables = []
+        col = 0
+        for c in conns:
+            for var in ['m', 'p', 'h']:
+                c.get_attr(var).is_var = True
+                c.get_attr(var).J_col = col
+                variables += [(c, var, col)]
+                col += 1
+            c.fluid.is_var = set()
+            c.fluid.J_col = {}
+            for fluid in instance.fuel_list & set(c.fluid.val):
+                # the numerical derivative is one-sided at mass fractions of 0
+                if 1e-5 < c.fluid.val[fluid] < 1 - 1e-5:
+                    c.fluid.is_var.add(fluid)
+                    c.fluid.J_col[fluid] = col
+                    variables += [(c, fluid, col)]
+                    col += 1
+        for param in ['P', 'Qloss']:
+            instance.get_attr(param).is_var = True
+            instance.get_attr(param).J_col = col
+            variables += [(None, param, col)]
+            col += 1
+
+        for name in ['tiP_char', 'Q1_char', 'Q2_char', 'Qloss_char']:
+            instance.jacobian = {}
+            getattr(instance, f'{name}_deriv')(None, 0)
+            for c, var, col in variables:
+                numeric = instance.numeric_deriv(
+                    getattr(instance, f'{name}_func'), var, c
+                )
+                assert instance.jacobian.get((0, col), 0) == pytest.approx(
+                    numeric, rel=1e-5, abs=1e-5
+                )
+
+        # the reference enthalpies' dependency on the fuel mass fractions is
+        # not considered in the energy balance
+        instance.jacobian = {}
+        instance.energy_balance_deriv(None, 0)
+        for c, var, col in variables:
+            if var in ['m', 'p', 'h', 'P', 'Qloss']:
+                numeric = instance.numeric_deriv(
+                    instance.energy_balance_func, var, c
+                )
+                assert instance.jacobian.get((0, col), 0) == pytest.approx(
+                    numeric, rel=1e-5, abs=1e-5
+                )
+
+        for bus in busses:
+            bus.jacobian = {}
+            instance.bus_deriv(bus)
+            for c, var, col in variables:
+                numeric = -instance.numeric_deriv(
+                    instance.calc_bus_value, var, c, bus=bus
+                )
+                assert bus.jacobian.get(col, 0) == pytest.approx(
+                    numeric, rel=1e-5, abs=1e-5
+                )
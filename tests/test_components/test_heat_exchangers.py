@@ -12,10 +12,12 @@ SPDX-License-Identifier: MIT
 import shutil
 
 import numpy as np
+import pytest
 
 from tespy.components import Condenser
 from tespy.components import HeatExchanger
 from tespy.components import ParabolicTrough
+from tespy.components import SegmentedHeatExchanger
 from tespy.components import SimpleHeatExchanger
 from tespy.components import Sink
 from tespy.components import SolarCollector
@@ -23,7 +25,10 @@ from tespy.components import Source
 from tespy.connections import Bus
 from tespy.connections import Connection
 from tespy.networks import Network
+from tespy.tools.fluid_properties import T_mix_ph
 from tespy.tools.fluid_properties import T_sat_p
+from tespy.tools.fluid_properties import h_mix_pQ
+from tespy.tools.fluid_properties.wrappers import IF97Wrapper
 
 
 class TestHeatExchangers:
@@ -53,6 +58,23 @@ class TestHeatExchangers:
 
         self.nw.add_conns(self.c1, self.c2, self.c3, self.c4)
 
+    def check_deriv(self, instance, func, deriv):
+        """Compare the analytical derivatives with the numerical ones."""
+        # make all mass flows, pressures and enthalpies variables
+        variables = []
+        for c in [self.c1, self.c2, self.c3, self.c4]:
+            for var in ['m', 'p', 'h']:
+                c.get_attr(var).is_var = True
+                c.get_attr(var).J_col = len(variables)
+                variables += [(c, var)]
+
+        instance.jacobian = {}
+        deriv(None, 0)
+        for c, var in variables:
+            numeric = instance.numeric_deriv(func, var, c)
+            analytic = instance.jacobian.get((0, c.get_attr(var).J_col), 0)
+            assert analytic == pytest.approx(numeric, rel=1e-4, abs=1e-6)
+
     def test_SimpleHeatExchanger(self):
         """Test component properties of simple heat exchanger."""
         instance = SimpleHeatExchanger('heat exchanger')
@@ -437,6 +459,44 @@ class TestHeatExchangers:
 
         shutil.rmtree('./tmp', ignore_errors=True)
 
+    @pytest.mark.parametrize("component", [HeatExchanger, Condenser])
+    def test_deriv(self, component):
+        """Test the analytical derivatives of the heat transfer equations."""
+        instance = component('heat exchanger')
+        self.setup_HeatExchanger_network(instance)
+        instance.set_attr(
+            pr1=0.98, pr2=0.98, ttd_u=5, Q=-80e3, design=['ttd_u'],
+            offdesign=['kA_char']
+        )
+        if component == Condenser:
+            self.c1.set_attr(x=1, p0=0.5, fluid={'H2O': 1})
+            self.c4.set_attr(T=40)
+        else:
+            self.c1.set_attr(T=120, p=3, fluid={'H2O': 1})
+            self.c2.set_attr(T=70)
+        self.c3.set_attr(T=30, p=5, fluid={'H2O': 1})
+        self.nw.solve('design')
+        self.nw._convergence_check()
+        self.nw.save('tmp')
+        self.c3.set_attr(T=35)
+        self.nw.solve('offdesign', design_path='tmp')
+        self.nw._convergence_check()
+
+        instance.kA.val = instance.kA.design
+        for func, deriv in [
+                (instance.kA_func, instance.kA_deriv),
+                (instance.kA_char_func, instance.kA_char_deriv),
+                (instance.ttd_u_func, instance.ttd_u_deriv),
+                (instance.ttd_l_func, instance.ttd_l_deriv)]:
+            self.check_deriv(instance, func, deriv)
+
+        # characteristic depending on pressure and enthalpy
+        instance.kA_char1.param = 'v'
+        self.check_deriv(
+            instance, instance.kA_char_func, instance.kA_char_deriv
+        )
+        shutil.rmtree('./tmp', ignore_errors=True)
+
     def test_Condenser(self):
         """Test component properties of Condenser."""
         instance = Condenser('condenser')
@@ -507,6 +567,88 @@ class TestHeatExchangers:
         assert p == round(self.c1.p.val_SI, 5), msg
         shutil.rmtree('./tmp', ignore_errors=True)
 
+    @pytest.mark.parametrize("engine", [None, IF97Wrapper])
+    def test_SegmentedHeatExchanger(self, engine):
+        """Test component properties of segmented heat exchanger."""
+        instance = SegmentedHeatExchanger('segmented heat exchanger')
+        self.setup_HeatExchanger_network(instance)
+        engines = {} if engine is None else {'H2O': engine}
+
+        instance.set_attr(pr1=1, pr2=1, td_pinch=5, num_segments=30)
+        self.c1.set_attr(
+            fluid={'H2O': 1}, fluid_engines=engines, m=1, p=1, T=150
+        )
+        self.c2.set_attr(T=50)
+        self.c3.set_attr(fluid={'H2O': 1}, fluid_engines=engines, p=3, T=20)
+        self.nw.solve('design')
+        self.nw._convergence_check()
+
+        # the pinch is located at the beginning of the condensation
+        h_cold = self.c4.h.val_SI - self.c1.m.val_SI * (
+            self.c1.h.val_SI
+            - h_mix_pQ(self.c1.p.val_SI, 1, self.c1.fluid_data)
+        ) / self.c3.m.val_SI
+        td_pinch = (
+            T_sat_p(self.c1.p.val_SI, self.c1.fluid_data)
+            - T_mix_ph(self.c3.p.val_SI, h_cold, self.c3.fluid_data)
+        )
+        msg = (
+            'Value of the pinch temperature difference must be 5, is '
+            f'{round(td_pinch, 1)}.'
+        )
+        assert round(td_pinch, 3) == 5, msg
+        assert instance.ttd_u.val > 5 and instance.ttd_l.val > 5
+
+        # the segments are weighted with their heat transfer coefficient
+        td_log = HeatExchanger.calculate_td_log(instance)
+        msg = (
+            'Value of mean temperature difference must be lower than the '
+            f'value of the terminals ({round(td_log, 1)}), is '
+            f'{round(instance.td_log.val, 1)}.'
+        )
+        assert instance.td_log.val < td_log, msg
+
+        # specified heat transfer coefficient results in identical state
+        m = self.c3.m.val
+        instance.set_attr(td_pinch=None, kA=instance.kA.val)
+        self.c2.set_attr(T=None)
+        self.c3.set_attr(m=m)
+        self.nw.solve('design')
+        self.nw._convergence_check()
+        msg = (
+            'Value of the pinch temperature difference must be 5, is '
+            f'{round(instance.td_pinch.val, 1)}.'
+        )
+        assert round(instance.td_pinch.val, 3) == 5, msg
+        assert round(self.c2.T.val, 3) == 50
+
+        # saturated gas and liquid states are added to the segment boundaries
+        instance.set_attr(num_segments=1)
+        assert len(instance.calculate_segment_fractions()) == 4
+
+        # a single segment without phase change is identical to the lumped
+        # heat exchanger
+        self.c2.h.val_SI = self.c1.h.val_SI - 1e4
+        x = instance.calculate_segment_fractions()
+        assert list(x) == [0, 1]
+        td_log = HeatExchanger.calculate_td_log(instance)
+        assert instance.calculate_td_log() == pytest.approx(td_log)
+
+        # derivatives from the temperature profile match the numerical
+        # derivatives of the complete function, which are subject to the
+        # tolerance of the temperature inversion
+        instance.set_attr(num_segments=5)
+        td_log, deriv = instance.calculate_td_log_deriv()
+        assert td_log == pytest.approx(instance.calculate_td_log())
+        f = instance.calculate_td_log
+        for c, d_dp, d_dh in deriv:
+            if instance.is_variable(c.p):
+                numeric = instance.numeric_deriv(f, 'p', c)
+                assert d_dp == pytest.approx(numeric, rel=1e-4, abs=1e-10)
+            if instance.is_variable(c.h):
+                numeric = instance.numeric_deriv(f, 'h', c)
+                assert d_dh == pytest.approx(numeric, rel=1e-4, abs=1e-10)
+
     def test_CondenserWithEvaporation(self):
         """Test a Condenser that evaporates a fluid."""
         instance = Condenser('condenser')
@@ -10,6 +10,8 @@ tests/test_components/test_piping.py
 SPDX-License-Identifier: MIT
 """
 import numpy as np
+import pytest
+from pytest import approx
 
 from tespy.components import Pipe
 from tespy.components import Sink
@@ -83,3 +85,60 @@ class TestPiping:
         # NO TEST NEEDED AT THE MOMENT, THE PIPE PROPERTIES ARE IDENTICAL TO
         # THE PROPERTIES OF THE SIMPLE HEAT EXCHANGER. TESTS ARE LOCATED AT
         # heat_exchanger_tests.py
+
+    def test_Pipe_friction_model(self):
+        """Test the darcy friction factor models of the pipe."""
+        instance = Pipe('pipe')
+        self.setup_piping_network(instance)
+        self.nw.set_attr(iterinfo=False)
+
+        self.c1.set_attr(fluid={'H2O': 1}, m=10, p=10, T=80)
+        self.c2.set_attr(T=79)
+        instance.set_attr(L=500, D=0.1, ks=1e-4)
+        self.nw.solve('design')
+        self.nw._convergence_check()
+        reference = self.c2.p.val
+
+        for model in ['swamee-jain', 'haaland', 'serghides']:
+            self.nw.set_attr(friction_model=model)
+            self.nw.solve('design')
+            self.nw._convergence_check()
+            assert instance.friction_model.val == model
+            assert self.c2.p.val == approx(reference, rel=1e-2)
+
+        # the component specification overrules the network setting
+        instance.set_attr(friction_model='colebrook')
+        self.nw.solve('design')
+        self.nw._convergence_check()
+        assert self.c2.p.val == approx(reference, rel=1e-9)
+
+        with pytest.raises(KeyError):
+            self.nw.set_attr(friction_model='moody')
+        instance.set_attr(friction_model='moody')
+        with pytest.raises(KeyError):
+            self.nw.solve('design')
+
+    @pytest.mark.parametrize(
+        "fluid, m", [({'H2O': 1}, 10), ({'N2': 0.77, 'O2': 0.23}, 0.5)]
+    )
+    def test_Pipe_darcy_derivatives(self, fluid, m):
+        """Test the partial derivatives of the darcy equation."""
+        instance = Pipe('pipe', L=500, D=0.1, ks=1e-4)
+        self.setup_piping_network(instance)
+        self.nw.set_attr(iterinfo=False)
+        self.c1.set_attr(fluid=fluid, m=m, p=10, T=80)
+        self.c2.set_attr(T=79)
+        self.nw.solve('design')
+        self.nw._convergence_check()
+
+        # mass flow at the inlet, pressure and enthalpy at the outlet
+        self.c1.m.is_var, self.c1.m.J_col = True, 2
+        instance.jacobian = {}
+        instance.darcy_deriv(None, 0)
+        for c, variable in [(self.c1, 'm'), (self.c2, 'p'), (self.c2, 'h')]:
+            expected = instance.numeric_deriv(
+                instance.darcy_func, variable, c
+            )
+            assert instance.jacobian[0, c.get_attr(variable).J_col] == (
+                approx(expected, rel=1e-4, abs=1e-8)
+            )
@@ -12,6 +12,7 @@ SPDX-License-Identifier: MIT
 import shutil
 
 import numpy as np
+import pytest
 
 from tespy.components import Compressor
 from tespy.components import Pump
@@ -38,6 +39,101 @@ class TestTurbomachinery:
         self.c2 = Connection(instance, 'out1', self.sink, 'in1')
         self.nw.add_conns(self.c1, self.c2)
 
+    def check_deriv(self, instance, func, deriv, rel=1e-4):
+        """Compare the analytical derivatives with the numerical ones."""
+        # make all mass flows, pressures and enthalpies variables
+        variables = []
+        for c in [self.c1, self.c2]:
+            for var in ['m', 'p', 'h']:
+                c.get_attr(var).is_var = True
+                c.get_attr(var).J_col = len(variables)
+                variables += [(c, var)]
+
+        instance.it = 0
+        instance.jacobian = {}
+        deriv(None, 0)
+        for c, var in variables:
+            numeric = instance.numeric_deriv(func, var, c)
+            analytic = instance.jacobian.get((0, c.get_attr(var).J_col), 0)
+            assert analytic == pytest.approx(numeric, rel=rel, abs=1e-10)
+
+    def test_deriv_Turbine(self, tmp_path):
+        """Test the partial derivatives of the turbine equations."""
+        instance = Turbine('turbine')
+        self.setup_network(instance)
+        self.c1.set_attr(fluid={'H2O': 1}, m=10, p=100, T=500)
+        self.c2.set_attr(p=10)
+        instance.set_attr(eta_s=0.9)
+        self.nw.solve('design')
+        self.nw.save(str(tmp_path))
+        self.c1.set_attr(m=8, p=None)
+        instance.set_attr(eta_s=None, eta_s_char={'is_set': True}, cone={})
+        self.nw.solve('offdesign', design_path=str(tmp_path))
+        self.nw._convergence_check()
+
+        instance.eta_s.val = 0.85
+        for name in ['eta_s', 'cone', 'eta_s_char']:
+            self.check_deriv(
+                instance, getattr(instance, f'{name}_func'),
+                getattr(instance, f'{name}_deriv')
+            )
+
+    def test_deriv_Compressor(self, tmp_path):
+        """Test the partial derivatives of the compressor equations."""
+        instance = Compressor('compressor')
+        self.setup_network(instance)
+        self.c1.set_attr(fluid={'air': 1}, m=10, p=1, T=20)
+        self.c2.set_attr(p=5)
+        instance.set_attr(eta_s=0.85)
+        self.nw.solve('design')
+        self.nw.save(str(tmp_path))
+        self.c1.set_attr(m=9)
+        self.c2.set_attr(p=4.5)
+        instance.set_attr(eta_s=None, eta_s_char={'is_set': True})
+        self.nw.solve('offdesign', design_path=str(tmp_path))
+        self.nw._convergence_check()
+
+        # evaluate the maps outside of the design point
+        self.c1.m.val_SI = 10.2
+        self.c1.h.val_SI += 5e3
+        instance.eta_s.val = 0.8
+        instance.char_map_pr.char_func = ldc(
+            'compressor', 'char_map_pr', 'DEFAULT', CharMap
+        )
+        instance.char_map_eta_s.char_func = ldc(
+            'compressor', 'char_map_eta_s', 'DEFAULT', CharMap
+        )
+        for name in ['eta_s', 'eta_s_char', 'char_map_pr', 'char_map_eta_s']:
+            self.check_deriv(
+                instance, getattr(instance, f'{name}_func'),
+                getattr(instance, f'{name}_deriv')
+            )
+
+    def test_deriv_Pump(self, tmp_path):
+        """Test the partial derivatives of the pump equations."""
+        instance = Pump('pump')
+        self.setup_network(instance)
+        self.c1.set_attr(fluid={'H2O': 1}, v=0.9, p=1, T=20)
+        self.c2.set_attr(p=7)
+        instance.set_attr(eta_s=0.8)
+        self.nw.solve('design')
+        self.nw.save(str(tmp_path))
+        self.c1.set_attr(v=0.8)
+        instance.set_attr(eta_s=None, eta_s_char={'is_set': True})
+        self.nw.solve('offdesign', design_path=str(tmp_path))
+        self.nw._convergence_check()
+
+        instance.eta_s.val = 0.75
+        x = [0, 0.2, 0.4, 0.6, 0.8, 1, 1.2, 1.4]
+        y = np.array([14, 13.5, 12.5, 11, 9, 6.5, 3.5, 0]) * 1e5
+        instance.flow_char.char_func = CharLine(x, y)
+        # the numerical pressure derivatives are less accurate for liquids
+        for name in ['eta_s', 'eta_s_char', 'flow_char']:
+            self.check_deriv(
+                instance, getattr(instance, f'{name}_func'),
+                getattr(instance, f'{name}_deriv'), rel=1e-3
+            )
+
     def test_Compressor(self):
         """Test component properties of compressors."""
         instance = Compressor('compressor')
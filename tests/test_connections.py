@@ -123,3 +123,18 @@ class TestConnections:
             f'{m_expected} kg/s, but is {m_is} kg/s'
         )
         assert m_is == m_expected, msg
+
+    def test_temperature_starting_value(self):
+        """Test the temperature calculation keeps the result unchanged."""
+        c1 = self.nw.get_conn('Some example label')
+        T = c1.T.val_SI
+        c1.h.val_SI += 1e4
+        T_new = c1.calc_T()
+        msg = (
+            'The temperature of the connection must not be changed by the '
+            f'calculation of the temperature, but is {c1.T.val_SI} K instead '
+            f'of {T} K.'
+        )
+        assert c1.T.val_SI == T, msg
+        msg = 'The last temperature must be kept as starting value.'
+        assert c1._get_T_guess() == T_new, msg
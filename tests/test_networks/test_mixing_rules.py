@@ -100,6 +100,25 @@ class TestGasMixingRules:
         )
         assert c6.h.val_SI > target, msg
 
+    def test_temperature_inversion_metric(self):
+
+        c1, c2, c3, c7 = self.nwk.get_conn(["1", "2", "3", "7"])
+        c1.set_attr(fluid={"N2": 0.76, "O2": 0.23, "Ar": 0.01}, m=10, T=400, p=1, mixing_rule="ideal")
+        c2.set_attr(fluid={"H2O": 1}, m=.5, T=400)
+        c3.set_attr(fluid0={"H2O": 0.05})
+        c7.set_attr(m=4)
+
+        self.nwk.solve("design")
+        self.nwk._convergence_check()
+
+        msg = "The mixture temperature must have been calculated."
+        assert self.nwk.num_T_mix_calls > 0, msg
+        msg = (
+            "The number of inner iterations must not be smaller than the "
+            "number of calls to the mixture temperature inversion."
+        )
+        assert self.nwk.num_T_mix_iterations >= self.nwk.num_T_mix_calls, msg
+
 class TestIncompressibleMixingRule:
 
     def setup_method(self):
@@ -10,10 +10,12 @@ tests/test_networks/test_network.py
 SPDX-License-Identifier: MIT
 """
 
+import json
 import os
 import shutil
 
 import numpy as np
+from pytest import approx
 from pytest import mark
 from pytest import raises
 
@@ -29,6 +31,7 @@ from tespy.components import Splitter
 from tespy.components import SubsystemInterface
 from tespy.components import Turbine
 from tespy.components import Valve
+from tespy.connections import Bus
 from tespy.connections import Connection
 from tespy.connections import Ref
 from tespy.networks import Network
@@ -642,3 +645,209 @@ def test_missing_source_sink_cycle_closer():
     nw.add_conns(c1, c2)
     with raises(TESPyNetworkError):
         nw.check_network()
+
+
+def test_reuse_unchanged_equations():
+    """Test skipping the evaluation of equations with unchanged variables."""
+    nw = Network(T_unit="C", p_unit="bar", iterinfo=False)
+    so1, si1 = Source("source 1"), Sink("sink 1")
+    so2, si2 = Source("source 2"), Sink("sink 2")
+    pipe = Pipe("pipe")
+    valve = Valve("valve")
+    c1 = Connection(so1, "out1", pipe, "in1", label="1")
+    c2 = Connection(pipe, "out1", si1, "in1", label="2")
+    c3 = Connection(so2, "out1", valve, "in1", label="3")
+    c4 = Connection(valve, "out1", si2, "in1", label="4")
+    nw.add_conns(c1, c2, c3, c4)
+
+    # the valve converges within the first iteration, the pipe does not
+    c1.set_attr(fluid={"water": 1}, m=10, T=90, p=10)
+    pipe.set_attr(zeta=1e6, kA=5e3, Tamb=10)
+    c3.set_attr(fluid={"water": 1}, m=5, T=20, p=10)
+    c4.set_attr(p=5)
+    nw.solve("design")
+    nw._convergence_check()
+
+    msg = (
+        "The equations of the valve and its connections must be reused after "
+        "the first iteration."
+    )
+    assert nw.num_reused_evaluations > 0, msg
+    assert round(c2.T.val, 4) == 81.0347
+    assert c4.h.val_SI == c3.h.val_SI
+
+
+def test_constant_partial_derivatives():
+    """Test the partial derivatives of linear equations calculated once."""
+    nw = Network(T_unit="C", p_unit="bar", iterinfo=False)
+    so, si = Source("source"), Sink("sink")
+    valve = Valve("valve")
+    pipe = Pipe("pipe")
+    c1 = Connection(so, "out1", valve, "in1", label="1")
+    c2 = Connection(valve, "out1", pipe, "in1", label="2")
+    c3 = Connection(pipe, "out1", si, "in1", label="3")
+    nw.add_conns(c1, c2, c3)
+
+    c1.set_attr(fluid={"water": 1}, m=10, T=90, p=10)
+    valve.set_attr(pr=0.5)
+    pipe.set_attr(pr=0.9)
+    c3.set_attr(h=Ref(c1, 1, -1e4))
+    nw.solve("design")
+    nw._convergence_check()
+
+    assert pipe.constant_deriv_parameters == ["pr"]
+    assert (0, c2.p.J_col) in pipe.constant_jacobian
+    assert (0, c3.h.J_col) in c3.constant_jacobian
+    assert nw.num_constant_jacobian_entries == 5
+    assert round(c3.p.val, 4) == 4.5
+    assert round(pipe.Q.val) == -1e5
+
+    # the partial derivative to the inlet pressure depends on the variable
+    valve.set_attr(pr="var")
+    c3.set_attr(p=4)
+    nw.solve("design")
+    nw._convergence_check()
+
+    assert valve.constant_deriv_parameters == []
+    assert round(valve.pr.val, 4) == round(4 / 9, 4)
+
+
+def create_branched_network(num):
+    """Create a network of parallel pipes between a splitter and a merge."""
+    nw = Network(T_unit="C", p_unit="bar", iterinfo=False)
+    so, si = Source("source"), Sink("sink")
+    splitter = Splitter("splitter", num_out=num)
+    merge = Merge("merge", num_in=num)
+    c1 = Connection(so, "out1", splitter, "in1", label="inlet")
+    c2 = Connection(merge, "out1", si, "in1", label="outlet")
+    nw.add_conns(c1, c2)
+    heat = Bus("heat loss")
+    for i in range(num):
+        pipe = Pipe(f"pipe {i}", design=["zeta"], offdesign=["kA_char"])
+        c3 = Connection(splitter, f"out{i + 1}", pipe, "in1", label=f"{i} in")
+        c4 = Connection(
+            pipe, "out1", merge, f"in{i + 1}", label=f"{i} out", p0=5
+        )
+        nw.add_conns(c3, c4)
+        pipe.set_attr(zeta=1e6 * (1 + i / num), kA=5e3, Tamb=10)
+        heat.add_comps({"comp": pipe, "char": 0.9})
+    nw.add_busses(heat)
+    c1.set_attr(fluid={"water": 1}, m=10 * num, T=90, p=10)
+    return nw
+
+
+def test_add_conns_duplicate_labels():
+    """Test the label check for connections added at once."""
+    nw = Network()
+    so, si = Source("source"), Sink("sink")
+    pipe = Pipe("pipe")
+    c1 = Connection(so, "out1", pipe, "in1", label="1")
+    c2 = Connection(pipe, "out1", si, "in1", label="1")
+    with raises(ValueError):
+        nw.add_conns(c1, c2)
+    assert len(nw.conns) == 0
+    assert len(nw.comps) == 0
+
+
+@mark.parametrize("fn", ["network", "network.json"])
+def test_export_load_round_trip(tmp_path, fn):
+    """Test identical networks and results after export and loading."""
+    nw = create_branched_network(3)
+    nw.solve("design")
+    nw._convergence_check()
+    path = str(tmp_path / fn)
+    nw.export(path)
+    if fn.endswith(".json"):
+        assert os.path.isfile(path)
+
+    exported = [
+        json.dumps(data, sort_keys=True) for data in [
+            nw._serialize_connections(), nw._serialize_components(),
+            nw._serialize_busses()
+        ]
+    ]
+    imported_nwk = load_network(path)
+    imported = [
+        json.dumps(data, sort_keys=True) for data in [
+            imported_nwk._serialize_connections(),
+            imported_nwk._serialize_components(),
+            imported_nwk._serialize_busses()
+        ]
+    ]
+    assert imported == exported
+    assert imported_nwk.get_conn("inlet").fluid.is_set == {"water"}
+
+    imported_nwk.solve("design")
+    imported_nwk._convergence_check()
+    for prop in ["m", "p", "h"]:
+        assert imported_nwk.results["Connection"][prop].values == approx(
+            nw.results["Connection"][prop].values, rel=1e-8
+        )
+    assert imported_nwk.results["heat loss"]["bus value"].values == (
+        approx(nw.results["heat loss"]["bus value"].values, rel=1e-8)
+    )
+
+
+def test_solve_callbacks():
+    """Test the events passed to the callbacks of the simulation."""
+    nw = create_branched_network(2)
+    events = []
+
+    def callback(event, network, data):
+        assert network is nw
+        events.append((event, data))
+
+    nw.solve("design", callbacks=[callback])
+    nw._convergence_check()
+    names = [event for event, _ in events]
+    assert names[0] == "initialised"
+    assert names[-2:] == ["converged", "postprocessed"]
+    assert set(names[1:-2]) == {"iteration"}
+
+    iterations = [data for event, data in events if event == "iteration"]
+    assert len(iterations) == nw.iter + 1
+    assert [data["iteration"] for data in iterations] == list(
+        range(1, nw.iter + 2)
+    )
+    assert [data["residual"] for data in iterations] == approx(
+        nw.residual_history
+    )
+    assert set(iterations[0]["increment"]) == {
+        "massflow", "pressure", "enthalpy", "fluid", "component"
+    }
+    assert events[0][1]["num_vars"] == nw.num_vars
+    assert events[-2][1]["iterations"] == nw.iter + 1
+    assert events[-1][1]["converged"]
+    elapsed = [data["elapsed"] for _, data in events]
+    assert elapsed == sorted(elapsed)
+
+
+def test_solve_callbacks_abort():
+    """Test stopping the simulation from a callback."""
+    nw = create_branched_network(2)
+    events = []
+
+    def stop_after_two_iterations(event, network, data):
+        events.append((event, data))
+        return event == "iteration" and data["iteration"] == 2
+
+    nw.solve("design", callbacks=[stop_after_two_iterations])
+    assert nw.aborted
+    assert not nw.converged
+    assert nw.iter + 1 == 2
+    assert events[-2][0] == "failed"
+    assert events[-2][1]["reason"] == "callback"
+
+    # the next simulation without callbacks is not affected
+    nw.solve("design")
+    nw._convergence_check()
+    assert not nw.aborted
+
+
+def test_solve_callbacks_invalid():
+    """Test the error for callbacks not provided as list of functions."""
+    nw = create_branched_network(2)
+    with raises(TypeError):
+        nw.solve("design", callbacks=lambda event, nw, data: None)
+    with raises(TypeError):
+        nw.solve("design", callbacks=["iteration"])
@@ -0,0 +1,212 @@
+# -*- coding: utf-8
+
+"""Module for testing the automatic differentiation.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+tests/test_tools/test_autodiff.py
+
+SPDX-License-Identifier: MIT
+"""
+import numpy as np
+import pytest
+from pytest import approx
+
+from tespy.components import Pipe
+from tespy.components import Sink
+from tespy.components import Source
+from tespy.connections import Connection
+from tespy.connections import Ref
+from tespy.networks import Network
+from tespy.tools import UserDefinedEquation
+from tespy.tools.autodiff import Dual
+from tespy.tools.fluid_properties import T_mix_ph
+from tespy.tools.fluid_properties import h_mix_pT
+from tespy.tools.fluid_properties import isentropic
+from tespy.tools.fluid_properties import s_mix_ph
+from tespy.tools.fluid_properties import v_mix_ph
+from tespy.tools.fluid_properties.wrappers import CoolPropWrapper
+
+
+def test_Dual_operations():
+    """Test the chain rule for the supported operations."""
+    x = Dual(2.0, np.array([1.0, 0.0]))
+    y = Dual(0.5, np.array([0.0, 1.0]))
+    for f, df in [
+            (lambda x, y: x * y - y / x, [y.val + y.val / x.val ** 2,
+                                          x.val - 1 / x.val]),
+            (lambda x, y: 3 / x + x ** y, [-3 / x.val ** 2
+                                           + y.val * x.val ** (y.val - 1),
+                                           x.val ** y.val * np.log(x.val)]),
+            (lambda x, y: np.exp(-x) * np.sqrt(y) - abs(-x), [
+                -np.exp(-x.val) * y.val ** 0.5 - 1,
+                np.exp(-x.val) / (2 * y.val ** 0.5)]),
+            (lambda x, y: np.float64(2.0) ** x - np.float64(1.0) / y,
+             [2 ** x.val * np.log(2), 1 / y.val ** 2])]:
+        result = f(x, y)
+        assert result.val == approx(f(x.val, y.val))
+        assert result.der == approx(df)
+
+    assert x > y and y < 1 and not x == y
+
+
+@pytest.mark.parametrize("fluid_data", [
+    {"water": {"wrapper": CoolPropWrapper("water"), "mass_fraction": 1}},
+    {
+        "N2": {"wrapper": CoolPropWrapper("N2"), "mass_fraction": 0.75},
+        "O2": {"wrapper": CoolPropWrapper("O2"), "mass_fraction": 0.25}
+    }
+])
+def test_property_functions(fluid_data):
+    """Test the partial derivatives of the fluid property functions."""
+    p = 1e6
+    h = h_mix_pT(p, 500, fluid_data, "ideal-cond")
+    p_dual = Dual(p, np.array([1.0, 0.0]))
+    h_dual = Dual(h, np.array([0.0, 1.0]))
+    d = 1e-1
+    for function in [T_mix_ph, v_mix_ph, s_mix_ph]:
+        result = function(p_dual, h_dual, fluid_data, "ideal-cond")
+        deriv = [
+            (function(p + d, h, fluid_data, "ideal-cond")
+             - function(p - d, h, fluid_data, "ideal-cond")) / (2 * d),
+            (function(p, h + d, fluid_data, "ideal-cond")
+             - function(p, h - d, fluid_data, "ideal-cond")) / (2 * d),
+        ]
+        assert result.val == function(p, h, fluid_data, "ideal-cond")
+        assert result.der == approx(deriv, rel=1e-4)
+
+    result = isentropic(p_dual, h_dual, 1e5, fluid_data, "ideal-cond")
+    assert result.der[1] == approx(
+        (isentropic(p, h + d, 1e5, fluid_data, "ideal-cond")
+         - isentropic(p, h - d, 1e5, fluid_data, "ideal-cond")) / (2 * d),
+        rel=1e-4
+    )
+
+
+class TestAutodiff:
+
+    def setup_method(self):
+        self.nw = Network(T_unit="C", p_unit="bar", iterinfo=False)
+        so = Source("source")
+        si = Sink("sink")
+        self.pipe = Pipe("pipe")
+        self.c1 = Connection(so, "out1", self.pipe, "in1", label="1")
+        self.c2 = Connection(self.pipe, "out1", si, "in1", label="2")
+        self.nw.add_conns(self.c1, self.c2)
+
+        self.c1.set_attr(fluid={"water": 1}, m=10, T=90, p=10)
+        self.pipe.set_attr(zeta=1e6, kA=5e3, Tamb=10)
+
+    def compare_jacobian(self, data, deriv, **kwargs):
+        """Compare the automatic and the reference partial derivatives."""
+        for c in [self.c1, self.c2]:
+            for var in [c.m, c.p, c.h]:
+                var.is_var = True
+                var.J_col = len(self.pipe.jacobian)
+                self.pipe.jacobian[0, var.J_col] = 0
+        increment_filter = np.zeros(len(self.pipe.jacobian), dtype=bool)
+
+        residual = self.pipe.autodiff(data.func, increment_filter, 0, **kwargs)
+        assert residual[0] == approx(data.func(**kwargs))
+        # the dual numbers are evaluated on copies of the connections
+        for c in [self.c1, self.c2]:
+            for var in [c.m, c.p, c.h]:
+                assert not isinstance(var.val_SI, Dual)
+        autodiff = self.pipe.jacobian.copy()
+
+        deriv(increment_filter, 0, **kwargs)
+        for key, value in self.pipe.jacobian.items():
+            assert autodiff[key] == approx(value, rel=1e-4, abs=1e-10)
+
+    def test_component(self):
+        """Test the partial derivatives of the opt-in component equations."""
+        self.nw.solve("design")
+        self.nw._convergence_check()
+        self.compare_jacobian(
+            self.pipe.zeta, self.pipe.zeta_deriv, **self.pipe.zeta.func_params
+        )
+        self.compare_jacobian(self.pipe.kA_group, self.pipe.kA_group_deriv)
+
+    def test_results(self):
+        """Test identical results with and without autodiff."""
+        self.pipe.zeta.autodiff = True
+        self.pipe.kA_group.autodiff = True
+        self.nw.solve("design")
+        self.nw._convergence_check()
+        reference = self.c2.p.val_SI, self.pipe.Q.val
+
+        self.pipe.zeta.autodiff = False
+        self.pipe.kA_group.autodiff = False
+        self.nw.solve("design")
+        self.nw._convergence_check()
+        assert self.c2.p.val_SI == approx(reference[0], rel=1e-8)
+        assert self.pipe.Q.val == approx(reference[1], rel=1e-8)
+
+    def test_evaluation_count(self):
+        """Benchmark the number of fluid property calls of the equations."""
+        calls = {}
+        for autodiff in [False, True]:
+            self.pipe.zeta.autodiff = autodiff
+            self.pipe.kA_group.autodiff = autodiff
+            self.nw.set_attr(profile=True)
+            self.nw.solve("design")
+            self.nw._convergence_check()
+            report = self.nw.profile_report()
+            report = report[
+                (report["object"] == "pipe")
+                & (report["phase"].isin(["residual", "derivative"]))
+            ]
+            calls[autodiff] = report["calls"].sum() / self.nw.iter
+
+        # numerical derivatives: two evaluations per variable on top of the
+        # residual, autodiff: one evaluation and the property derivatives
+        assert calls[True] < 0.5 * calls[False]
+
+    def test_connection(self):
+        """Test the automatic derivatives of connection equations."""
+        self.pipe.set_attr(kA=None)
+        self.c2.set_attr(T=Ref(self.c1, 1, -15))
+        self.c2.T_ref.autodiff = True
+        self.nw.solve("design")
+        self.nw._convergence_check()
+        assert self.c2.T.val == approx(75)
+
+        k = [k for k, v in self.c2.equations.items() if v == "T_ref"][0]
+        self.c1.h.is_var = True
+        self.c1.h.J_col = self.c2.h.J_col + 1
+        residual = self.c2.residual.copy()
+        values = [self.c2.p.val_SI, self.c2.h.val_SI, self.c1.h.val_SI]
+        self.c2.autodiff("T_ref", k)
+        autodiff = self.c2.jacobian.copy()
+        # the state of the connections is not changed
+        assert type(self.c2.residual) is type(residual)
+        assert self.c2.residual[k] == approx(residual[k], abs=1e-8)
+        assert [self.c2.p.val_SI, self.c2.h.val_SI, self.c1.h.val_SI] == values
+        self.c2.T_ref_deriv(k)
+        for key, value in self.c2.jacobian.items():
+            assert autodiff[key] == approx(value, rel=1e-4)
+        assert (k, self.c1.h.J_col) in autodiff
+
+    def test_UserDefinedEquation(self):
+        """Test user defined equation without derivative function."""
+        def myfunc(ude):
+            c0, c1 = ude.conns
+            return c0.calc_T() - c1.calc_T() - ude.params["dT"] * np.sqrt(
+                c0.m.val_SI * c0.calc_vol()
+            )
+
+        self.pipe.set_attr(kA=None)
+        ude = UserDefinedEquation(
+            "ude", myfunc, None, [self.c1, self.c2], params={"dT": 15}
+        )
+        self.nw.add_ude(ude)
+        self.nw.solve("design")
+        self.nw._convergence_check()
+
+        dT = self.c1.T.val - self.c2.T.val
+        assert dT == approx(15 * (self.c1.m.val_SI * self.c1.vol.val) ** 0.5)
+        for var in ["p", "h"]:
+            assert ude.jacobian[self.c2.get_attr(var).J_col] == approx(
+                ude.numeric_deriv(var, self.c2), rel=1e-3
+            )
@@ -182,6 +182,29 @@ def test_CharLine_extrapolation():
     assert y == 7.0, msg
 
 
+def test_CharLine_derivative():
+    """Test the derivative of the characteristc line."""
+
+    # create a characteristc line with values of y=(x-2)^2
+    line = CharLine(x=[0, 1, 2, 3, 4], y=[4, 1, 0, 1, 4])
+
+    # slope of the segments, lower segment at the supporting points
+    for x, dy in [(0.5, -3), (1, -3), (1.5, -1), (3.5, 3)]:
+        msg = (
+            f'The derivative at x={x} must be {dy}, but is '
+            f'{line.evaluate_deriv(x)}.'
+        )
+        assert line.evaluate_deriv(x) == dy, msg
+
+    # constant values outside of the range
+    assert line.evaluate_deriv(-1) == 0
+    assert line.evaluate_deriv(5) == 0
+
+    line.extrapolate = True
+    assert line.evaluate_deriv(-1) == -3
+    assert line.evaluate_deriv(5) == 3
+
+
 def test_CharMap_evaluation():
     """Test the characteristc map evaluation."""
 
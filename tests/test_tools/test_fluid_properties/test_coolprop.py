@@ -145,6 +145,43 @@ class TestFluidProperties:
                                str(d_rel_max) + '.')
                         assert d_rel < d_rel_max, self.errormsg + msg
 
+    def test_temperature_inversion(self):
+        """
+        Test the inversion of mixture enthalpy and entropy to temperature.
+
+        The temperature must be recovered from enthalpy and entropy with and
+        without starting value. With a starting value close to the result, the
+        inversion must converge within three inner iterations.
+        """
+        statistics = fp.helpers.T_MIX_INVERSION_STATISTICS
+        for p in self.p_range[::4]:
+            for T in self.T_range[::4]:
+                h = fp.h_mix_pT(p, T, self.mixture_data, "ideal")
+                s = fp.s_mix_pT(p, T, self.mixture_data, "ideal")
+                for T0 in [None, T + 0.5]:
+                    iterations = statistics["iterations"]
+                    T_h = fp.T_mix_ph(p, h, self.mixture_data, "ideal", T0=T0)
+                    iterations = statistics["iterations"] - iterations
+                    T_s = fp.T_mix_ps(p, s, self.mixture_data, "ideal", T0=T0)
+
+                    msg = (
+                        f'The temperature from enthalpy ({T_h}) must be equal '
+                        f'to the original temperature ({T}).'
+                    )
+                    assert T_h == pytest.approx(T, abs=1e-6), msg
+                    msg = (
+                        f'The temperature from entropy ({T_s}) must be equal '
+                        f'to the original temperature ({T}).'
+                    )
+                    assert T_s == pytest.approx(T, abs=1e-6), msg
+                    if T0 is not None:
+                        msg = (
+                            'The number of inner iterations with starting '
+                            f'value close to the result is {iterations}, '
+                            'it should not be larger than 3.'
+                        )
+                        assert iterations <= 3, msg
+
 
 class TestFluidPropertyBackEnds:
     """Testing full models with different fluid property back ends."""
@@ -0,0 +1,79 @@
+# -*- coding: utf-8
+
+"""Module for testing the darcy friction factor models.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+tests/test_tools/test_fluid_properties/test_friction.py
+
+SPDX-License-Identifier: MIT
+"""
+import numpy as np
+import pytest
+from pytest import approx
+
+from tespy.tools.fluid_properties.helpers import colebrook
+from tespy.tools.fluid_properties.helpers import darcy_friction_factor
+from tespy.tools.fluid_properties.helpers import darcy_friction_factor_array
+from tespy.tools.fluid_properties.helpers import \
+    darcy_friction_factor_derivative
+from tespy.tools.fluid_properties.helpers import prandtl_karman
+
+MODELS = ["colebrook", "swamee-jain", "haaland", "serghides"]
+
+
+class TestDarcyFrictionFactor:
+
+    def setup_method(self):
+        # laminar, smooth (blasius, hanakov, prandtl-karman) and rough states
+        self.re = np.array([1500, 5000, 5e4, 2e6, 7e4, 7e4, 1e7])
+        self.ks = np.array([1e-5, 1e-7, 1e-7, 1e-7, 1e-3, 1e-4, 1e-3])
+        self.d = np.full(len(self.re), 0.1)
+
+    def test_implicit_equations(self):
+        lamb = darcy_friction_factor_array(self.re, self.ks, self.d)
+        assert lamb[0] == 64 / self.re[0]
+        assert prandtl_karman(self.re[3], lamb[3]) == approx(0, abs=1e-10)
+        for i in [4, 5, 6]:
+            residual = colebrook(self.re[i], self.ks[i], self.d[i], lamb[i])
+            assert residual == approx(0, abs=1e-10)
+
+    def test_array_and_scalar(self):
+        for model in MODELS:
+            lamb = darcy_friction_factor_array(self.re, self.ks, self.d, model)
+            assert lamb.shape == self.re.shape
+            for i in [0, 1, 2, 4, 5]:
+                scalar = darcy_friction_factor(
+                    self.re[i], self.ks[i], self.d[i], model
+                )
+                assert scalar == approx(lamb[i], rel=1e-5)
+
+    def test_explicit_models(self):
+        reference = darcy_friction_factor_array(self.re, self.ks, self.d)
+        rough = slice(4, None)
+        for model in MODELS[1:]:
+            lamb = darcy_friction_factor_array(self.re, self.ks, self.d, model)
+            assert lamb[0] == reference[0]
+            assert lamb[rough] == approx(reference[rough], rel=2e-2)
+
+    def test_derivative(self):
+        d_re = self.re * 1e-6
+        for model in MODELS:
+            analytic = darcy_friction_factor_derivative(
+                self.re, self.ks, self.d, model
+            )
+            numeric = (
+                darcy_friction_factor_array(
+                    self.re + d_re, self.ks, self.d, model
+                ) - darcy_friction_factor_array(
+                    self.re - d_re, self.ks, self.d, model
+                )
+            ) / (2 * d_re)
+            assert analytic == approx(numeric, rel=1e-5)
+
+    def test_unknown_model(self):
+        with pytest.raises(KeyError):
+            darcy_friction_factor(1e5, 1e-4, 0.1, "moody")
+        with pytest.raises(KeyError):
+            darcy_friction_factor_array(self.re, self.ks, self.d, "moody")
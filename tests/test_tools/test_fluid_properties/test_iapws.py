@@ -1,9 +1,13 @@
+import numpy as np
+import pytest
+
 from tespy.components import Sink
 from tespy.components import Source
 from tespy.components import Turbine
 from tespy.connections import Connection
 from tespy.networks import Network
 from tespy.tools.fluid_properties.wrappers import IAPWSWrapper
+from tespy.tools.fluid_properties.wrappers import IF97Wrapper
 
 
 class TestIAPWS:
@@ -67,3 +71,98 @@ class TestIAPWS:
         assert h_out_ref == round(c2.h.val_SI / 1000)
         assert T_out_ref == round(c2.T.val_SI)
         assert x_out_ref == round(c2.x.val_SI, 3)
+
+    def test_if97_native(self):
+        c1, c2 = self.nwk.get_conn(["1", "2"])
+        c1.set_attr(fluid={"IF97::H2O": 1}, fluid_engines={"H2O": IAPWSWrapper})
+
+        self.nwk.solve("design")
+        self.nwk._convergence_check()
+
+        h_out_ref = round(c2.h.val_SI, 3)
+        T_out_ref = round(c2.T.val_SI, 3)
+        x_out_ref = round(c2.x.val_SI, 6)
+
+        self.setup_method()
+        c1, c2 = self.nwk.get_conn(["1", "2"])
+        c1.set_attr(fluid={"H2O": 1}, fluid_engines={"H2O": IF97Wrapper})
+
+        self.nwk.solve("design")
+        self.nwk._convergence_check()
+
+        assert h_out_ref == round(c2.h.val_SI, 3)
+        assert T_out_ref == round(c2.T.val_SI, 3)
+        assert x_out_ref == round(c2.x.val_SI, 6)
+
+
+class TestIF97Wrapper:
+
+    def setup_method(self):
+        self.reference = IAPWSWrapper("H2O")
+        self.wrapper = IF97Wrapper("H2O")
+
+    def _compare(self, method, *states, rel=1e-8):
+        values = getattr(self.wrapper, method)(*[np.array(s) for s in states])
+        for value, state in zip(values, zip(*states)):
+            reference = getattr(self.reference, method)(*state)
+            msg = f"{method}{state}: {value} != {reference} (IAPWSWrapper)"
+            assert value == pytest.approx(reference, rel=rel), msg
+
+    def test_pT(self):
+        p, T = np.meshgrid(
+            np.geomspace(1e3, 99e6, 12), np.linspace(280, 1900, 15)
+        )
+        # the iapws region 5 is limited to 50 MPa
+        valid = (T <= 1073.15) | (p <= 50e6)
+        p, T = p[valid], T[valid]
+        for method in ["h_pT", "s_pT", "d_pT", "cp_pT", "viscosity_pT"]:
+            self._compare(method, p, T)
+
+    def test_ph_ps(self):
+        p, T = np.meshgrid(
+            np.geomspace(1e3, 99e6, 12), np.linspace(280, 1900, 15)
+        )
+        valid = (T <= 1073.15) | (p <= 50e6)
+        p, T = p[valid], T[valid]
+        h = self.wrapper.h_pT(p, T)
+        s = self.wrapper.s_pT(p, T)
+        for method in ["T_ph", "s_ph", "d_ph", "viscosity_ph"]:
+            self._compare(method, p, h)
+        for method in ["T_ps", "h_ps"]:
+            self._compare(method, p, s)
+
+    def test_two_phase(self):
+        p = np.geomspace(1e3, 20e6, 15)
+        T = self.wrapper.T_sat(p)
+        # the saturated states of region 3 are calculated iteratively in
+        # IF97Wrapper and with the backward equations in iapws
+        for Q in [0, 0.4, 1]:
+            Q = np.full(len(p), Q)
+            self._compare("h_pQ", p, Q, rel=1e-5)
+            self._compare("h_QT", Q, T, rel=1e-5)
+            self._compare("s_QT", Q, T, rel=1e-5)
+            self._compare("d_QT", Q, T, rel=1e-5)
+        h = self.wrapper.h_pQ(p, 0.4)
+        self._compare("Q_ph", p, h, rel=1e-5)
+        self._compare("T_ph", p, h)
+        self._compare("T_sat", p)
+
+    def test_scalar_and_array(self):
+        p = np.array([1e5, 1e6, 1e7])
+        h = np.array([4e5, 2.8e6, 1.5e6])
+        T = self.wrapper.T_ph(p, h)
+        assert T.shape == (3,)
+        for i in range(3):
+            T_scalar = self.wrapper.T_ph(p[i], h[i])
+            assert isinstance(T_scalar, float)
+            assert T_scalar == T[i]
+
+    def test_out_of_range(self):
+        T = self.wrapper.T_ph(np.array([1e5, 200e6]), np.array([4e5, 4e5]))
+        assert np.isnan(T[1])
+        with pytest.raises(ValueError):
+            self.wrapper.T_ph(200e6, 4e5)
+        with pytest.raises(ValueError):
+            IF97Wrapper("R134a")
+        with pytest.raises(NotImplementedError):
+            IF97Wrapper("H2O", back_end="IF95")
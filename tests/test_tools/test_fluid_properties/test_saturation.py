@@ -0,0 +1,118 @@
+# -*- coding: utf-8
+
+"""Module for testing the saturation cache.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+tests/test_tools/test_fluid_properties/test_saturation.py
+
+SPDX-License-Identifier: MIT
+"""
+import numpy as np
+from pytest import approx
+
+from tespy.components import SimpleHeatExchanger
+from tespy.components import Sink
+from tespy.components import Source
+from tespy.connections import Connection
+from tespy.networks import Network
+from tespy.tools.fluid_properties.saturation import _SATURATION_CACHES
+from tespy.tools.fluid_properties.saturation import SaturationCache
+from tespy.tools.fluid_properties.saturation import get_saturation_cache
+from tespy.tools.fluid_properties.wrappers import CoolPropWrapper
+
+
+class TestSaturationCache:
+
+    def setup_method(self):
+        self.wrapper = CoolPropWrapper("R134a")
+        self.cache = SaturationCache(self.wrapper)
+
+    def test_accuracy(self):
+        for p in np.geomspace(1e3, 3.5e6, 25):
+            T_sat = self.wrapper.T_sat(p)
+            assert self.cache.T_sat(p) == approx(T_sat, abs=1e-6)
+            assert self.cache.p_sat(T_sat) == approx(p, rel=1e-6)
+            for Q in [0, 0.3, 1]:
+                h = self.wrapper.h_pQ(p, Q)
+                assert self.cache.h_pQ(p, Q) == approx(h, rel=1e-8)
+                assert self.cache.h_QT(Q, T_sat) == approx(h, rel=1e-6)
+
+            d = p * 1e-5
+            dT = (self.wrapper.T_sat(p + d) - self.wrapper.T_sat(p - d)) / 2 / d
+            assert self.cache.dT_sat_dp(p) == approx(dT, rel=1e-5)
+            dh = (
+                self.wrapper.h_pQ(p + d, 1) - self.wrapper.h_pQ(p - d, 1)
+            ) / 2 / d
+            # the vapor enthalpy has a maximum, use an absolute tolerance
+            tol = 1e-6 * self.wrapper.h_pQ(p, 1) / p
+            assert self.cache.dh_pQ_dp(p, 1) == approx(dh, abs=tol)
+
+    def test_p_sat_range_ends(self):
+        self.cache.build()
+        for T in np.r_[
+                np.linspace(self.cache.T_min, self.cache.T_min + 2, 21),
+                np.linspace(self.cache.T_max - 2, self.cache.T_max, 21)]:
+            assert self.cache.p_sat(T) == approx(
+                self.wrapper.p_sat(T), rel=1e-6
+            )
+
+    def test_near_critical_point(self):
+        p = self.wrapper._p_crit * 0.995
+        assert self.cache.T_sat(p) == self.wrapper.T_sat(p)
+        assert self.cache.h_pQ(p, 1) == self.wrapper.h_pQ(p, 1)
+        assert self.cache.dT_sat_dp(p) is None
+
+    def test_no_saturation_curve(self):
+        wrapper = CoolPropWrapper("Water", "INCOMP")
+        cache = SaturationCache(wrapper)
+        assert cache.dT_sat_dp(1e5) is None
+        assert not cache.available
+
+    def test_shared_per_fluid(self):
+        cache = get_saturation_cache(CoolPropWrapper("R134a"))
+        assert cache is get_saturation_cache(CoolPropWrapper("R134a"))
+        other_back_end = CoolPropWrapper("R134a", "BICUBIC&HEOS")
+        assert cache is not get_saturation_cache(other_back_end)
+        assert cache is _SATURATION_CACHES["CoolPropWrapper", "R134a", "HEOS"]
+
+
+class TestNetworkSaturationCache:
+
+    def setup_method(self):
+        self.nwk = Network(T_unit="C", p_unit="bar", iterinfo=False)
+
+        so = Source("source")
+        ev = SimpleHeatExchanger("evaporator", pr=1)
+        sh = SimpleHeatExchanger("superheater", pr=1)
+        si = Sink("sink")
+
+        c1 = Connection(so, "out1", ev, "in1", label="1")
+        c2 = Connection(ev, "out1", sh, "in1", label="2")
+        c3 = Connection(sh, "out1", si, "in1", label="3")
+
+        self.nwk.add_conns(c1, c2, c3)
+
+        c1.set_attr(fluid={"R134a": 1}, m=1, T=10, p=5)
+        c2.set_attr(x=1)
+        c3.set_attr(Td_bp=5)
+
+    def _solve(self):
+        self.nwk.solve("design")
+        self.nwk._convergence_check()
+        ev, sh = self.nwk.get_comp(["evaporator", "superheater"])
+        return ev.Q.val, sh.Q.val
+
+    def test_saturation_cache(self):
+        reference = self._solve()
+
+        self.nwk.set_attr(saturation_cache=True)
+        result = self._solve()
+        c2 = self.nwk.get_conn("2")
+        assert c2.fluid.wrapper["R134a"]._saturation_cache is not None
+        assert result == approx(reference, rel=1e-7)
+
+        self.nwk.set_attr(saturation_cache=["water"])
+        self._solve()
+        assert c2.fluid.wrapper["R134a"]._saturation_cache is None
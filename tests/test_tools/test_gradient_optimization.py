@@ -0,0 +1,151 @@
+# -*- coding: utf-8
+
+"""Module for testing the gradient based optimization problem.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+tests/test_tools/test_gradient_optimization.py
+
+SPDX-License-Identifier: MIT
+"""
+import numpy as np
+import pytest
+from pytest import approx
+from pytest import raises
+
+from tespy.components import Compressor
+from tespy.components import SimpleHeatExchanger
+from tespy.components import Sink
+from tespy.components import Source
+from tespy.connections import Connection
+from tespy.networks import Network
+
+pytest.importorskip("scipy")
+
+from tespy.tools.optimization import GradientOptimizationProblem  # noqa: E402
+
+
+class CompressionModel:
+    """Model of a two stage compression of air with intercooling."""
+
+    def __init__(self):
+        self.nw = Network(T_unit="C", p_unit="bar", iterinfo=False)
+        so = Source("source")
+        si = Sink("sink")
+        self.cp1 = Compressor("compressor 1", eta_s=0.85)
+        self.cp2 = Compressor("compressor 2", eta_s=0.85)
+        intercooler = SimpleHeatExchanger("intercooler", pr=1)
+        c1 = Connection(so, "out1", self.cp1, "in1", label="1")
+        c2 = Connection(self.cp1, "out1", intercooler, "in1", label="2")
+        self.c3 = Connection(intercooler, "out1", self.cp2, "in1", label="3")
+        c4 = Connection(self.cp2, "out1", si, "in1", label="4")
+        self.nw.add_conns(c1, c2, self.c3, c4)
+
+        c1.set_attr(fluid={"air": 1}, m=1, p=1, T=20)
+        c2.set_attr(p=2)
+        self.c3.set_attr(T=20)
+        c4.set_attr(p=16)
+        self.nw.solve("design")
+
+    def get_param(self, obj, label, parameter):
+        if obj == "Connections":
+            return self.nw.get_conn(label).get_attr(parameter).val
+        return self.nw.get_comp(label).get_attr(parameter).val
+
+    def solve_model(self, **kwargs):
+        for obj, data in kwargs.items():
+            for label, params in data.items():
+                if obj == "Connections":
+                    self.nw.get_conn(label).set_attr(**params)
+                elif obj == "Components":
+                    self.nw.get_comp(label).set_attr(**params)
+                else:
+                    self.c3.set_attr(T=params)
+        self.nw.solve("design")
+
+    def get_objective(self, objective):
+        return (self.cp1.P.val + self.cp2.P.val) / 1e3
+
+
+variables = {"Connections": {"2": {"p": {"min": 1.5, "max": 12}}}}
+constraints = {"upper limits": {"Connections": {"2": {"T": 150}}}}
+
+
+def create_problem(constraints={}, **kwargs):
+    return GradientOptimizationProblem(
+        CompressionModel(), variables, constraints, objective="P", **kwargs
+    )
+
+
+def test_gradient():
+    """Test the gradients against finite differences of the simulations."""
+    problem = create_problem(constraints)
+    x = 3.0
+    fitness, gradient = problem._evaluate([x])
+    assert problem.num_solves == 1
+
+    upper, _ = problem.evaluate([x + 1e-4])
+    lower, _ = problem.evaluate([x - 1e-4])
+    finite_differences = (np.array(upper) - lower) / 2e-4
+    assert gradient[:, 0] == approx(finite_differences, rel=1e-5)
+
+
+def test_gradient_custom_variable():
+    """Test forward differences for decision variables outside the network."""
+    problem = GradientOptimizationProblem(
+        CompressionModel(),
+        {"Custom": {"T": {"min": 10, "max": 50}}}, objective="P"
+    )
+    _, gradient = problem._evaluate([20])
+    assert problem.num_solves == 2
+
+    reference = GradientOptimizationProblem(
+        CompressionModel(),
+        {"Connections": {"3": {"T": {"min": 10, "max": 50}}}}, objective="P"
+    )
+    _, reference_gradient = reference._evaluate([20])
+    assert reference.num_solves == 1
+    assert gradient == approx(reference_gradient, rel=1e-3)
+
+
+@pytest.mark.parametrize("method", ["SLSQP", "trust-constr"])
+def test_optimum(method):
+    """Test the optimal intermediate pressure without and with constraint."""
+    problem = create_problem(method=method)
+    result = problem.run()
+    assert result.success
+    # about the geometric mean of the pressures for ideal gases
+    assert result.x[0] == approx(4, rel=1e-2)
+    assert problem.num_solves < 15
+    assert problem.num_gradients == problem.num_solves
+    assert len(problem.individuals) == problem.num_solves
+
+    problem = create_problem(constraints, method=method)
+    result = problem.run()
+    assert result.success
+    assert problem.model.nw.get_conn("2").T.val == approx(150, abs=1e-2)
+    assert problem.individuals["valid"].iloc[-1]
+
+
+def test_repeated_run():
+    """Test running the optimization of the same problem twice."""
+    custom_variables = {
+        "Connections": {"2": {"p": {"min": 1.5, "max": 12}}},
+        "Custom": {"T": {"min": 10, "max": 50}}
+    }
+    problem = GradientOptimizationProblem(
+        CompressionModel(), custom_variables, objective="P"
+    )
+    first = problem.run(options={"maxiter": 3})
+    second = problem.run(options={"maxiter": 3})
+    assert problem.variables["Custom"]["T"] == {"min": 10, "max": 50}
+    assert np.isfinite(first.x).all() and np.isfinite(second.x).all()
+
+
+def test_model_without_network():
+    """Test the error for models not providing their network."""
+    model = CompressionModel()
+    del model.nw
+    with raises(AttributeError):
+        GradientOptimizationProblem(model, variables, objective="P")
@@ -10,7 +10,10 @@ tests/test_tools/test_helpers.py
 SPDX-License-Identifier: MIT
 """
 from pytest import approx
+from pytest import raises
 
+from tespy.tools.helpers import check_workers
+from tespy.tools.helpers import newton_brent
 from tespy.tools.helpers import newton_with_kwargs
 
 
@@ -59,3 +62,57 @@ def test_newton_bounds():
            'The value ' + str(round(result, 1)) + ' was found, but the '
            'algorithm should have found the upper boundary of -10.0.')
     assert -10.0 == approx(result), msg
+
+
+def test_newton_brent_bounds():
+    """Test the bracketed newton algorithm with the cases of the newton."""
+    kwargs = {"function": func, "parameter": "x"}
+    for derivative in [deriv, None]:
+        result, _ = newton_brent(derivative, 0, valmin=-10, valmax=10, val0=0, **kwargs)
+        msg = (
+            'The bracketed newton algorithm should find the zero crossing at '
+            f'4.0. {round(result, 1)} was found instead.'
+        )
+        assert 4.0 == approx(result), msg
+
+        result, _ = newton_brent(derivative, 0, valmin=-10, valmax=10, val0=-10, **kwargs)
+        msg = (
+            'The bracketed newton algorithm should find the zero crossing at '
+            f'-5.0. {round(result, 1)} was found instead.'
+        )
+        assert -5.0 == approx(result), msg
+
+        result, _ = newton_brent(derivative, 0, valmin=-4, valmax=-2, val0=-3, **kwargs)
+        msg = (
+            'The bracketed newton algorithm should not be able to find a zero '
+            f'crossing. The value {round(result, 1)} was found, but the '
+            'algorithm should have found the lower boundary of -4.0.'
+        )
+        assert -4.0 == approx(result), msg
+
+
+def step(x, **kwargs):
+    return x + 10 * (x > 1)
+
+
+def test_newton_brent_discontinuity():
+    """Test the bracketed newton algorithm with a discontinuous function."""
+    kwargs = {"function": step, "parameter": "x"}
+    result, _ = newton_brent(None, 5, valmin=-10, valmax=10, val0=0, **kwargs)
+    msg = (
+        'The target value lies within the jump of the function, the value '
+        f'at the lower side of the jump (1.0) must be returned, {result} was '
+        'found instead.'
+    )
+    assert 1.0 == approx(result) and result <= 1, msg
+
+
+
+def test_check_workers():
+    """Test invalid numbers of worker processes."""
+    for workers in [1.5, True, "2"]:
+        with raises(TypeError):
+            check_workers(workers)
+    for workers in [0, -1]:
+        with raises(ValueError):
+            check_workers(workers)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8
+
+"""Module for testing the logging of the solver.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+tests/test_tools/test_logger.py
+
+SPDX-License-Identifier: MIT
+"""
+import logging
+import threading
+
+from tespy.components import Pipe
+from tespy.components import Sink
+from tespy.components import Source
+from tespy.connections import Connection
+from tespy.networks import Network
+from tespy.tools import logger
+
+
+def create_pipe_network():
+    nw = Network(T_unit="C", p_unit="bar", iterinfo=True)
+    so = Source("source")
+    si = Sink("sink")
+    pipe = Pipe("pipe", zeta=1e6, kA=5e3, Tamb=10)
+    c1 = Connection(so, "out1", pipe, "in1", label="1")
+    c2 = Connection(pipe, "out1", si, "in1", label="2")
+    nw.add_conns(c1, c2)
+    c1.set_attr(fluid={"water": 1}, m=10, T=90, p=10)
+    return nw
+
+
+def test_is_enabled_for(caplog):
+    """Test the check of the logger and handler levels."""
+    caplog.set_level(logging.WARNING, logger=logger.TESPY_LOGGER_ID)
+    assert not logger.is_enabled_for(logging.DEBUG)
+    assert logger.is_enabled_for(logging.WARNING)
+
+    level = logger.get_logger().level
+    with logger.minimum_level(logging.ERROR):
+        assert not logger.is_enabled_for(logging.WARNING)
+        assert logger.get_logger().level == level
+        # messages of other threads are not affected
+        thread = threading.Thread(
+            target=logger.warning, args=("Warning of another thread.",)
+        )
+        thread.start()
+        thread.join()
+        logger.warning("Ignored warning.")
+    assert logger.is_enabled_for(logging.WARNING)
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages == ["Warning of another thread."]
+
+    caplog.set_level(logging.DEBUG, logger=logger.TESPY_LOGGER_ID)
+    assert logger.is_enabled_for(logging.DEBUG)
+
+
+def test_log_iterations(caplog, capsys):
+    """Test disabling the logging and printing within the iterations."""
+    caplog.set_level(logging.DEBUG, logger=logger.TESPY_LOGGER_ID)
+    nw = create_pipe_network()
+    nw.solve("design")
+    nw._convergence_check()
+    assert "residual" in capsys.readouterr().out
+    levels = {record.levelname for record in caplog.records}
+    assert "PROGRESS" in levels
+
+    caplog.clear()
+    nw.solve("design", log_iterations=False)
+    nw._convergence_check()
+    assert capsys.readouterr().out == ""
+    levels = {record.levelname for record in caplog.records}
+    assert "PROGRESS" not in levels
+    # messages outside of the iterations are still logged
+    assert "DEBUG" in levels
+    assert logger.get_logger().level == logging.DEBUG
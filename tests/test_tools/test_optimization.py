@@ -0,0 +1,163 @@
+# -*- coding: utf-8
+
+"""Module for testing the optimization problem.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+tests/test_tools/test_optimization.py
+
+SPDX-License-Identifier: MIT
+"""
+import gc
+
+import numpy as np
+import pytest
+from pytest import approx
+
+from tespy.components import Pipe
+from tespy.components import Sink
+from tespy.components import Source
+from tespy.connections import Connection
+from tespy.networks import Network
+
+pg = pytest.importorskip("pygmo")
+
+from tespy.tools.optimization import OptimizationProblem  # noqa: E402
+from tespy.tools.optimization import _pools  # noqa: E402
+
+
+class PipeModel:
+    """Model of a pipe with heat losses to the ambient."""
+
+    def __init__(self):
+        self.nw = Network(T_unit="C", p_unit="bar", iterinfo=False)
+        so = Source("source")
+        si = Sink("sink")
+        self.pipe = Pipe("pipe")
+        self.c1 = Connection(so, "out1", self.pipe, "in1", label="1")
+        self.c2 = Connection(self.pipe, "out1", si, "in1", label="2")
+        self.nw.add_conns(self.c1, self.c2)
+
+        self.c1.set_attr(fluid={"water": 1}, m=10, T=90, p=10)
+        self.pipe.set_attr(zeta=1e6, kA=5e3, Tamb=10)
+        self.nw.solve("design")
+
+    def get_param(self, obj, label, parameter):
+        if obj == "Connections":
+            return self.nw.get_conn(label).get_attr(parameter).val
+        return self.nw.get_comp(label).get_attr(parameter).val
+
+    def solve_model(self, **kwargs):
+        for obj, data in kwargs.items():
+            for label, params in data.items():
+                if obj == "Connections":
+                    self.nw.get_conn(label).set_attr(**params)
+                else:
+                    self.nw.get_comp(label).set_attr(**params)
+        self.nw.solve("design")
+
+    def get_objective(self, objective):
+        return self.pipe.Q.val
+
+
+variables = {
+    "Connections": {
+        "1": {"m": {"min": 5, "max": 20}, "T": {"min": 60, "max": 120}}
+    }
+}
+constraints = {
+    "lower limits": {"Connections": {"2": {"p": "ref1"}}},
+    "ref1": ["Connections", "1", "p"]
+}
+
+
+def create_problem(**kwargs):
+    return OptimizationProblem(
+        PipeModel(), variables, constraints, objective="Q", **kwargs
+    )
+
+
+def create_individuals():
+    rng = np.random.default_rng(1)
+    x = np.column_stack([rng.uniform(5, 20, 6), rng.uniform(60, 120, 6)])
+    # repeat some of the individuals
+    return np.vstack([x, x[:3]])
+
+
+def test_batch_fitness():
+    """Test identical fitness of the batch and the single evaluation."""
+    x = create_individuals()
+    reference = create_problem(decimals=None)
+    expected = np.concatenate([reference.fitness(xi) for xi in x])
+    assert reference.num_solves == len(x)
+
+    problem = create_problem()
+    assert problem.batch_fitness(x.ravel()) == approx(expected, rel=1e-8)
+    assert problem.num_solves == 6
+    assert problem.num_memo_hits == 3
+
+    # all individuals are taken from the memo in the second evaluation
+    assert problem.batch_fitness(x.ravel()) == approx(expected, rel=1e-8)
+    assert problem.fitness(x[0]) == approx(expected[:2], rel=1e-8)
+    assert problem.num_solves == 6
+    assert problem.num_memo_hits == 13
+
+
+def test_batch_fitness_workers():
+    """Test identical fitness of the serial and the parallel evaluation."""
+    x = create_individuals()
+    results = {}
+    for workers in [1, 2]:
+        problem = create_problem(workers=workers)
+        results[workers] = problem.batch_fitness(x.ravel())
+        problem.close()
+
+    assert results[2] == approx(results[1], rel=1e-8)
+
+
+def test_run_checkpoint(tmp_path):
+    """Test stopping and resuming a run from the checkpoint file."""
+    checkpoint = str(tmp_path / "optimization.pkl")
+    algo = pg.algorithm(pg.ihs(gen=2, seed=42))
+
+    problem = create_problem()
+    pop = pg.population(pg.problem(problem), size=5, seed=42)
+    problem.run(
+        algo, pop, 5, 6, checkpoint=checkpoint,
+        callback=lambda gen, pop, problem: gen == 2
+    )
+    stopped = problem.individuals
+    assert stopped.index.names == ["gen", "ind"]
+    assert stopped.loc[:2].notna().all().all()
+    assert stopped.loc[3:, "Q"].isna().all()
+    constraint = problem.constraint_list[0]
+    assert (stopped["valid"] == (stopped[constraint] < 0)).all()
+
+    problem = create_problem()
+    pop = pg.population(pg.problem(problem), size=5, seed=1)
+    pop = problem.run(algo, pop, 5, 6, checkpoint=checkpoint)
+    resumed = problem.individuals
+    assert resumed.loc[:2].equals(stopped.loc[:2])
+    assert resumed.notna().all().all()
+    assert pop.get_x() == approx(resumed.loc[5, problem.variable_list].values)
+
+    # the archive of the first run is restored with the population
+    udp = pop.problem.extract(OptimizationProblem)
+    assert len(udp.memo) > udp.num_solves
+
+
+def test_pool_release():
+    """Test stopping the worker processes without a run."""
+    x = create_individuals()
+    with create_problem(workers=2) as problem:
+        problem.batch_fitness(x.ravel())
+        assert problem.pool_id in _pools
+    assert problem.pool_id not in _pools
+
+    problem = create_problem(workers=2)
+    problem.batch_fitness(x.ravel())
+    pool_id = problem.pool_id
+    del problem
+    gc.collect()
+    assert pool_id not in _pools
@@ -0,0 +1,102 @@
+# -*- coding: utf-8
+
+"""Module for testing the parallel evaluation of the equations.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+tests/test_tools/test_parallel.py
+
+SPDX-License-Identifier: MIT
+"""
+from pytest import approx
+
+from tespy.components import Merge
+from tespy.components import Pipe
+from tespy.components import Sink
+from tespy.components import Source
+from tespy.components import Splitter
+from tespy.connections import Connection
+from tespy.networks import Network
+
+
+def create_pipe_network(num_branches, workers=1):
+    """Create a network of parallel pipes with different friction."""
+    nw = Network(T_unit="C", p_unit="bar", iterinfo=False, workers=workers)
+    so = Source("source")
+    si = Sink("sink")
+    splitter = Splitter("splitter", num_out=num_branches)
+    merge = Merge("merge", num_in=num_branches)
+    inlet = Connection(so, "out1", splitter, "in1", label="inlet")
+    outlet = Connection(merge, "out1", si, "in1", label="outlet")
+    nw.add_conns(inlet, outlet)
+
+    for i in range(num_branches):
+        pipe = Pipe(f"pipe {i}")
+        c1 = Connection(splitter, f"out{i + 1}", pipe, "in1", label=f"{i} in")
+        c2 = Connection(pipe, "out1", merge, f"in{i + 1}", label=f"{i} out")
+        nw.add_conns(c1, c2)
+        pipe.set_attr(zeta=1e6 * (1 + i / num_branches), kA=5e3, Tamb=10)
+        c1.set_attr(m0=10)
+        c2.set_attr(p0=10)
+
+    inlet.set_attr(fluid={"water": 1}, m=10 * num_branches, T=90, p=20)
+    return nw
+
+
+def test_parallel_results():
+    """Test identical results of the serial and the parallel evaluation."""
+    results = {}
+    for workers in [1, 2]:
+        nw = create_pipe_network(6, workers)
+        nw.solve("design")
+        nw._convergence_check()
+        results[workers] = nw.iter, nw.results["Connection"].copy()
+
+    assert results[1][0] == results[2][0]
+    for prop in ["m", "p", "h", "T"]:
+        assert results[2][1][prop].values == approx(
+            results[1][1][prop].values, rel=1e-10
+        )
+
+
+def test_parallel_pool_persistence():
+    """Test reusing the worker processes for the following simulations."""
+    nw = create_pipe_network(4, 2)
+    nw.solve("design")
+    nw._convergence_check()
+    pool = nw._parallel_pool
+    processes = list(pool.processes)
+
+    inlet = nw.get_conn("inlet")
+    inlet.set_attr(m=50)
+    nw.solve("design")
+    nw._convergence_check()
+    assert nw._parallel_pool is pool
+    assert pool.processes == processes
+    assert nw.results["Connection"].loc["outlet", "m"] == approx(50)
+
+    # a different number of workers starts a new pool
+    nw.set_attr(workers=1)
+    nw.solve("design")
+    assert nw._parallel_pool is None
+    assert not any(process.is_alive() for process in processes)
+
+
+
+def test_parallel_profiling():
+    """Test the parallel evaluation of a profiled network."""
+    reference = create_pipe_network(4)
+    reference.solve("design")
+
+    nw = create_pipe_network(4, 2)
+    nw.set_attr(profile=True)
+    nw.solve("design")
+    nw._convergence_check()
+    assert nw.results["Connection"]["h"].values == approx(
+        reference.results["Connection"]["h"].values, rel=1e-10
+    )
+    # the main process is still profiled after starting the workers
+    report = nw.profile_report()
+    assert "postprocessing" in report["phase"].values
+    assert "convergence_check" not in vars(nw.get_comp("pipe 0"))
@@ -0,0 +1,86 @@
+# -*- coding: utf-8
+
+"""Module for testing the fluid property profiler.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+tests/test_tools/test_profiling.py
+
+SPDX-License-Identifier: MIT
+"""
+import pytest
+from pytest import approx
+
+from tespy.components import Compressor
+from tespy.components import Sink
+from tespy.components import Source
+from tespy.connections import Bus
+from tespy.connections import Connection
+from tespy.networks import Network
+from tespy.tools import fluid_properties
+from tespy.tools.fluid_properties import functions
+from tespy.tools.fluid_properties.wrappers import CoolPropWrapper
+from tespy.tools.helpers import TESPyNetworkError
+
+
+class TestProfiling:
+
+    def setup_method(self):
+        self.nw = Network(T_unit="C", p_unit="bar", iterinfo=False)
+        so = Source("source")
+        cp = Compressor("compressor")
+        si = Sink("sink")
+        c1 = Connection(so, "out1", cp, "in1", label="1")
+        c2 = Connection(cp, "out1", si, "in1", label="2")
+        self.nw.add_conns(c1, c2)
+
+        power = Bus("power", P=1e5)
+        power.add_comps({"comp": cp, "base": "bus"})
+        self.nw.add_busses(power)
+
+        cp.set_attr(eta_s=0.85)
+        c1.set_attr(fluid={"air": 1}, p=1, T=20)
+        c2.set_attr(T=200)
+
+    def test_report(self):
+        self.nw.solve("design")
+        reference = self.nw.get_conn("1").m.val_SI
+
+        with pytest.raises(TESPyNetworkError):
+            self.nw.profile_report()
+
+        self.nw.set_attr(profile=True)
+        self.nw.solve("design")
+        self.nw._convergence_check()
+        assert self.nw.get_conn("1").m.val_SI == approx(reference, rel=1e-9)
+
+        report = self.nw.profile_report()
+        assert set(report["phase"]) == {
+            "initialisation", "residual", "derivative", "bounds",
+            "postprocessing"
+        }
+        compressor = report[report["object"] == "compressor"]
+        assert set(compressor["phase"]) >= {"residual", "derivative"}
+        assert "isentropic" in compressor["function"].values
+        assert (report["calls"] > 0).all()
+        assert report["time"].is_monotonic_decreasing
+
+    def test_restore(self):
+        original_method = CoolPropWrapper.__dict__["h_pT"]
+        original_function = functions.h_mix_pT
+        self.nw.set_attr(profile=True)
+        self.nw.solve("design")
+        assert CoolPropWrapper.__dict__["h_pT"] is original_method
+        assert functions.h_mix_pT is original_function
+        assert fluid_properties.h_mix_pT is original_function
+        assert "initialise" not in vars(self.nw)
+        compressor = self.nw.get_comp("compressor")
+        assert "calc_parameters" not in vars(compressor)
+        assert not hasattr(compressor.eta_s.func, "__wrapped__")
+
+        # the original functions are restored in case of an error as well
+        with pytest.raises(ValueError):
+            self.nw.solve("something")
+        assert CoolPropWrapper.__dict__["h_pT"] is original_method
+        assert "initialise" not in vars(self.nw)
@@ -0,0 +1,202 @@
+# -*- coding: utf-8
+
+"""Module for testing the sensitivity analysis.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+tests/test_tools/test_sensitivity.py
+
+SPDX-License-Identifier: MIT
+"""
+import numpy as np
+from pytest import approx
+from pytest import raises
+
+from tespy.components import Compressor
+from tespy.components import CycleCloser
+from tespy.components import Merge
+from tespy.components import Pipe
+from tespy.components import SimpleHeatExchanger
+from tespy.components import Sink
+from tespy.components import Source
+from tespy.components import Valve
+from tespy.connections import Bus
+from tespy.connections import Connection
+from tespy.networks import Network
+from tespy.tools import UserDefinedEquation
+from tespy.tools.helpers import TESPyNetworkError
+
+
+def finite_differences(nw, outputs, obj, name, d):
+    """Calculate the sensitivities by solving the network twice."""
+    if isinstance(obj, UserDefinedEquation):
+        value = obj.params[name]
+    else:
+        value = obj.get_attr(name).val
+
+    results = []
+    for v in [value + d, value - d]:
+        if isinstance(obj, UserDefinedEquation):
+            obj.params[name] = v
+        else:
+            obj.set_attr(**{name: v})
+        nw.solve("design")
+        nw._convergence_check()
+        results += [np.array([o.get_attr(p).val for o, p in outputs])]
+
+    if isinstance(obj, UserDefinedEquation):
+        obj.params[name] = value
+    else:
+        obj.set_attr(**{name: value})
+    nw.solve("design")
+    return (results[0] - results[1]) / (2 * d)
+
+
+def pressure_ratio(ude):
+    return ude.conns[0].p.val_SI - ude.params["ratio"] * ude.conns[1].p.val_SI
+
+
+class TestSensitivityHeatPump:
+
+    def setup_method(self):
+        self.nw = Network(
+            T_unit="C", p_unit="bar", h_unit="kJ / kg", iterinfo=False
+        )
+        cc = CycleCloser("cycle closer")
+        self.cp = Compressor("compressor")
+        self.co = SimpleHeatExchanger("condenser")
+        va = Valve("valve")
+        ev = SimpleHeatExchanger("evaporator")
+        self.c1 = Connection(cc, "out1", self.cp, "in1", label="1")
+        self.c2 = Connection(self.cp, "out1", self.co, "in1", label="2")
+        self.c3 = Connection(self.co, "out1", va, "in1", label="3")
+        self.c4 = Connection(va, "out1", ev, "in1", label="4")
+        c0 = Connection(ev, "out1", cc, "in1", label="0")
+        self.nw.add_conns(self.c1, self.c2, self.c3, self.c4, c0)
+
+        self.cp.set_attr(eta_s=0.8)
+        self.co.set_attr(pr=0.98, Q=-1e6)
+        ev.set_attr(pr=0.98)
+        self.c1.set_attr(fluid={"R134a": 1}, T=5, x=1)
+        self.c3.set_attr(Td_bp=-5)
+        self.ude = UserDefinedEquation(
+            "pressure ratio", pressure_ratio, None, [self.c2, self.c1],
+            params={"ratio": 4}
+        )
+        self.nw.add_ude(self.ude)
+        self.power = Bus("power")
+        self.power.add_comps({"comp": self.cp, "base": "bus", "char": 0.95})
+        self.nw.add_busses(self.power)
+        self.nw.solve("design")
+        self.nw._convergence_check()
+
+        self.outputs = [
+            (self.power, "P"), (self.c2, "T"), (self.cp, "P"),
+            (self.c4, "x"), (self.c3, "m")
+        ]
+        self.parameters = [
+            (self.cp, "eta_s"), (self.c1, "T"), (self.c3, "Td_bp"),
+            (self.co, "Q"), (self.ude, "ratio"), (self.co, "pr")
+        ]
+
+    def test_finite_differences(self):
+        """Test the sensitivities against two simulations per parameter."""
+        reference = [c.get_attr(p).val for c in [self.c2, self.c3]
+                     for p in ["m", "p", "h", "T"]]
+        sensitivities = self.nw.sensitivities(self.outputs, self.parameters)
+        results = [c.get_attr(p).val for c in [self.c2, self.c3]
+                   for p in ["m", "p", "h", "T"]]
+        # the network's results are unchanged
+        assert results == approx(reference, rel=1e-12)
+
+        for (obj, name), d in zip(
+                self.parameters, [1e-4, 1e-3, 1e-3, 10, 1e-4, 1e-5]):
+            expected = finite_differences(self.nw, self.outputs, obj, name, d)
+            assert sensitivities[(obj.label, name)].values == approx(
+                expected, rel=1e-5, abs=1e-6
+            )
+
+    def test_methods(self):
+        """Test identical results of the direct and the adjoint method."""
+        direct = self.nw.sensitivities(
+            self.outputs, self.parameters, method="direct"
+        )
+        adjoint = self.nw.sensitivities(
+            self.outputs, self.parameters, method="adjoint"
+        )
+        assert adjoint.values == approx(direct.values, rel=1e-9, abs=1e-9)
+        assert list(direct.index) == [
+            ("power", "P"), ("2", "T"), ("compressor", "P"), ("4", "x"),
+            ("3", "m")
+        ]
+
+    def test_functions(self):
+        """Test functions as outputs against the results of the network."""
+        def temperature():
+            return self.c2.T.val
+
+        def cop():
+            return -self.co.Q.val / self.power.P.val
+
+        outputs = [(self.co, "Q"), (self.power, "P"), (self.c2, "T")]
+        reference = self.nw.sensitivities(outputs, self.parameters)
+        sensitivities = self.nw.sensitivities(
+            [temperature, cop], self.parameters
+        )
+        assert list(sensitivities.index) == [("temperature", ""), ("cop", "")]
+        assert sensitivities.loc["temperature"].values[0] == approx(
+            reference.loc[("2", "T")].values, rel=1e-5, abs=1e-6
+        )
+
+        Q, P = self.co.Q.val, self.power.P.val
+        expected = -(
+            reference.loc[("condenser", "Q")].values * P
+            - Q * reference.loc[("power", "P")].values
+        ) / P ** 2
+        assert sensitivities.loc["cop"].values[0] == approx(
+            expected, rel=1e-5, abs=1e-6
+        )
+
+    def test_errors(self):
+        """Test invalid parameters, outputs and methods."""
+        with raises(ValueError):
+            self.nw.sensitivities(self.outputs, [(self.c2, "T")])
+        with raises(ValueError):
+            self.nw.sensitivities(self.outputs, [(self.cp, "P")])
+        with raises(KeyError):
+            self.nw.sensitivities(self.outputs, [(self.ude, "dT")])
+        with raises(ValueError):
+            self.nw.sensitivities([(self.power, "efficiency")], [])
+        with raises(ValueError):
+            self.nw.sensitivities(self.outputs, self.parameters, "newton")
+        with raises(TESPyNetworkError):
+            Network().sensitivities([], [])
+
+
+def test_fluid_composition():
+    """Test the sensitivities of mixture results to the mixing inputs."""
+    nw = Network(T_unit="C", p_unit="bar", iterinfo=False)
+    s1 = Source("nitrogen")
+    s2 = Source("oxygen")
+    merge = Merge("merge")
+    pipe = Pipe("pipe", pr=0.9, Q=-1e4)
+    si = Sink("sink")
+    c1 = Connection(s1, "out1", merge, "in1", label="1")
+    c2 = Connection(s2, "out1", merge, "in2", label="2")
+    c3 = Connection(merge, "out1", pipe, "in1", label="3")
+    c4 = Connection(pipe, "out1", si, "in1", label="4")
+    nw.add_conns(c1, c2, c3, c4)
+    c1.set_attr(fluid={"N2": 1, "O2": 0}, m=2, T=20, p=2)
+    c2.set_attr(fluid={"N2": 0, "O2": 1}, m=1, T=120)
+    nw.solve("design")
+    nw._convergence_check()
+
+    outputs = [(c3, "T"), (c4, "T"), (c4, "v")]
+    parameters = [(c1, "m"), (c2, "T"), (pipe, "Q")]
+    sensitivities = nw.sensitivities(outputs, parameters)
+    for (obj, name), d in zip(parameters, [1e-4, 1e-3, 1]):
+        expected = finite_differences(nw, outputs, obj, name, d)
+        assert sensitivities[(obj.label, name)].values == approx(
+            expected, rel=1e-5, abs=1e-9
+        )
@@ -0,0 +1,233 @@
+# -*- coding: utf-8
+
+"""Module for testing the surrogate models of networks.
+
+This file is part of project TESPy (github.com/oemof/tespy). It's copyrighted
+by the contributors recorded in the version control history of the file,
+available from its original location
+tests/test_tools/test_surrogate.py
+
+SPDX-License-Identifier: MIT
+"""
+import numpy as np
+from pytest import approx
+from pytest import raises
+
+from tespy.components import Pipe
+from tespy.components import Sink
+from tespy.components import Source
+from tespy.connections import Connection
+from tespy.networks import Network
+from tespy.tools.surrogate import Surrogate
+from tespy.tools.surrogate import SurrogateBuilder
+
+
+def create_pipe_network():
+    nw = Network(T_unit="C", p_unit="bar", iterinfo=False)
+    so = Source("source")
+    si = Sink("sink")
+    pipe = Pipe("pipe", pr=0.95, kA=5e3, Tamb=10)
+    c1 = Connection(so, "out1", pipe, "in1", label="1")
+    c2 = Connection(pipe, "out1", si, "in1", label="2")
+    nw.add_conns(c1, c2)
+    c1.set_attr(fluid={"water": 1}, m=10, T=90, p=10)
+    nw.solve("design", print_results=False)
+    return nw, pipe, c1, c2
+
+
+def analytical_function(X):
+    return np.column_stack([
+        1 + 2 * X[:, 0] - X[:, 1] + 0.5 * X[:, 0] * X[:, 1],
+        X[:, 0] ** 2 - 3 * X[:, 1] ** 2
+    ])
+
+
+class TestSurrogate:
+
+    def setup_method(self):
+        self.parameters = [("a", "x"), ("b", "y")]
+        self.outputs = [("c", "f"), ("d", "g")]
+        self.lower = np.array([0, 10])
+        self.upper = np.array([2, 30])
+        rng = np.random.default_rng(1)
+        self.X = self.lower + rng.random((30, 2)) * (self.upper - self.lower)
+
+    def fit(self, kind, X, **kwargs):
+        return Surrogate.fit(
+            kind, self.parameters, self.outputs, self.lower, self.upper,
+            X, analytical_function(X), **kwargs
+        )
+
+    def test_polynomial(self):
+        """Test the exact reproduction of a polynomial function."""
+        surrogate = self.fit("polynomial", self.X, degree=2)
+        X = self.lower + np.array([[0.3, 0.7], [1.2, -0.1]]) * (
+            self.upper - self.lower
+        )
+        assert surrogate.predict(X) == approx(analytical_function(X))
+
+    def test_rbf(self):
+        """Test the interpolation of the samples and of linear functions."""
+        surrogate = self.fit("rbf", self.X)
+        assert surrogate.predict(self.X) == approx(
+            analytical_function(self.X), rel=1e-8
+        )
+
+        Y = self.X @ np.array([[2, 1], [-1, 3]])
+        surrogate = Surrogate.fit(
+            "rbf", self.parameters, self.outputs, self.lower, self.upper,
+            self.X, Y
+        )
+        X = np.array([[0.5, 15], [1.5, 25]])
+        assert surrogate.predict(X) == approx(
+            X @ np.array([[2, 1], [-1, 3]]), rel=1e-8
+        )
+
+    def test_grid(self):
+        """Test the piecewise linear interpolation on a grid."""
+        X = np.array([[x, y] for x in [0, 1, 2] for y in [10, 30]])
+        Y = analytical_function(X)
+        Y[-1] = np.nan
+        surrogate = Surrogate.fit(
+            "grid", self.parameters, self.outputs, self.lower, self.upper,
+            X, Y
+        )
+        # bilinear functions are reproduced in the cells without failures
+        point = np.array([[0.5, 17]])
+        assert surrogate.predict(point)[0, 0] == approx(
+            analytical_function(point)[0, 0], rel=1e-12
+        )
+        assert np.isnan(surrogate.predict([[1.5, 20]])).all()
+
+        with raises(ValueError):
+            self.fit("grid", self.X)
+
+    def test_failed_samples(self):
+        """Test the exclusion of failed samples from the fit."""
+        Y = analytical_function(self.X)
+        Y[0] = np.nan
+        surrogate = Surrogate.fit(
+            "polynomial", self.parameters, self.outputs, self.lower,
+            self.upper, self.X, Y
+        )
+        assert surrogate.predict(self.X[0]) == approx(
+            analytical_function(self.X[:1])
+        )
+
+    def test_save_load(self, tmp_path):
+        """Test identical predictions of a saved and loaded surrogate."""
+        for kind in ["rbf", "polynomial"]:
+            surrogate = self.fit(kind, self.X)
+            path = str(tmp_path / f"{kind}.npz")
+            surrogate.save(path)
+            loaded = Surrogate.load(path)
+            assert loaded.kind == kind
+            assert loaded.parameters == self.parameters
+            assert loaded.outputs == self.outputs
+            assert loaded.predict(self.X) == approx(
+                surrogate.predict(self.X), rel=1e-14
+            )
+
+    def test_errors(self):
+        surrogate = self.fit("polynomial", self.X)
+        with raises(ValueError):
+            surrogate.predict(np.ones((2, 3)))
+        with raises(ValueError):
+            self.fit("spline", self.X)
+
+
+class TestSurrogateBuilder:
+
+    def setup_method(self):
+        self.nw, self.pipe, self.c1, self.c2 = create_pipe_network()
+        self.parameters = {(self.c1, "T"): [60, 120], (self.c1, "m"): [5, 20]}
+        self.outputs = [(self.c2, "T"), (self.pipe, "Q")]
+
+    def test_sampling(self):
+        """Test the stratification of the Latin hypercube sampling."""
+        builder = SurrogateBuilder(self.nw, self.parameters, self.outputs)
+        X = builder.sample(20, "lhs", seed=1)
+        for i, (lower, upper) in enumerate([[60, 120], [5, 20]]):
+            bins = np.floor((X[:, i] - lower) / (upper - lower) * 20)
+            assert sorted(bins) == list(range(20))
+
+        assert builder.sample(4, "grid").shape == (16, 2)
+        assert builder.sample(8, "random", seed=1) == approx(
+            builder.sample(8, "random", seed=1)
+        )
+        with raises(ValueError):
+            builder.sample(8, "halton")
+
+    def test_build(self, tmp_path):
+        """Test the surrogate against simulations of the network."""
+        builder = SurrogateBuilder(self.nw, self.parameters, self.outputs)
+        surrogate = builder.build(40, method="lhs", kind="rbf", seed=42)
+        assert builder.samples["converged"].all()
+        assert builder.num_solves == 48
+        assert (surrogate.validation["max relative"] < 1e-2).all()
+
+        # parameters of the network are reset
+        assert self.c1.T.val == approx(90)
+        assert self.c1.m.val == approx(10)
+
+        samples = builder.solve([[75, 12], [110, 7]])
+        assert surrogate.predict([[75, 12], [110, 7]]) == approx(
+            samples[builder.output_labels].values, rel=1e-2
+        )
+
+        path = str(tmp_path / "pipe.npz")
+        surrogate.save(path)
+        loaded = Surrogate.load(path)
+        assert loaded.validation.equals(surrogate.validation)
+
+    def test_workers(self):
+        """Test identical samples with several worker processes."""
+        X = SurrogateBuilder(
+            self.nw, self.parameters, self.outputs
+        ).sample(12, "lhs", seed=3)
+        samples = {}
+        for workers in [1, 2]:
+            builder = SurrogateBuilder(
+                self.nw, self.parameters, self.outputs, workers=workers
+            )
+            samples[workers] = builder.solve(X)
+        assert samples[2].values.astype(float) == approx(
+            samples[1].values.astype(float), rel=1e-8
+        )
+
+    def test_failed_samples(self):
+        """Test marking of failed simulations and recovery of the network."""
+        builder = SurrogateBuilder(
+            self.nw, {(self.pipe, "pr"): [-0.5, 0.99]}, self.outputs
+        )
+        samples = builder.solve([[0.9], [-0.5], [0.95], [0.8]])
+        assert list(samples["converged"]) == [True, False, True, True]
+        assert np.isnan(samples.loc[1, builder.output_labels]).all()
+        assert builder.num_failed == 1
+
+        self.nw.solve("design", print_results=False)
+        self.nw._convergence_check()
+
+    def test_failed_validation(self, monkeypatch):
+        """Test the validation errors without converged validation samples."""
+        builder = SurrogateBuilder(
+            self.nw, {(self.pipe, "pr"): [0.8, 0.99]}, self.outputs
+        )
+        sample = builder.sample
+
+        def sample_failing(num_points, method="lhs", seed=None):
+            X = sample(num_points, method, seed)
+            if method == "random":
+                X[:] = -0.5
+            return X
+
+        monkeypatch.setattr(builder, "sample", sample_failing)
+        surrogate = builder.build(6, kind="polynomial", num_validation=2)
+        assert not builder.validation_samples["converged"].any()
+        assert surrogate.validation.isna().all().all()
+
+    def test_errors(self):
+        with raises(ValueError):
+            SurrogateBuilder(self.nw, {(self.c2, "T"): [60, 80]}, [])
+        with raises(ValueError):
+            SurrogateBuilder(self.nw, self.parameters, [], workers=0)
@@ -16,6 +16,7 @@ from tespy.connections import Bus
 from tespy.connections import Connection
 from tespy.networks import Network
 
+from tespy.tools.optimization import GradientOptimizationProblem
 from tespy.tools.optimization import OptimizationProblem
 
 
@@ -292,3 +293,13 @@ plt.tight_layout()
 fig.savefig("pygmo_optimization.svg")
 print(data.loc[data["efficiency"].values == data["efficiency"].min()])
 # %%[sec_6]
+plant = SamplePlant()
+optimize = GradientOptimizationProblem(
+    plant, variables, constraints, objective="efficiency"
+)
+result = optimize.run(tol=1e-10)
+print(f"Efficiency: {round(100 / result.fun, 2)} %")
+print(f"Extraction 1: {round(result.x[0], 4)} bar")
+print(f"Extraction 2: {round(result.x[1], 4)} bar")
+print(optimize.individuals)
+# %%[sec_7]